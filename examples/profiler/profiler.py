@@ -37,7 +37,7 @@ algorithms to the existing ones.
 
 Invoke the script as ::
 
-  ./profiler.py s1
+  ./profiler.py s1 [--mmap]
 
 where ``s1`` is a subdirectory containing the following files.
 
@@ -60,6 +60,9 @@ Optional files::
                                 # your Kombilo installation.
 
 
+With ``--mmap``, the database is loaded with memory-mapped algorithm data (see
+``KEngine.loadDBs``).
+
 Of course, you could easily to change the script to read the database from a
 different path or to use more than one database.
 '''
@@ -144,7 +147,7 @@ if __name__ == '__main__':
     K = KEngine()
     K.gamelist.DBlist.append({'sgfpath': '', 'name':(os.path.abspath(basepath), 'kombilo1'), 'data': None, 'disabled': 0})
 
-    dummy, data['loading'] = timer(K.loadDBs)
+    dummy, data['loading'] = timer(K.loadDBs, mmap='--mmap' in sys.argv[2:])
     data['numofgames'] = K.gamelist.noOfGames()
     try:
         f = open('/proc/self/status')
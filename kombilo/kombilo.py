@@ -768,6 +768,13 @@ class PrevSearchesStack(object):
             # the root node, so there is nothing to do
             return
 
+        # release the snapshots held by this node
+        for i, sid in node.d['kw']['snapshot_ids']:
+            try:
+                self.mster.gamelist.DBlist[i]['data'].delete_snapshot(sid)
+            except (lk.DBError, IndexError):
+                pass  # already deleted by delete_all_snapshots
+
         b = node.d['board']
         if not b:
             return
@@ -1407,15 +1414,37 @@ class App(v.Viewer, KEngine):
 
         for k in d:
             for game in [d[k][i:i+2] for i in range(0, len(d[k]), 2)]:
-                DBindex = dbs[game[0]]
-                index = self.gamelist.DBlist[DBindex]['data'].find_by_ID(game[1])
-                text.append('[%d] %s: %s - %s\n' % (game[0], self.gamelist.DBlist[DBindex]['data'][index][GL_FILENAME],
-                                                    self.gamelist.DBlist[DBindex]['data'][index][GL_PW],
-                                                    self.gamelist.DBlist[DBindex]['data'][index][GL_PB]))
+                cols = self.gamelist.DBlist[dbs[game[0]]]['data'].columns()
+                row = cols.row(game[1])
+                text.append('[%d] %s: %s - %s\n' % (game[0], cols.filename[row], cols.value('PW', row), cols.value('PB', row)))
             text.append('-----------------------------------------------\n')
         v.TextEditor(''.join(text), self.sgfpath, self.monospaceFont)
 
 
+    def find_near_duplicates_GUI(self):
+        self.logger.insert('end', _('Searching for near duplicates') + '\n\n')
+        text = []
+        clusters = self.find_near_duplicates()
+        dbs = {}
+        i = 0
+        text.append(_('Databases:') + '\n')
+        for index, db in enumerate(self.gamelist.DBlist):
+            if db['disabled']:
+                continue
+            text.append('[%d] %s\n' % (i, db['sgfpath']))
+            dbs[i] = index
+            i += 1
+        text.append('-----------------------------------------------\n\n')
+
+        for score, games in clusters:
+            text.append(_('Similarity %.2f') % score + '\n')
+            for game in games:
+                cols = self.gamelist.DBlist[dbs[game[0]]]['data'].columns()
+                row = cols.row(game[1])
+                text.append('[%d] %s: %s - %s\n' % (game[0], cols.filename[row], cols.value('PW', row), cols.value('PB', row)))
+            text.append('-----------------------------------------------\n')
+        v.TextEditor(''.join(text), self.sgfpath, self.monospaceFont)
+
     def sigSearch(self):
         """ Search a game by its Dyer signature (sgf coord. of moves 20, 40, 60, 31, 51, 71)."""
 
@@ -1594,7 +1623,7 @@ class App(v.Viewer, KEngine):
 
         # restore currentSearchPattern
         i, sid = target_values['snapshot_ids'][0]
-        self.currentSearchPattern = Pattern(
+        self.currentSearchPattern = self.gamelist.DBlist[i]['data'].searchPattern or Pattern(
                 '',
                 pattern=self.gamelist.DBlist[i]['data'].mrs_pattern)
 
@@ -2113,6 +2142,16 @@ class App(v.Viewer, KEngine):
             algos |= lk.ALGO_HASH_FULL
         if self.options.algo_hash_corner.get():
             algos |= lk.ALGO_HASH_CORNER
+        if self.options.algo_hash_side.get():
+            algos |= lk.ALGO_HASH_SIDE
+        if self.options.algo_hash_center.get():
+            algos |= lk.ALGO_HASH_CENTER
+        if self.options.algo_fulltext.get():
+            algos |= lk.ALGO_FULLTEXT
+        if self.options.algo_minhash.get():
+            algos |= lk.ALGO_MINHASH
+        if self.options.compress_sgf.get():
+            algos |= lk.ALGO_SGF_COMPRESSED
         KEngine.addDB(
                 self,
                 dbp, datap,
@@ -2162,6 +2201,11 @@ class App(v.Viewer, KEngine):
                 os.remove(os.path.join(datap[0], datap[1] + '.db2'))
             except:
                 pass
+            for ext in ['db3', 'db4', ]:
+                try:
+                    os.remove(os.path.join(datap[0], datap[1] + '.' + ext))
+                except:
+                    pass
             self.processMessages.insert(END, _('Removed %s.') % dbpath + '\n')
 
         self.gamelist.reset()
@@ -2203,6 +2247,11 @@ class App(v.Viewer, KEngine):
                 os.remove(os.path.join(datap[0], datap[1] + '.db2'))
             except:
                 pass
+            for ext in ['db3', 'db4', ]:
+                try:
+                    os.remove(os.path.join(datap[0], datap[1] + '.' + ext))
+                except:
+                    pass
 
             self.db_list.delete(index)
             self.callAddDB(dbpath, datap, index=i)
@@ -2222,6 +2271,37 @@ class App(v.Viewer, KEngine):
         self.processMessages.update()
         self.saveProcMess.config(state=NORMAL)
 
+    def updateDB_GUI(self):
+        self.editDB_OK.config(state=DISABLED)
+        self.saveProcMess.config(state=DISABLED)
+
+        for index in self.db_list.list.curselection():
+            i = int(index)
+            if self.gamelist.DBlist[i]['disabled']:
+                continue
+
+            self.prevSearches.clear()
+            self.currentSearchPattern = None
+            self.updateDB(
+                    i,
+                    acceptDupl=self.options.acceptDupl.get(),
+                    strictDuplCheck=self.options.strictDuplCheck.get(),
+                    messages=self.processMessages,
+                    progBar=self.progBar,
+                    logDuplicates=self.options.logDuplicates.get())
+
+            db = self.gamelist.DBlist[i]
+            db_date = getDateOfFile(os.path.join(db['name'][0], db['name'][1] + '.da'))
+            self.db_list.delete(index)
+            self.db_list.insert(index, db['sgfpath'] + ' (%s, %d %s)' % (db_date, db['data'].size_all(), _('games')))
+            self.db_list.list.select_set(i)
+
+        self.gamelist.reset()
+        self.editDB_OK.config(state=NORMAL)
+        self.processMessages.insert('end', _('Done. Click "OK" to close this window and continue.'))
+        self.processMessages.update()
+        self.saveProcMess.config(state=NORMAL)
+
     def toggleDisabled(self):
         for index in self.db_list.list.curselection():
             i = int(index)
@@ -2314,7 +2394,7 @@ class App(v.Viewer, KEngine):
             self.whereDatabasesEntry.config(state=DISABLED)
 
     def finalizeEditDB(self):
-        self.dateProfileWholeDB = self.dateProfile()
+        self.dateProfileWholeDB = self.dateProfile(wholeDB=True)
         self.editDB_window.destroy()
         self.redo_date_profile = True
         self.notebookTabChanged()
@@ -2334,7 +2414,7 @@ class App(v.Viewer, KEngine):
         f1.grid(row=0, sticky=NSEW)
         f2 = Frame(window)
         f2.grid(row=1, sticky=NSEW)
-        for i in range(4):
+        for i in range(5):
             f2.columnconfigure(i, weight=1)
 
         f3 = Frame(window)
@@ -2367,15 +2447,16 @@ class App(v.Viewer, KEngine):
             self.stop_process_var.set(True)
 
         for i, (text, command, ) in enumerate([(_('Add DB'), self.addDB), (_('Toggle normal/disabled'), self.toggleDisabled),
-                                               (_('Remove DB'), self.removeDB), (_('Reprocess DB'), self.reprocessDB)]):
+                                               (_('Remove DB'), self.removeDB), (_('Reprocess DB'), self.reprocessDB),
+                                               (_('Update DB'), self.updateDB_GUI)]):
             Button(f2, text=text, command=command).grid(row=0, column=i, sticky=NSEW)
 
         self.stop_process_button = Button(f2, text=_('Stop'), command=stop_process, activebackground='red')
         self.stop_process_button.config(state=DISABLED)
-        self.stop_process_button.grid(row=0, column=4, sticky=NSEW)
+        self.stop_process_button.grid(row=0, column=5, sticky=NSEW)
 
         self.editDB_OK = Button(f2, text=_('OK'), command=self.finalizeEditDB)
-        self.editDB_OK.grid(row=0, column=5, sticky=NSEW)
+        self.editDB_OK.grid(row=0, column=6, sticky=NSEW)
 
         Label(f3, text=_('Processing options'), justify=LEFT, font=self.boldFont
                 ).grid(row=0, column=0, sticky=W)
@@ -2439,6 +2520,9 @@ class App(v.Viewer, KEngine):
         includeFullSGFButton = Checkbutton(f3, text=_('Include full SGF source'), highlightthickness=0, variable=self.options.include_full_sgf, pady=5)
         includeFullSGFButton.grid(row=6, column=0, columnspan=2, sticky=W)
 
+        compressSGFButton = Checkbutton(f3, text=_('Compress SGF source'), highlightthickness=0, variable=self.options.compress_sgf, pady=5)
+        compressSGFButton.grid(row=6, column=2, columnspan=2, sticky=W)
+
 
         sep = Separator(f3, orient='horizontal')
         sep.grid(row=7, column=0, columnspan=7, sticky=NSEW)
@@ -2473,6 +2557,18 @@ class App(v.Viewer, KEngine):
         self.algo_hash_corner = Checkbutton(f3, text=_('Use hashing for corner positions'), highlightthickness=0, variable=self.options.algo_hash_corner, pady=5)
         self.algo_hash_corner.grid(row=10, column=3, columnspan=2)
 
+        self.algo_hash_side = Checkbutton(f3, text=_('Use hashing for side positions'), highlightthickness=0, variable=self.options.algo_hash_side, pady=5)
+        self.algo_hash_side.grid(row=11, column=0, columnspan=2)
+
+        self.algo_hash_center = Checkbutton(f3, text=_('Use hashing for center positions'), highlightthickness=0, variable=self.options.algo_hash_center, pady=5)
+        self.algo_hash_center.grid(row=11, column=3, columnspan=2)
+
+        self.algo_fulltext = Checkbutton(f3, text=_('Full text index for game info search'), highlightthickness=0, variable=self.options.algo_fulltext, pady=5)
+        self.algo_fulltext.grid(row=12, column=0, columnspan=2)
+
+        self.algo_minhash = Checkbutton(f3, text=_('Index for finding near duplicates'), highlightthickness=0, variable=self.options.algo_minhash, pady=5)
+        self.algo_minhash.grid(row=12, column=3, columnspan=2)
+
         self.saveProcMess = Button(
                 f4, text=_('Save messages'), command=self.saveMessagesEditDBlist)
         self.saveProcMess.pack(side=RIGHT)
@@ -2508,6 +2604,25 @@ class App(v.Viewer, KEngine):
 
         KEngine.copyCurrentGamesToFolder(self, dir)
 
+    def exportCurrentGames(self, target=None):
+        if target is None:
+            target = tkFileDialog.asksaveasfilename(
+                    filetypes=[(_('Zip archives'), '*.zip'), (_('Tar archives'), '*.tar.gz'), (_('SGF collections'), '*.sgf'), (_('All files'), '*')],
+                    initialdir=self.datapath)
+            if not target:
+                return
+            target = str(target)
+        if exportFormat(target) == 'folder':
+            return self.copyCurrentGamesToFolder(target)
+
+        self.progBar.start(50)
+        try:
+            KEngine.exportCurrentGames(self, target)
+        except (IOError, OSError) as e:
+            showwarning(_('Error'), _('Could not write to ') + target + '\n' + str(e))
+        finally:
+            self.progBar.stop()
+
     def openFile(self, path=None, filename=None, do_not_change_sgfpath=False):
         self.board.newPosition()
         v.Viewer.openFile(self, path, filename, do_not_change_sgfpath=do_not_change_sgfpath)
@@ -2526,6 +2641,7 @@ class App(v.Viewer, KEngine):
             c['main']['version'] = 'kombilo%s' % '.'.join(KOMBILO_VERSION.split('.')[:2])
             c['main']['sgfpath'] = self.sgfpath
             c['main']['datapath'] = self.datapath
+            c['main']['referencesHash'] = self.referencesHash()
             self.saveOptions(c['options'])
             c['databases'] = {}
             for counter, db in enumerate(self.gamelist.DBlist):
@@ -2660,9 +2776,11 @@ class App(v.Viewer, KEngine):
         self.dbmenu.add_command(label=_('Export tags to file'), command=self.exportTags)
         self.dbmenu.add_command(label=_('Import tags from file'), command=self.importTags)
         self.dbmenu.add_command(v.get_addmenu_options(label=_('_Copy current SGF files to folder'), command=self.copyCurrentGamesToFolder))
+        self.dbmenu.add_command(label=_('Export current games to archive'), command=self.exportCurrentGames)
 
         self.dbmenu.add_command(label=_('Signature search'), command=self.sigSearch)
         self.dbmenu.add_command(label=_('Find duplicates'), command=self.find_duplicates_GUI)
+        self.dbmenu.add_command(label=_('Find near duplicates'), command=self.find_near_duplicates_GUI)
 
         self.optionsmenu.add_checkbutton(v.get_addmenu_options(label=_('_Jump to match'), variable=self.options.jumpToMatchVar))
         self.optionsmenu.add_checkbutton(v.get_addmenu_options(label=_('S_mart FixedColor'), variable=self.options.smartFixedColor))
@@ -2782,6 +2900,10 @@ class App(v.Viewer, KEngine):
             so.algos |= lk.ALGO_HASH_FULL
         if self.algo_hash_corner_search.get():
             so.algos |= lk.ALGO_HASH_CORNER
+        if self.algo_hash_side_search.get():
+            so.algos |= lk.ALGO_HASH_SIDE
+        if self.algo_hash_center_search.get():
+            so.algos |= lk.ALGO_HASH_CENTER
         return so
 
     def search(self):
@@ -2881,6 +3003,12 @@ class App(v.Viewer, KEngine):
         reset_game_list_button.grid(row=row_ctr, column=0)
         row_ctr += 1
 
+        one_pass_var = IntVar()
+        one_pass_var.set(0)
+        one_pass_button = Checkbutton(options_window, text=_('Read games only once (fixed anchors)'), highlightthickness=0, variable=one_pass_var, pady=5)
+        one_pass_button.grid(row=row_ctr, column=0)
+        row_ctr += 1
+
         cancel = []
 
         def ok_fct():
@@ -2927,6 +3055,7 @@ class App(v.Viewer, KEngine):
 
         options_dict = {s: getattr(variables, s).get() for s, t, v in entry_list}
         options_dict.update({'reset_game_list': reset_game_list_var.get(),
+                             'one_pass': one_pass_var.get(),
                              'sort_criterion': self.untranslate_cont_sort_crit(),
                              'boardsize': CSP.boardsize,
                              'sizex': CSP.sizeX, 'sizey': CSP.sizeY,
@@ -3086,8 +3215,7 @@ class App(v.Viewer, KEngine):
         t = self.getTagHandle()
         if t is None:
             return
-        for dummy, DBindex, index in self.gamelist.gameIndex:
-            self.gamelist.DBlist[DBindex]['data'].setTag(t, index, index + 1)
+        self.gamelist.setTags(t)
 
         self.gamelist.upd()
         if self.gamelist.listbox.curselection():
@@ -3099,8 +3227,7 @@ class App(v.Viewer, KEngine):
         t = self.getTagHandle()
         if t is None:
             return
-        for dummy, DBindex, index in self.gamelist.gameIndex:
-            self.gamelist.DBlist[DBindex]['data'].deleteTag(t, index)
+        self.gamelist.deleteTags(t)
         self.logger.insert(END, _('Deleted tag [{0}] {1} from {2} games.\n').format(self.gamelist.customTags[str(t)][0], self.gamelist.customTags[str(t)][1], len(self.gamelist.gameIndex)))
 
         self.gamelist.upd()
@@ -3125,7 +3252,13 @@ class App(v.Viewer, KEngine):
             except:
                 showwarning(_('Error'), _('SGF Error'))
         tag = tag or self.tagSearchVar.get()
-        KEngine.tagSearch(self, tag)
+        try:
+            KEngine.tagSearch(self, tag)
+        except ValueError:
+            self.progBar.stop()
+            self.logger.insert(END, _('Invalid query.') + '\n')
+            self.configButtons(NORMAL)
+            return
 
         self.progBar.stop()
         self.logger.insert(END, (_('Tag search %s') % tag) + ', ' + _('%1.1f seconds') % (time.time() - currentTime) + '\n')
@@ -3484,13 +3617,23 @@ class App(v.Viewer, KEngine):
         self.algo_hash_corner = Checkbutton(self.patternSearchOptions, text=_('Use hashing for corner positions'), highlightthickness=0, variable=self.algo_hash_corner_search, pady=5)
         self.algo_hash_corner.grid(row=5, column=0, columnspan=2, sticky=W)
 
+        self.algo_hash_side_search = IntVar()
+        self.algo_hash_side_search.set(1)
+        self.algo_hash_side = Checkbutton(self.patternSearchOptions, text=_('Use hashing for side positions'), highlightthickness=0, variable=self.algo_hash_side_search, pady=5)
+        self.algo_hash_side.grid(row=6, column=0, columnspan=2, sticky=W)
+
+        self.algo_hash_center_search = IntVar()
+        self.algo_hash_center_search.set(1)
+        self.algo_hash_center = Checkbutton(self.patternSearchOptions, text=_('Use hashing for center positions'), highlightthickness=0, variable=self.algo_hash_center_search, pady=5)
+        self.algo_hash_center.grid(row=7, column=0, columnspan=2, sticky=W)
+
         sep2 = Separator(self.patternSearchOptions, orient='horizontal')
-        sep2.grid(row=6, column=0, columnspan=2, sticky=NSEW)
+        sep2.grid(row=8, column=0, columnspan=2, sticky=NSEW)
 
         # add widgets for date profile options
 
         self.patternSearchOptions_dp = Frame(self.patternSearchOptions)
-        self.patternSearchOptions_dp.grid(row=7, columnspan=6, sticky=NSEW)
+        self.patternSearchOptions_dp.grid(row=9, columnspan=6, sticky=NSEW)
         self.dp_label = Label(self.patternSearchOptions_dp, text=_('Date profile options'))
         self.dp_label.grid(row=7, column=0, columnspan=4)
         self.dp_from_lb = Label(self.patternSearchOptions_dp, text=_('From'))
@@ -3509,7 +3652,7 @@ class App(v.Viewer, KEngine):
         self.dp_chunk_size.pack(side=LEFT)
         self.dp_chunk_f.grid(row=8, column=4, padx=60, sticky='E')
         self.patternSearchOptions_dp1 = Frame(self.patternSearchOptions)
-        self.patternSearchOptions_dp1.grid(row=8, columnspan=8, sticky=NSEW)
+        self.patternSearchOptions_dp1.grid(row=10, columnspan=8, sticky=NSEW)
         self.dp_sort_crit_lb = Label(self.patternSearchOptions_dp1, text=_('Sort continuations by'))
         self.dp_sort_crit_lb.grid(row=0, column=0)
         self.dp_sort_crit = Combobox(self.patternSearchOptions_dp1, values=(_('total'), _('earliest'), _('latest'), _('average'), _('became popular'), _('became unpopular'), ), textvariable=self.options.continuations_sort_crit,
@@ -3671,12 +3814,16 @@ class App(v.Viewer, KEngine):
             self.fixedColorVar.set(1)
         self.gamelist.showFilename = self.options.showFilename.get()
         self.gamelist.showDate = self.options.showDate.get()
+        retagReferences = False
         if not self.parseReferencesFile(
                 datafile=pkg_resources.resource_stream(__name__, 'data/references'),
                 options=self.config['references']
                 if 'references' in self.config else None):
             self.logger.insert(END, _('Error parsing references file.\n'))
-        self.loadDBs(self.progBar, showwarning)
+        else:
+            # re-apply the references if they changed since the last session
+            retagReferences = self.config['main'].get('referencesHash') != self.referencesHash()
+        self.loadDBs(self.progBar, showwarning, retagReferences=retagReferences)
 
         self.logger.insert(END, 'Kombilo %s.\n' % KOMBILO_VERSION + _('Ready ...') + '\n')
         self.progBar.stop()
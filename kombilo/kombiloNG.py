@@ -39,10 +39,21 @@ except:
 
 import time
 import os
+import re
 import sys
-from collections import defaultdict
-from copy import copy
+import hashlib
+import sqlite3
+import threading
+import weakref
+from collections import defaultdict, deque, OrderedDict
 import glob
+import shutil
+import tarfile
+import zipfile
+from bisect import bisect_right
+from io import BytesIO
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 from array import *
 from configobj import ConfigObj
 
@@ -96,6 +107,15 @@ class dummyMessages:
         pass
 
 
+class bufferedMessages(dummyMessages):
+    '''Collect the messages in the list ``self.text``.'''
+    def __init__(self):
+        self.text = []
+
+    def insert(self, pos, s):
+        self.text.append(s)
+
+
 def translateRE(s):
     '''
     Try to provide accurate translation of REsult string in an SGF file.
@@ -188,6 +208,7 @@ class Pattern(lk.Pattern):
         if 'pattern' in kwargs:
             # "copy constructor": create Pattern instance from an lk.Pattern
             lk.Pattern.__init__(self, kwargs['pattern'])
+            self.contLabelsStr = getattr(kwargs['pattern'], 'contLabelsStr', None)
             return
 
         iPos = p.replace(' ', '').replace(',', '.').replace('\n', '').replace('\r', '')
@@ -230,6 +251,7 @@ class Pattern(lk.Pattern):
                 color = 'X' if color == 'O' else 'O'
 
         contlabels = kwargs.get('contlabels', '.' * len(iPos))
+        self.contLabelsStr = contlabels  # lk.Pattern.contLabels is not null-terminated, so we keep a copy
 
         # print(iPos, len(contlist), [(m.x, m.y, m.color) for m in contlist])
 
@@ -238,6 +260,50 @@ class Pattern(lk.Pattern):
         else:
             lk.Pattern.__init__(self, *(kwargs['anchors'] + (boardsize, sX, sY, iPos, contlist, contlabels)))
 
+    def key(self):
+        '''Return a hashable key which identifies this pattern (i.e., its
+        anchors, size, initial position, continuation list and labels). Two
+        patterns with the same key give the same search results. Returns None
+        if the continuation labels of the pattern are not known.
+        '''
+        if self.contLabelsStr is None:
+            return None
+        return (self.left, self.right, self.top, self.bottom, self.boardsize, self.sizeX, self.sizeY,
+                ''.join([uu(self.getInitial(i, j)) for j in range(self.sizeY) for i in range(self.sizeX)]),
+                tuple([(ord(m.x), ord(m.y), uu(m.color)) for m in self.contList]),
+                self.contLabelsStr, )
+
+    def canonical(self):
+        '''Return a pair ``(p, f)`` where ``p`` is the image of this pattern
+        under the board symmetry ``f`` (compare ``lk.Pattern.flipsX``), chosen
+        such that all patterns which differ only by a symmetry of the board
+        have the same ``p``. Since a pattern search always takes all
+        symmetries into account, searching for ``p`` gives the same results
+        as searching for this pattern, with the point ``(x, y)`` of this
+        pattern corresponding to the point ``(lk.Pattern.flipsX(f, x, y,
+        sizeX-1, sizeY-1), lk.Pattern.flipsY(...))`` of ``p``.
+
+        If the pattern is invariant under some symmetry (possibly combined
+        with exchanging the colors), the continuations of symmetric points
+        are merged by the search in a way which depends on the orientation
+        of the pattern, so in this case ``(self, 0)`` is returned.
+        '''
+        key = self.key()
+        if key is None:
+            return self, 0
+        if getattr(self, 'canonicalCache', (None, ))[0] == key:
+            return self.canonicalCache[1]
+
+        flipped = [(flipPatternKey(key, f), f) for f in range(8)]
+        swapped = [flipPatternKey(key, f, switchColors=True) for f in range(8)]
+        if key in [k for k, f in flipped[1:]] + swapped:
+            result = self, 0
+        else:
+            k, f = min(flipped)
+            result = (self, 0) if f == 0 else (patternFromKey(k), f)
+        self.canonicalCache = (key, result, )
+        return result
+
     def getInitialPosAsList(self, hoshi=False, boundary=False, ):
         '''
         Export current pattern as list of lists, like [ ['.', 'X', '.'], ['O', '.', '.'] ]
@@ -275,6 +341,66 @@ class Pattern(lk.Pattern):
 
         return plist
 
+_flipPermutations = {}
+
+
+def flipPermutation(f, sizeX, sizeY):
+    '''Return a list ``l`` such that the point with index ``k`` (i.e.,
+    ``(k % newSizeX, k // newSizeX)``) of the image of a pattern of size
+    ``sizeX`` times ``sizeY`` under the flip ``f`` is the image of the point
+    with index ``l[k]`` of the pattern. Compare ``lk.Pattern.flipsX``.
+    '''
+    if not (f, sizeX, sizeY) in _flipPermutations:
+        newSizeX = max(lk.Pattern.flipsX(f, 0, 0, sizeX, sizeY), lk.Pattern.flipsX(f, sizeX, sizeY, sizeX, sizeY))
+        l = [0] * (sizeX * sizeY)
+        for i in range(sizeX):
+            for j in range(sizeY):
+                l[lk.Pattern.flipsX(f, i, j, sizeX - 1, sizeY - 1) + newSizeX * lk.Pattern.flipsY(f, i, j, sizeX - 1, sizeY - 1)] = i + sizeX * j
+        _flipPermutations[(f, sizeX, sizeY)] = l
+    return _flipPermutations[(f, sizeX, sizeY)]
+
+
+def flipPatternKey(key, f, switchColors=False):
+    '''Return the key (see :py:meth:`Pattern.key`) of the image of the
+    pattern with the given key under the flip ``f`` (and with black and
+    white exchanged, if ``switchColors`` is True). This is computed in the
+    same way as the patterns in a ``PatternList``.
+    '''
+    left, right, top, bottom, boardsize, sizeX, sizeY, iPos, contList, contLabels = key
+    fX = lambda x, y, XX, YY: lk.Pattern.flipsX(f, x, y, XX, YY)
+    fY = lambda x, y, XX, YY: lk.Pattern.flipsY(f, x, y, XX, YY)
+
+    newSizeX = max(fX(0, 0, sizeX, sizeY), fX(sizeX, sizeY, sizeX, sizeY))
+    newSizeY = max(fY(0, 0, sizeX, sizeY), fY(sizeX, sizeY, sizeX, sizeY))
+    corners = [(left, top), (right + sizeX - 1, bottom + sizeY - 1)]
+    xs = [fX(x, y, boardsize - 1, boardsize - 1) for x, y in corners]
+    ys = [fY(x, y, boardsize - 1, boardsize - 1) for x, y in corners]
+
+    perm = flipPermutation(f, sizeX, sizeY)
+    newIPos = ''.join([iPos[k] for k in perm])
+    newLabels = ''.join([contLabels[k] for k in perm])
+    newContList = tuple([(fX(x, y, sizeX - 1, sizeY - 1), fY(x, y, sizeX - 1, sizeY - 1), c) for x, y, c in contList])
+    if switchColors:
+        inv = {'X': 'O', 'O': 'X', 'x': 'o', 'o': 'x', }
+        newIPos = ''.join([inv.get(c, c) for c in newIPos])
+        newContList = tuple([(x, y, inv.get(c, c)) for x, y, c in newContList])
+
+    return (min(xs), max(xs) - (newSizeX - 1), min(ys), max(ys) - (newSizeY - 1), boardsize, newSizeX, newSizeY,
+            newIPos, newContList, newLabels, )
+
+
+def patternFromKey(key):
+    '''Create a :py:class:`Pattern` from its key (see :py:meth:`Pattern.key`).'''
+
+    left, right, top, bottom, boardsize, sizeX, sizeY, iPos, contList, contLabels = key
+    cl = lk.vectorMNC()
+    for x, y, c in contList:
+        cl.push_back(lk.MoveNC(x, y, c))
+    p = Pattern.__new__(Pattern)
+    lk.Pattern.__init__(p, left, right, top, bottom, boardsize, sizeX, sizeY, iPos, cl, contLabels)
+    p.contLabelsStr = contLabels
+    return p
+
 # ------ CURSOR -----------------------------------------------------------------
 
 
@@ -301,7 +427,338 @@ class Node(sgf.Node):
 # ------ GAMELIST ---------------------------------------------------------------
 
 
+# the attributes of KEngine which hold the results of a pattern search (see KEngine.saveSearchState)
+SEARCH_STATE_ATTRIBUTES = ('currentSearchPattern', 'searchOptions', 'contLabels', 'fixedLabels', 'continuations',
+                           'noMatches', 'noSwitched', 'Bwins', 'Wwins', 'BwinsG', 'WwinsG', )
+
+
+def searchOptionsKey(so):
+    '''Return a hashable key for the lk.SearchOptions instance ``so``.'''
+
+    so = so or lk.SearchOptions()
+    return (so.fixedColor, so.nextMove, so.moveLimit, so.trustHashFull, so.searchInVariations, so.algos, )
+
+
+class SearchCache(object):
+    '''A cache for the results of pattern searches, shared by the databases
+    of a :py:class:`KEngine` (see ``KEngine.searchCache``).
+
+    The results of a search in one database are stored as a snapshot of that
+    database (see ``lk.GameList.snapshot``), which contains the current list
+    together with the hits, continuations and win statistics. An entry is
+    keyed by the pattern (see :py:meth:`Pattern.key`), the search options and
+    the fingerprint of the current list before the search (see
+    ``lkGameList.listState``), so a repeated search is answered by restoring
+    the snapshot.
+
+    The least recently used entries are evicted as soon as the total size of
+    the stored snapshots exceeds ``maxSize`` bytes. Entries of a database are
+    dropped when the database is changed (by processing games), or when its
+    snapshots are deleted. The attributes ``hits`` and ``misses`` count how
+    many searches could be answered from the cache.
+    '''
+
+    def __init__(self, maxSize=64 * 1024 * 1024):
+        self.maxSize = maxSize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()  # key -> (gl, handle, size)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, gl, pattern, options=None):
+        '''Do a pattern search in the lkGameList ``gl``, or restore its result
+        from the cache.
+        '''
+        cp, flip = pattern.canonical() if hasattr(pattern, 'canonical') else (pattern, 0)
+        pkey = cp.key() if hasattr(cp, 'key') else None
+        if pkey is None or gl.listState is None:
+            gl.search(pattern, options)
+            return
+
+        # Patterns which differ by a symmetry of the board have the same
+        # canonical pattern, so they share the cache entry.
+        key = (uu(gl.dbname), gl.listState, pkey, searchOptionsKey(options), )
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries[key] = self.entries.pop(key)  # mark as most recently used
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            gl.restore(entry[1])
+        else:
+            gl.search(cp, options)
+            if not gl.search_interrupted():  # do not store partial results
+                handle = gl.snapshot()
+                self.put(key, gl, handle, self.snapshotSize(gl, handle))
+        gl.setSearchPattern(pattern, flip)
+
+    def snapshotSize(self, gl, handle):
+        '''Return the size (in bytes) of the snapshot ``handle`` of ``gl``.'''
+
+        return gl.snapshot_size(handle)
+
+    def put(self, key, gl, handle, size):
+        gl.searchCache = self
+        with self.lock:
+            self.entries[key] = (gl, handle, size)
+            self.size += size
+            evicted = []
+            while self.size > self.maxSize and self.entries:
+                evicted.append(self.entries.popitem(last=False)[1])
+                self.size -= evicted[-1][2]
+        for e_gl, e_handle, e_size in evicted:
+            try:
+                e_gl.delete_snapshot(e_handle)
+            except lk.DBError:
+                pass
+
+    def invalidate(self, gl=None, delete=True):
+        '''Drop all entries belonging to ``gl`` (or all entries, if ``gl`` is
+        None). If ``delete`` is True, the corresponding snapshots are deleted
+        from the database.
+        '''
+        with self.lock:
+            dropped = [(k, e) for k, e in self.entries.items() if gl is None or e[0] is gl]
+            for k, e in dropped:
+                del self.entries[k]
+                self.size -= e[2]
+        if delete:
+            for k, (e_gl, e_handle, e_size) in dropped:
+                try:
+                    e_gl.delete_snapshot(e_handle)
+                except lk.DBError:
+                    pass
+
+    def clear(self):
+        self.invalidate()
+
+
+class SearchMonitor(object):
+    '''Reports the progress of a pattern search or game info search, and
+    stops it on request (see :py:meth:`KEngine.patternSearch` and
+    :py:meth:`KEngine.gameinfoSearch`).
+
+    * ``progress``: a callable which is called as ``progress(done, total)``
+      every ``interval`` games (of a single database) from inside the search
+      loop, where ``total`` is the number of games in the current lists of
+      all databases, and ``done`` (an estimate of) the number of games
+      examined so far. If it returns ``False`` (not just a false value), the
+      search is stopped.
+    * ``stop_var``: an object with a ``get`` method (e.g. a Tkinter
+      ``BooleanVar``); the search is stopped as soon as ``stop_var.get()``
+      returns a true value.
+    * ``timeLimit``: the search is stopped after this many seconds.
+
+    These conditions are checked every ``interval`` games. After the search,
+    ``interrupted`` says whether it was stopped. Exceptions raised by
+    ``progress`` stop the search and are re-raised afterwards.
+    '''
+
+    def __init__(self, progress=None, stop_var=None, timeLimit=None, interval=1000):
+        self.progress = progress
+        self.stop_var = stop_var
+        self.timeLimit = timeLimit
+        self.interval = interval
+        self.interrupted = False
+        self.error = None
+        self.lock = threading.Lock()
+
+    def attach(self, gls):
+        '''Install progress callbacks in the lkGameLists ``gls``, and start
+        the clock.'''
+
+        self.gls = gls
+        self.deadline = time.time() + self.timeLimit if self.timeLimit is not None else None
+        self.total = sum(gl.size() for gl in gls)
+        self.done = [0] * len(gls)
+        offset = 0
+        for i, gl in enumerate(gls):
+            gl.set_progress_callback(self.callback(i, offset, gl.size()), self.interval)
+            offset += gl.size()
+
+    def detach(self):
+        '''Remove the progress callbacks; re-raise an exception raised by
+        ``progress``.'''
+
+        for gl in self.gls:
+            gl.set_progress_callback(None, 0)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def callback(self, i, offset, size):
+        def cb(done, total):
+            # done/total refer to the current pass of the search in this
+            # database; convert to the number of games of all databases
+            with self.lock:
+                if self.interrupted:
+                    return False
+                self.done[i] = max(self.done[i], (size * done // total) if total else 0)
+                try:
+                    if self.stop_var is not None and self.stop_var.get():
+                        self.interrupted = True
+                    elif self.deadline is not None and time.time() > self.deadline:
+                        self.interrupted = True
+                    elif self.progress is not None and self.progress(offset + self.done[i], self.total) is False:
+                        self.interrupted = True
+                except Exception as e:
+                    self.error = e
+                    self.interrupted = True
+                return not self.interrupted
+        return cb
+
+
+def _chain(state, *op):
+    # the fingerprint of the current list obtained by applying op to a list
+    # with fingerprint state
+    if state is None:
+        return None
+    return hashlib.sha1(bb(repr((state, ) + op))).hexdigest()
+
+
+# a condition "column like 'pattern'" in a game info query (without an escape
+# clause); the pattern may contain doubled quotes
+_LIKE_CLAUSE = re.compile(r"\b(PB|PW|EV|sgf)\s+like\s+'((?:[^']|'')*)'(?!\s*escape\b)", re.IGNORECASE)
+_SGF_COLUMN = re.compile(r"('(?:[^']|'')*')|(?<![.\w])sgf\b(?!\s*\()", re.IGNORECASE)
+
+
+class GameInfoColumns(object):
+    '''The game information of all games of a database in columnar form, see
+    :py:meth:`lkGameList.columns`. The games are the rows, ordered by their
+    ids, and each column is a list or array with one entry per row:
+
+    * ``ids``: the ids of the games (array)
+    * ``PB``, ``PW``, ``EV``, ``path``: indices into the list ``names`` of
+      (interned) player names, events and paths (arrays); ``names[0]`` is the
+      empty string, which is used for missing values
+    * ``date``: the dates as integers YYYYMMDD (array); 0 if the date is
+      unknown
+    * ``winner``: indices into ``WINNERS``, i.e., 0 (unknown), 1 (black
+      won), 2 (white won), 3 (jigo) (array)
+    * ``filename``: the file names (list of strings)
+
+    The row of the game with id ``i`` is ``rowOf[i]`` (or -1, if there is no
+    such game).
+    '''
+
+    WINNERS = '-BWJ'
+    NAME_COLUMNS = ('PB', 'PW', 'EV', 'path', )
+
+    def __init__(self, dbname):
+        self.names = ['']
+        nameIndex = {'': 0}
+
+        def intern(name):
+            if not name:
+                return 0
+            i = nameIndex.get(name)
+            if i is None:
+                i = nameIndex[name] = len(self.names)
+                self.names.append(name)
+            return i
+
+        self.ids = array(str('l'))
+        self.PB, self.PW, self.EV, self.path = array(str('l')), array(str('l')), array(str('l')), array(str('l'))
+        self.date = array(str('l'))
+        self.winner = array(str('b'))
+        self.filename = []
+
+        db = sqlite3.connect(dbname)
+        try:
+            # EV is stored only if it is one of the rootNodeTags of the database
+            ev = 'EV' if 'EV' in [row[1] for row in db.execute('pragma table_info(GAMES)')] else "''"
+            for ID, path, filename, PB, PW, RE, date, EV in db.execute(
+                    'select id, path, filename, PB, PW, RE, date, %s from GAMES order by id' % ev):
+                self.ids.append(ID)
+                self.path.append(intern(path))
+                self.filename.append(filename or '')
+                self.PB.append(intern(PB))
+                self.PW.append(intern(PW))
+                self.EV.append(intern(EV))
+                self.winner.append(self.winnerIndex(RE))
+                self.date.append(self.dateAsInt(date))
+        finally:
+            db.close()
+
+        self.rowOf = array(str('l'), [-1]) * ((self.ids[-1] + 1) if self.ids else 0)
+        for row, ID in enumerate(self.ids):
+            self.rowOf[ID] = row
+
+    @staticmethod
+    def winnerIndex(RE):
+        # as in libkombilo, only the first character of RE is taken into account
+        if not RE:
+            return 0
+        if RE[0] == '0':  # officially, SGF says that jigo should be given as RE[0]
+            return 3
+        return max(GameInfoColumns.WINNERS.find(RE[0]), 0)
+
+    @staticmethod
+    def dateAsInt(date):
+        try:
+            return int(date[:4]) * 10000 + int(date[5:7]) * 100 + int(date[8:10])
+        except (TypeError, ValueError):
+            return 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, ID):
+        '''Return the row of the game with id ``ID``, or -1.'''
+        return self.rowOf[ID] if 0 <= ID < len(self.rowOf) else -1
+
+    def decoder(self, name):
+        '''Return a function translating the entries of the column ``name``
+        into strings (for names and the winner), or the identity.'''
+        if name in self.NAME_COLUMNS:
+            return self.names.__getitem__
+        if name == 'winner':
+            return self.WINNERS.__getitem__
+        return lambda x: x
+
+    def value(self, name, row, decode=True):
+        '''Return the entry of the column ``name`` in row ``row``.'''
+        v = getattr(self, name)[row]
+        return self.decoder(name)(v) if decode else v
+
+
 class lkGameList(lk.GameList):
+    '''The Python wrapper of the libkombilo GameList (i.e., of one Kombilo
+    database).
+
+    The results of the most recent pattern search are stored with respect
+    to the pattern ``mrs_pattern`` which was actually searched for. This may
+    be the image of the pattern ``searchPattern`` asked for under the
+    symmetry ``patternFlip`` (see :py:meth:`Pattern.canonical`); use
+    :py:meth:`patternCoordinates` to translate coordinates.
+
+    Besides the methods of ``lk.GameList``, it keeps track of a fingerprint
+    ``listState`` of the current list: after :py:meth:`reset`, it depends only
+    on the database, and every search changes it in a deterministic way
+    depending on the search parameters. Two current lists with the same
+    fingerprint contain the same games. The fingerprint is None if the
+    current list is not known (e.g. before the first reset); it is used by
+    the :py:class:`SearchCache`.
+
+    The game information of all games is available in columnar form from
+    :py:meth:`columns`; :py:meth:`currentRows` gives the rows of the games in
+    the current list.
+
+    The SGF files processed into the database are recorded (path, filename,
+    modification time, size and a hash of the content) in the table
+    ``FILES`` of the database; see :py:meth:`KEngine.updateDB`. Entries are
+    collected in ``processedFiles`` and written by
+    :py:meth:`finalize_processing`.
+    '''
+
+    searchCache = None  # the SearchCache holding results of this list, if any
+    rootNodeCacheSize = 256  # number of games whose root node is kept by rootNode
 
     def __init__(self, *args):
         try:
@@ -312,6 +769,431 @@ class lkGameList(lk.GameList):
             lk.GameList.__init__(self, args[0], '', '[[filename.]],,,[[id]],,,[[PB]],,,[[PW]],,,[[winner]],,,signaturexxx,,,[[date]],,,[[path]],,,', lk.ProcessOptions(), 19, 500)
         else:
             lk.GameList.__init__(self, *args)
+        self.generation = 0      # incremented whenever games are processed
+        self.tagGeneration = 0   # incremented whenever tags are changed
+        self.listState = None
+        self.snapshotStates = {}
+        self.searchPattern = None
+        self.patternFlip = 0
+        self.processedFiles = []
+        self._columns = None
+        self._fulltext = None    # (generation, columns of the full text index)
+        self._sgfDictionary = None  # (generation, dictionary for the compressed SGF sources)
+        self._rootNodes = None   # (generation, columns of GAMES, LRU cache of root nodes), see rootNode
+        self._rootNodeDB = None  # sqlite3 connection for reading root nodes, closed with the list
+        self._datesAll = None    # (generation, DateHistogram of all games)
+        self._tagBits = {}       # tag -> bitset of the games with this tag, see tagBits
+        self.duplicateIndexToken = None  # see DuplicateIndex.registered
+
+    def columns(self):
+        '''Return the :py:class:`GameInfoColumns` of this database. They are
+        read from the database when they are needed for the first time, and
+        again after games have been processed.
+        '''
+        if self._columns is None or self._columns[0] != self.generation:
+            self._columns = (self.generation, GameInfoColumns(uu(self.dbname)), )
+        return self._columns[1]
+
+    def datesCurrent(self):
+        '''Return the :py:class:`DateHistogram` of the current list.'''
+        return DateHistogram(self.dates_current)
+
+    def datesAll(self):
+        '''Return the :py:class:`DateHistogram` of all games of the
+        database. It is kept until games are processed.'''
+        if self._datesAll is None or self._datesAll[0] != self.generation:
+            self._datesAll = (self.generation, DateHistogram(self.dates_all), )
+        return self._datesAll[1]
+
+    def currentRows(self):
+        '''Return an array with the rows (in :py:meth:`columns`) of the games
+        in the current list, in the order of the current list.'''
+        rowOf = self.columns().rowOf
+        return array(str('l'), [rowOf[int(i)] for i in self.currentEntriesField(GL_NAMELISTINDEX)])
+
+    def setSearchPattern(self, pattern, flip):
+        '''Record that the results of the most recent search are to be used
+        for ``pattern``, which is mapped to ``mrs_pattern`` by ``flip``.
+        '''
+        self.searchPattern = pattern
+        self.patternFlip = flip
+
+    def patternCoordinates(self, x, y):
+        '''Translate coordinates relative to ``searchPattern`` into
+        coordinates relative to ``mrs_pattern``.
+        '''
+        if not self.patternFlip:
+            return x, y
+        XX, YY = self.searchPattern.sizeX - 1, self.searchPattern.sizeY - 1
+        return lk.Pattern.flipsX(self.patternFlip, x, y, XX, YY), lk.Pattern.flipsY(self.patternFlip, x, y, XX, YY)
+
+    def invalidateCache(self):
+        self.generation += 1
+        self.listState = None
+        self._tagBits = {}
+        if self.searchCache is not None:
+            self.searchCache.invalidate(self)
+
+    def reset(self):
+        lk.GameList.reset(self)
+        self.listState = _chain(uu(self.dbname), 'reset', self.generation)
+
+    def search(self, pattern, options=None):
+        lk.GameList.search(self, pattern, options)
+        self.setSearchPattern(pattern, 0)
+        pkey = pattern.key() if hasattr(pattern, 'key') else None
+        self.listState = _chain(self.listState, 'search', pkey, searchOptionsKey(options)) if pkey is not None else None
+
+    def fulltextColumns(self):
+        '''Return the set of (upper case) column names which are covered by
+        the full text index of this database (see ``lk.ALGO_FULLTEXT``); the
+        set is empty if there is no such index.'''
+        if self._fulltext is None or self._fulltext[0] != self.generation:
+            db = sqlite3.connect(uu(self.dbname))
+            try:
+                columns = set(row[1].upper() for row in db.execute('pragma table_info(games_fts)'))
+            except sqlite3.DatabaseError:  # e.g., no FTS5 in this sqlite library
+                columns = set()
+            finally:
+                db.close()
+            self._fulltext = (self.generation, columns, )
+        return self._fulltext[1]
+
+    def sgfDictionary(self):
+        '''Return the dictionary (a byte string) with which the SGF sources in
+        this database are compressed (see ``lk.ALGO_SGF_COMPRESSED``), or None
+        if they are stored uncompressed.'''
+        if self._sgfDictionary is None or self._sgfDictionary[0] != self.generation:
+            dictionary = None
+            db = sqlite3.connect(uu(self.dbname))
+            db.text_factory = bytes
+            try:
+                info = db.execute('select info from db_info where rowid = 2').fetchone()
+                if info is not None and lk.ProcessOptions(uu(info[0])).algos & lk.ALGO_SGF_COMPRESSED:
+                    row = db.execute('select info from db_info where rowid = 4').fetchone()
+                    dictionary = bytes(row[0]) if row else b''
+            finally:
+                db.close()
+            self._sgfDictionary = (self.generation, dictionary, )
+        return self._sgfDictionary[1]
+
+    def storedSGF(self, ID):
+        '''Return the SGF source of the game with id ``ID`` which is stored
+        in the database (decompressed by libkombilo, if necessary) as a byte
+        string.'''
+        sgf = self.getGameProperty(ID, 'sgf_text(sgf)')
+        if not isinstance(sgf, bytes):  # Python 3: decoded by the wrapper
+            sgf = sgf.encode('utf-8', 'surrogateescape')
+        return sgf
+
+    def sgfQuery(self, sql):
+        '''If the SGF sources in this database are compressed, rewrite the game
+        info query ``sql`` such that it refers to the decompressed sources
+        (given by the SQL function ``sgf_text`` which libkombilo provides)
+        instead of the ``sgf`` column.
+        '''
+        if self.sgfDictionary() is None:
+            return sql
+        return _SGF_COLUMN.sub(lambda m: m.group(1) or 'sgf_text(sgf)', sql)
+
+    def fulltextQuery(self, sql):
+        '''Rewrite the game info query ``sql`` such that the conditions of the
+        form ``PB like 'pattern'`` (and similarly for PW, EV, sgf) are looked
+        up in the full text index, if there is one. Only patterns which
+        contain at least 3 consecutive characters other than the wildcards
+        are rewritten (for others, the index does not help). The original
+        condition is kept, so the result of the query does not change.
+        '''
+        columns = self.fulltextColumns()
+        if not columns:
+            return sql
+
+        def rewrite(m):
+            col, pattern = m.group(1).upper(), m.group(2)
+            if col not in columns or '_' in pattern or max(len(x) for x in pattern.replace("''", "'").split('%')) < 3:
+                return m.group(0)
+            return "(id in (select rowid from games_fts where games_fts.%s like '%s') and %s)" % (col, pattern, m.group(0))
+
+        return _LIKE_CLAUSE.sub(rewrite, sql)
+
+    def gisearch(self, sql, complete=0):
+        lk.GameList.gisearch(self, self.sgfQuery(sql if complete else self.fulltextQuery(sql)), complete)
+        self.listState = _chain(self.listState, 'gisearch', uu(sql), complete)
+
+    def gisearchNC(self, sql, complete=0):
+        return lk.GameList.gisearchNC(self, self.sgfQuery(sql if complete else self.fulltextQuery(sql)), complete)
+
+    def sigsearch(self, sig):
+        lk.GameList.sigsearch(self, sig)
+        self.listState = _chain(self.listState, 'sigsearch', uu(sig))
+
+    def tagsearch(self, tag):
+        lk.GameList.tagsearch(self, tag)
+        self.listState = _chain(self.listState, 'tagsearch', tag, self.tagGeneration)
+
+    def tagsearchSQL(self, query):
+        lk.GameList.tagsearchSQL(self, query)
+        self.listState = _chain(self.listState, 'tagsearchSQL', uu(query), self.tagGeneration)
+
+    def setCurrentBits(self, bits):
+        lk.GameList.setCurrentBits(self, bits)
+        # the list depends only on the bitset
+        self.listState = _chain(uu(self.dbname), 'setCurrentBits', self.generation, uu(bits).lstrip('0').lower())
+
+    def snapshot(self):
+        handle = lk.GameList.snapshot(self)
+        self.snapshotStates[handle] = (self.listState, self.searchPattern, self.patternFlip, )
+        return handle
+
+    def restore(self, handle, delete=False):
+        lk.GameList.restore(self, handle)
+        state = self.snapshotStates.get(handle)
+        if delete:
+            self.delete_snapshot(handle)
+        self.listState, self.searchPattern, self.patternFlip = state or (None, None, 0)
+
+    def delete_snapshot(self, handle):
+        '''Drop a reference to the snapshot ``handle`` (see
+        ``lk.GameList.retain_snapshot``), and return the number of references
+        left.'''
+        refs = lk.GameList.delete_snapshot(self, handle)
+        if not refs:
+            self.snapshotStates.pop(handle, None)
+        return refs
+
+    def delete_all_snapshots(self):
+        if self.searchCache is not None:
+            self.searchCache.invalidate(self, delete=False)
+        lk.GameList.delete_all_snapshots(self)
+        self.snapshotStates = {}
+
+    def process(self, sgf, path, fn, glists, DBTREE=None, flags=0):
+        if not flags & lk.USE_DUPLICATE_INDEX:
+            # the games will be missing in the duplicate index
+            self.duplicateIndexToken = None
+        return lk.GameList.process(self, sgf, path, fn, glists, DBTREE, flags)
+
+    def merge(self, other, glists, flags=0):
+        if not flags & lk.USE_DUPLICATE_INDEX:
+            self.duplicateIndexToken = None
+        return lk.GameList.merge(self, other, glists, flags)
+
+    def start_processing(self, *args):
+        self.invalidateCache()
+        self.snapshotStates = {}  # start_processing deletes all snapshots
+        self.processedFiles = []
+        lk.GameList.start_processing(self, *args)
+
+    def finalize_processing(self):
+        lk.GameList.finalize_processing(self)
+        self.invalidateCache()
+        self.recordFiles(self.processedFiles)
+        self.processedFiles = []
+
+    def recordFiles(self, files):
+        '''Write the entries ``(path, filename, mtime, size, hash)`` of the
+        list ``files`` to the ``FILES`` table.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            db.execute('create table if not exists FILES ( path text, filename text, mtime real, size integer, hash text, primary key (path, filename) );')
+            db.executemany('insert or replace into FILES (path, filename, mtime, size, hash) values (?, ?, ?, ?, ?)', files)
+            db.commit()
+        finally:
+            db.close()
+
+    def getFiles(self):
+        '''Return a dictionary mapping ``(path, filename)`` to ``(mtime, size,
+        hash)`` for the files recorded in the ``FILES`` table.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            return dict(((path, fn), (mtime, size, h)) for path, fn, mtime, size, h in db.execute('select path, filename, mtime, size, hash from FILES'))
+        except sqlite3.OperationalError:  # table does not exist
+            return {}
+        finally:
+            db.close()
+
+    def forgetFiles(self, keys):
+        '''Remove the entries for the pairs ``(path, filename)`` in ``keys``
+        from the ``FILES`` table.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            db.executemany('delete from FILES where path = ? and filename = ?', keys)
+            db.commit()
+        except sqlite3.OperationalError:  # table does not exist
+            pass
+        finally:
+            db.close()
+
+    def gameIds(self, keys):
+        '''Return the sorted list of ids of the games from the files given
+        by the pairs ``(path, filename)`` in ``keys``.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            return sorted(ID for key in keys for ID, in db.execute('select id from GAMES where path = ? and filename = ?', key))
+        finally:
+            db.close()
+
+    def countGames(self, query):
+        '''Return the number of games of the database (not only of the
+        current list) which satisfy the SQL condition ``query`` on the
+        ``GAMES`` table.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            return db.execute('select count(*) from GAMES where %s' % query).fetchone()[0]
+        finally:
+            db.close()
+
+    def recordFileOptions(self, recursive, filenames):
+        '''Record the arguments ``recursive`` and ``filenames`` with which
+        the SGF files were looked up (see :py:meth:`KEngine.addDB`).'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            db.execute('create table if not exists FILE_OPTIONS ( recursive integer, filenames text );')
+            db.execute('delete from FILE_OPTIONS')
+            db.execute('insert into FILE_OPTIONS (recursive, filenames) values (?, ?)', (int(bool(recursive)), filenames, ))
+            db.commit()
+        finally:
+            db.close()
+
+    def getFileOptions(self):
+        '''Return the pair ``(recursive, filenames)`` recorded by
+        :py:meth:`recordFileOptions`, or None.'''
+        db = sqlite3.connect(uu(self.dbname))
+        try:
+            row = db.execute('select recursive, filenames from FILE_OPTIONS').fetchone()
+            return (bool(row[0]), row[1], ) if row else None
+        except sqlite3.OperationalError:  # table does not exist
+            return None
+        finally:
+            db.close()
+
+    def exportData(self, ids, withSGF=True):
+        '''Return a dictionary mapping each of the game ids in ``ids`` to the
+        pair ``(pos, sgf)``, where ``pos`` is the position of the game in its
+        SGF file, and ``sgf`` is the SGF source of the game as a byte string
+        if ``withSGF`` is True and the database was processed with
+        ``sgfInDB``, and None otherwise.
+        All entries are read in a single query; compressed SGF sources are
+        decompressed by libkombilo (see :py:meth:`storedSGF`).'''
+        db = sqlite3.connect(uu(self.dbname))
+        db.text_factory = bytes
+        try:
+            info = db.execute('select info from db_info where rowid = 2').fetchone()
+            sgfInDB = withSGF and info is not None and info[0][1:2] == b't'  # see ProcessOptions::asString
+            db.execute('create temp table export_ids ( id integer primary key );')
+            db.executemany('insert or ignore into export_ids (id) values (?)', ((ID, ) for ID in ids))
+            result = {}
+            for ID, pos, sgf, t in db.execute(
+                    'select GAMES.id, pos, {0}, typeof({0}) from GAMES join export_ids on GAMES.id = export_ids.id'.format('sgf' if sgfInDB else 'null')):
+                result[ID] = (pos, self.storedSGF(ID) if t == b'blob' else sgf, )
+            return result
+        finally:
+            db.close()
+
+    def rootNode(self, ID):
+        '''Return a dictionary mapping the properties in :py:data:`ROOT_NODE_PROPERTIES`
+        to their values in the root node of the game with id ``ID``
+        (properties which are missing in the game are missing in the
+        dictionary).
+
+        The values are read from the columns of the ``GAMES`` table (see
+        ``ProcessOptions.rootNodeTags`` and :py:attr:`KEngine.rootNodeTags`);
+        only the properties for which the database has no column are taken
+        from the root node stored in the ``sgf`` column. The SGF file of the
+        game is never read. The root nodes of the ``rootNodeCacheSize`` most
+        recently used games are cached. All reads use one connection to the
+        database, which is kept open as long as this list exists.
+        '''
+        if self._rootNodeDB is None:
+            self._rootNodeDB = sqlite3.connect(uu(self.dbname))
+            self._rootNodeDB.text_factory = bytes
+        if self._rootNodes is None or self._rootNodes[0] != self.generation:
+            columns = set(uu(row[1]).upper() for row in self._rootNodeDB.execute('pragma table_info(GAMES)').fetchall())
+            self._rootNodes = (self.generation, columns, OrderedDict(), )
+        dummy, columns, cache = self._rootNodes
+
+        node = cache.pop(ID, None)  # mark as most recently used
+        if node is None:
+            node = self._readRootNode(ID, columns)
+            while len(cache) >= self.rootNodeCacheSize:
+                cache.popitem(last=False)
+        cache[ID] = node
+        return node
+
+    def _readRootNode(self, ID, columns):
+        stored = [p for p in ROOT_NODE_PROPERTIES if p in columns]
+        missing = [p for p in ROOT_NODE_PROPERTIES if p not in columns]
+        rows = self._rootNodeDB.execute('select %s from GAMES where id = ?' % ', '.join(stored + (['sgf', 'typeof(sgf)'] if missing else [])), (ID, )).fetchall()
+        if not rows:
+            return {}
+        row = rows[0]
+        node = dict((p, uu(v)) for p, v in zip(stored, row) if v)
+        if missing and row[-2]:
+            sgf = self.storedSGF(ID) if row[-1] == b'blob' else row[-2]
+            try:
+                c = Cursor(uu(sgf), 1)  # the root node belongs to the cursor, which must be kept alive
+                root = c.getRootNode(0)
+            except (lk.SGFError, UnicodeError):
+                return node
+            for p in missing:
+                try:  # even if p in root succeeds, retrieving it might lead to encoding errors
+                    if p in root:
+                        node[p] = ', '.join(root[p])
+                except (KeyError, UnicodeError):
+                    pass
+        return node
+
+    def tagBits(self, tag):
+        '''Return the set of games tagged with ``tag`` as a bitset (a Python
+        integer, bit ``i`` standing for the ``i``-th game of
+        ``lk.GameList.all``, as in :py:class:`GameSet`). The bitsets are read
+        from the database once and then kept up to date by the tagging
+        methods of this class.'''
+        if tag not in self._tagBits:
+            self._tagBits[tag] = int(lk.GameList.tagBits(self, tag), 16)
+        return self._tagBits[tag]
+
+    def setTag(self, *args):
+        self.tagGeneration += 1
+        self._tagBits.pop(args[0], None)
+        lk.GameList.setTag(self, *args)
+
+    def setTagID(self, *args):
+        self.tagGeneration += 1
+        self._tagBits.pop(args[0], None)
+        lk.GameList.setTagID(self, *args)
+
+    def deleteTag(self, *args):
+        self.tagGeneration += 1
+        self._tagBits.pop(args[0], None)
+        lk.GameList.deleteTag(self, *args)
+
+    def setTagsBySignature(self, tag, sigs):
+        '''Tag all games whose (symmetrized) signature is in ``sigs`` with
+        ``tag``, in one pass over the games. Returns the number of games
+        which were newly tagged.'''
+        self.tagGeneration += 1
+        self._tagBits.pop(tag, None)
+        return lk.GameList.setTagsBySignature(self, tag, [uu(sig) for sig in sigs])
+
+    def setTags(self, tag):
+        '''Tag all games in the current list with ``tag``.'''
+        self.tagGeneration += 1
+        lk.GameList.setTags(self, tag)
+        if tag in self._tagBits:
+            self._tagBits[tag] |= int(self.currentBits(), 16)
+
+    def deleteTags(self, tag):
+        '''Remove ``tag`` from all games in the current list.'''
+        self.tagGeneration += 1
+        lk.GameList.deleteTags(self, tag)
+        if tag in self._tagBits:
+            self._tagBits[tag] &= ~int(self.currentBits(), 16)
+
+    def import_tags(self, *args):
+        self.tagGeneration += 1
+        self._tagBits = {}
+        lk.GameList.import_tags(self, *args)
 
     def getCurrent(self, index):
         return uu(self.currentEntryAsString(index)).split(',,,')
@@ -330,6 +1212,152 @@ GL_SIGNATURE = 5
 GL_DATE = 6
 GL_PATH = 7
 
+# The root node properties shown in the game info, see lkGameList.rootNode
+ROOT_NODE_PROPERTIES = ('PW', 'PB', 'WR', 'BR', 'RE', 'KM', 'HA', 'EV', 'RO', 'DT', 'GC', )
+
+
+class GameIndex(object):
+    '''The sorted current list of games of a :py:class:`GameList`, see
+    ``GameList.gameIndex``. Entry ``k`` is the triple ``(sort key, index of
+    the database in DBlist, index of the game in the current list of that
+    database)``.
+
+    Only the sort keys are stored (as one list for all databases, in the
+    order of the databases), together with the sorting permutation as an
+    array; the triples are built when they are accessed.
+    '''
+
+    def __init__(self, keys=None, offsets=None, dbIndices=None, order=None, sortcrit=None):
+        self.sortcrit = sortcrit              # the entry of the game info used as sort key
+        self.keys = keys or []                # sort keys of all databases
+        self.offsets = offsets or []          # position of the first key of each database in keys
+        self.dbIndices = dbIndices or []      # the corresponding indices in DBlist
+        self.order = order if order is not None else array(str('l'))
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[j] for j in range(*k.indices(len(self)))]
+        j = self.order[k]
+        d = bisect_right(self.offsets, j) - 1
+        return self.keys[j], self.dbIndices[d], j - self.offsets[d]
+
+    def __iter__(self):
+        for k in xrange(len(self)):
+            yield self[k]
+
+
+class GameSet(object):
+    '''A set of games of the databases of a :py:class:`GameList`, e.g. the
+    current list or the list stored in a snapshot, see
+    :py:meth:`GameList.currentSet` and :py:meth:`GameList.snapshotSet`.
+
+    For each database, the games are given by a bitset over all games of the
+    database (stored as a Python integer, bit ``i`` standing for the ``i``-th
+    game in the order of ``lk.GameList.all``), so that sets can be combined
+    quickly: ``A & B``, ``A | B``, ``A ^ B``, ``A - B``, and ``~A`` (the
+    complement with respect to all games). ``len(A)`` is the number of games
+    in ``A``. Use :py:meth:`GameList.setCurrent` to make a set the current
+    list.
+
+    ``bits`` and ``sizes`` are dicts mapping the index of a database in
+    ``GameList.DBlist`` to the bitset and the number of all games of this
+    database, respectively.
+    '''
+
+    def __init__(self, bits, sizes):
+        self.bits = bits
+        self.sizes = sizes
+
+    def combine(self, other, op):
+        if set(self.bits) != set(other.bits):
+            raise ValueError('The sets belong to different databases.')
+        return GameSet(dict((i, op(b, other.bits[i])) for i, b in self.bits.items()), self.sizes)
+
+    def __and__(self, other):
+        return self.combine(other, lambda a, b: a & b)
+
+    def __or__(self, other):
+        return self.combine(other, lambda a, b: a | b)
+
+    def __xor__(self, other):
+        return self.combine(other, lambda a, b: a ^ b)
+
+    def __sub__(self, other):
+        return self.combine(other, lambda a, b: a & ~b)
+
+    def __invert__(self):
+        return GameSet(dict((i, b ^ ((1 << self.sizes[i]) - 1)) for i, b in self.bits.items()), self.sizes)
+
+    def __eq__(self, other):
+        return isinstance(other, GameSet) and self.bits == other.bits
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __len__(self):
+        return sum(bin(b).count('1') for b in self.bits.values())
+
+
+class DateHistogram(object):
+    '''The numbers of games per month, from January of
+    ``lk.DATE_PROFILE_START`` up to December of ``lk.DATE_PROFILE_END - 1``,
+    as an array ``counts`` (entry ``12 * (year - lk.DATE_PROFILE_START) +
+    month - 1``). Games whose date has no month count as January. The games
+    before this period (including those with unknown date) and from
+    ``lk.DATE_PROFILE_END`` on are only counted in total, in ``before`` and
+    ``after``.
+
+    The prefix sums are computed when they are needed for the first time, so
+    that afterwards the number of games in any range of months costs one
+    subtraction. Histograms can be added with ``+``. See
+    :py:meth:`GameList.dateHistograms`.
+    '''
+
+    SIZE = (lk.DATE_PROFILE_END - lk.DATE_PROFILE_START) * 12
+
+    # the years which can occur in a database (see GameList::process)
+    YEARS = (0, 3000)
+
+    def __init__(self, counts=None):
+        '''``counts`` is a sequence of ``SIZE + 2`` numbers, the months
+        followed by ``before`` and ``after`` (as in ``lk.GameList.dates_all``
+        and ``lk.GameList.dates_current``).'''
+        counts = list(counts) if counts is not None else [0] * (self.SIZE + 2)
+        self.counts = array(str('l'), counts[:self.SIZE])
+        self.before, self.after = counts[self.SIZE:]
+        self._prefix = None
+
+    def __add__(self, other):
+        return DateHistogram([a + b for a, b in zip(self.counts, other.counts)] + [self.before + other.before, self.after + other.after])
+
+    def prefix(self):
+        if self._prefix is None:
+            self._prefix = array(str('l'), [0]) * (self.SIZE + 1)
+            for i, c in enumerate(self.counts):
+                self._prefix[i + 1] = self._prefix[i] + c
+        return self._prefix
+
+    def months(self, fr, to):
+        '''Return the number of games in the months ``fr``, ..., ``to - 1``
+        (counted from January of ``lk.DATE_PROFILE_START``).'''
+        prefix = self.prefix()
+        fr, to = min(max(fr, 0), self.SIZE), min(max(to, 0), self.SIZE)
+        return prefix[to] - prefix[fr] if to > fr else 0
+
+    def years(self, fr, to):
+        '''Return the number of games in the years ``fr``, ..., ``to - 1``
+        (not counting ``before`` and ``after``).'''
+        return self.months((fr - lk.DATE_PROFILE_START) * 12, (to - lk.DATE_PROFILE_START) * 12)
+
+    def chunks(self, fr, to, chunk_size=1):
+        '''Return the list of the numbers of games in the consecutive chunks
+        of ``chunk_size`` months starting at month ``fr``, as many as fit
+        before month ``to``.'''
+        return [self.months(fr + i * chunk_size, fr + (i + 1) * chunk_size) for i in range((to - fr) // chunk_size)]
+
 
 class GameList(object):
     '''A Kombilo list of games. The list can consist of several Kombilo
@@ -344,11 +1372,11 @@ class GameList(object):
 
     def __init__(self):
         self.DBlist = []      # list of dicts
+        self.gameIndex = GameIndex()
 
         self.Bwins, self.Wwins, self.BwinsG, self.WwinsG = 0, 0, 0, 0
 
         self.references = {}
-        self.gameIndex = []
         self.showFilename = 1
         self.showDate = 0
         self.customTags = {'1': ('H', 'Handicap game', ),
@@ -402,6 +1430,22 @@ class GameList(object):
             return
         self.DBlist[DBindex]['data'].setTag(tag, index, index + 1)
 
+    def setTags(self, tag):
+        '''Set ``tag`` on all games in the current list (one transaction per
+        database).'''
+        for db in self.DBlist:
+            if db['disabled']:
+                continue
+            db['data'].setTags(tag)
+
+    def deleteTags(self, tag):
+        '''Remove ``tag`` from all games in the current list (one transaction
+        per database).'''
+        for db in self.DBlist:
+            if db['disabled']:
+                continue
+            db['data'].deleteTags(tag)
+
     def getTags(self, index):
         '''
         Get all tags of the game at position index in the current list
@@ -471,6 +1515,8 @@ class GameList(object):
         return uu(self.DBlist[DBindex]['data'].getSGF(game))
 
     def sortCrit(self, index, c):
+        if c == self.gameIndex.sortcrit and 0 <= index < len(self.gameIndex):
+            return uu(self.gameIndex[index][0])
         dbIndex, j = self.getIndex(index)
         return self.DBlist[dbIndex]['data'].getCurrent(j)[c]
 
@@ -543,17 +1589,30 @@ class GameList(object):
             self.Wwins += db['data'].Wwins
 
     def update(self, sortcrit=GL_DATE, sortReverse=False, ):
-        self.gameIndex = []
+        '''Sort the current list of games by the entry ``sortcrit`` (one of
+        ``GL_FILENAME``, ``GL_PB``, ...) of the game info, and store the
+        result in ``self.gameIndex`` (see :py:class:`GameIndex`).
+
+        The sort keys are fetched from each database in one go, and the games
+        are sorted by sorting their indices; the entries of the game list are
+        only formatted when they are displayed (see :py:meth:`get_data`).
+        Games with equal keys are ordered by database, and within a database
+        by their position in the current list.
+        '''
         self.update_winning_percentages()
 
+        keys, offsets, dbIndices = [], [], []
         for i, db in enumerate(self.DBlist):
             if db['disabled']:
                 continue
-            self.gameIndex.extend([(db['data'].getCurrent(x)[sortcrit], i, x) for x in xrange(db['data'].size())])
+            offsets.append(len(keys))
+            dbIndices.append(i)
+            keys.extend(db['data'].currentEntriesField(sortcrit))
 
-        self.gameIndex.sort()
+        order = array(str('l'), sorted(xrange(len(keys)), key=keys.__getitem__))
         if sortReverse:
-            self.gameIndex.reverse()
+            order.reverse()
+        self.gameIndex = GameIndex(keys, offsets, dbIndices, order, sortcrit)
         # assert len(self.gameIndex) == sum([ db['data'].size() for db in self.DBlist if not db['disabled'] ])
         # assert len(self.gameIndex) == self.noOfGames()
 
@@ -573,6 +1632,37 @@ class GameList(object):
         '''
         return sum([db['data'].num_switched for db in self.DBlist if not db['disabled']])
 
+    def currentSet(self):
+        '''Return the current list as a :py:class:`GameSet`.'''
+
+        return GameSet(
+                dict((i, int(db['data'].currentBits(), 16)) for i, db in enumerate(self.DBlist) if not db['disabled']),
+                dict((i, db['data'].size_all()) for i, db in enumerate(self.DBlist) if not db['disabled']))
+
+    def snapshotSet(self, snapshot_ids):
+        '''Return the list stored in the snapshots ``snapshot_ids`` (a list of
+        pairs (index of the database in ``self.DBlist``, snapshot handle), one
+        for each enabled database) as a :py:class:`GameSet`.
+        '''
+        return GameSet(
+                dict((i, int(self.DBlist[i]['data'].snapshotBits(sid), 16)) for i, sid in snapshot_ids),
+                dict((i, self.DBlist[i]['data'].size_all()) for i, sid in snapshot_ids))
+
+    def setCurrent(self, gameset):
+        '''Make the games in the :py:class:`GameSet` ``gameset`` the current
+        list. Games which were in the current list before keep their hits. The
+        statistics are recomputed and the list is updated.
+        '''
+        for i, b in gameset.bits.items():
+            self.DBlist[i]['data'].setCurrentBits('%x' % b)
+        self.update()
+
+    def snapshotsMemory(self):
+        '''Return a list of pairs (database name, number of bytes held by the
+        snapshots of this database), one for each enabled database.
+        '''
+        return [(uu(db['data'].dbname), db['data'].snapshots_memory()) for db in self.DBlist if not db['disabled']]
+
     def listOfCurrentSGFFiles(self):
         '''Return a list of file names for all SGF files of games in the
         current list of games.
@@ -581,15 +1671,86 @@ class GameList(object):
         for db in self.DBlist:
             if db['disabled']:
                 continue
-            for i in xrange(db['data'].size()):
-                gm = db['data'].getCurrent(i)
-                l.append(os.path.join(gm[GL_PATH], getFilename(gm[GL_FILENAME])))
+            cols = db['data'].columns()
+            l.extend([os.path.join(cols.names[cols.path[r]], cols.filename[r]) for r in db['data'].currentRows()])
         return l
 
+    def currentGamesForExport(self, withSGF=True):
+        '''Return a list of triples ``(filename, pos, sgf)``, one for each
+        game in the current list, in the order of the list. Here
+        ``filename`` is the full path of the SGF file of the game, ``pos``
+        the position of the game in this file, and ``sgf`` the SGF source of
+        the game (as a byte string) if ``withSGF`` is True and the database
+        was processed with ``sgfInDB``, and None otherwise (see
+        :py:meth:`lkGameList.exportData`).
+        '''
+        data = {}
+        for i, db in enumerate(self.DBlist):
+            if db['disabled']:
+                continue
+            cols = db['data'].columns()
+            rows = db['data'].currentRows()
+            data[i] = (cols, rows, db['data'].exportData([cols.ids[r] for r in rows], withSGF), )
+        result = []
+        for dummy, i, x in self.gameIndex:
+            cols, rows, games = data[i]
+            r = rows[x]
+            pos, sgf = games[cols.ids[r]]
+            result.append((os.path.join(cols.names[cols.path[r]], cols.filename[r]), pos, sgf, ))
+        return result
+
+    def currentColumn(self, name, decode=True):
+        '''Return the list of entries of the column ``name`` (see
+        :py:class:`GameInfoColumns`, e.g. ``'PB'``, ``'date'``,
+        ``'winner'``) for the games in the current list, in the order of the
+        game list. If ``decode`` is True, player names etc. are given as
+        strings, otherwise as their indices in the ``names`` list of the
+        respective database.
+        '''
+        columns = {}
+        for i, db in enumerate(self.DBlist):
+            if db['disabled']:
+                continue
+            cols = db['data'].columns()
+            columns[i] = (getattr(cols, name), db['data'].currentRows(), cols.decoder(name) if decode else (lambda x: x), )
+        result = []
+        for dummy, i, x in self.gameIndex:
+            column, rows, decoder = columns[i]
+            result.append(decoder(column[rows[x]]))
+        return result
+
+    def countBy(self, name, key=None):
+        '''Count the games in the current list by the (decoded) entries of
+        the column ``name`` (see :py:class:`GameInfoColumns`), and return a
+        dictionary mapping values to numbers of games. If ``key`` is given,
+        the games are counted by ``key(value)``. For example, ::
+
+          gamelist.countBy('date', key=lambda d: d // 10000)
+
+        gives the number of games per year.
+        '''
+        counts = defaultdict(int)
+        for db in self.DBlist:
+            if db['disabled']:
+                continue
+            cols = db['data'].columns()
+            column = getattr(cols, name)
+            dbCounts = defaultdict(int)
+            for r in db['data'].currentRows():
+                dbCounts[column[r]] += 1
+            decoder = cols.decoder(name)
+            for v, n in dbCounts.items():
+                v = decoder(v)
+                counts[key(v) if key else v] += n
+        return dict(counts)
+
     def printGameInfo(self, index):
         '''Return a pair whose first entry is a string containing the game info
         for the game at index. The second entry is a string giving the
         reference to commentaries in the literature, if available.
+
+        The game info is taken from the database (see
+        :py:meth:`lkGameList.rootNode`), not from the SGF file.
         '''
 
         if index == -1:
@@ -599,107 +1760,816 @@ class GameList(object):
         if DBindex == -1:
             return
 
-        gm = self.DBlist[DBindex]['data'].getCurrent(index)
-        f1 = os.path.join(gm[GL_PATH], gm[GL_FILENAME]).strip()
+        ID, pos = self.DBlist[DBindex]['data'].get_currentList_entry(index)
+        node = self.DBlist[DBindex]['data'].rootNode(ID)
 
-        if f1.find('[') != -1:
-            f1, f2 = f1.split('[')
-            gameNumber = int(f2.strip()[:-1])
-        else:
-            gameNumber = 0
-
-        filename = getFilename(f1)
-
-        try:
-            f = open(filename, 'rt')
-            sgf = f.read()
-            c = Cursor(sgf, 1)
-
-            f.close()
-            node = c.getRootNode(gameNumber)
-        except:
-            return
-
-        # use try/except for accessing properties because even if key in node
-        # succeeds, retrieving it might lead to encoding errors
-        try:
-            t = node['PW'][0]
-        except:
-            t = '?'
-        try:
-            t += ' ' + node['WR'][0]
-        except:
-            pass
+        t = node.get('PW', '?')
+        if 'WR' in node:
+            t += ' ' + node['WR']
         t += ' - '
 
-        try:
-            t += node['PB'][0]
-        except:
-            t += '?'
-        try:
-            t += ' ' + node['BR'][0]
-        except:
-            pass
+        t += node.get('PB', '?')
+        if 'BR' in node:
+            t += ' ' + node['BR']
 
-        try:
-            t += ', ' + translateRE(node['RE'][0])
-        except:
-            pass
-        try:
-            t += ' (' + _('Komi') + ' ' + node['KM'][0] + ')'
-        except:
-            pass
-        try:
-            t += ' (' + _('Hcp') + ' ' + node['HA'][0] + ')'
-        except:
-            pass
+        if 'RE' in node:
+            t += ', ' + translateRE(node['RE'])
+        if 'KM' in node:
+            t += ' (' + _('Komi') + ' ' + node['KM'] + ')'
+        if 'HA' in node:
+            t += ' (' + _('Hcp') + ' ' + node['HA'] + ')'
 
         t += '\n'
 
         for prop in ['EV', 'RO', 'DT']:
-            try:
-                t += node[prop][0] + ', '
-            except:
-                pass
+            if prop in node:
+                t += node[prop] + ', '
         if t.endswith(', '):
             t = t[:-2] + '\n'
 
-        try:
-            t += node['GC'][0].replace('\n\r', ' ').replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' ')
-        except:
-            pass
+        if 'GC' in node:
+            t += node['GC'].replace('\n\r', ' ').replace('\r\n', ' ').replace('\r', ' ').replace('\n', ' ')
 
         signature = uu(self.DBlist[DBindex]['data'].getSignature(index))
         t2 = (_('Commentary in ') + ', '.join(self.references[signature])) if signature in self.references else ''
 
         return t, t2
 
-    def dates_relative(self, fr=0, to=0, chunk_size=1):
-        result = []
-        to = to or (lk.DATE_PROFILE_END - lk.DATE_PROFILE_START) * 12
-        fr = max(0, fr)
-        to = min(to, (lk.DATE_PROFILE_END - lk.DATE_PROFILE_START) * 12)
+    def dateHistograms(self):
+        '''Return the pair of :py:class:`DateHistogram` instances for the
+        current list of games and for all games of the (enabled) databases.
+        '''
+        current, d_all = DateHistogram(), DateHistogram()
+        for db in self.DBlist:
+            if db['disabled']:
+                continue
+            current += db['data'].datesCurrent()
+            d_all += db['data'].datesAll()
+        return current, d_all
+
+    def dates_relative(self, fr=0, to=0, chunk_size=1):
+        '''Return, for the consecutive chunks of ``chunk_size`` months
+        between the months ``fr`` and ``to`` (counted from January of
+        ``lk.DATE_PROFILE_START``), the ratio of the number of games in the
+        current list and the number of all games in this chunk.'''
+        to = to or DateHistogram.SIZE
+        fr = max(0, fr)
+        to = min(to, DateHistogram.SIZE)
+
+        current, d_all = self.dateHistograms()
+        return [c / a if a else 0 for c, a in zip(current.chunks(fr, to, chunk_size), d_all.chunks(fr, to, chunk_size))]
+
+
+cont_sort_criteria = {'total': lambda c2: -c2.total(),
+                      'earliest': lambda c2: c2.earliest(),
+                      'latest': lambda c2: -c2.latest(),
+                      'average': lambda c2: c2.average_date(),
+                      'became popular': lambda c2: c2.became_popular() if c2.became_popular() != -1 else 10000,
+                      'became unpopular': lambda c2: -c2.became_unpopular(),
+                     }
+
+
+class BatchSearchResult(object):
+    '''The result of the search for one pattern in
+    :py:meth:`KEngine.batchPatternSearch`.
+
+    * ``pattern``: the pattern
+    * ``hits``: the set of games matching the pattern, as pairs ``(i, id)``
+      where ``i`` is the index of the database in ``gamelist.DBlist``, and
+      ``id`` the id of the game in that database
+    * ``noMatches``, ``noSwitched``, ``Bwins``, ``Wwins``, ``BwinsG``,
+      ``WwinsG``: the statistics, as in :py:class:`KEngine`
+    * ``continuations``: the list of continuations (instances of
+      ``lk.Continuation``), sorted and labelled as by
+      :py:meth:`KEngine.patternSearch`
+    '''
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.hits = set()
+        self.noMatches, self.noSwitched = 0, 0
+        self.Bwins, self.Wwins = 0, 0
+        self.BwinsG, self.WwinsG = 0, 0
+        self.continuations = []
+
+    def noOfGames(self):
+        return len(self.hits)
+
+
+class PatternSearchNCResult(object):
+    '''The result of :py:meth:`KEngine.patternSearchNC`.
+
+    * ``pattern``: the pattern
+    * ``noGames``: the number of games matching the pattern
+    * ``noMatches``, ``noSwitched``, ``Bwins``, ``Wwins``, ``BwinsG``,
+      ``WwinsG``: the statistics, as in :py:class:`KEngine`
+    * ``continuations``: the list of continuations (instances of
+      ``lk.Continuation``), sorted and labelled as by
+      :py:meth:`KEngine.patternSearch`, or None if they were not requested
+    '''
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.noGames = 0
+        self.noMatches, self.noSwitched = 0, 0
+        self.Bwins, self.Wwins = 0, 0
+        self.BwinsG, self.WwinsG = 0, 0
+        self.continuations = None
+
+    def noOfGames(self):
+        return self.noGames
+
+
+def addContinuations(continuations, gl, items):
+    '''Add the continuations given as triples ``(x, y, c)`` (where ``c`` is
+    an ``lk.Continuation``) in ``items`` to the list ``continuations``,
+    merging those at the same point.'''
+    for x, y, cont in items:
+        for c in continuations:
+            if c.x == x and c.y == y:  # exists
+                ll = c
+                break
+        else:
+            ll = lk.Continuation(gl)
+            ll.x = x
+            ll.y = y
+            ll.label = '?'
+            continuations.append(ll)
+        ll.add(cont)
+
+
+def continuationsOf(gl, pattern):
+    '''Yield the continuations of the most recent search in the lkGameList
+    ``gl`` as triples ``(x, y, c)``, where ``x``, ``y`` are coordinates
+    relative to ``pattern``.'''
+    for y in range(pattern.sizeY):
+        for x in range(pattern.sizeX):
+            gx, gy = gl.patternCoordinates(x, y)
+            if uu(gl.lookupLabel(gx, gy)) != '.':
+                yield x, y, gl.lookupContinuation(gx, gy)
+
+
+class OpeningTree(object):
+    '''An index of the positions which arise in a region of the board in the
+    games of the current list, built in a single pass over the games. It is
+    used by :py:meth:`KEngine.sgf_tree` (option ``one_pass``) instead of one
+    pattern search per node of the tree.
+
+    The region is given by ``selection`` (as in :py:meth:`KEngine.sgf_tree`),
+    and is searched for at the fixed position ``anchors[0], anchors[2]`` and
+    at all its images under the symmetries of the board (with colors
+    reversed, too, unless ``searchOptions.fixedColor`` is set). For each game
+    and each image, the first occurrence of each position in it (up to
+    ``searchOptions.moveLimit``, with at most ``maxStones`` stones) is
+    recorded together with the next move played in the region.
+
+    :py:meth:`lookup` then yields the same games and continuations as a
+    pattern search for the position, with fixed anchors, in the games of the
+    list; this includes the way libkombilo maps the continuations of
+    symmetric patterns (see ``PatternList`` in libkombilo), so that the
+    labels in the SGF tree are the same as with pattern searches.
+    '''
+
+    def __init__(self, DBlist, selection, anchors, boardsize, searchOptions, maxStones, messages=None, progBar=None, stop_var=None):
+        self.DBlist = DBlist
+        self.x0, self.y0 = selection[0]
+        self.sizeX = selection[1][0] - selection[0][0] + 1
+        self.sizeY = selection[1][1] - selection[0][1] + 1
+        self.left, self.top = anchors[0], anchors[2]
+        self.boardsize = boardsize
+        self.fixedColor = searchOptions.fixedColor
+        self.nextMove = searchOptions.nextMove
+        self.moveLimit = searchOptions.moveLimit
+        self.searchInVariations = searchOptions.searchInVariations
+        self.maxStones = maxStones
+
+        # the images of the region: (flip, color switch)
+        self.views = [(f, c) for c in ((0, ) if self.fixedColor else (0, 1)) for f in range(8)]
+        # pointViews[(x, y)] is the list of triples (v, i, j) such that the
+        # board point (x, y) is the point (i, j) of the region in view v
+        self.pointViews = {}
+        XX = YY = boardsize - 1
+        for v, (f, c) in enumerate(self.views):
+            for i in range(self.sizeX):
+                for j in range(self.sizeY):
+                    p = (lk.Pattern.flipsX(f, self.left + i, self.top + j, XX, YY),
+                         lk.Pattern.flipsY(f, self.left + i, self.top + j, XX, YY), )
+                    self.pointViews.setdefault(p, []).append((v, i, j))
+
+        self.games = []  # (index in DBlist, winner, year)
+        self.index = {}  # position -> list of (game, view, continuation)
+        self.build(messages or dummyMessages(), progBar, stop_var)
+
+    def build(self, messages, progBar, stop_var):
+        '''Walk through the games of the current lists of the databases in
+        ``self.DBlist``, and fill ``self.index``.'''
+        counter = 0
+        for dbIndex, db in enumerate(self.DBlist):
+            gl = db['data']
+            columns = gl.columns()
+            variations = self.searchInVariations and gl.processVariations
+            for j in range(gl.size()):
+                if stop_var is not None and stop_var.get():
+                    return
+                counter += 1
+                if counter % 1000 == 0:
+                    messages.insert('end', _('Read {0} games so far.\n').format(counter))
+                    if progBar:
+                        progBar.update()
+                row = columns.row(gl.get_currentList_entry(j)[0])
+                game = self.gameRoot(gl, j, columns, row)
+                if game is None:
+                    continue
+                g = len(self.games)
+                self.games.append((dbIndex, columns.value('winner', row), columns.date[row] // 10000, ))
+                done = set()
+                for line in self.lines(game[1], variations):
+                    self.addLine(g, line, done)
+
+    def gameRoot(self, gl, j, columns, row):
+        '''Return a pair (cursor, root node) for the j-th game in the current
+        list of ``gl``, or None. The game is read from the database, or from
+        the SGF file if only the root node is stored in the database.
+        '''
+        try:
+            cursor = lk.Cursor(gl.getSGF(j), 1)
+            root = cursor.getRootNode(0)
+            if root.next is not None:
+                return cursor, root
+            filename = os.path.join(columns.value('path', row), columns.filename[row]).strip()
+            gameNumber = 0
+            if filename.find('[') != -1:
+                filename, f2 = filename.split('[')
+                gameNumber = int(f2.strip()[:-1])
+            with open(getFilename(filename), 'rt') as f:
+                cursor = lk.Cursor(f.read(), 1)
+            return cursor, cursor.getRootNode(gameNumber)
+        except:
+            return None
+
+    @staticmethod
+    def lines(root, variations):
+        '''Yield the lines of play of the game starting at ``root``, as lists
+        of pairs ``(node id, node)``; only the main line, unless
+        ``variations`` is True.'''
+        ctr = 0
+        stack = [([], root)]
+        while stack:
+            line, node = stack.pop()
+            while node is not None:
+                line.append((ctr, node))
+                ctr += 1
+                node = node.next
+                if variations and node is not None:
+                    sibling = node.down
+                    while sibling is not None:
+                        stack.append((list(line), sibling))
+                        sibling = sibling.down
+            yield line
+
+    def addLine(self, g, line, done):
+        board = lk.abstractBoard(self.boardsize)
+        state = [{} for v in self.views]
+        seen = [set() for v in self.views]
+        pending = [[] for v in self.views]  # found positions without continuation (key, node number, node id)
+        swap = {'X': 'O', 'O': 'X'}
+
+        def record(v, key, nodeId, cont, contId):
+            # in different lines of play, the same position is counted again
+            # only if it is followed by a different continuation
+            if (v, nodeId, contId) in done:
+                return
+            done.add((v, nodeId, contId))
+            self.index.setdefault(key, []).append((g, v, cont))
+
+        for number, (nodeId, node) in enumerate(line):
+            changed = set()
+            hasStones = False
+            for prop in ('AB', 'AW', 'B', 'W'):
+                for p in node.gpv(prop):
+                    p = uu(p)
+                    if len(p) != 2:
+                        continue
+                    x, y = ord(p[0]) - 97, ord(p[1]) - 97
+                    if not (0 <= x < self.boardsize and 0 <= y < self.boardsize) or not board.play(x, y, prop[-1]):
+                        continue
+                    hasStones = True
+                    co = 'X' if prop[-1] == 'B' else 'O'
+                    for v, i, j in self.pointViews.get((x, y), ()):
+                        changed.add(v)
+                        for key, n0, id0 in pending[v]:
+                            # tenuki as in libkombilo: more than one move elsewhere in between
+                            record(v, key, id0, (i, j, co, number - n0 > 2), nodeId)
+                        pending[v] = []
+                        state[v][(i, j)] = swap[co] if self.views[v][1] else co
+                    for cx, cy in board.undostack_top_captures():
+                        for v, i, j in self.pointViews.get((cx, cy), ()):
+                            changed.add(v)
+                            del state[v][(i, j)]
+            if number > self.moveLimit:
+                continue
+            for v in range(len(self.views)):
+                # as in libkombilo, the position is checked after nodes which
+                # change the region, and after nodes without stones
+                if (v in changed or not hasStones) and len(state[v]) <= self.maxStones:
+                    key = frozenset(state[v].items())
+                    if key not in seen[v]:
+                        seen[v].add(key)
+                        pending[v].append((key, number, nodeId, ))
+        for v in range(len(self.views)):
+            for key, n0, id0 in pending[v]:
+                record(v, key, id0, None, -1 - line[-1][0])
+
+    def patternList(self, content):
+        '''Return the list of (flip, color switch, symmetries) for the distinct
+        images of the pattern ``content`` (a dict mapping points (i, j) of the
+        region to ``'X'`` or ``'O'``), the index of the "special" symmetry (or
+        -1), as computed by ``PatternList::patternList`` in libkombilo; the
+        symmetries map the points of each image to the point of the pattern
+        where its continuations are counted.
+        '''
+        sX, sY, bs = self.sizeX, self.sizeY, self.boardsize
+        fX, fY = lk.Pattern.flipsX, lk.Pattern.flipsY
+        invert = {'X': 'O', 'O': 'X', '.': '.'}
+
+        def placed(f, cs):
+            nsX = max(fX(f, 0, 0, sX, sY), fX(f, sX, sY, sX, sY))
+            nsY = max(fY(f, 0, 0, sX, sY), fY(f, sX, sY, sX, sY))
+            xs = (fX(f, self.left, self.top, bs - 1, bs - 1), fX(f, self.left + sX - 1, self.top + sY - 1, bs - 1, bs - 1), )
+            ys = (fY(f, self.left, self.top, bs - 1, bs - 1), fY(f, self.left + sX - 1, self.top + sY - 1, bs - 1, bs - 1), )
+            pos = [None] * (sX * sY)
+            for i in range(sX):
+                for j in range(sY):
+                    co = content.get((i, j), '.')
+                    pos[fX(f, i, j, sX - 1, sY - 1) + nsX * fY(f, i, j, sX - 1, sY - 1)] = invert[co] if cs else co
+            return (min(xs), max(xs) - nsX + 1, min(ys), max(ys) - nsY + 1, nsX, nsY, tuple(pos), )
+
+        original = placed(0, 0)
+        data = []  # (placed pattern, flip, color switch)
+        lCS = []
+        sy = []  # the pairs (flip, color switch) which stabilize the pattern
+        special = -1
+        for f in range(8):
+            pNew = placed(f, 0)
+            if not [d for d in data if d[0] == pNew]:
+                data.append((pNew, f, 0, ))
+            if pNew == original:
+                sy.append((f, 0, ))
+            if not self.fixedColor:
+                pNew1 = placed(f, 1)
+                if not [d for d in lCS if d[0] == pNew1]:
+                    lCS.append((pNew1, f, 1, ))
+                if pNew1 == original:
+                    sy.append((f, 1, ))
+                    special = lk.Pattern.PatternInvFlip(f)
+        data.extend(it for it in lCS if not [d for d in data if d[0] == it[0]])
+
+        # map continuations to one representative of each orbit under the
+        # symmetries of the pattern
+        symm = dict(((i, j), (i, j, 0)) for i in range(sX) for j in range(sY))
+        for s, c in sy:
+            if c and special != -1:
+                continue
+            symm1 = {}
+            for i in range(sX):
+                for j in range(sY):
+                    x, y = fX(s, i, j, sX - 1, sY - 1), fY(s, i, j, sX - 1, sY - 1)
+                    if (i != x or j != y) and (x, y) not in symm1:
+                        symm1[(i, j)] = (x, y, c, )
+            for p, (x, y, cs) in list(symm.items()):
+                if (x, y) in symm1:
+                    x1, y1, cs1 = symm1[(x, y)]
+                    symm[p] = (x1, y1, 1 if bool(cs1) != bool(cs) else 0, )
+
+        result = []
+        for k, (pl, f, cs) in enumerate(data):
+            if k == 0:
+                result.append((f, cs, symm, ))
+                continue
+            s = {}
+            for (i, j), (x, y, c) in symm.items():
+                s[(fX(f, i, j, sX - 1, sY - 1), fY(f, i, j, sX - 1, sY - 1))] = (x, y, 1 - c if cs else c, )
+            result.append((f, cs, s, ))
+        return result, special
+
+    def continuation(self, data, special, k, x, y, co):
+        '''Return the point (relative to the pattern) and color at which the
+        continuation ``co`` at (x, y) (relative to the k-th image in
+        ``data``) is counted, and whether the colors are switched, or None if
+        it has the wrong color; compare ``PatternList::updateContinuations``
+        in libkombilo.
+        '''
+        fX, fY = lk.Pattern.flipsX, lk.Pattern.flipsY
+        sX, sY = self.sizeX, self.sizeY
+        f, cs, symm = data[k]
+        cc = 'B' if co == 'X' else 'W'
+        cSymm = 0
+        if special != -1 and ((cc == 'W' and not self.nextMove) or (self.nextMove == 1 and cc == 'W') or (self.nextMove == 2 and cc == 'B')):
+            dsX, dsY = (sY, sX) if f >= 4 else (sX, sY)
+            g = lk.Pattern.PatternInvFlip(f)
+            x, y = fX(g, x, y, dsX - 1, dsY - 1), fY(g, x, y, dsX - 1, dsY - 1)
+            x, y = fX(special, x, y, sX - 1, sY - 1), fY(special, x, y, sX - 1, sY - 1)
+            x, y = fX(f, x, y, sX - 1, sY - 1), fY(f, x, y, sX - 1, sY - 1)
+            cc = 'W' if cc == 'B' else 'B'
+            cSymm = 1
+        if (self.nextMove == 1 and cc == 'W') or (self.nextMove == 2 and cc == 'B'):
+            return None
+        xx, yy, c = symm[(x, y)]
+        if c:
+            cSymm = 1 - cSymm
+            cc = 'W' if cc == 'B' else 'B'
+        return xx, yy, cc, cSymm
+
+    def lookup(self, board, games=None, CL='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz123456789'):
+        '''Return the games (a set of indices into ``self.games``) in which the
+        position in the region of ``board`` (an ``lk.abstractBoard``) occurs,
+        the list of continuations (instances of ``lk.Continuation``, merged
+        from the databases and labelled as by :py:meth:`KEngine.patternSearch`
+        with the default sort criterion), and the numbers of these games won
+        by B and by W. If ``games`` is given, only these games are taken into
+        account.
+        '''
+        content = {}
+        for i in range(self.sizeX):
+            for j in range(self.sizeY):
+                co = uu(board.getStatus(self.x0 + i, self.y0 + j))
+                if co in ('B', 'W'):
+                    content[(i, j)] = 'X' if co == 'B' else 'O'
+        data, special = self.patternList(content)
+        image = dict((self.views.index((f, cs)), k) for k, (f, cs, symm) in enumerate(data))
+
+        found = set()
+        conts = [{} for db in self.DBlist]
+        for g, v, cont in self.index.get(frozenset(content.items()), ()):
+            k = image.get(v)
+            if k is None or (games is not None and g not in games):
+                continue
+            if cont is None:
+                if not self.nextMove:
+                    found.add(g)
+                continue
+            f = self.views[v][0]
+            i, j, co, tenuki = cont
+            c = self.continuation(data, special, k, lk.Pattern.flipsX(f, i, j, self.sizeX - 1, self.sizeY - 1), lk.Pattern.flipsY(f, i, j, self.sizeX - 1, self.sizeY - 1), co)
+            if c is None:
+                continue
+            found.add(g)
+            dbIndex, winner, year = self.games[g]
+            xx, yy, cc, cSymm = c
+            stats = conts[dbIndex].setdefault((xx, yy), defaultdict(int))
+            stats[cc] += 1
+            if tenuki:
+                stats['t' + cc] += 1
+            if (winner == 'B') != bool(cSymm) and winner in 'BW':
+                stats['w' + cc] += 1
+            elif winner in 'BW':
+                stats['l' + cc] += 1
+            if lk.DATE_PROFILE_START <= year < lk.DATE_PROFILE_END:
+                stats[(cc, year - lk.DATE_PROFILE_START)] += 1
+
+        continuations = []
+        size = lk.DATE_PROFILE_END - lk.DATE_PROFILE_START + 1
+        for dbIndex, db in enumerate(self.DBlist):
+            items = []
+            for y in range(self.sizeY):
+                for x in range(self.sizeX):
+                    stats = conts[dbIndex].get((x, y))
+                    if not stats:
+                        continue
+                    c = lk.Continuation(db['data'])
+                    c.B, c.W, c.tB, c.tW = stats['B'], stats['W'], stats['tB'], stats['tW']
+                    c.wB, c.lB, c.wW, c.lW = stats['wB'], stats['lB'], stats['wW'], stats['lW']
+                    c.dates_B = lk.vectori([stats[('B', i)] for i in range(size)])
+                    c.dates_W = lk.vectori([stats[('W', i)] for i in range(size)])
+                    items.append((x, y, c, ))
+            addContinuations(continuations, db['data'], items)
+        continuations.sort(key=cont_sort_criteria['total'])
+        for c, lab in zip(continuations, CL):
+            c.label = lab
+        for c in continuations[len(CL):]:
+            c.label = '?'
+
+        Bwins = sum(1 for g in found if self.games[g][1] == 'B')
+        Wwins = sum(1 for g in found if self.games[g][1] == 'W')
+        return found, continuations, Bwins, Wwins
+
+
+def sgfFiles(dbpath, filenames='*.sgf'):
+    '''Return the sorted list of files in the directory ``dbpath`` which
+    match ``filenames`` (``'*.sgf'``, ``'*.sgf, *.mgt'``, or anything else,
+    meaning all files).
+    '''
+    if filenames == '*.sgf':
+        filelist = glob.glob(os.path.join(dbpath, '*.sgf'))
+    elif filenames == '*.sgf, *.mgt':
+        filelist = glob.glob(os.path.join(dbpath, '*.sgf')) + glob.glob(os.path.join(dbpath, '*.mgt'))
+    else:
+        filelist = glob.glob(os.path.join(dbpath, '*'))
+    filelist.sort()
+    return filelist
+
+
+def readSGFFile(filename):
+    '''Return the contents of the given file as a string, or None if it
+    cannot be read.'''
+    try:
+        with open(filename, 'rt') as file:
+            return file.read()
+    except:
+        return None
+
+
+def sgfHash(sgf):
+    '''Return a hash value of the content of an SGF file (see
+    :py:meth:`KEngine.updateDB`). Byte strings (as read from the file with
+    Python 2) are hashed as they are, unicode strings in UTF-8.'''
+    if not isinstance(sgf, bytes):
+        sgf = sgf.encode('utf-8')
+    return hashlib.sha1(sgf).hexdigest()
+
+
+class SGFReader(object):
+    '''Iterate over the pairs ``(filename, sgf)`` for the files in
+    ``filelist`` (in this order), where ``sgf`` is the content of the file,
+    or None if the file could not be read. (A file may contain a collection
+    of several games.)
+
+    The files are read and decoded by a pool of ``num_threads`` threads
+    ahead of the consumer. At most ``prefetch`` files are held in memory at
+    any time, independently of the number of files in ``filelist``, which
+    may be any iterable.
+
+    Use :py:meth:`batches` to obtain lists of (at most ``batchSize``) pairs.
+
+    The files are read by the function ``reader``, which is called with an
+    entry of ``filelist`` and returns its content.
+    '''
+
+    def __init__(self, filelist, num_threads=4, prefetch=64, reader=readSGFFile):
+        self.filelist = filelist
+        self.num_threads = max(1, num_threads)
+        self.prefetch = max(1, prefetch)
+        self.reader = reader
+
+    def __iter__(self):
+        pool = ThreadPool(self.num_threads)
+        try:
+            files = iter(self.filelist)
+            pending = deque((f, pool.apply_async(self.reader, (f, ))) for f in islice(files, self.prefetch))
+            while pending:
+                filename, result = pending.popleft()
+                for f in islice(files, 1):
+                    pending.append((f, pool.apply_async(self.reader, (f, ))))
+                yield filename, result.get()
+        finally:
+            pool.terminate()
+
+    def batches(self, batchSize=100):
+        batch = []
+        for item in self:
+            batch.append(item)
+            if len(batch) >= batchSize:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _processShard(args):
+    '''Process the files of one shard into a new database (in a worker
+    process, see :py:meth:`KEngine.parallelProcess`). Returns the messages
+    and the statistics of :py:meth:`KEngine.process`.
+    '''
+    filelist, datap, kwargs, rootNodeTags = args
+    messages = bufferedMessages()
+    K = KEngine()
+    K.rootNodeTags = rootNodeTags
+    gl = K.process(os.path.dirname(filelist[0]), datap, messages=messages, filelist=filelist, **kwargs)
+    del gl  # close the database files
+    return ''.join(messages.text), K.processStatistics
+
+
+class DuplicateIndex(object):
+    '''Keeps track of the databases in the duplicate index of libkombilo
+    (see ``lk.duplicate_index_add``), which maps the signatures of the games
+    of all registered databases to their final position hashes. With it, the
+    duplicate check of :py:meth:`KEngine.process` is one hash lookup per
+    game, however many databases there are, and
+    :py:meth:`KEngine.find_duplicates` only looks at the signatures which
+    occur more than once.
+
+    There is only one index in libkombilo, so this class is used through
+    its instance ``duplicateIndex``. The index is built anew (from the
+    signatures stored in the databases) only if a registered database is
+    not among those passed to :py:meth:`sync`, or was changed otherwise than
+    by processing games with the flag ``lk.USE_DUPLICATE_INDEX``, which adds
+    them to the index on the fly. New databases are just added.
+    '''
+
+    def __init__(self):
+        self.resets = 0
+        self.slots = []  # weak references to the registered lkGameList instances, by number in the index
+
+    def registered(self, gl):
+        '''Return True if all games of ``gl`` are in the index.'''
+        return gl.duplicateIndexToken == self.resets
+
+    def add(self, gl):
+        lk.duplicate_index_add(gl, len(self.slots))
+        self.slots.append(weakref.ref(gl))
+        gl.duplicateIndexToken = self.resets
+
+    def sync(self, gls):
+        '''Make sure that the index contains exactly the games of the
+        lkGameList instances in ``gls``.'''
+        current = [r() for r in self.slots]
+        ids = set(id(gl) for gl in gls)
+        if all(gl is not None and id(gl) in ids and self.registered(gl) for gl in current):
+            # only add the new databases
+            registered = set(id(gl) for gl in current)
+            for gl in gls:
+                if id(gl) not in registered:
+                    self.add(gl)
+            return
+        lk.duplicate_index_reset()
+        self.resets += 1
+        self.slots = []
+        for gl in gls:
+            self.add(gl)
+
+    def duplicates(self, gls, strict=True, dupl_within_db=True):
+        '''Find the duplicates among the games of ``gls``. The return
+        value is as for ``lk.find_duplicates``, the databases being numbered
+        by their position in ``gls``.'''
+        self.sync(gls)
+        position = dict((id(gl), i) for i, gl in enumerate(gls))
+        slotPosition = [position[id(r())] for r in self.slots]
+        d = lk.duplicate_index_duplicates(strict, dupl_within_db)
+        return dict((k, [slotPosition[x] if i % 2 == 0 else x for i, x in enumerate(d[k])]) for k in d)
+
+duplicateIndex = DuplicateIndex()
+
+
+EXPORT_TAR_MODES = [('.tar', 'w'), ('.tar.gz', 'w:gz'), ('.tgz', 'w:gz'), ('.tar.bz2', 'w:bz2'), ]
+try:
+    import lzma  # tarfile needs it for xz compression (Python 3 only)
+    EXPORT_TAR_MODES.append(('.tar.xz', 'w:xz'))
+except ImportError:
+    pass
+
+
+def exportFormat(target):
+    '''Return the format in which :py:meth:`KEngine.exportCurrentGames`
+    writes to ``target``, judging from its extension: ``'zip'``, ``'tar'``,
+    ``'collection'`` (a single SGF file, for the extensions ``.sgf`` and
+    ``.mgt``), or ``'folder'``.
+    '''
+    t = target.lower()
+    if t.endswith('.zip'):
+        return 'zip'
+    if any(t.endswith(ext) for ext, mode in EXPORT_TAR_MODES):
+        return 'tar'
+    if t.endswith('.sgf') or t.endswith('.mgt'):
+        return 'collection'
+    return 'folder'
+
+
+def readFileBytes(filename):
+    '''Return the contents of the given file as a byte string, or None if
+    it cannot be read.'''
+    try:
+        with open(filename, 'rb') as file:
+            return file.read()
+    except (IOError, OSError):
+        return None
+
+
+def copyFile(src, dst, hardlink=False):
+    '''Copy the file ``src`` to ``dst``. If ``hardlink`` is True, ``dst`` is
+    created as a hard link to ``src`` if possible (i.e., if both are on the
+    same file system). Otherwise the data is copied inside the kernel (by
+    ``os.copy_file_range`` or ``os.sendfile``, where available), without
+    passing through Python.
+    '''
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except (OSError, AttributeError):  # different file systems, or no hard links on this platform
+            pass
+    with open(src, 'rb') as inf:
+        with open(dst, 'wb') as outf:
+            size = os.fstat(inf.fileno()).st_size
+            copied = 0
+            for kernelCopy in (getattr(os, 'copy_file_range', None), getattr(os, 'sendfile', None), ):
+                if kernelCopy is None:
+                    continue
+                try:
+                    while copied < size:
+                        if kernelCopy is os.sendfile:
+                            n = os.sendfile(outf.fileno(), inf.fileno(), copied, size - copied)
+                        else:
+                            n = os.copy_file_range(inf.fileno(), outf.fileno(), size - copied, copied)
+                        if not n:
+                            break
+                        copied += n
+                except OSError:  # not supported for these files
+                    continue
+                break
+            if copied < size:
+                inf.seek(copied)
+                outf.seek(copied)
+                shutil.copyfileobj(inf, outf)
+
+
+def exportName(filename, pos, used):
+    '''Return the name under which the game at position ``pos`` of the SGF
+    file ``filename`` is exported to an archive or a folder; the name is
+    added to the set ``used`` of names which have been given out already.
+    '''
+    root, ext = os.path.splitext(os.path.basename(filename))
+    if pos:
+        root += '-%d' % pos
+    name = root + (ext or '.sgf')
+    i = 1
+    while name in used:
+        name = '%s_%d%s' % (root, i, ext or '.sgf')
+        i += 1
+    used.add(name)
+    return name
+
+
+def _exportToFile(job):
+    '''Write one file of :py:meth:`KEngine.exportCurrentGames` to a folder.
+    Return 1 if the file was written, and 0 otherwise.'''
+    dst, filename, sgf, hardlink = job
+    try:
+        if sgf is None:
+            copyFile(filename, dst, hardlink)
+        else:
+            with open(dst, 'wb') as file:
+                file.write(sgf)
+        return 1
+    except (IOError, OSError):
+        return 0
 
-        l = (to - fr) // chunk_size
 
-        for i in range(l):
-            current = sum([db['data'].dates_current[j + fr] for j in range(i * chunk_size, (i + 1) * chunk_size) for db in self.DBlist if not db['disabled']])
-            d_all = sum([db['data'].dates_all[j + fr] for j in range(i * chunk_size, (i + 1) * chunk_size) for db in self.DBlist if not db['disabled']])
-            result.append(current / d_all if d_all else 0)
-        return result
+def _get_date(d):
+    return '%d' % d
 
 
-cont_sort_criteria = {'total': lambda c2: -c2.total(),
-                      'earliest': lambda c2: c2.earliest(),
-                      'latest': lambda c2: -c2.latest(),
-                      'average': lambda c2: c2.average_date(),
-                      'became popular': lambda c2: c2.became_popular() if c2.became_popular() != -1 else 10000,
-                      'became unpopular': lambda c2: -c2.became_unpopular(),
-                     }
+def parseTagQuery(query, customTags):
+    '''
+    Parse a tag query like ``H and (X or not M)`` (see
+    :py:meth:`KEngine.tagSearch`), where the abbreviations are looked up in
+    customTags. As in SQL, ``not`` binds stronger than ``and``, and ``and``
+    binds stronger than ``or``.
 
+    Returns a function which evaluates the query, given a function which maps
+    tag handles to bitsets. Raises ValueError if the query is invalid.
+    '''
 
-def _get_date(d):
-    return '%d' % d
+    tags = dict((customTags[t][0], int(t)) for t in customTags)
+    tokens = query.replace('(', ' ( ').replace(')', ' ) ').split()
+    pos = [0]
+
+    def peek():
+        return tokens[pos[0]] if pos[0] < len(tokens) else None
+
+    def binary(operand, op, combine):
+        f = operand()
+        while peek() == op:
+            pos[0] += 1
+            f = (lambda a, b: lambda bits: combine(a(bits), b(bits)))(f, operand())
+        return f
+
+    def disjunction():
+        return binary(conjunction, 'or', lambda a, b: a | b)
+
+    def conjunction():
+        return binary(negation, 'and', lambda a, b: a & b)
+
+    def negation():
+        token = peek()
+        pos[0] += 1
+        if token == 'not':
+            f = negation()
+            return lambda bits: ~f(bits)
+        if token == '(':
+            f = disjunction()
+            if peek() != ')':
+                raise ValueError('Invalid query: %s' % query)
+            pos[0] += 1
+            return f
+        if token not in tags:
+            raise ValueError('Invalid query: %s' % query)
+        t = tags[token]
+        return lambda bits: bits(t)
+
+    f = disjunction()
+    if peek() is not None:
+        raise ValueError('Invalid query: %s' % query)
+    return f
 
 
 class KEngine(object):
@@ -723,13 +2593,23 @@ class KEngine(object):
     number of white continuations, number of black wins after white play here,
     number of black losses after white play here, number of white plays here
     after tenuki, label used on the board at this point.
+
+    The root node properties listed in ``rootNodeTags`` are stored in the
+    ``GAMES`` table of newly created databases (so that they can be used in
+    game info searches and shown by :py:meth:`GameList.printGameInfo`).
     '''
 
+    rootNodeTags = ','.join(ROOT_NODE_PROPERTIES)
+
     def __init__(self):
         self.gamelist = GameList()
         self.currentSearchPattern = None
+        self.searchCache = None  # set this to a SearchCache instance to cache pattern search results
+        self.searchInterrupted = False  # whether the most recent search was stopped early (see patternSearch)
+        self.processStatistics = None  # (files, games, seconds) of the last call of process
 
-    def patternSearch(self, CSP, SO=None, CL='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz123456789', FL={}, progBar=None, sort_criterion=None, update_gamelist=True):
+    def patternSearch(self, CSP, SO=None, CL='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz123456789', FL={}, progBar=None, sort_criterion=None, update_gamelist=True, parallel=0,
+                      progress=None, stop_var=None, timeLimit=None, progressInterval=1000, keepPartial=True):
         '''Start a pattern search on the current game list.
 
         * CSP must be an instance of :py:class:`Pattern` - it is the pattern
@@ -746,6 +2626,13 @@ class KEngine(object):
           * became popular: by weighted average which tries to measure when the move became popular (earliest date first)
           * became unpopular: by weighted average which tries to measure when the move became unpopular (latest date first)
 
+        * ``parallel``: if this is a positive integer, the searches in the
+          individual databases are run at the same time in a pool of (at most)
+          this many threads. (The libkombilo search releases the GIL.) The
+          results are merged in the order of the databases, so they are the
+          same as for the serial search. With the default value 0, the
+          databases are searched one after another.
+
         **Search options.**
         Create an instance of ``lk.SearchOptions`` by ::
 
@@ -775,8 +2662,46 @@ class KEngine(object):
             lk.ALGO_FINALPOS | lk.ALGO_MOVELIST | lk.ALGO_HASH_FULL
             lk.ALGO_FINALPOS | lk.ALGO_MOVELIST | lk.ALGO_HASH_FULL | lk.ALGO_HASH_CORNER
 
-          The default is to use all available algorithms.
+          and add ``lk.ALGO_HASH_SIDE`` and/or ``lk.ALGO_HASH_CENTER`` to use the
+          side and center hash indexes (for databases which were processed
+          with these algorithms, see the ``algos`` argument of :py:meth:`addDB`). The default
+          is to use all available algorithms.
+
+        **Symmetries.**
+        The search is always done for the canonical form of ``CSP`` (see
+        :py:meth:`Pattern.canonical`), and the continuations and labels are
+        translated back to the coordinates of ``CSP``. So patterns which
+        differ only by a symmetry of the board give the same results. This
+        alone does not save any work; the results of an earlier search for a
+        symmetric pattern are reused only if a search cache is used (see
+        below).
+
+        **Caching.**
+        If ``self.searchCache`` is a :py:class:`SearchCache` instance, the
+        results are stored there, and repeating a search (with the same
+        pattern, or a pattern which differs only by a symmetry of the board,
+        and the same options, on the same current list) restores the stored
+        results instead of searching again.
+
+        **Progress and cancellation.**
+        If ``progress``, ``stop_var`` or ``timeLimit`` is given, the search
+        reports its progress and can be stopped early, see
+        :py:class:`SearchMonitor`; these are checked every
+        ``progressInterval`` games from inside the search loop. If the search
+        is stopped, ``self.searchInterrupted`` is set to True, and
+
+        * if ``keepPartial`` is True, the current list contains the hits
+          found so far (all of them are genuine hits, together with their
+          continuations and statistics, but other games in the current list
+          may match the pattern, too),
+        * if ``keepPartial`` is False, the current list, the continuations
+          and the statistics are restored to their state before the search.
         '''
+        monitor = None
+        if progress is not None or stop_var is not None or timeLimit is not None:
+            monitor = SearchMonitor(progress, stop_var, timeLimit, progressInterval)
+        saved = self.saveSearchState() if monitor is not None and not keepPartial else None
+
         self.currentSearchPattern = CSP
         self.searchOptions = SO if SO else lk.SearchOptions(0, 0, 10000)
         # self.searchOptions.algos = lk.ALGO_FINALPOS | lk.ALGO_MOVELIST # | lk.ALGO_HASH_CORNER | lk.ALGO_HASH_FULL
@@ -793,28 +2718,272 @@ class KEngine(object):
             progBar.update()
         done = 0
 
-        for db in self.gamelist.DBlist:
-            if db['disabled']:
-                continue
-            gl = db['data']
-            # print self.searchOptions.algos
-            gl.search(self.currentSearchPattern, self.searchOptions)
+        if monitor is not None:
+            monitor.attach([db['data'] for db in self.gamelist.DBlist if not db['disabled']])
+        try:
+            if parallel and len([db for db in self.gamelist.DBlist if not db['disabled']]) > 1:
+                self.parallelSearch(parallel, progBar)
+            else:
+                for db in self.gamelist.DBlist:
+                    if db['disabled']:
+                        continue
+                    gl = db['data']
+                    # print self.searchOptions.algos
+                    self.searchInDB(gl)
 
-            done += db['data'].size_all()
-            if progBar:
-                if self.gamelist.noOfGames():
-                    progBar.configure(value=min(99, int(done * 100 / self.gamelist.noOfGames())))
-                else:
-                    progBar.configure(value=1)
-                progBar.update()
+                    done += db['data'].size_all()
+                    if progBar:
+                        if self.gamelist.noOfGames():
+                            progBar.configure(value=min(99, int(done * 100 / self.gamelist.noOfGames())))
+                        else:
+                            progBar.configure(value=1)
+                        progBar.update()
+
+                    self.lookUpContinuations(gl)
+        finally:
+            self.endSearch(monitor, saved)
+
+        if saved is None or not self.searchInterrupted:
+            self.set_labels(sort_criterion)
+        if update_gamelist:
+            self.gamelist.update()
+
+    def saveSearchState(self):
+        '''Return the current lists of all databases (as snapshots), and the
+        results of the most recent pattern search, so that they can be
+        restored by :py:meth:`endSearch`.'''
+
+        handles = [(db['data'], db['data'].snapshot()) for db in self.gamelist.DBlist if not db['disabled']]
+        attributes = dict((a, getattr(self, a, None)) for a in SEARCH_STATE_ATTRIBUTES)
+        return handles, attributes
+
+    def endSearch(self, monitor, saved):
+        '''Clean up after a search with the :py:class:`SearchMonitor`
+        ``monitor`` (or None): set ``self.searchInterrupted``, and if the
+        search was interrupted, restore the state ``saved`` by
+        :py:meth:`saveSearchState` (unless it is None).
+        '''
+        self.searchInterrupted = monitor is not None and monitor.interrupted
+        try:
+            if monitor is not None:
+                monitor.detach()
+        finally:
+            if saved is not None:
+                handles, attributes = saved
+                for gl, handle in handles:
+                    if self.searchInterrupted:
+                        gl.restore(handle)
+                    gl.delete_snapshot(handle)
+                if self.searchInterrupted:
+                    for a, value in attributes.items():
+                        setattr(self, a, value)
+
+    def searchInDB(self, gl):
+        '''Search for ``self.currentSearchPattern`` in the lkGameList ``gl``,
+        using ``self.searchCache`` if available.
+        '''
+        if self.searchCache is not None:
+            self.searchCache.search(gl, self.currentSearchPattern, self.searchOptions)
+        else:
+            pattern = self.currentSearchPattern
+            cp, flip = pattern.canonical() if hasattr(pattern, 'canonical') else (pattern, 0)
+            gl.search(cp, self.searchOptions)
+            gl.setSearchPattern(pattern, flip)
+
+    def parallelSearch(self, num_threads, progBar=None):
+        '''Search for ``self.currentSearchPattern`` in all databases, using a
+        pool of ``num_threads`` threads, and collect the continuations. Used
+        by :py:meth:`patternSearch`; the progress bar is updated (from the
+        calling thread) whenever the search in one of the databases is
+        finished.
+        '''
+        gls = [db['data'] for db in self.gamelist.DBlist if not db['disabled']]
+        total = sum([gl.size_all() for gl in gls])
+        done = 0
 
+        def search(i):
+            self.searchInDB(gls[i])
+            return i
+
+        pool = ThreadPool(min(num_threads, len(gls)))
+        try:
+            for i in pool.imap_unordered(search, range(len(gls))):
+                done += gls[i].size_all()
+                if progBar:
+                    progBar.configure(value=min(99, int(done * 100 / total)) if total else 1)
+                    progBar.update()
+        finally:
+            pool.close()
+            pool.join()
+
+        # merge in the order of DBlist, so that the order of the continuations
+        # (and hence the labels) is the same as for the serial search
+        for gl in gls:
             self.lookUpContinuations(gl)
 
-        self.set_labels(sort_criterion)
-        if update_gamelist:
-            self.gamelist.update()
+    def batchPatternSearch(self, patterns, options=None, CL='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz123456789', sort_criterion=None, parallel=0):
+        '''Search for each of the patterns in the list ``patterns`` in the
+        current list of games, and return a list of
+        :py:class:`BatchSearchResult` instances (one for each pattern).
+
+        In each database, the final positions of the games are compared with
+        all patterns in one pass over the current list (see the batch search
+        methods ``batch_add`` etc. of ``lk.GameList``), and only then the
+        move lists of the candidates are replayed, pattern by pattern.
+        Patterns which can be searched for by hashing do not need this pass.
+        The results are the same as those of :py:meth:`patternSearch`.
+
+        The current list, the continuations and the statistics of the
+        KEngine are not changed: the current list of each database is
+        restored (from a snapshot) after each search, and the Python game
+        list is not updated. The search cache is not used. The options
+        ``options`` (an ``lk.SearchOptions`` instance) are used for all
+        patterns, and ``CL`` and ``sort_criterion`` are used as in
+        :py:meth:`patternSearch`.
+
+        If ``parallel`` is a positive integer, the databases are searched in
+        a pool of (at most) this many threads.
+        '''
+        so = options or lk.SearchOptions(0, 0, 10000)
+        gls = [(i, db['data']) for i, db in enumerate(self.gamelist.DBlist) if not db['disabled']]
+        results = [BatchSearchResult(p) for p in patterns]
+        canonical = [p.canonical() if hasattr(p, 'canonical') else (p, 0) for p in patterns]
+
+        def search(item):
+            i, gl = item
+            partial = [None] * len(patterns)
+            handle = gl.snapshot()
+
+            def collect(k):
+                gl.setSearchPattern(patterns[k], canonical[k][1])
+                conts = []
+                for x, y, c in continuationsOf(gl, patterns[k]):
+                    cc = lk.Continuation(gl)
+                    cc.add(c)
+                    conts.append((x, y, cc))
+                partial[k] = (
+                    [gl.get_currentList_entry(j)[0] for j in range(gl.size())],
+                    (gl.num_hits, gl.num_switched, gl.Bwins, gl.Wwins, gl.BwinsG, gl.WwinsG),
+                    conts, )
+                gl.restore(handle)
+
+            try:
+                for cp, flip in canonical:
+                    gl.batch_add(cp, so)
+                postponed = []
+                for k in range(len(patterns)):
+                    if gl.batch_search(k):
+                        collect(k)
+                    else:
+                        postponed.append(k)
+                if postponed:
+                    gl.batch_prefilter()  # one pass over the games for all postponed patterns
+                    for k in postponed:
+                        gl.batch_search(k)
+                        collect(k)
+            finally:
+                gl.batch_clear()
+                gl.restore(handle, True)
+            return partial
+
+        if parallel and len(gls) > 1:
+            pool = ThreadPool(min(parallel, len(gls)))
+            try:
+                partials = pool.map(search, gls)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            partials = [search(item) for item in gls]
+
+        # merge in the order of DBlist, as in patternSearch
+        for (i, gl), partial in zip(gls, partials):
+            for r, (ids, stats, conts) in zip(results, partial):
+                r.hits.update((i, id) for id in ids)
+                r.noMatches += stats[0]
+                r.noSwitched += stats[1]
+                r.Bwins += stats[2]
+                r.Wwins += stats[3]
+                r.BwinsG += stats[4]
+                r.WwinsG += stats[5]
+                addContinuations(r.continuations, gl, conts)
+
+        for r in results:
+            r.continuations.sort(key=cont_sort_criteria[sort_criterion or 'total'])
+            for c, lab in zip(r.continuations, CL):
+                c.label = lab
+            for c in r.continuations[len(CL):]:
+                c.label = '?'
+        return results
+
+    def patternSearchNC(self, pattern, options=None, continuations=False, CL='ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz123456789', sort_criterion=None):
+        '''Count the games in the current list which match ``pattern``, and
+        return a :py:class:`PatternSearchNCResult`.
+
+        Nothing is changed: the current list (with the hits of its games), the
+        labels, the continuations and the statistics of the KEngine stay as
+        they are (compare ``lk.GameList.gisearchNC``). Since the search is
+        undone in memory (see ``lk.GameList.searchNC``), this is much cheaper
+        than :py:meth:`patternSearch` followed by restoring a snapshot: no
+        snapshot is written, the game list is not updated, and no labels are
+        set.
+
+        The continuations are only collected if ``continuations`` is True; they
+        are sorted and labelled using ``CL`` and ``sort_criterion`` as in
+        :py:meth:`patternSearch`. The options ``options`` (an
+        ``lk.SearchOptions`` instance) are used as in :py:meth:`patternSearch`;
+        the search cache is not used.
+        '''
+        so = options or lk.SearchOptions(0, 0, 10000)
+        result = PatternSearchNCResult(pattern)
+        if continuations:
+            result.continuations = []
+        for db in self.gamelist.DBlist:
+            if db['disabled']:
+                continue
+            gl = db['data']
+            stats = gl.searchNC(pattern, so)
+            result.noGames += stats[0]
+            result.noMatches += stats[1]
+            result.noSwitched += stats[2]
+            result.Bwins += stats[3]
+            result.Wwins += stats[4]
+            result.BwinsG += stats[5]
+            result.WwinsG += stats[6]
+            if continuations:
+                conts = []
+                for i in range(gl.numContinuationsNC()):
+                    c = gl.lookupContinuationNC(i)
+                    conts.append((c.x, c.y, c))
+                addContinuations(result.continuations, gl, conts)
+
+        if continuations:
+            result.continuations.sort(key=cont_sort_criteria[sort_criterion or 'total'])
+            for c, lab in zip(result.continuations, CL):
+                c.label = lab
+            for c in result.continuations[len(CL):]:
+                c.label = '?'
+        return result
 
     def sgf_tree(self, cursor, current_game, options, searchOptions, messages=None, progBar=None, stop_var=None):
+        '''Build a tree of the continuations of the position at the current
+        node of ``cursor``, as children of this node, with the statistics in
+        the comments and the continuations labelled.
+
+        ``options`` is a ConfigObj instance with the entries
+        ``min_number_of_hits``, ``max_number_of_branches``, ``depth``,
+        ``reset_game_list``, ``sort_criterion``, ``comment_head``,
+        ``boardsize``, ``anchors``, ``selection`` (see the GUI), and
+        optionally ``one_pass``.
+
+        By default, the statistics of each node are obtained by a pattern
+        search. If ``one_pass`` is true and the anchors are fixed, the games
+        of the current list are instead read once to build an
+        :py:class:`OpeningTree`, in which the statistics of all nodes are looked
+        up. The result is the same, but this is much faster for trees with
+        many nodes.
+        '''
+
         # plist is a list of pairs consisting of a node and some information (label,
         # number of B, W hits of this node) which will eventually be inserted into the
         # comments of the parent node during the search, new nodes (arising as
@@ -829,15 +2998,44 @@ class KEngine(object):
         head_str = head_str % (_('Label'), _('First played'), _('Last played'))
         body_str = '%%%ds (%%s) | %%6d | %%%ds | %%%ds |\n'  % (max(5, len(_('Label'))) - 4, max(7, len(_('First played'))), max(7, len(_('Last played'))))
 
+        fixedAnchor = (
+                options['anchors'][0] == options['anchors'][1] and
+                options['anchors'][2] == options['anchors'][3])
+        onePass = options.as_bool('one_pass') if 'one_pass' in options else False
+        if onePass and not fixedAnchor:
+            messages.insert('end', _('The anchors are not fixed, so the tree is built by pattern searches.\n'))
+            onePass = False
+
         # create snapshot for initial situation:
         DBlist = [db for db in self.gamelist.DBlist if not db['disabled']]
-        snapshot_ids = [(i, db['data'].snapshot()) for i, db in enumerate(DBlist)]
-        all_snapshot_ids = copy(snapshot_ids)
+        snapshot_ids = [(i, db['data'].snapshot()) for i, db in enumerate(DBlist)] if not onePass else None
+
+        # every entry of plist holds a reference to the snapshots of its parent
+        # node, which is dropped when the snapshots are restored
+        def retain(handles):
+            for i, sid in handles:
+                DBlist[i]['data'].retain_snapshot(sid)
+
+        def release(handles):
+            for i, sid in handles:
+                DBlist[i]['data'].delete_snapshot(sid)
         messages.insert('end', _('Start building SGF tree.\n'))
         messages.insert('end', _('%d games before searching for initial pattern.\n') % self.gamelist.noOfGames())
 
         path_to_initial_node = cursor.currentNode().pathToNode()
-        plist = [(cursor.currentNode(), snapshot_ids)]
+        if onePass:
+            # for each node, plist contains the set of games of its parent and the board
+            board = self.get_board_from_node(cursor.currentNode(), boardsize=options.as_int('boardsize'))
+            tree = OpeningTree(
+                    DBlist, options['selection'], tuple(int(x) for x in options['anchors']), options.as_int('boardsize'), searchOptions,
+                    len([1 for i in range(options['selection'][0][0], options['selection'][1][0] + 1)
+                         for j in range(options['selection'][0][1], options['selection'][1][1] + 1)
+                         if board.getStatus(i, j) in ('B', 'W')]) + options.as_int('depth'),
+                    messages, progBar, stop_var)
+            plist = [(cursor.currentNode(), (None, lk.abstractBoard(board)))]
+        else:
+            retain(snapshot_ids)
+            plist = [(cursor.currentNode(), snapshot_ids)]
 
         def board_coord_to_human(x, y):
             # takes x, y between 0 and boardsize-1 in "Kombilo coordinate
@@ -860,9 +3058,6 @@ class KEngine(object):
             'sel': selection_readable,
             })
         options_text += _('Fixed Color') + ': %s\n' % (_('Yes') if searchOptions.fixedColor else _('No'))
-        fixedAnchor = (
-                options['anchors'][0] == options['anchors'][1] and
-                options['anchors'][2] == options['anchors'][3])
         options_text += _('Fixed Anchor') + ': %s\n' % (_('Yes') if fixedAnchor else _('No'))
         options_text += _('Next move') + ': %s\n' % {0: _('B or W'), 1: _('B'), 2: _('W'), }[searchOptions.nextMove]
         options_text += _('Move limit') + ': %d\n' % searchOptions.moveLimit
@@ -892,18 +3087,26 @@ class KEngine(object):
 
             (node, snapshot_ids_parent, ), plist = plist[0], plist[1:]
 
-            # restore snapshots ...
-            for i, sid in snapshot_ids_parent:
-                DBlist[i]['data'].restore(sid)
-
-            pattern = self.get_pattern_from_node(node, anchors=tuple(int(x) for x in options['anchors']), boardsize=options.as_int('boardsize'), selection=options['selection'])
-            # FIXME (in get_pattern_from_node): wildcards?! move sequences?!
-            self.patternSearch(pattern, searchOptions, update_gamelist=False)
-            self.gamelist.update_winning_percentages()
-            noOfG = self.gamelist.noOfGames()
+            if onePass:
+                parent_games, board = snapshot_ids_parent
+                games, node_continuations, BwinsG, WwinsG = tree.lookup(
+                        board, None if options.as_bool('reset_game_list') else parent_games)
+                noOfG = len(games)
+            else:
+                # restore snapshots ...
+                for i, sid in snapshot_ids_parent:
+                    DBlist[i]['data'].restore(sid, True)
+
+                pattern = self.get_pattern_from_node(node, anchors=tuple(int(x) for x in options['anchors']), boardsize=options.as_int('boardsize'), selection=options['selection'])
+                # FIXME (in get_pattern_from_node): wildcards?! move sequences?!
+                self.patternSearch(pattern, searchOptions, update_gamelist=False)
+                self.gamelist.update_winning_percentages()
+                noOfG = self.gamelist.noOfGames()
+                BwinsG, WwinsG = self.gamelist.BwinsG, self.gamelist.WwinsG
+                node_continuations = self.continuations
             if noOfG:
-                Bperc = self.gamelist.BwinsG * 100 / noOfG
-                Wperc = self.gamelist.WwinsG * 100 / noOfG
+                Bperc = BwinsG * 100 / noOfG
+                Wperc = WwinsG * 100 / noOfG
             else:
                 Bperc, Wperc = 0, 0
             comment_text = _('{0} games (B: {1:1.1f}%, W: {2:1.1f}%)').format(noOfG, Bperc, Wperc)
@@ -917,14 +3120,15 @@ class KEngine(object):
             if len(node.pathToNode()) - len(path_to_initial_node) >= options.as_int('depth'):
                 continue
 
-            if options.as_bool('reset_game_list'):
+            if onePass:
+                pass
+            elif options.as_bool('reset_game_list'):
                 snapshot_ids_parent = snapshot_ids
             else:
                 snapshot_ids_parent = [(i, db['data'].snapshot()) for i, db in enumerate(DBlist)]
-                all_snapshot_ids.extend(snapshot_ids_parent)
             # split continuations up according to B/W
             continuations = []
-            for cont in self.continuations:
+            for cont in node_continuations:
                 cB = lk.Continuation(cont.gamelist)
                 cB.add(cont)
                 cB.W = 0
@@ -974,10 +3178,19 @@ class KEngine(object):
                 for i in path:
                     cursor.next(i, markCurrent=False)
                 cursor.add(s, update=False)
+                if onePass:
+                    child_board = lk.abstractBoard(board)
+                    child_board.play(ord(pos[0]) - 97, ord(pos[1]) - 97, 'B' if cont.B else 'W')
+                    snapshot_ids_parent = (games, child_board, )
+                else:
+                    retain(snapshot_ids_parent)
                 plist.append((cursor.currentNode(),         # store the node
                               snapshot_ids_parent,          # store snapshots
                             ))
 
+            if not onePass and not options.as_bool('reset_game_list'):
+                release(snapshot_ids_parent)  # now only referenced by the children
+
             if comment_text:
                 comment_text = head_str + comment_text
             node['C'] = [node['C'][0] + '\n\n' + comment_text, ]
@@ -985,16 +3198,14 @@ class KEngine(object):
         if stop_var is not None and stop_var.get():
             messages.insert('end', _('Interrupted\n'))
 
-        messages.insert('end', _('Total: %d pattern searches\n') % counter)
+        messages.insert('end', (_('Total: %d nodes\n') if onePass else _('Total: %d pattern searches\n')) % counter)
         messages.insert('end', _('Cleaning up ...\n'))
-        for i, sid in snapshot_ids:
-            DBlist[i]['data'].restore(sid)
-        self.gamelist.update()
-
-        # not deleting snapshots here: the following is super-inefficient, and
-        # we delete all snapshots when quitting anyway
-        #  for i, id in all_snapshot_ids:
-        #      DBlist[i]['data'].delete_snapshot(id)
+        if not onePass:
+            for node, snapshot_ids_parent in plist:  # left over if interrupted
+                release(snapshot_ids_parent)
+            for i, sid in snapshot_ids:
+                DBlist[i]['data'].restore(sid, True)
+            self.gamelist.update()
 
         return cursor
 
@@ -1002,10 +3213,22 @@ class KEngine(object):
         '''Return a full board pattern with the position at ``node``.
         \**kwargs are passed on to :py:meth:`Pattern.__init__`.
         '''
-        b = abstractBoard(boardsize=boardsize)
+        b = self.get_board_from_node(node, boardsize)
         kwargs['sizeX'] = kwargs['selection'][1][0] - kwargs['selection'][0][0] + 1
         kwargs['sizeY'] = kwargs['selection'][1][1] - kwargs['selection'][0][1] + 1
 
+        p = self.pattern_string_from_board(b, kwargs['selection'])[1]
+        if not kwargs:
+            kwargs['ptype'] = FULLBOARD_PATTERN
+        #print p
+        #print kwargs
+        return Pattern(p, **kwargs)
+
+    def get_board_from_node(self, node, boardsize=19):
+        '''Return an :py:class:`abstractBoard` with the position at ``node``.
+        '''
+        b = abstractBoard(boardsize=boardsize)
+
         path = []  # compare pathToNode; redo this here since we also need to find corresponding starting node
         while node.previous:
             path.append(node.level)
@@ -1025,13 +3248,7 @@ class KEngine(object):
             for j in range(i):
                 node = node.down
             play(Node(node), b)
-
-        p = self.pattern_string_from_board(b, kwargs['selection'])[1]
-        if not kwargs:
-            kwargs['ptype'] = FULLBOARD_PATTERN
-        #print p
-        #print kwargs
-        return Pattern(p, **kwargs)
+        return b
 
     def pattern_string_from_board(self, board, sel, cursor=None):
         try:
@@ -1088,22 +3305,7 @@ class KEngine(object):
         self.Wwins += gl.Wwins
         self.BwinsG += gl.BwinsG
         self.WwinsG += gl.WwinsG
-
-        for y in range(self.currentSearchPattern.sizeY):
-            for x in range(self.currentSearchPattern.sizeX):
-                if uu(gl.lookupLabel(x, y)) != '.':
-                    for c in self.continuations:
-                        if c.x == x and c.y == y:  # exists
-                            ll = c
-                            break
-                    else:
-                        ll = lk.Continuation(gl)
-                        ll.x = x
-                        ll.y = y
-                        ll.label = '?'
-                        self.continuations.append(ll)
-                    ll.add(gl.lookupContinuation(x, y))
-
+        addContinuations(self.continuations, gl, continuationsOf(gl, self.currentSearchPattern))
 
     def set_labels(self, sort_criterion=None):
         self.continuations.sort(key=cont_sort_criteria[sort_criterion or 'total'])
@@ -1122,9 +3324,9 @@ class KEngine(object):
             for db in self.gamelist.DBlist:
                 if db['disabled']:
                     continue
-                db['data'].setLabel(x, y, c.label)
+                db['data'].setLabel(*(db['data'].patternCoordinates(x, y) + (c.label, )))
 
-    def gameinfoSearch(self, query):
+    def gameinfoSearch(self, query, progress=None, stop_var=None, timeLimit=None, progressInterval=1000, keepPartial=True):
         '''Do a game info search on the current list of games.
 
         * ``query`` provides the query as part of an SQL clause which can be
@@ -1148,11 +3350,30 @@ class KEngine(object):
             date (the date in the form YYYY-MM-DD)
             filename
             sgf (the full SFG source).
+
+          For databases processed with ``lk.ALGO_FULLTEXT``, conditions of
+          the form ``PB like '%Cho%'`` (on the columns PB, PW, EV, sgf) are
+          answered from a full text index (see
+          :py:meth:`lkGameList.fulltextQuery`).
+
+        The arguments ``progress``, ``stop_var``, ``timeLimit``,
+        ``progressInterval`` and ``keepPartial`` are used as in
+        :py:meth:`patternSearch`; a partial result consists of the matching
+        games among those examined so far.
         '''
-        for db in self.gamelist.DBlist:
-            if db['disabled']:
-                continue
-            db['data'].gisearch(query)
+        monitor = None
+        if progress is not None or stop_var is not None or timeLimit is not None:
+            monitor = SearchMonitor(progress, stop_var, timeLimit, progressInterval)
+            monitor.attach([db['data'] for db in self.gamelist.DBlist if not db['disabled']])
+        saved = self.saveSearchState() if monitor is not None and not keepPartial else None
+
+        try:
+            for db in self.gamelist.DBlist:
+                if db['disabled']:
+                    continue
+                db['data'].gisearch(query)
+        finally:
+            self.endSearch(monitor, saved)
 
         self.gamelist.update()
 
@@ -1177,22 +3398,49 @@ class KEngine(object):
         d = self.dateProfile()
         return [(x, y, self.dateProfileWholeDB[i][1]) for i, (x, y) in enumerate(d)]
 
-    def dateProfile(self, intervals=None):
+    def dateProfile(self, intervals=None, wholeDB=False):
         '''Return the absolute numbers of games in the given date intervals
-        among the games in the current list of games.
+        (pairs of years ``(fr, to)``, the year ``to`` not included) among the
+        games in the current list of games (or among all games, if
+        ``wholeDB`` is True).
 
         Default value for ``intervals`` is ::
 
           [ (0, 1900), (1900, 1950), (1950, 1975), (1975, 1985), (1985, 1992),
           (1992, 1997), (1997, 2002), (2002, 2006), (2006, 2009), (2009, 2013),
           ]
+
+        The numbers are taken from the histograms of the databases (see
+        :py:meth:`GameList.dateHistograms`), which count the games per month
+        from ``lk.DATE_PROFILE_START`` to ``lk.DATE_PROFILE_END - 1``, and in
+        total before and after this period. Only if an interval contains a
+        part, but not all, of the years before or after this period, the games
+        in this part are counted by an SQL query.
         '''
         if intervals is None:
             intervals = [(0, 1900), (1900, 1950), (1950, 1975), (1975, 1985),
                     (1985, 1992), (1992, 1997), (1997, 2002), (2002, 2006),
                     (2006, 2009), (2009, 2013), ]
 
-        return [(i, self.gameinfoSearchNC("date >= '%d-00-00' and date < '%d-00-00'" % i)) for i in intervals]
+        current, d_all = self.gamelist.dateHistograms()
+        h = d_all if wholeDB else current
+
+        def count(fr, to, total, first, last):
+            # the number of games in the years fr, ..., to - 1 among the years
+            # first, ..., last - 1, which are counted in total by the histogram
+            if fr >= to:
+                return 0
+            if fr <= first and to >= last:
+                return total
+            query = "date >= '%d-00-00' and date < '%d-00-00'" % (fr, to)
+            if wholeDB:
+                return sum(db['data'].countGames(query) for db in self.gamelist.DBlist if not db['disabled'])
+            return self.gameinfoSearchNC(query)
+
+        return [((fr, to), h.years(fr, to)
+                 + count(fr, min(to, lk.DATE_PROFILE_START), h.before, DateHistogram.YEARS[0], lk.DATE_PROFILE_START)
+                 + count(max(fr, lk.DATE_PROFILE_END), to, h.after, lk.DATE_PROFILE_END, DateHistogram.YEARS[1]))
+                for fr, to in intervals]
 
     def signatureSearch(self, sig):
         '''Do a signature search for the Dyer signature ``sig``.
@@ -1223,27 +3471,26 @@ class KEngine(object):
         abbreviations for tags (i.e. keys in self.gamelist.customTags). In the
         simplest example, tag == ``H``, i.e. we just search for all games tagged
         with ``H``.
+
+        The expression is evaluated on the bitsets of the tags (see
+        :py:meth:`lkGameList.tagBits` and :py:func:`parseTagQuery`).
+
+        Raises ValueError if the expression is invalid; the current list is
+        not changed in this case.
         '''
 
         if not self.gamelist.noOfGames():
             return
-        query = tag.replace('(', ' ( ').replace(')', ' ) ').split()
-        if not query:
+        if not tag.split():
             return
-        for i, q in enumerate(query):
-            if not q in ['and', 'or', 'not', '(', ')']:
-                for t in self.gamelist.customTags:
-                    if self.gamelist.customTags[t][0] == q:
-                        break  # find the integer handle corresponding to the given abbreviation
-                else:
-                    self.logger.insert('end', 'Invalid query.\n')
-                    return
-                query[i] = 'exists(select * from game_tags where game_id=games.id and tag_id=%s)' % t
+        evaluate = parseTagQuery(tag, self.gamelist.customTags)
 
         for db in self.gamelist.DBlist:
             if db['disabled']:
                 continue
-            db['data'].tagsearchSQL(' '.join(query))
+            gl = db['data']
+            bits = evaluate(gl.tagBits)
+            gl.setCurrentBits('%x' % (bits & int(gl.currentBits(), 16)))
         self.gamelist.update()
 
     def patternSearchDetails(self, exportMode='ascii', showAllCont=False):
@@ -1379,20 +3626,97 @@ class KEngine(object):
 
     def copyCurrentGamesToFolder(self, dir):
         '''Copy all SGF files belonging to games in the current list to the
-        folder given as ``dir``.
+        folder given as ``dir``; files which exist there already are not
+        overwritten (see :py:meth:`exportCurrentGames`).
+        '''
+        self.exportCurrentGames(dir, format='folder')
+
+    def exportCurrentGames(self, target, format=None, hardlink=False, num_threads=4, fromDB=False):
+        '''Export the games in the current list to ``target``. The ``format``
+        is one of the following (if it is None, it is determined from the
+        extension of ``target`` by :py:func:`exportFormat`):
+
+        * ``'folder'``: write one SGF file per game to the folder ``target``;
+          files which exist there already are not overwritten. The files are
+          written by a pool of ``num_threads`` threads. Unless the SGF source
+          is taken from the database, the files are copied inside the kernel,
+          or, if ``hardlink`` is True, created as hard links to the original
+          files where possible (note that then changes to the exported files
+          also change the files in the database).
+        * ``'collection'``: write all games to the single SGF file ``target``.
+        * ``'zip'``, ``'tar'``: write the files to the archive ``target``
+          (which is compressed according to its extension, e.g. ``.tar.gz``;
+          ``.tar.xz`` requires Python 3).
+
+        The original SGF files of the games are exported; a file containing
+        several games is exported only once. If ``fromDB`` is True, then for
+        databases processed with ``sgfInDB`` the SGF sources of all games
+        are read from the database in one query per database instead, and
+        each game is written separately. When
+        writing a collection or an archive, the files are read by
+        ``num_threads`` threads ahead of the writer (see
+        :py:class:`SGFReader`).
+
+        Return the number of files (or, for a collection, SGF sources)
+        written.
         '''
-        l = self.gamelist.listOfCurrentSGFFiles()
-        for f in l:
-            inf = open(f, 'rb')
-            s = inf.read()
-            inf.close()
+        format = format or exportFormat(target)
+        used = set()
+        files = set()
+        items = []
+        for filename, pos, sgf in self.gamelist.currentGamesForExport(fromDB):
+            if sgf is None:
+                if filename in files:
+                    continue
+                files.add(filename)
+                pos = 0
+            items.append((exportName(filename, pos, used), filename, sgf, ))
+
+        if format == 'folder':
+            existing = set(os.listdir(target))
+            jobs = [(os.path.join(target, name), filename, sgf, hardlink, ) for name, filename, sgf in items if name not in existing]
+            pool = ThreadPool(max(1, num_threads))
+            try:
+                return sum(pool.map(_exportToFile, jobs, chunksize=64))
+            finally:
+                pool.terminate()
 
-            outfile = os.path.join(dir, os.path.split(f)[-1])
-            if os.path.exists(outfile):
-                continue
-            out = open(outfile, 'wb')
-            out.write(s)
-            out.close()
+        def read(item):
+            return item[2] if item[2] is not None else readFileBytes(item[1])
+
+        counter = 0
+        if format == 'collection':
+            with open(target, 'wb') as out:
+                for (name, filename, sgf), data in SGFReader(items, num_threads, reader=read):
+                    if data is None:
+                        continue
+                    out.write(data.strip() + b'\n')
+                    counter += 1
+        elif format == 'zip':
+            with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for (name, filename, sgf), data in SGFReader(items, num_threads, reader=read):
+                    if data is None:
+                        continue
+                    archive.writestr(name, data)
+                    counter += 1
+        elif format == 'tar':
+            mode = [m for ext, m in EXPORT_TAR_MODES if target.lower().endswith(ext)]
+            archive = tarfile.open(target, mode[-1] if mode else 'w')
+            try:
+                now = time.time()
+                for (name, filename, sgf), data in SGFReader(items, num_threads, reader=read):
+                    if data is None:
+                        continue
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    info.mtime = now
+                    archive.addfile(info, BytesIO(data))
+                    counter += 1
+            finally:
+                archive.close()
+        else:
+            raise ValueError('Unknown export format: %s' % format)
+        return counter
 
     def parseReferencesFile(self, datafile, options=None):
         '''Parse a file with references to commentaries in the literature. See
@@ -1445,11 +3769,58 @@ class KEngine(object):
         except:
             return False
 
-    def loadDBs(self, progBar=None, showwarning=None):
+    def referencesHash(self):
+        '''Return a hash of the signatures in ``self.gamelist.references``,
+        which can be used to find out whether the references changed, and
+        :py:meth:`loadDBs` should re-apply them.'''
+        return hashlib.sha1(bb(','.join(sorted(self.gamelist.references)))).hexdigest()
+
+    def tagReferences(self, gl, retag=False):
+        '''Tag the games of the lkGameList ``gl`` which occur in
+        ``self.gamelist.references`` with ``REFERENCED_TAG``, joining all
+        signatures against the games in one pass (see
+        ``lk.GameList.setTagsBySignature``). If ``retag`` is True, the tag is
+        first removed from all games.'''
+        if retag:
+            gl.deleteTag(REFERENCED_TAG, -1)
+        sigs = [sig for sig in self.gamelist.references if not '_' in sig]
+        if sigs:
+            gl.setTagsBySignature(REFERENCED_TAG, sigs)
+        for sig in self.gamelist.references:
+            if '_' in sig:  # signatures with wildcards need a signature search
+                for gid in gl.sigsearchNC(sig):
+                    gl.setTagID(REFERENCED_TAG, gid)
+
+    def loadDBs(self, progBar=None, showwarning=None, mmap=False, retagReferences=False):
         '''Load the database files for all databases that were added to the
         gamelist.
+
+        If ``mmap`` is True, the algorithm data (the ``.da`` files) is
+        memory-mapped rather than read into memory; it is then read only when
+        it is needed for the first time (see
+        ``libkombilo.set_mmap_loading``). This makes loading large databases
+        much faster. The option has no effect on Windows.
+
+        If ``retagReferences`` is True (e.g. because the references file
+        changed, see :py:meth:`referencesHash`), the ``REFERENCED_TAG`` of all
+        games is set anew according to ``self.gamelist.references`` (see
+        :py:meth:`tagReferences`).
         '''
 
+        mmapBefore = lk.get_mmap_loading()
+        lk.set_mmap_loading(mmap)
+        try:
+            self._loadDBs(progBar, showwarning)
+        finally:
+            lk.set_mmap_loading(mmapBefore)
+        if retagReferences:
+            for db in self.gamelist.DBlist:
+                if not db['disabled']:
+                    self.tagReferences(db['data'], retag=True)
+        self.gamelist.reset()
+        self.dateProfileWholeDB = self.dateProfile(wholeDB=True)
+
+    def _loadDBs(self, progBar, showwarning):
         DBlistIndex = 0
         for i in range(len(self.gamelist.DBlist)):
             if progBar:
@@ -1470,17 +3841,45 @@ class KEngine(object):
                     del self.gamelist.DBlist[DBlistIndex]
                     continue
             DBlistIndex += 1  # May differ from loop counter if databases which cannot be opened are omitted.
-        self.gamelist.reset()
-        self.dateProfileWholeDB = self.dateProfile()
 
     # ---------- database administration (processing etc.)
 
     def find_duplicates(self, strict=True, dupl_within_db=True):
-        return lk.find_duplicates(
-                [os.path.join(db['name'][0], db['name'][1]+'.db')
-                    for db in self.gamelist.DBlist if not db['disabled']],
-                strict, dupl_within_db
-                )
+        '''Find the duplicates among the games of all enabled databases,
+        using the :py:class:`DuplicateIndex`. The return value is as for
+        ``lk.find_duplicates``: a dict mapping signatures to lists ``db1, id1,
+        db2, id2, ...``, where db is the position among the enabled databases.
+        '''
+        return duplicateIndex.duplicates(
+                [db['data'] for db in self.gamelist.DBlist if not db['disabled']],
+                strict, dupl_within_db)
+
+    def find_near_duplicates(self, threshold=0.6):
+        '''Find clusters of games which are probably near duplicates of each
+        other (e.g. the same game from different sources, where a few moves
+        differ, one record is truncated, or the orientation differs). Only
+        the enabled databases which were processed with ``lk.ALGO_MINHASH``
+        are taken into account (see ``lk.find_near_duplicates``).
+
+        Returns a list of pairs ``(score, games)``, sorted by decreasing
+        score, where ``games`` is a list of pairs ``(db, id)``, db being the
+        position among the enabled databases, and ``score`` (between
+        ``threshold`` and 1) is the smallest estimated similarity of the
+        pairs of games which connect the cluster.
+        '''
+        gls = lk.vectorGL()
+        for db in self.gamelist.DBlist:
+            if not db['disabled']:
+                gls.push_back(db['data'])
+        d = lk.find_near_duplicates(gls, threshold)
+        clusters = []
+        i = 0
+        while i < len(d):
+            n, score = d[i], d[i + 1] / 1000
+            clusters.append((score, [tuple(d[j:j + 2]) for j in range(i + 2, i + 2 + 2 * n, 2)], ))
+            i += 2 + 2 * n
+        clusters.sort(key=lambda c: -c[0])
+        return clusters
 
     def add_gl_at(self, index, gl, dbpath):
         datapath = os.path.dirname(gl.dbname), os.path.basename(gl.dbname)[:-3]
@@ -1493,7 +3892,7 @@ class KEngine(object):
     def create_GameList(self, datapath, tagAsPro, processVariations, algos, sgfInDB = False, messages=None, deleteDBfiles=False):
         messages = messages or dummyMessages()
         pop = lk.ProcessOptions()
-        pop.rootNodeTags = 'PW,PB,RE,DT,EV'
+        pop.rootNodeTags = self.rootNodeTags
         pop.sgfInDB = sgfInDB
         pop.professional_tag = tagAsPro
         pop.processVariations = processVariations
@@ -1504,7 +3903,7 @@ class KEngine(object):
             if deleteDBfiles:
                 messages.insert('end', _('Delete old database files.'))
                 messages.update()
-                for ext in ['db', 'da', 'db1', 'db2', ]:
+                for ext in ['db', 'da', 'db1', 'db2', 'db3', 'db4', ]:
                     try:
                         os.remove(os.path.join(datapath[0], datapath[1] + '.%s' % ext))
                     except:
@@ -1531,7 +3930,9 @@ class KEngine(object):
             return (os.path.isfile(os.path.join(d[0], d[1] + '.da')) or
                     os.path.isfile(os.path.join(d[0], d[1] + '.db')) or
                     os.path.isfile(os.path.join(d[0], d[1] + '.db1')) or
-                    os.path.isfile(os.path.join(d[0], d[1] + '.db2')))
+                    os.path.isfile(os.path.join(d[0], d[1] + '.db2')) or
+                    os.path.isfile(os.path.join(d[0], d[1] + '.db3')) or
+                    os.path.isfile(os.path.join(d[0], d[1] + '.db4')))
 
         if db_file_exists(datap):
             # if file exists, append a counter
@@ -1550,7 +3951,8 @@ class KEngine(object):
             messages=None, progBar=None, showwarning=None,
             index=None, all_in_one_db=True, sgfInDB=True,
             logDuplicates=True,
-            stop_var=None):
+            stop_var=None,
+            processes=0):
         '''
         Call this method to newly add a database of SGF files.
 
@@ -1572,6 +3974,9 @@ class KEngine(object):
         * index: where to add this in the DBlist (None means: add at end)
         * all_in_one_db: Put all games found in this folder and all its
           subfolders into one db (rather than creating one db per folder)
+        * processes: if all_in_one_db is True and processes > 1, the games are
+          processed in this number of worker processes, and the results are
+          merged into one database (see :py:meth:`parallelProcess`)
         '''
 
         self.currentSearchPattern = None
@@ -1584,6 +3989,20 @@ class KEngine(object):
                 sgfInDB,
                 logDuplicates)
 
+        if all_in_one_db and processes > 1:
+            if recursive:
+                filelist = [f for dirpath, dirnames, files in os.walk(dbp) for f in sgfFiles(dirpath, filenames)]
+            else:
+                filelist = sgfFiles(dbp, filenames)
+            if filelist:
+                gl = self.parallelProcess(
+                        dbp, datap, filelist, processes,
+                        acceptDupl, strictDuplCheck, tagAsPro, processVariations, algos,
+                        messages, progBar, sgfInDB, logDuplicates, index)
+                if gl is not None:
+                    gl.recordFileOptions(recursive, filenames)
+            return
+
         if all_in_one_db:
             gl = self.create_GameList(self.get_datapath(datap, dbp), tagAsPro, processVariations, algos, sgfInDB, messages)
             if gl is None:
@@ -1608,12 +4027,10 @@ class KEngine(object):
                 messages.insert('end', _('Finalizing ... (this will take some time)\n'))
                 messages.update()
             gl.finalize_processing()
+            gl.recordFileOptions(recursive, filenames)
             if gl.size_all():
                 self.add_gl_at(index, gl, dbp)
-                for ref in self.gamelist.references:
-                    for gid in gl.sigsearchNC(ref):
-                        # print gid, ref, self.gamelist.references[ref],
-                        gl.setTagID(REFERENCED_TAG, gid)
+                self.tagReferences(gl)
 
     def addOneFolder(self, arguments, dbpath, gl=None):
         """This should really be named add_one_folder: Adds all sgf files in the
@@ -1640,6 +4057,7 @@ class KEngine(object):
         else:
             if gl is None:
                 # no gl was passed to us, so add the newly created one to DBlist
+                success.recordFileOptions(False, filenames)
                 self.add_gl_at(index, success, dbpath)
             if logDuplicates:
                 messages.insert('end', _('Added %s.') % dbpath + '\n')
@@ -1656,7 +4074,23 @@ class KEngine(object):
             deleteDBfiles=False,
             gl=None,
             sgfInDB=True,
-            logDuplicates=True):
+            logDuplicates=True,
+            readers=4, prefetch=256, batchSize=100,
+            filelist=None):
+        '''Process the files matching ``filenames`` in the directory
+        ``dbpath`` into the database ``datap`` (or into the GameList ``gl``,
+        if given). Returns the GameList, or None if there were no files.
+        Instead of the files in ``dbpath``, the files in the list ``filelist``
+        can be processed.
+
+        The files are read by ``readers`` threads ahead of processing (see
+        :py:class:`SGFReader`), holding at most ``prefetch`` files in memory,
+        and are handed to ``lkGameList.process`` in batches of ``batchSize``
+        files. Messages and the progress bar are updated once per batch.
+        Afterwards, ``self.processStatistics`` holds the triple (number of
+        files, number of games, seconds), and the throughput (games/sec) is
+        reported in ``messages``.
+        '''
         messages = messages or dummyMessages()
         if progBar:
             progBar.configure(value=0)
@@ -1664,20 +4098,10 @@ class KEngine(object):
         if logDuplicates:
             messages.insert('end', _('Processing %s.') % dbpath + '\n')
             messages.update()
-        if filenames == '*.sgf':
-            filelist = glob.glob(os.path.join(dbpath, '*.sgf'))
-        elif filenames == '*.sgf, *.mgt':
-            filelist = glob.glob(os.path.join(dbpath, '*.sgf')) + glob.glob(os.path.join(dbpath, '*.mgt'))
-        else:
-            filelist = glob.glob(os.path.join(dbpath, '*'))
+        if filelist is None:
+            filelist = sgfFiles(dbpath, filenames)
         if len(filelist) == 0:
             return
-        filelist.sort()
-
-        gls = lk.vectorGL()  # for duplicate check
-        for db in self.gamelist.DBlist:
-            if not db['disabled']:  # for disabled db's, db['data'] is None
-                gls.push_back(db['data'])
 
         if gl is None:
             gamelist = self.create_GameList(datap, tagAsPro, processVariations, algos, sgfInDB, messages, deleteDBfiles)
@@ -1687,73 +4111,370 @@ class KEngine(object):
         else:
             gamelist = gl
 
-        for counter, filename in enumerate(filelist):
-            if progBar and counter % 100 == 0:
+        # the duplicate check uses the duplicate index of all enabled
+        # databases (for disabled db's, db['data'] is None) and gamelist
+        dbs = [db['data'] for db in self.gamelist.DBlist if not db['disabled']]
+        if not any(g is gamelist for g in dbs):
+            dbs.append(gamelist)
+        duplicateIndex.sync(dbs)
+        gls = lk.vectorGL()  # not needed with the duplicate index
+
+        pops = lk.CHECK_FOR_DUPLICATES | lk.USE_DUPLICATE_INDEX
+        if not acceptDupl:
+            pops |= lk.OMIT_DUPLICATES
+        if strictDuplCheck:
+            pops |= lk.CHECK_FOR_DUPLICATES_STRICT
+
+        startTime = time.time()
+        noGames = 0
+        counter = 0
+        reader = SGFReader(filelist, readers, prefetch)
+        for batch in reader.batches(batchSize):
+            log = []
+            for filename, sgf in batch:
+                if sgf is None:
+                    log.append(_('Unable to read file %s') % filename + '\n')
+                    continue
+
+                path, fn = os.path.split(filename)
+                try:
+                    st = os.stat(filename)
+                    gamelist.processedFiles.append((path, fn, st.st_mtime, st.st_size, sgfHash(sgf), ))
+                except OSError:
+                    pass
+                try:
+                    n = gamelist.process(sgf, path, fn, gls, '', pops)
+                    if n:
+                        noGames += n
+                        pres = gamelist.process_results()
+                        # if not logDuplicates, do not log "not inserted", unless
+                        # there is also another reason for this
+                        log_not_inserted = logDuplicates
+                        if logDuplicates and pres & lk.IS_DUPLICATE:
+                            log.append(_('Duplicate ... %s\n') % filename)
+                        if pres & lk.SGF_ERROR:
+                            # We do usually insert games even if there are SGF
+                            # errors somewhere, so be careful with setting
+                            # log_not_inserted:
+                            if not (pres & lk.IS_DUPLICATE):
+                                log_not_inserted = True
+                            log.append(_('SGF error, file {0}, {1}\n').format(filename, pres))
+                        if pres & lk.UNACCEPTABLE_BOARDSIZE:
+                            log_not_inserted = True
+                            log.append(_('Unacceptable board size error, file {0}, {1}\n').format(filename, pres))
+                        if log_not_inserted and pres & lk.NOT_INSERTED_INTO_DB:
+                            log.append(_('not inserted\n'))
+                    else:
+                        log.append(_('SGF error, file %s, not inserted.') % filename + '\n')
+                except:
+                    log.append(_('SGF error, file %s, not inserted.') % filename + '\n')
+
+            # report once per batch rather than once per file
+            counter += len(batch)
+            if log:
+                messages.insert('end', ''.join(log))
+                messages.update()
+            if progBar:
                 progBar.configure(value=counter * 100 / len(filelist))
                 progBar.update()
-            try:
-                # read as binary file, since we want to pass bytestring to
-                # process
-                file = open(filename, 'rt')
-                sgf = file.read()
-                file.close()
-            except:
-                messages.insert('end', _('Unable to read file %s') % filename + '\n')
+
+        elapsed = time.time() - startTime
+        self.processStatistics = (len(filelist), noGames, elapsed, )
+        if logDuplicates:
+            messages.insert('end', _('%d games processed in %.1f seconds (%.1f games/sec).') % (noGames, elapsed, noGames / max(elapsed, 1e-6)) + '\n')
+            messages.update()
+
+        if gl is None:
+            if logDuplicates:
+                messages.insert('end', _('Finalizing ... (this will take some time)\n'))
                 messages.update()
-                continue
+            gamelist.finalize_processing()
+
+            self.tagReferences(gamelist)
+        if progBar:
+            progBar.stop()
+
+        return gamelist
+
+    def parallelProcess(
+            self,
+            dbpath, datap, filelist, processes,
+            acceptDupl=True, strictDuplCheck=True,
+            tagAsPro=0,
+            processVariations=True, algos=None,
+            messages=None, progBar=None,
+            sgfInDB=True,
+            logDuplicates=True,
+            index=None):
+        '''Process the files in ``filelist`` in ``processes`` worker
+        processes, into one new database ``datap`` (see
+        :py:meth:`get_datapath`). The list is split into consecutive shards,
+        and each shard is processed into a temporary database (named like the
+        new database, with suffixes ``.part1``, ``.part2``, ...). Afterwards,
+        the shards are merged into the new database in the order of
+        ``filelist`` (see ``lk.GameList.merge``; the games do not have to be
+        processed again for this), and deleted. The new database is added to
+        the DBlist (at ``index``, if given) and returned (None, if it does
+        not contain any games).
+
+        Duplicates are detected as by :py:meth:`process`, when the shards are
+        merged: A game counts as a duplicate if it has a duplicate in one of
+        the databases in the DBlist, or among the games before it (in the
+        order of ``filelist``). If ``acceptDupl`` is False, duplicates are
+        not added to the database.
+        '''
+        import multiprocessing
+
+        messages = messages or dummyMessages()
+        if progBar:
+            progBar.configure(value=0)
+            progBar.update()
+        processes = max(1, min(processes, len(filelist)))
+        shards = [filelist[i * len(filelist) // processes:(i + 1) * len(filelist) // processes] for i in range(processes)]
+
+        datap = self.get_datapath(datap, dbpath)
+        datapaths = []
+        for i in range(len(shards)):
+            datapaths.append(self.get_datapath((datap[0], '%s.part%d' % (datap[1], i + 1)), dbpath))
+
+        # The workers keep duplicates (which are handled when merging), and
+        # neither compress the SGF sources nor build a full text index; this
+        # is done for the merged database.
+        kwargs = {'acceptDupl': True, 'strictDuplCheck': strictDuplCheck, 'tagAsPro': tagAsPro,
+                  'processVariations': processVariations,
+                  'algos': algos & ~(lk.ALGO_SGF_COMPRESSED | lk.ALGO_FULLTEXT) if algos else algos,
+                  'sgfInDB': sgfInDB, 'logDuplicates': False, }
+        startTime = time.time()
+        if logDuplicates:
+            messages.insert('end', _('Processing %s.') % dbpath + '\n')
+            messages.update()
+        gl = None
+        try:
+            pool = multiprocessing.Pool(len(shards))
+            try:
+                for counter, result in enumerate(pool.imap(_processShard, [(shard, d, kwargs, self.rootNodeTags) for shard, d in zip(shards, datapaths)])):
+                    messages.insert('end', result[0])
+                    messages.update()
+                    if progBar:
+                        progBar.configure(value=(counter + 1) * 100 / len(shards))
+                        progBar.update()
+            finally:
+                pool.close()
+                pool.join()
 
-            path, fn = os.path.split(filename)
-            pops = lk.CHECK_FOR_DUPLICATES
+            gl = self.create_GameList(datap, tagAsPro, processVariations, algos, sgfInDB, messages)
+            if gl is None:
+                return
+            gl.start_processing()
+            dbs = [db['data'] for db in self.gamelist.DBlist if not db['disabled']]
+            duplicateIndex.sync(dbs + [gl])
+            pops = lk.CHECK_FOR_DUPLICATES | lk.USE_DUPLICATE_INDEX
             if not acceptDupl:
                 pops |= lk.OMIT_DUPLICATES
             if strictDuplCheck:
                 pops |= lk.CHECK_FOR_DUPLICATES_STRICT
 
-            try:
-                if gamelist.process(sgf, path, fn, gls, '', pops):
-                    pres = gamelist.process_results()
-                    # if not logDuplicates, do not log "not inserted", unless
-                    # there is also another reason for this
-                    log_not_inserted = logDuplicates
-                    if logDuplicates and pres & lk.IS_DUPLICATE:
-                        messages.insert('end', _('Duplicate ... %s\n') % filename)
-                        messages.update()
-                    if pres & lk.SGF_ERROR:
-                        # We do usually insert games even if there are SGF
-                        # errors somewhere, so be careful with setting
-                        # log_not_inserted:
-                        if not (pres & lk.IS_DUPLICATE):
-                            log_not_inserted = True
-                        messages.insert('end', _('SGF error, file {0}, {1}\n').format(filename, pres))
-                        messages.update()
-                    if pres & lk.UNACCEPTABLE_BOARDSIZE:
-                        log_not_inserted = True
-                        messages.insert('end', _('Unacceptable board size error, file {0}, {1}\n').format(filename, pres))
-                        messages.update()
-                    if log_not_inserted and pres & lk.NOT_INSERTED_INTO_DB:
-                        messages.insert('end', _('not inserted\n'))
-                        messages.update()
-                else:
-                    messages.insert('end', _('SGF error, file %s, not inserted.') % filename + '\n')
-                    messages.update()
-            except:
-                messages.insert('end', _('SGF error, file %s, not inserted.') % filename + '\n')
+            if logDuplicates:
+                messages.insert('end', _('Merging ...') + '\n')
                 messages.update()
-
-        if gl is None:
+            for d in datapaths:
+                dbname = os.path.join(d[0], d[1] + '.db')
+                if not os.path.exists(dbname):
+                    continue
+                shard = lkGameList(dbname)
+                n = gl.merge(shard, lk.vectorGL(), pops)
+                gl.processedFiles.extend(key + value for key, value in shard.getFiles().items())
+                if logDuplicates and any(gl.process_results(i) & lk.IS_DUPLICATE for i in range(n)):
+                    dbh = sqlite3.connect(dbname)
+                    try:
+                        files = dbh.execute('select path, filename from GAMES order by id').fetchall()
+                    finally:
+                        dbh.close()
+                    messages.insert('end', ''.join(_('Duplicate ... %s\n') % os.path.join(*files[i]) for i in range(n) if gl.process_results(i) & lk.IS_DUPLICATE))
+                    messages.update()
+                del shard  # close the database files
             if logDuplicates:
                 messages.insert('end', _('Finalizing ... (this will take some time)\n'))
                 messages.update()
-            gamelist.finalize_processing()
-
-            for ref in self.gamelist.references:
-                for gid in gamelist.sigsearchNC(ref):
-                    # print gid, ref, self.gamelist.references[ref],
-                    gamelist.setTagID(REFERENCED_TAG, gid)
+            gl.finalize_processing()
+        finally:
+            for d in datapaths:
+                for ext in ['db', 'da', 'db1', 'db2', 'db3', 'db4', ]:
+                    if os.path.exists(os.path.join(d[0], d[1] + '.' + ext)):
+                        os.remove(os.path.join(d[0], d[1] + '.' + ext))
+
+        noGames = gl.size_all()
+        elapsed = time.time() - startTime
+        self.processStatistics = (len(filelist), noGames, elapsed, )
+        if logDuplicates:
+            messages.insert('end', _('%d games processed in %.1f seconds (%.1f games/sec).') % (noGames, elapsed, noGames / max(elapsed, 1e-6)) + '\n')
+            messages.update()
         if progBar:
             progBar.stop()
+        if not noGames:
+            return
+        self.add_gl_at(index, gl, dbpath)
+        self.tagReferences(gl)
+        return gl
 
-        return gamelist
+    def updateDB(
+            self, index,
+            recursive=None, filenames=None,
+            acceptDupl=True, strictDuplCheck=True,
+            messages=None, progBar=None,
+            logDuplicates=True):
+        '''Bring the database at position ``index`` of the DBlist up to date
+        with the SGF files below its ``sgfpath``. Returns the triple of lists
+        of added, modified and deleted files.
+
+        The files which were processed into the database are recorded in it
+        together with their modification time, size and a hash of their
+        content (see :py:class:`lkGameList`). A file counts as modified if
+        its size or modification time changed and its content hash differs
+        from the recorded one. For databases created before this information
+        was stored, the files which contain games in the database are
+        recorded as unchanged when this method is called for the first time.
+
+        By default, the files are looked up with the arguments ``recursive``
+        and ``filenames`` which the database was created with (see
+        :py:meth:`addDB`; for a database created with ``all_in_one_db=False``,
+        subfolders are not included). For databases created before these
+        options were recorded, subfolders are included if the database
+        contains games from files outside ``sgfpath``, and ``filenames`` is
+        ``'*.sgf'``.
+
+        The games from modified and deleted files are removed from the
+        database (see ``lk.GameList.delete_games``), and the added and
+        modified files are processed into it; the tags of the games from
+        modified files are kept. The update is done on a copy of the
+        database files, which replaces the database only after it was
+        completed, so if an error occurs, the database is left unchanged.
+        '''
+        messages = messages or dummyMessages()
+        db = self.gamelist.DBlist[index]
+        gl = db['data']
+        if db['disabled'] or gl is None:
+            return [], [], []
+        sgfpath = db['sgfpath']
+
+        known = gl.getFiles()
+        if not known:
+            dbh = sqlite3.connect(uu(gl.dbname))
+            try:
+                gamefiles = set(dbh.execute('select distinct path, filename from GAMES'))
+            finally:
+                dbh.close()
+            baseline = []
+            for path, fn in gamefiles:
+                try:
+                    st = os.stat(os.path.join(path, fn))
+                except OSError:
+                    continue
+                baseline.append((path, fn, st.st_mtime, st.st_size, sgfHash(readSGFFile(os.path.join(path, fn)) or ''), ))
+            gl.recordFiles(baseline)
+            known = gl.getFiles()
+
+        fileOptions = gl.getFileOptions()
+        if recursive is None:
+            if fileOptions:
+                recursive = fileOptions[0]
+            else:
+                recursive = any(os.path.normpath(path) != os.path.normpath(sgfpath) for path, fn in known)
+        if filenames is None:
+            filenames = fileOptions[1] if fileOptions else '*.sgf'
+        if fileOptions != (recursive, filenames, ):
+            gl.recordFileOptions(recursive, filenames)
+
+        if recursive:
+            filelist = [f for dirpath, dirnames, files in os.walk(sgfpath) for f in sgfFiles(dirpath, filenames)]
+        else:
+            filelist = sgfFiles(sgfpath, filenames)
+
+        added, modified, touched = [], [], []
+        for filename in filelist:
+            key = os.path.split(filename)
+            if not key in known:
+                added.append(filename)
+                continue
+            st = os.stat(filename)
+            if (st.st_mtime, st.st_size) == known[key][:2]:
+                continue
+            h = sgfHash(readSGFFile(filename) or '')
+            if h == known[key][2]:
+                touched.append(key + (st.st_mtime, st.st_size, h, ))
+            else:
+                modified.append(filename)
+        deleted = sorted(set(os.path.join(*key) for key in known) - set(os.path.join(*os.path.split(f)) for f in filelist))
+
+        messages.insert('end', _('Updating %s: %d new, %d modified, %d deleted files.') % (sgfpath, len(added), len(modified), len(deleted)) + '\n')
+        messages.update()
+
+        if touched:
+            gl.recordFiles(touched)
+
+        if added or modified or deleted:
+            from tempfile import NamedTemporaryFile
+            datap = db['name']
+            tmp = self.get_datapath((datap[0], datap[1] + '.update'), sgfpath)
+            exts = ['db', 'da', 'db1', 'db2', 'db3', 'db4', ]
+            tagfilename = None
+            try:
+                for ext in exts:
+                    if os.path.exists(os.path.join(datap[0], datap[1] + '.' + ext)):
+                        shutil.copyfile(os.path.join(datap[0], datap[1] + '.' + ext), os.path.join(tmp[0], tmp[1] + '.' + ext))
+                if modified:
+                    # the games from modified files get new ids
+                    f = NamedTemporaryFile(delete=False)
+                    tagfilename = f.name
+                    f.close()
+                    gl.export_tags(tagfilename, [int(x) for x in self.gamelist.customTags.keys() if not int(x) == lk.HANDI_TAG])
+
+                newgl = lkGameList(os.path.join(tmp[0], tmp[1] + '.db'))
+                ids = newgl.gameIds([os.path.split(f) for f in modified + deleted])
+                newgl.start_processing()
+                newgl.delete_games(ids)
+                # the old version of the database must not take part in the
+                # duplicate check
+                db['data'] = newgl
+                try:
+                    if added or modified:
+                        self.process(
+                                sgfpath, None,
+                                acceptDupl=acceptDupl, strictDuplCheck=strictDuplCheck,
+                                messages=messages, progBar=progBar,
+                                gl=newgl, logDuplicates=logDuplicates,
+                                filelist=added + modified)
+                    newgl.finalize_processing()
+                finally:
+                    db['data'] = gl
+                newgl.forgetFiles([os.path.split(f) for f in deleted])
+                if tagfilename:
+                    newgl.import_tags(tagfilename)
+                del newgl  # close the database files
+
+                gl.invalidateCache()
+                del db['data'], gl
+                try:
+                    for ext in exts:
+                        if os.path.exists(os.path.join(datap[0], datap[1] + '.' + ext)):
+                            os.remove(os.path.join(datap[0], datap[1] + '.' + ext))
+                        if os.path.exists(os.path.join(tmp[0], tmp[1] + '.' + ext)):
+                            os.rename(os.path.join(tmp[0], tmp[1] + '.' + ext), os.path.join(datap[0], datap[1] + '.' + ext))
+                finally:
+                    db['data'] = gl = lkGameList(os.path.join(datap[0], datap[1] + '.db'))
+            finally:
+                if tagfilename:
+                    os.remove(tagfilename)
+                for ext in exts:
+                    try:
+                        if os.path.exists(os.path.join(tmp[0], tmp[1] + '.' + ext)):
+                            os.remove(os.path.join(tmp[0], tmp[1] + '.' + ext))
+                    except OSError:
+                        pass
+            self.tagReferences(gl)
+
+        self.gamelist.reset()
+        return added, modified, deleted
 
     # ---------- misc tools
 
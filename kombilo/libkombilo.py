@@ -1212,6 +1212,9 @@ ALGO_HASH_FULL = cvar.ALGO_HASH_FULL
 ALGO_HASH_CORNER = cvar.ALGO_HASH_CORNER
 ALGO_HASH_CENTER = cvar.ALGO_HASH_CENTER
 ALGO_HASH_SIDE = cvar.ALGO_HASH_SIDE
+ALGO_FULLTEXT = cvar.ALGO_FULLTEXT
+ALGO_MINHASH = cvar.ALGO_MINHASH
+ALGO_SGF_COMPRESSED = cvar.ALGO_SGF_COMPRESSED
 algo_finalpos = cvar.algo_finalpos
 algo_movelist = cvar.algo_movelist
 algo_hash_full = cvar.algo_hash_full
@@ -1219,6 +1222,7 @@ algo_hash_corner = cvar.algo_hash_corner
 algo_intervals = cvar.algo_intervals
 algo_hash_center = cvar.algo_hash_center
 algo_hash_side = cvar.algo_hash_side
+algo_minhash = cvar.algo_minhash
 DATE_PROFILE_START = cvar.DATE_PROFILE_START
 DATE_PROFILE_END = cvar.DATE_PROFILE_END
 
@@ -1630,6 +1634,14 @@ class ProcessOptions(_object):
     __swig_getmethods__["algo_hash_corner_maxNumStones"] = _libkombilo.ProcessOptions_algo_hash_corner_maxNumStones_get
     if _newclass:
         algo_hash_corner_maxNumStones = _swig_property(_libkombilo.ProcessOptions_algo_hash_corner_maxNumStones_get, _libkombilo.ProcessOptions_algo_hash_corner_maxNumStones_set)
+    __swig_setmethods__["algo_hash_side_maxNumStones"] = _libkombilo.ProcessOptions_algo_hash_side_maxNumStones_set
+    __swig_getmethods__["algo_hash_side_maxNumStones"] = _libkombilo.ProcessOptions_algo_hash_side_maxNumStones_get
+    if _newclass:
+        algo_hash_side_maxNumStones = _swig_property(_libkombilo.ProcessOptions_algo_hash_side_maxNumStones_get, _libkombilo.ProcessOptions_algo_hash_side_maxNumStones_set)
+    __swig_setmethods__["algo_hash_center_maxNumStones"] = _libkombilo.ProcessOptions_algo_hash_center_maxNumStones_set
+    __swig_getmethods__["algo_hash_center_maxNumStones"] = _libkombilo.ProcessOptions_algo_hash_center_maxNumStones_get
+    if _newclass:
+        algo_hash_center_maxNumStones = _swig_property(_libkombilo.ProcessOptions_algo_hash_center_maxNumStones_get, _libkombilo.ProcessOptions_algo_hash_center_maxNumStones_set)
     __swig_setmethods__["professional_tag"] = _libkombilo.ProcessOptions_professional_tag_set
     __swig_getmethods__["professional_tag"] = _libkombilo.ProcessOptions_professional_tag_get
     if _newclass:
@@ -1858,6 +1870,12 @@ class GameList(_object):
     def finalize_processing(self):
         return _libkombilo.GameList_finalize_processing(self)
 
+    def delete_games(self, ids):
+        return _libkombilo.GameList_delete_games(self, ids)
+
+    def merge(self, other, glists, flags=0):
+        return _libkombilo.GameList_merge(self, other, glists, flags)
+
     def search(self, pattern, options=None):
         return _libkombilo.GameList_search(self, pattern, options)
 
@@ -1873,6 +1891,30 @@ class GameList(_object):
     def numHits(self):
         return _libkombilo.GameList_numHits(self)
 
+    def searchNC(self, pattern, options=None):
+        return _libkombilo.GameList_searchNC(self, pattern, options)
+
+    def numContinuationsNC(self):
+        return _libkombilo.GameList_numContinuationsNC(self)
+
+    def lookupContinuationNC(self, i):
+        return _libkombilo.GameList_lookupContinuationNC(self, i)
+
+    def batch_add(self, pattern, options=None):
+        return _libkombilo.GameList_batch_add(self, pattern, options)
+
+    def batch_search(self, i):
+        return _libkombilo.GameList_batch_search(self, i)
+
+    def batch_prefilter(self):
+        return _libkombilo.GameList_batch_prefilter(self)
+
+    def batch_clear(self):
+        return _libkombilo.GameList_batch_clear(self)
+
+    def search_interrupted(self):
+        return _libkombilo.GameList_search_interrupted(self)
+
     def sigsearch(self, sig):
         return _libkombilo.GameList_sigsearch(self, sig)
 
@@ -1906,6 +1948,18 @@ class GameList(_object):
     def deleteTag(self, tag, i=-1):
         return _libkombilo.GameList_deleteTag(self, tag, i)
 
+    def setTags(self, tag):
+        return _libkombilo.GameList_setTags(self, tag)
+
+    def deleteTags(self, tag):
+        return _libkombilo.GameList_deleteTags(self, tag)
+
+    def setTagsBySignature(self, tag, sigs):
+        return _libkombilo.GameList_setTagsBySignature(self, tag, sigs)
+
+    def tagBits(self, tag):
+        return _libkombilo.GameList_tagBits(self, tag)
+
     def getTags(self, i, tag=0):
         return _libkombilo.GameList_getTags(self, i, tag)
 
@@ -1921,12 +1975,33 @@ class GameList(_object):
     def restore(self, handle, arg3=False):
         return _libkombilo.GameList_restore(self, handle, arg3)
 
+    def retain_snapshot(self, handle):
+        return _libkombilo.GameList_retain_snapshot(self, handle)
+
     def delete_snapshot(self, handle):
         return _libkombilo.GameList_delete_snapshot(self, handle)
 
     def delete_all_snapshots(self):
         return _libkombilo.GameList_delete_all_snapshots(self)
 
+    def snapshot_size(self, handle):
+        return _libkombilo.GameList_snapshot_size(self, handle)
+
+    def snapshots_memory(self):
+        return _libkombilo.GameList_snapshots_memory(self)
+
+    def num_snapshots(self):
+        return _libkombilo.GameList_num_snapshots(self)
+
+    def currentBits(self):
+        return _libkombilo.GameList_currentBits(self)
+
+    def snapshotBits(self, handle):
+        return _libkombilo.GameList_snapshotBits(self, handle)
+
+    def setCurrentBits(self, bits):
+        return _libkombilo.GameList_setCurrentBits(self, bits)
+
     def reset(self):
         return _libkombilo.GameList_reset(self)
 
@@ -1960,23 +2035,33 @@ class GameList(_object):
     def currentEntriesAsStrings(self, start=0, end=0):
         return _libkombilo.GameList_currentEntriesAsStrings(self, start, end)
 
+    def currentEntriesField(self, field):
+        return _libkombilo.GameList_currentEntriesField(self, field)
+
     def getSGF(self, i):
         return _libkombilo.GameList_getSGF(self, i)
 
     def getCurrentProperty(self, i, tag):
         return _libkombilo.GameList_getCurrentProperty(self, i, tag)
 
+    def getGameProperty(self, id, tag):
+        return _libkombilo.GameList_getGameProperty(self, id, tag)
+
     def plSize(self):
         return _libkombilo.GameList_plSize(self)
 
     def plEntry(self, i):
         return _libkombilo.GameList_plEntry(self, i)
+
+    def set_progress_callback(self, callback, interval):
+        return _libkombilo.GameList_set_progress_callback(self, callback, interval)
 GameList_swigregister = _libkombilo.GameList_swigregister
 GameList_swigregister(GameList)
 CHECK_FOR_DUPLICATES = cvar.CHECK_FOR_DUPLICATES
 CHECK_FOR_DUPLICATES_STRICT = cvar.CHECK_FOR_DUPLICATES_STRICT
 OMIT_DUPLICATES = cvar.OMIT_DUPLICATES
 OMIT_GAMES_WITH_SGF_ERRORS = cvar.OMIT_GAMES_WITH_SGF_ERRORS
+USE_DUPLICATE_INDEX = cvar.USE_DUPLICATE_INDEX
 UNACCEPTABLE_BOARDSIZE = cvar.UNACCEPTABLE_BOARDSIZE
 SGF_ERROR = cvar.SGF_ERROR
 IS_DUPLICATE = cvar.IS_DUPLICATE
@@ -1987,6 +2072,34 @@ INDEX_OUT_OF_RANGE = cvar.INDEX_OUT_OF_RANGE
 def find_duplicates(glists, strict=False, dupl_within_db=False):
     return _libkombilo.find_duplicates(glists, strict, dupl_within_db)
 find_duplicates = _libkombilo.find_duplicates
+
+def find_near_duplicates(glists, threshold):
+    return _libkombilo.find_near_duplicates(glists, threshold)
+find_near_duplicates = _libkombilo.find_near_duplicates
+
+def duplicate_index_reset():
+    return _libkombilo.duplicate_index_reset()
+duplicate_index_reset = _libkombilo.duplicate_index_reset
+
+def duplicate_index_add(gl, db_id):
+    return _libkombilo.duplicate_index_add(gl, db_id)
+duplicate_index_add = _libkombilo.duplicate_index_add
+
+def duplicate_index_size():
+    return _libkombilo.duplicate_index_size()
+duplicate_index_size = _libkombilo.duplicate_index_size
+
+def duplicate_index_duplicates(strict, dupl_within_db):
+    return _libkombilo.duplicate_index_duplicates(strict, dupl_within_db)
+duplicate_index_duplicates = _libkombilo.duplicate_index_duplicates
+
+def set_mmap_loading(MMAP):
+    return _libkombilo.set_mmap_loading(MMAP)
+set_mmap_loading = _libkombilo.set_mmap_loading
+
+def get_mmap_loading():
+    return _libkombilo.get_mmap_loading()
+get_mmap_loading = _libkombilo.get_mmap_loading
 class vectorMNC(_object):
     __swig_setmethods__ = {}
     __setattr__ = lambda self, name, value: _swig_setattr(self, vectorMNC, name, value)
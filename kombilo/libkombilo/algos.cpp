@@ -60,10 +60,33 @@ DBError::DBError() {
 
 Algorithm::Algorithm(int bsize) {
   boardsize = bsize;
+  mapped = 0;
+  mapped_size = 0;
+  mapped_loaded = false;
 }
 
 Algorithm::~Algorithm() {}
 
+void Algorithm::load_data(DataReader& DATA, bool in_place) {}
+
+void Algorithm::map_data(const char* DATA, size_t SIZE) {
+  mapped = DATA;
+  mapped_size = SIZE;
+  mapped_loaded = false;
+}
+
+void Algorithm::ensure_loaded() {
+  if (mapped && !mapped_loaded) {
+    mapped_loaded = true;
+    DataReader r(mapped, mapped_size);
+    if (!r.empty()) load_data(r, true);
+  }
+}
+
+bool Algorithm::is_mapped(const char* p) {
+  return mapped && p >= mapped && p < mapped + mapped_size;
+}
+
 void Algorithm::initialize_process() {}
 void Algorithm::newgame_process(int game_id) {}
 void Algorithm::AB_process(int x, int y) {}
@@ -80,6 +103,8 @@ SnapshotVector Algorithm::get_data() { return SnapshotVector(); }
 int Algorithm::search(PatternList& patternList, GameList& gl, SearchOptions& options) {
   return -1;
 }
+void Algorithm::remove_games(const std::set<int>& ids) {}
+void Algorithm::merge_data(Algorithm* other, const map<int, int>& ids) {}
 
 
 // -----------------------------------------------------------------------------------------------
@@ -89,23 +114,24 @@ Algo_signature::Algo_signature(int bsize, SnapshotVector DATA) : Algorithm(bsize
   main_variation = true;
 
   // initialize data from DATA
-  // data is boost::unordered_multimap<string = signature, int = gameid>
-
   if (!DATA.empty()) {
-    int si = DATA.retrieve_int();
-    // printf("read size %d\n", si);
-    for(int i=0; i<si; i++) {
-      // int size = DATA.retrieve_int();
-      // if (size!=13) printf("ouch %d\n", size);
-      // DATA.current -= 4;
-      char* s = DATA.retrieve_charp();
-      data.insert(pair<string,int>(string(s), DATA.retrieve_int()));
-      delete [] s;
-    }
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
+  }
+}
+
+void Algo_signature::load_data(DataReader& DATA, bool in_place) {
+  // data is boost::unordered_multimap<string = signature, int = gameid>
+  int si = DATA.retrieve_int();
+  // printf("read size %d\n", si);
+  for(int i=0; i<si; i++) {
+    char* s = DATA.retrieve_charp_in_place();
+    data.insert(pair<string,int>(string(s), DATA.retrieve_int()));
   }
 }
 
 SnapshotVector Algo_signature::get_data() {
+  ensure_loaded();
   SnapshotVector v;
 
   v.pb_int(data.size());
@@ -125,6 +151,7 @@ Algo_signature::~Algo_signature() {
 }
 
 void Algo_signature::initialize_process() {
+  ensure_loaded();
 }
 
 void Algo_signature::newgame_process(int game_id) {
@@ -209,6 +236,7 @@ char* Algo_signature::get_current_signature() {
 vector<int> Algo_signature::search_signature(char* sig) { // sig is expected to be a 0-terminated cstr;
                                                           // this is called only during process (but also for other gamelists in the glists
                                                           // argument to process, in order to check for duplicates).
+  ensure_loaded();
   vector<int> result;
   pair<boost::unordered_multimap<string,int>::iterator, boost::unordered_multimap<string,int>::iterator> res = data.equal_range(string(sig));
   for (boost::unordered_multimap<string,int>::iterator it = res.first; it != res.second; it++)
@@ -216,6 +244,24 @@ vector<int> Algo_signature::search_signature(char* sig) { // sig is expected to
   return result;
 }
 
+void Algo_signature::remove_games(const std::set<int>& ids) {
+  ensure_loaded();
+  for(boost::unordered_multimap<string,int>::iterator it = data.begin(); it != data.end(); ) {
+    if (ids.count(it->second)) it = data.erase(it);
+    else it++;
+  }
+}
+
+void Algo_signature::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_signature* o = (Algo_signature*)other;
+  o->ensure_loaded();
+  for(boost::unordered_multimap<string,int>::iterator it = o->data.begin(); it != o->data.end(); it++) {
+    map<int, int>::const_iterator id = ids.find(it->second);
+    if (id != ids.end()) data.insert(pair<string,int>(it->first, id->second));
+  }
+}
+
 
 
 
@@ -226,22 +272,26 @@ Algo_finalpos::Algo_finalpos(int bsize, SnapshotVector DATA) : Algorithm(bsize)
   fp = 0;
   fpIndex = -1;
 
-  // data is a map<int = gameid, char* = char[100] containing the finalpos for gameid>
-
   if (!DATA.empty()) {
-    unsigned int si = DATA.retrieve_int();
-    for(size_t i=0; i<si; i++) {
-      int game_id = DATA.retrieve_int();
-      // printf("game id %d\n", game_id);
-      char* s = DATA.retrieve_charp();
-      data.push_back(pair<int, char*>(game_id, s));
-    }
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
   }
 }
 
+void Algo_finalpos::load_data(DataReader& DATA, bool in_place) {
+  // data is a map<int = gameid, char* = char[100] containing the finalpos for gameid>
+  unsigned int si = DATA.retrieve_int();
+  for(size_t i=0; i<si; i++) {
+    int game_id = DATA.retrieve_int();
+    // printf("game id %d\n", game_id);
+    char* s = in_place ? DATA.retrieve_charp_in_place() : DATA.retrieve_charp();
+    data.push_back(pair<int, char*>(game_id, s));
+  }
+}
 
 
 SnapshotVector Algo_finalpos::get_data() {
+  ensure_loaded();
   SnapshotVector v;
   v.pb_int(data.size());
 
@@ -253,10 +303,12 @@ SnapshotVector Algo_finalpos::get_data() {
 }
 
 Algo_finalpos::~Algo_finalpos() {
-  for(vector<pair<int, char* > >::iterator it = data.begin(); it != data.end(); it++) delete [] it->second;
+  for(vector<pair<int, char* > >::iterator it = data.begin(); it != data.end(); it++)
+    if (!is_mapped(it->second)) delete [] it->second;
 }
 
 void Algo_finalpos::initialize_process() {
+  ensure_loaded();
   // printf("init Algo_finalpos\n");
 }
 
@@ -321,133 +373,177 @@ hashtype Algo_finalpos::get_current_fphash() {
 }
 
 hashtype Algo_finalpos::get_fphash(int index) {
+  ensure_loaded();
   char* np = 0;
   vector<pair<int, char*> >::iterator it = lower_bound(data.begin(), data.end(), pair<int, char*>(index, np));
   return stringhash(100, it->second); // TODO boardsize;
 }
 
+void Algo_finalpos::remove_games(const std::set<int>& ids) {
+  ensure_loaded();
+  vector<pair<int, char* > > kept;
+  for(vector<pair<int, char* > >::iterator it = data.begin(); it != data.end(); it++) {
+    if (!ids.count(it->first)) kept.push_back(*it);
+    else if (!is_mapped(it->second)) delete [] it->second;
+  }
+  data.swap(kept);
+}
+
+void Algo_finalpos::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_finalpos* o = (Algo_finalpos*)other;
+  o->ensure_loaded();
+  for(vector<pair<int, char* > >::iterator it = o->data.begin(); it != o->data.end(); it++) {
+    map<int, int>::const_iterator id = ids.find(it->first);
+    if (id == ids.end()) continue;
+    char* f = new char[100];
+    memcpy(f, it->second, 100);
+    data.push_back(pair<int, char*>(id->second, f));
+  }
+  sort(data.begin(), data.end()); // search and get_fphash rely on data being sorted by game id
+}
 
-int Algo_finalpos::search(PatternList& patternList, GameList& gl, SearchOptions& options) { // progress bar?!
 
+char_p* Algo_finalpos::pattern_bits(Pattern* pattern) {
   // Put the pattern into bitmap format, which is the format the final
   // positions are stored in in the database. This makes the comparisons
   // faster.
 
-  int plS = patternList.size();
-  char_p** allbits = new char_p*[plS];
-  int** allbitlengths = new int*[plS];
-  for(int N=0; N<plS; N++) {
-    Pattern* pattern = &patternList.data[N];
-    allbits[N] = new char_p[4];
-    allbitlengths[N] = new int[4];
-
-    for(int i=0; i<2; i++) {
-      for(int j=0; j<2; j++) {
-        int xBlocks = (pattern->sizeY+i+1)/2;
-        int yBlocks = (pattern->sizeX+j+1)/2;
-        char* nextBlock = new char[400];
-        int nextBlockIndex = 0;
-        nextBlock[nextBlockIndex++] = yBlocks;
-
-        for(int k1=0; k1 < yBlocks; k1++) {
-          char nlist[400];
-          int nlistIndex = 0;
-
-          for(int k2=0; k2 < xBlocks; k2++) {
-            int n = 0;
-            for(int x=0; x<2; x++) {
-              for(int y=0; y<2; y++) {
-                int indexX = k1 * 2 + y - j;
-                int indexY = k2 * 2 + x - i;
-                if (0 <= indexX && indexX < pattern->sizeX && 0 <= indexY && indexY < pattern->sizeY) {
-                  if (pattern->getFinal(indexX,indexY)=='X')
-                    n |= 1 << (2*(2*x+y));
-                  else if (pattern->getFinal(indexX,indexY)=='O')
-                    n |= 1 << (2*(2*x+y)+1);
-                }
+  char_p* bits = new char_p[4];
+  for(int i=0; i<2; i++) {
+    for(int j=0; j<2; j++) {
+      int xBlocks = (pattern->sizeY+i+1)/2;
+      int yBlocks = (pattern->sizeX+j+1)/2;
+      char* nextBlock = new char[400];
+      int nextBlockIndex = 0;
+      nextBlock[nextBlockIndex++] = yBlocks;
+
+      for(int k1=0; k1 < yBlocks; k1++) {
+        char nlist[400];
+        int nlistIndex = 0;
+
+        for(int k2=0; k2 < xBlocks; k2++) {
+          int n = 0;
+          for(int x=0; x<2; x++) {
+            for(int y=0; y<2; y++) {
+              int indexX = k1 * 2 + y - j;
+              int indexY = k2 * 2 + x - i;
+              if (0 <= indexX && indexX < pattern->sizeX && 0 <= indexY && indexY < pattern->sizeY) {
+                if (pattern->getFinal(indexX,indexY)=='X')
+                  n |= 1 << (2*(2*x+y));
+                else if (pattern->getFinal(indexX,indexY)=='O')
+                  n |= 1 << (2*(2*x+y)+1);
               }
             }
-            nlist[nlistIndex++] = n;
           }
+          nlist[nlistIndex++] = n;
+        }
+
+        int start = 0;
+        int end = nlistIndex;
 
-          int start = 0;
-          int end = nlistIndex;
+        while (start < end && !nlist[start]) start++;
+        while (end > start && !nlist[end-1]) end--;
 
-          while (start < end && !nlist[start]) start++;
-          while (end > start && !nlist[end-1]) end--;
+        nextBlock[nextBlockIndex++] = start;
+        nextBlock[nextBlockIndex++] = end-start;
+        for(int current=start; current < end; current++)
+          nextBlock[nextBlockIndex++] = nlist[current];
+      }
+      char* nB = new char[nextBlockIndex];
+      for(int ii=0; ii<nextBlockIndex; ii++) nB[ii] = nextBlock[ii];
+      bits[2*i + j] = nB;
+      delete [] nextBlock;
+    }
+  }
+  return bits;
+}
+
+char_p** Algo_finalpos::patternlist_bits(PatternList& patternList) {
+  int plS = patternList.size();
+  char_p** allbits = new char_p*[plS];
+  for(int N=0; N<plS; N++) allbits[N] = pattern_bits(&patternList.data[N]);
+  return allbits;
+}
+
+void Algo_finalpos::delete_bits(PatternList& patternList, char_p** allbits) {
+  for(int N=0; N<patternList.size(); N++) {
+    for(int i=0; i<4; i++)
+      if (allbits[N][i]) delete [] allbits[N][i];
+    delete [] allbits[N];
+  }
+  delete [] allbits;
+}
 
-          nextBlock[nextBlockIndex++] = start;
-          nextBlock[nextBlockIndex++] = end-start;
-          for(int current=start; current < end; current++)
-            nextBlock[nextBlockIndex++] = nlist[current];
+char* Algo_finalpos::get_finalpos(int index) {
+  char* np = 0;
+  vector<pair<int, char*> >::iterator it = lower_bound(data.begin(), data.end(), pair<int, char*>(index, np));
+  if (it == data.end() || it->first != index) return 0; // safety check - this should never happen
+  return it->second;
+}
+
+vector<Candidate* >* Algo_finalpos::match(char* finalpos, PatternList& patternList, char_p** allbits) {
+  char start;
+  char length;
+  char x;
+  char y;
+  vector<Candidate* > *matchList = new vector<Candidate* >;
+
+  for(int N=0; N<patternList.size(); N++) {
+    Pattern* pattern = &patternList.data[N];
+    for(int a0=pattern->left; a0 <= pattern->right; a0++) {
+      for(int a1 = pattern->top; a1 <= pattern->bottom; a1++) {
+        int matches = 1;
+
+        int pIndex = 2*(a1%2) + (a0%2);
+        char* pbits = allbits[N][pIndex];
+        int pbIndex = 0;
+        int fpIndex = a1/2 + (a0/2)*10;
+
+        for(x=0; x < pbits[0]; x++) {
+          start = pbits[++pbIndex];
+          length = pbits[++pbIndex];
+          fpIndex += start;
+          for(y=0; y<length; y++) {
+            pbIndex++;
+            if (pbits[pbIndex] & finalpos[fpIndex]) {
+              matches = 0;
+              break;
+            }
+            fpIndex++;
+          }
+          if (!matches) break;
+          fpIndex += 10 - start - length;
+        }
+        if (matches) {
+          // printf("finalpos cand %d %d %d\n", a0, a1, N);
+          matchList->push_back(new Candidate(a0,a1,N));
         }
-        char* nB = new char[nextBlockIndex];
-        for(int ii=0; ii<nextBlockIndex; ii++) nB[ii] = nextBlock[ii];
-        allbitlengths[N][2*i + j] = nextBlockIndex;
-        allbits[N][2*i + j] = nB;
-        delete [] nextBlock;
       }
     }
   }
+  return matchList;
+}
+
+int Algo_finalpos::search(PatternList& patternList, GameList& gl, SearchOptions& options) { // progress bar?!
+  ensure_loaded();
+  char_p** bits = patternlist_bits(patternList);
 
   int num_of_games = gl.startO();
 
   #pragma omp parallel for
   for(int ctr=0; ctr < num_of_games; ctr++) {
+    if (!gl.report_progress(ctr, num_of_games)) continue; // search was cancelled
     int index = gl.oldList->at(ctr).first;
 
-    char start;
-    char length;
-    char x;
-    char y;
-
     // if (!(counter++ % 1000)) printf("counter: %d, index: %d\n", counter, index);
     // if (progBar && !(counter % 100))
     //   progBar.redraw((progEnd-progStart)*counter/len(gl.current) + progStart);
 
-    char* np = 0;
-    vector<pair<int, char*> >::iterator it = lower_bound(data.begin(), data.end(), pair<int, char*>(index, np));
-    if (it == data.end() || it->first != index) { // safety check - this should never happen
-      // printf("skip\n");
-      continue;
-    }
-    char* finalpos = it->second;
+    char* finalpos = get_finalpos(index);
+    if (!finalpos) continue;
     // printf("index %d, %p\n", index, finalpos);
-    vector<Candidate* > *matchList = new vector<Candidate* >;
-
-    for(int N=0; N<plS; N++) {
-      Pattern* pattern = &patternList.data[N];
-      for(int a0=pattern->left; a0 <= pattern->right; a0++) {
-        for(int a1 = pattern->top; a1 <= pattern->bottom; a1++) {
-          int matches = 1;
-
-          int pIndex = 2*(a1%2) + (a0%2);
-          char* pbits = allbits[N][pIndex];
-          int pbIndex = 0;
-          int fpIndex = a1/2 + (a0/2)*10;
-
-          for(x=0; x < pbits[0]; x++) {
-            start = pbits[++pbIndex];
-            length = pbits[++pbIndex];
-            fpIndex += start;
-            for(y=0; y<length; y++) {
-              pbIndex++;
-              if (pbits[pbIndex] & finalpos[fpIndex]) {
-                matches = 0;
-                break;
-              }
-              fpIndex++;
-            }
-            if (!matches) break;
-            fpIndex += 10 - start - length;
-          }
-          if (matches) {
-            // printf("finalpos cand %d %d %d\n", a0, a1, N);
-            matchList->push_back(new Candidate(a0,a1,N));
-          }
-        }
-      }
-    }
+    vector<Candidate* > *matchList = match(finalpos, patternList, bits);
 
     if (matchList->size()) {
       GameListEntry* gle = gl.all->at(gl.oldList->at(ctr).second);
@@ -457,17 +553,37 @@ int Algo_finalpos::search(PatternList& patternList, GameList& gl, SearchOptions&
       gl.currentList->push_back(gl.oldList->at(ctr));
     } else delete matchList;
   }
-  {
-    for(int N=0; N<plS; N++) {
-      delete [] allbitlengths[N];
-      for(int i=0; i<4; i++)
-        if (allbits[N][i]) delete [] allbits[N][i];
-      delete [] allbits[N];
+  delete_bits(patternList, bits);
+  return 0;
+}
+
+void Algo_finalpos::batch_search(vector<PatternList* >& patternLists, GameList& gl, vector<vector<pair<pair<int,int>, vector<Candidate* >* > > >& results) {
+  ensure_loaded();
+  int n = patternLists.size();
+  vector<char_p**> bits;
+  for(int k=0; k<n; k++) bits.push_back(patternlist_bits(*patternLists[k]));
+  results.clear();
+  results.resize(n);
+
+  int num_of_games = gl.currentList->size();
+
+  #pragma omp parallel for
+  for(int ctr=0; ctr < num_of_games; ctr++) {
+    if (!gl.report_progress(ctr, num_of_games)) continue; // search was cancelled
+    pair<int,int> entry = gl.currentList->at(ctr);
+    char* finalpos = get_finalpos(entry.first);
+    if (!finalpos) continue;
+
+    // the final position of the game is read once, and compared with all patterns
+    for(int k=0; k<n; k++) {
+      vector<Candidate* > *matchList = match(finalpos, *patternLists[k], bits[k]);
+      if (matchList->size()) {
+        #pragma omp critical
+        results[k].push_back(make_pair(entry, matchList));
+      } else delete matchList;
     }
   }
-  delete [] allbitlengths;
-  delete [] allbits;
-  return 0;
+  for(int k=0; k<n; k++) delete_bits(*patternLists[k], bits[k]);
 }
 
 
@@ -480,17 +596,23 @@ Algo_movelist::Algo_movelist(int bsize, SnapshotVector DATA) : Algorithm(bsize)
   // data2 is a map<int = gameid, char* "finalpos-captures">, where the char* has length 50
 
   if (!DATA.empty()) {
-    int si = DATA.retrieve_int();
-    for(int i=0; i<si; i++) {
-      int game_id = DATA.retrieve_int();
-      data1l.insert(pair<int, int>(game_id, DATA.retrieve_int()));
-      data1.insert(pair<int, char*>(game_id, DATA.retrieve_charp()));
-      data2.insert(pair<int, char*>(game_id, DATA.retrieve_charp()));
-    }
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
+  }
+}
+
+void Algo_movelist::load_data(DataReader& DATA, bool in_place) {
+  int si = DATA.retrieve_int();
+  for(int i=0; i<si; i++) {
+    int game_id = DATA.retrieve_int();
+    data1l.insert(pair<int, int>(game_id, DATA.retrieve_int()));
+    data1.insert(pair<int, char*>(game_id, in_place ? DATA.retrieve_charp_in_place() : DATA.retrieve_charp()));
+    data2.insert(pair<int, char*>(game_id, in_place ? DATA.retrieve_charp_in_place() : DATA.retrieve_charp()));
   }
 }
 
 SnapshotVector Algo_movelist::get_data() {
+  ensure_loaded();
   SnapshotVector v;
 
   v.pb_int(data1l.size());
@@ -506,14 +628,15 @@ SnapshotVector Algo_movelist::get_data() {
 
 Algo_movelist::~Algo_movelist() {
   for(map<int, char* >::iterator it = data1.begin(); it != data1.end(); it++) {
-    delete [] it->second;
+    if (!is_mapped(it->second)) delete [] it->second;
   }
   for(map<int, char* >::iterator it = data2.begin(); it != data2.end(); it++) {
-    delete [] it->second;
+    if (!is_mapped(it->second)) delete [] it->second;
   }
 }
 
 void Algo_movelist::initialize_process() {
+  ensure_loaded();
   // printf("init Algo_movelist\n");
 }
 
@@ -612,6 +735,37 @@ void Algo_movelist::endgame_process(bool commit)  {
 void Algo_movelist::finalize_process() {
 }
 
+void Algo_movelist::remove_games(const std::set<int>& ids) {
+  ensure_loaded();
+  for(std::set<int>::const_iterator id = ids.begin(); id != ids.end(); id++) {
+    map<int, char* >::iterator it1 = data1.find(*id);
+    if (it1 == data1.end()) continue;
+    map<int, char* >::iterator it2 = data2.find(*id);
+    if (!is_mapped(it1->second)) delete [] it1->second;
+    if (!is_mapped(it2->second)) delete [] it2->second;
+    data1.erase(it1);
+    data2.erase(it2);
+    data1l.erase(*id);
+  }
+}
+
+void Algo_movelist::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_movelist* o = (Algo_movelist*)other;
+  o->ensure_loaded();
+  for(map<int, int>::iterator it = o->data1l.begin(); it != o->data1l.end(); it++) {
+    map<int, int>::const_iterator id = ids.find(it->first);
+    if (id == ids.end()) continue;
+    char* ml = new char[it->second];
+    memcpy(ml, o->data1[it->first], it->second);
+    char* fc = new char[50];
+    memcpy(fc, o->data2[it->first], 50);
+    data1.insert(pair<int, char*>(id->second, ml));
+    data1l.insert(pair<int, int>(id->second, it->second));
+    data2.insert(pair<int, char*>(id->second, fc));
+  }
+}
+
 
 
 MovelistCand::MovelistCand(Pattern* P, int ORIENTATION, char* DICTS, int NO, char X, char Y) {
@@ -698,6 +852,7 @@ VecMC* VecMC::deepcopy(ExtendedMoveNumber& COUNTER, int CANDSSIZE) {
 }
 
 int Algo_movelist::search(PatternList& patternList, GameList& gl, SearchOptions& options) {
+  ensure_loaded();
   // printf("Enter Algo_movelist::search\n");
   int numOfHits = 0;
   int self_numOfSwitched = 0;
@@ -712,6 +867,7 @@ int Algo_movelist::search(PatternList& patternList, GameList& gl, SearchOptions&
   #pragma omp parallel for
   for(int ctr = 0; ctr < num_of_games; ctr++) {
     // printf("ctr: %d", ctr);
+    if (!gl.report_progress(ctr, num_of_games)) continue; // search was cancelled
 
     int index = gl.oldList->at(ctr).first;
     vector<Hit* > * result = new vector<Hit* >;
@@ -1067,6 +1223,138 @@ int Algo_movelist::search(PatternList& patternList, GameList& gl, SearchOptions&
 }
 
 
+// ----------------------------------------------------------------------------------------------------------------
+
+
+Algo_minhash::Algo_minhash(int bsize, SnapshotVector DATA) : Algorithm(bsize) {
+  main_variation = true;
+  if (!DATA.empty()) {
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
+  }
+}
+
+Algo_minhash::~Algo_minhash() {
+}
+
+void Algo_minhash::load_data(DataReader& DATA, bool in_place) {
+  // data: number n of games, their ids, and the n*MINHASH_SIZE entries of
+  // the sketches as one block
+  int n = DATA.retrieve_int();
+  ids.reserve(n);
+  for(int i=0; i<n; i++) ids.push_back(DATA.retrieve_int());
+  const unsigned short* block = (const unsigned short*)DATA.retrieve_charp_in_place();
+  sketches.assign(block, block + n*MINHASH_SIZE);
+}
+
+SnapshotVector Algo_minhash::get_data() {
+  ensure_loaded();
+  SnapshotVector v;
+  v.pb_int(ids.size());
+  for(vector<int>::iterator it = ids.begin(); it != ids.end(); it++) v.pb_int(*it);
+  v.pb_charp(sketches.empty() ? "" : (const char*)&sketches[0], sketches.size() * sizeof(unsigned short));
+  return v;
+}
+
+void Algo_minhash::initialize_process() {
+  ensure_loaded();
+}
+
+void Algo_minhash::remove_games(const std::set<int>& ids) {
+  ensure_loaded();
+  vector<int> kept_ids;
+  vector<unsigned short> kept_sketches;
+  for(unsigned int i=0; i < this->ids.size(); i++) {
+    if (ids.count(this->ids[i])) continue;
+    kept_ids.push_back(this->ids[i]);
+    kept_sketches.insert(kept_sketches.end(), sketches.begin() + MINHASH_SIZE*i, sketches.begin() + MINHASH_SIZE*(i+1));
+  }
+  this->ids.swap(kept_ids);
+  sketches.swap(kept_sketches);
+}
+
+void Algo_minhash::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_minhash* o = (Algo_minhash*)other;
+  o->ensure_loaded();
+  for(unsigned int i=0; i < o->ids.size(); i++) {
+    map<int, int>::const_iterator id = ids.find(o->ids[i]);
+    if (id == ids.end()) continue;
+    this->ids.push_back(id->second);
+    sketches.insert(sketches.end(), o->sketches.begin() + MINHASH_SIZE*i, o->sketches.begin() + MINHASH_SIZE*(i+1));
+  }
+}
+
+void Algo_minhash::newgame_process(int game_id) {
+  main_variation = true;
+  gid = game_id;
+  moves.clear();
+}
+
+void Algo_minhash::move_process(Move m) {
+  if (main_variation && moves.size() < (unsigned int)MINHASH_MOVES) moves.push_back(MoveNC(m.x, m.y, m.color));
+}
+
+void Algo_minhash::endOfVariation_process() {
+  main_variation = false;
+}
+
+int Algo_minhash::move_code(int f, const MoveNC& m) {
+  // the image of m under the symmetry f, as an integer < 2*boardsize*boardsize
+  int code = Pattern::flipsX(f, m.x, m.y, boardsize-1, boardsize-1) * boardsize + Pattern::flipsY(f, m.x, m.y, boardsize-1, boardsize-1);
+  return m.color == 'W' ? code + boardsize*boardsize : code;
+}
+
+static uint64_t minhash_mix(uint64_t x) {
+  // the finalizer of splitmix64
+  x += 0x9e3779b97f4a7c15ULL;
+  x = (x ^ (x >> 30)) * 0xbf58476d1ce4e5b9ULL;
+  x = (x ^ (x >> 27)) * 0x94d049bb133111ebULL;
+  return x ^ (x >> 31);
+}
+
+void Algo_minhash::endgame_process(bool commit) {
+  if (!commit || moves.size() < 2) return;
+
+  // normal form: the symmetry for which the sequence of moves is smallest
+  int best = 0;
+  for(int f=1; f<8; f++) {
+    for(unsigned int i=0; i < moves.size(); i++) {
+      int c = move_code(f, moves[i]);
+      int c_best = move_code(best, moves[i]);
+      if (c < c_best) best = f;
+      if (c != c_best) break;
+    }
+  }
+
+  uint64_t seeds[MINHASH_SIZE];
+  uint64_t minima[MINHASH_SIZE];
+  for(int k=0; k < MINHASH_SIZE; k++) {
+    seeds[k] = minhash_mix(k);
+    minima[k] = ~(uint64_t)0;
+  }
+  int previous = move_code(best, moves[0]);
+  for(unsigned int i=1; i < moves.size(); i++) {
+    int current = move_code(best, moves[i]);
+    uint64_t shingle = (uint64_t)previous * 2 * boardsize * boardsize + current;
+    for(int k=0; k < MINHASH_SIZE; k++) {
+      uint64_t h = minhash_mix(shingle ^ seeds[k]);
+      if (h < minima[k]) minima[k] = h;
+    }
+    previous = current;
+  }
+  ids.push_back(gid);
+  for(int k=0; k < MINHASH_SIZE; k++) sketches.push_back((unsigned short)(minima[k] >> 48));
+}
+
+double Algo_minhash::similarity(const unsigned short* s1, const unsigned short* s2) {
+  int equal = 0;
+  for(int k=0; k < MINHASH_SIZE; k++)
+    if (s1[k] == s2[k]) equal++;
+  return (double)equal / MINHASH_SIZE;
+}
+
+
 // -----------------------------------------------------------------------------------------------
 
 
@@ -1451,21 +1739,24 @@ Algo_hash_full::Algo_hash_full(int bsize, SnapshotVector DATA, const string OS_D
   os_data.open(OS_DATA_NAME.c_str(), ios::in | ios::out | ios::binary);
 
   // initialize from DATA
-  // data is a boost::unordered_multimap<int = hashCode, ptr_to_file>
   if (DATA.size()) { // allow passing an empty SnapshotVector to this constructor
-    hashtype si = DATA.retrieve_hashtype();
-    for(hashtype i=0; i<si; i++) {
-      hashtype HC = DATA.retrieve_hashtype(); // hash code
-      int i1 = DATA.retrieve_int();     // pointer to position in .dd file
-      data.push_back(pair<hashtype, int>(HC, i1));
-    }
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
   }
 }
 
+void Algo_hash_full::load_data(DataReader& DATA, bool in_place) {
+  // data is a boost::unordered_multimap<int = hashCode, ptr_to_file>
+  hashtype si = DATA.retrieve_hashtype();
+  for(hashtype i=0; i<si; i++) {
+    hashtype HC = DATA.retrieve_hashtype(); // hash code
+    int i1 = DATA.retrieve_int();     // pointer to position in .dd file
+    data.push_back(pair<hashtype, int>(HC, i1));
+  }
+}
 
-SnapshotVector Algo_hash_full::get_data() {
-  SnapshotVector v;
 
+void Algo_hash_full::read_data_p() {
   // Add all entries of data to data_p:
 
   for(vector<pair<hashtype, int> >::iterator it = data.begin(); it != data.end(); it++) {
@@ -1482,6 +1773,43 @@ SnapshotVector Algo_hash_full::get_data() {
   // Clear data:
 
   vector<pair<hashtype, int> >().swap(data);
+}
+
+void Algo_hash_full::remove_games(const std::set<int>& ids) {
+  // The hits are stored in os_data grouped by hash code, so we move
+  // everything to data_p, which is written back in get_data.
+  ensure_loaded();
+  read_data_p();
+  for(boost::unordered_multimap<hashtype, HashhitF>::iterator it = data_p.begin(); it != data_p.end(); ) {
+    if (ids.count(it->second.gameid)) it = data_p.erase(it);
+    else it++;
+  }
+}
+
+void Algo_hash_full::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_hash_full* o = (Algo_hash_full*)other;
+  o->ensure_loaded();
+  for(vector<pair<hashtype, int> >::iterator it = o->data.begin(); it != o->data.end(); it++) {
+    vpsip results = new vector<HashhitF* >;
+    o->get_HHF(it->second, results, 0);
+    for(vector<HashhitF* >::iterator hh = results->begin(); hh != results->end(); hh++) {
+      map<int, int>::const_iterator id = ids.find((*hh)->gameid);
+      if (id != ids.end()) {
+        (*hh)->gameid = id->second;
+        data_p.insert(pair<hashtype, HashhitF>(it->first, HashhitF(**hh)));
+      }
+      delete *hh;
+    }
+    delete results;
+  }
+}
+
+SnapshotVector Algo_hash_full::get_data() {
+  ensure_loaded();
+  SnapshotVector v;
+
+  read_data_p();
 
   // Create list of all hashCodes
   map<hashtype,int> hashcodes;
@@ -1532,6 +1860,7 @@ Algo_hash_full::~Algo_hash_full() {
 
 
 void Algo_hash_full::initialize_process() {
+  ensure_loaded();
   // printf("algo_hash_full::initialize_processing\n");
   boost::unordered_multimap<hashtype, HashhitF>().swap(data_p);
 }
@@ -1696,6 +2025,7 @@ void Algo_hash_full::get_HHF(int ptr, vpsip results, int orientation) {
 }
 
 int Algo_hash_full::search(PatternList& patternList, GameList& gl, SearchOptions& options) {
+  ensure_loaded();
   // printf("enter algo_hash_full::search\n");
 
   // hashing for patterns with contlist does not currently work since
@@ -1838,6 +2168,7 @@ void vCand::insert_if_new(int l, int t, int ind) {
 Algo_hash::Algo_hash(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int MAXNUMSTONES) : Algorithm(bsize) {
   hi = 0;
   maxNumStones = MAXNUMSTONES;
+  minNumStones = 0;
 
   // In case the file does not exist yet, we need to create it: hence open it
   // with the ios::app flag, and close again, then open with the flags we
@@ -1848,19 +2179,22 @@ Algo_hash::Algo_hash(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int MA
 
   // initialize from DATA
   if (!DATA.empty()) { // allow passing an empty SnapshotVector to this constructor
-    hashtype si = DATA.retrieve_hashtype();
-    for(hashtype i=0; i<si; i++) {
-      hashtype HC = DATA.retrieve_hashtype();
-      int i1 = DATA.retrieve_int();
-      data.push_back(pair<hashtype, int>(HC, i1));
-    }
+    DataReader r((const char*)&DATA[0], DATA.size());
+    load_data(r, false);
   }
 }
 
+void Algo_hash::load_data(DataReader& DATA, bool in_place) {
+  hashtype si = DATA.retrieve_hashtype();
+  for(hashtype i=0; i<si; i++) {
+    hashtype HC = DATA.retrieve_hashtype();
+    int i1 = DATA.retrieve_int();
+    data.push_back(pair<hashtype, int>(HC, i1));
+  }
+}
 
-SnapshotVector Algo_hash::get_data() {
-  SnapshotVector v;
 
+void Algo_hash::read_data_p() {
   // Add all entries of data to data_p:
 
   for(vector<pair<hashtype, int> >::iterator it = data.begin(); it != data.end(); it++) {
@@ -1876,6 +2210,39 @@ SnapshotVector Algo_hash::get_data() {
   // Clear data
 
   vector<pair<hashtype, int> >().swap(data);
+}
+
+void Algo_hash::remove_games(const std::set<int>& ids) {
+  // see Algo_hash_full::remove_games
+  ensure_loaded();
+  read_data_p();
+  for(boost::unordered_multimap<hashtype, pair<int, int> >::iterator it = data_p.begin(); it != data_p.end(); ) {
+    if (ids.count(it->second.first)) it = data_p.erase(it);
+    else it++;
+  }
+}
+
+void Algo_hash::merge_data(Algorithm* other, const map<int, int>& ids) {
+  ensure_loaded();
+  Algo_hash* o = (Algo_hash*)other;
+  o->ensure_loaded();
+  for(vector<pair<hashtype, int> >::iterator it = o->data.begin(); it != o->data.end(); it++) {
+    vector<HashhitCS* >* results = new vector<HashhitCS* >;
+    o->get_HHCS(it->second, results, false);
+    for(vector<HashhitCS* >::iterator hh = results->begin(); hh != results->end(); hh++) {
+      map<int, int>::const_iterator id = ids.find((*hh)->gameid);
+      if (id != ids.end()) data_p.insert(pair<hashtype, pair<int, int> >(it->first, make_pair(id->second, (*hh)->position)));
+      delete *hh;
+    }
+    delete results;
+  }
+}
+
+SnapshotVector Algo_hash::get_data() {
+  ensure_loaded();
+  SnapshotVector v;
+
+  read_data_p();
 
   // Create list of all hashCodes
   map<hashtype,int> hashcodes;
@@ -1920,6 +2287,7 @@ Algo_hash::~Algo_hash() {
 
 
 void Algo_hash::initialize_process() {
+  ensure_loaded();
   boost::unordered_multimap<hashtype, pair<int, int> >().swap(data_p);
 }
 
@@ -1948,7 +2316,7 @@ void Algo_hash::AE_process(int x, int y, char removed) {
 
 void Algo_hash::endOfNode_process() {
   for(vector<HashInstance>::iterator it = hi->begin(); it != hi->end(); it++) {
-    if (it->numStones <= maxNumStones && it->changed) {
+    if (it->numStones <= maxNumStones && it->numStones >= minNumStones && it->changed) {
       it->changed = false;
       hash_vector.push_back(it->cHC());
       // printf("push back %ld\n", it->cHC().first);
@@ -2028,6 +2396,7 @@ void Algo_hash::get_HHCS(int ptr, vector<HashhitCS* >* results, bool cs) {
 
 
 int Algo_hash::search(PatternList& patternList, GameList& gl, SearchOptions& options) {
+  ensure_loaded();
   // return value: -1 = failure; 0 = ok, but have to check w/ Algo_movelist
 
   // hashing for patterns with contlist does not currently work since
@@ -2216,31 +2585,199 @@ pair<hashtype,vector<int> > Algo_hash_corner::compute_hashkey(PatternList& pl, i
   return result;
 }
 
-// Algo_hash_side::Algo_hash_side(int bsize, int SIZEX, int SIZEY) : Algo_hash(bsize, "SIDE") {
-//   sizeX = SIZEX;
-//   sizeY = SIZEY;
-//   char buf[10];
-//   sprintf(buf, "%d_%d", sizeX, sizeY);
-//   dbnameext += buf;
-//
-//   hi = new vector<HashInstance>;
-//   for(int i=1; i<bsize-1-sizeX; i++)
-//     hi->push_back(HashInstance(i,0,sizeX, sizeY,boardsize));
-//   for(int i=1; i<bsize-1-sizeX; i++)
-//     hi->push_back(HashInstance(i,bsize-sizeY,sizeX, sizeY,boardsize));
-//   for(int i=1; i<bsize-1-sizeX; i++)
-//     hi->push_back(HashInstance(0, i, sizeY, sizeX,boardsize));
-//   for(int i=1; i<bsize-1-sizeX; i++)
-//     hi->push_back(HashInstance(bsize-sizeY, i, sizeY, sizeX,boardsize));
-// }
-
-HashInstance::HashInstance(char X, char Y, char SIZEX, char SIZEY, int BOARDSIZE) {
+// ------------------------------------------------------------------------------------------------------------------------
+
+
+Algo_hash_window::Algo_hash_window(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int MAXNUMSTONES) : Algo_hash(bsize, DATA, OS_DATA_NAME, MAXNUMSTONES) {
+  // regions with very few stones occur in almost every game, so we do not
+  // store them (a search will then not use hashing, see Algo_hash_window::search)
+  minNumStones = 3;
+  hi = new vector<HashInstance>;
+}
+
+void Algo_hash_window::add_window(char X, char Y, char SIZEX, char SIZEY, int FRAME) {
+  hi->push_back(HashInstance(X, Y, SIZEX, SIZEY, boardsize, FRAME));
+  recorded.insert(FRAME*(1<<16) + X + boardsize*Y);
+}
+
+int Algo_hash_window::window_codes(Pattern& p, HashInstance& shape, int ox, int oy, hashtype* codes) {
+  // Use a copy of shape located at (ox, oy); codeIndex only depends on the coordinates relative to the region.
+  HashInstance h(ox, oy, shape.sizeX, shape.sizeY, boardsize, shape.frame);
+  for(int i=0; i<shape.numSyms; i++) codes[i] = 0;
+  int ns = 0;
+  for(int x=ox; x<ox+shape.sizeX; x++) {
+    for(int y=oy; y<oy+shape.sizeY; y++) {
+      char c = p.getFinal(x, y);
+      if (c == 'x' || c == 'o' || c == '*') return -1;
+      if (c == 'X' || c == 'O') {
+        int sign = c == 'X' ? 1 : -1;
+        for(int i=0; i<shape.numSyms; i++) codes[i] += sign*Algo_hash::hashCodes[h.codeIndex(i, x, y)];
+        ns++;
+      }
+    }
+  }
+  return ns;
+}
+
+class WindowMatch { // region in one of the patterns of a PatternList, the hash code of which matches the one we look up
+  public:
+    int index; // index of the pattern in PatternList.data
+    int frame;
+    int ox;
+    int oy;
+    hashtype codes[8];
+};
+
+int Algo_hash_window::search(PatternList& patternList, GameList& gl, SearchOptions& options) {
+  ensure_loaded();
+  // return value: -1 = failure; 0 = ok, but have to check w/ Algo_movelist
+
+  if (patternList.pattern.contList.size()) return -1;
+
+  // find the region in the pattern which has most stones, among those which
+  // are recorded for every possible position of the pattern
+  Pattern& p0 = patternList.data[0];
+  int best_ns = -1;
+  hashtype best_codes[8];
+  int best_numSyms = 0;
+  for(vector<HashInstance>::iterator sh = shapes.begin(); sh != shapes.end(); sh++) {
+    for(int ox=0; ox <= p0.sizeX - sh->sizeX; ox++) {
+      for(int oy=0; oy <= p0.sizeY - sh->sizeY; oy++) {
+        hashtype codes[8];
+        int ns = window_codes(p0, *sh, ox, oy, codes);
+        if (ns <= 2 || ns < minNumStones || ns > maxNumStones || ns <= best_ns) continue;
+
+        bool ok = true;
+        for(int x = p0.left; ok && x <= p0.right; x++) {
+          for(int y = p0.top; ok && y <= p0.bottom; y++) {
+            if (recorded.find(sh->frame*(1<<16) + x+ox + boardsize*(y+oy)) == recorded.end()) ok = false;
+          }
+        }
+        if (!ok) continue;
+
+        best_ns = ns;
+        best_numSyms = sh->numSyms;
+        for(int i=0; i<sh->numSyms; i++) best_codes[i] = codes[i];
+      }
+    }
+  }
+  if (best_ns == -1) return -1; // failure
+
+  hashtype hashCode = best_codes[0];
+  hashtype hashCode2 = -best_codes[0]; // hash code with colors reversed
+  for(int i=1; i<best_numSyms; i++) {
+    if (best_codes[i] < hashCode) hashCode = best_codes[i];
+    if (-best_codes[i] < hashCode2) hashCode2 = -best_codes[i];
+  }
+  bool cs = patternList.data[patternList.size()-1].colorSwitch;
+
+  // collect the regions (in all patterns of patternList) which have one of the hash codes we look for
+  vector<WindowMatch> matches;
+  for(int k=0; k < patternList.size(); k++) {
+    Pattern& p = patternList.data[k];
+    for(vector<HashInstance>::iterator sh = shapes.begin(); sh != shapes.end(); sh++) {
+      for(int ox=0; ox <= p.sizeX - sh->sizeX; ox++) {
+        for(int oy=0; oy <= p.sizeY - sh->sizeY; oy++) {
+          WindowMatch wm;
+          if (window_codes(p, *sh, ox, oy, wm.codes) != best_ns) continue;
+          hashtype m = wm.codes[0];
+          for(int i=1; i<sh->numSyms; i++) if (wm.codes[i] < m) m = wm.codes[i];
+          if (m != hashCode && !(cs && m == hashCode2)) continue;
+          wm.index = k;
+          wm.frame = sh->frame;
+          wm.ox = ox;
+          wm.oy = oy;
+          matches.push_back(wm);
+        }
+      }
+    }
+  }
+
+  vector<HashhitCS* >* results = new vector<HashhitCS* >;
+  vector<pair<hashtype, int> >::iterator it = lower_bound(data.begin(), data.end(), pair<hashtype, int>(hashCode,0));
+  if (it != data.end() && it->first == hashCode) get_HHCS(it->second, results, false);
+  if (cs && hashCode2 != hashCode) {
+    it = lower_bound(data.begin(), data.end(), pair<hashtype, int>(hashCode2,0));
+    if (it != data.end() && it->first == hashCode2) get_HHCS(it->second, results, true);
+  }
+
+  if (gl.start_sorted() == 0) {
+    sort(results->begin(), results->end(), cmp_HashhitCS);
+
+    vector<HashhitCS* >::iterator resultIT = results->begin();
+    while (resultIT != results->end()) {
+      int index = (*resultIT)->gameid;
+
+      vCand* candidates = new vCand;
+      while (resultIT != results->end() && (*resultIT)->gameid == index) {
+        int position = (*resultIT)->position;
+        int frame = position / (1<<20) - 1;
+        int ori = (position / (1<<16)) % 16;
+        int wx = (position % (1<<16)) % boardsize;
+        int wy = (position % (1<<16)) / boardsize;
+        hashtype hc = (*resultIT)->cs ? hashCode2 : hashCode;
+        for(vector<WindowMatch>::iterator wm = matches.begin(); wm != matches.end(); wm++) {
+          if (wm->frame != frame || wm->codes[ori] != hc) continue;
+          Pattern& p = patternList.data[wm->index];
+          int x = wx - wm->ox;
+          int y = wy - wm->oy;
+          if (p.left <= x && x <= p.right && p.top <= y && y <= p.bottom)
+            candidates->insert_if_new(x, y, wm->index);
+        }
+        resultIT++;
+      }
+      if (candidates->size()) gl.makeIndexCandidate(index, candidates);
+      else delete candidates;
+    }
+    for(vector<HashhitCS* >::iterator it = results->begin(); it != results->end(); it++) delete *it;
+    delete results;
+    gl.end_sorted();
+  } else {
+    for(vector<HashhitCS* >::iterator it = results->begin(); it != results->end(); it++) delete *it;
+    delete results;
+    return -1;
+  }
+  return 0;
+}
+
+
+Algo_hash_side::Algo_hash_side(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int SIZEX, int SIZEY, int MAXNUMSTONES) : Algo_hash_window(bsize, DATA, OS_DATA_NAME, MAXNUMSTONES) {
+  sizeX = SIZEX;
+  sizeY = SIZEY;
+
+  // during processing, we keep track of all regions of size sizeX x sizeY along the four edges
+  if (sizeX <= bsize && sizeY <= bsize) {
+    for(int i=0; i<=bsize-sizeX; i++) add_window(i, 0, sizeX, sizeY, HASH_FRAME_TOP);
+    for(int i=0; i<=bsize-sizeX; i++) add_window(i, bsize-sizeY, sizeX, sizeY, HASH_FRAME_BOTTOM);
+    for(int i=0; i<=bsize-sizeX; i++) add_window(0, i, sizeY, sizeX, HASH_FRAME_LEFT);
+    for(int i=0; i<=bsize-sizeX; i++) add_window(bsize-sizeY, i, sizeY, sizeX, HASH_FRAME_RIGHT);
+  }
+  shapes.push_back(HashInstance(0, 0, sizeX, sizeY, boardsize, HASH_FRAME_TOP));
+  shapes.push_back(HashInstance(0, 0, sizeX, sizeY, boardsize, HASH_FRAME_BOTTOM));
+  shapes.push_back(HashInstance(0, 0, sizeY, sizeX, boardsize, HASH_FRAME_LEFT));
+  shapes.push_back(HashInstance(0, 0, sizeY, sizeX, boardsize, HASH_FRAME_RIGHT));
+}
+
+
+Algo_hash_center::Algo_hash_center(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int SIZE, int MAXNUMSTONES) : Algo_hash_window(bsize, DATA, OS_DATA_NAME, MAXNUMSTONES) {
+  size = SIZE;
+
+  // during processing, we keep track of all square regions of side-length size
+  for(int i=0; i<=bsize-size; i++) {
+    for(int j=0; j<=bsize-size; j++) add_window(i, j, size, size, HASH_FRAME_CENTER);
+  }
+  shapes.push_back(HashInstance(0, 0, size, size, boardsize, HASH_FRAME_CENTER));
+}
+
+HashInstance::HashInstance(char X, char Y, char SIZEX, char SIZEY, int BOARDSIZE, int FRAME) {
   boardsize = BOARDSIZE;
   xx = X;
   yy = Y;
   pos = xx + boardsize*yy;
   sizeX = SIZEX;
   sizeY = SIZEY;
+  frame = FRAME;
+  numSyms = (frame == HASH_FRAME_BOARD || frame == HASH_FRAME_CENTER) ? 8 : 2;
   branchpoints = 0;
   currentHashCode = 0;
   numStones = 0;
@@ -2266,6 +2803,31 @@ void HashInstance::finalize() {
   }
 }
 
+int HashInstance::codeIndex(int i, char x, char y) {
+  if (frame == HASH_FRAME_BOARD)
+    return Pattern::flipsX(i,x,y,boardsize-1, boardsize-1) + boardsize*Pattern::flipsY(i,x,y,boardsize-1, boardsize-1);
+
+  int rx = x-xx;
+  int ry = y-yy;
+  if (frame == HASH_FRAME_CENTER)
+    return Pattern::flipsX(i,rx,ry,sizeX-1, sizeY-1) + boardsize*Pattern::flipsY(i,rx,ry,sizeX-1, sizeY-1);
+
+  // side regions: rx = position along the edge, ry = distance from the edge
+  int length = sizeX;
+  if (frame == HASH_FRAME_BOTTOM) ry = sizeY-1-ry;
+  else if (frame == HASH_FRAME_LEFT) {
+    rx = y-yy;
+    ry = x-xx;
+    length = sizeY;
+  } else if (frame == HASH_FRAME_RIGHT) {
+    rx = y-yy;
+    ry = sizeX-1-(x-xx);
+    length = sizeY;
+  }
+  if (i) rx = length-1-rx; // reflection along the axis perpendicular to the edge
+  return rx + boardsize*ry;
+}
+
 bool HashInstance::inRelevantRegion(char X, char Y) {
   if (xx <= X && X < xx+sizeX && yy <= Y && Y < yy+sizeY) return true;
   return false;
@@ -2275,7 +2837,7 @@ void HashInstance::initialize() {
   // keep track of 8 hashCodes, corresponding to 8 symmetries
   // at the end of each node, the maximum of these values is written to the db.
   currentHashCode = new hashtype[8];
-  for(int i=0; i<8; i++) currentHashCode[i] = 0; // start with empty board
+  for(int i=0; i<8; i++) currentHashCode[i] = 0; // start with empty board (unused symmetries stay 0)
   numStones = 0;
   branchpoints = new stack<pair<hashtype*,int> >;
   changed = true; // do record empty pattern ...
@@ -2284,8 +2846,8 @@ void HashInstance::initialize() {
 void HashInstance::addB(char x, char y) {
   if (inRelevantRegion(x,y)) {
     changed = true;
-    for(int i=0; i<8; i++) {
-      currentHashCode[i] += Algo_hash::hashCodes[Pattern::flipsX(i,x,y,boardsize-1, boardsize-1) + boardsize*Pattern::flipsY(i,x,y,boardsize-1, boardsize-1)];
+    for(int i=0; i<numSyms; i++) {
+      currentHashCode[i] += Algo_hash::hashCodes[codeIndex(i,x,y)];
     }
     numStones++;
   }
@@ -2294,8 +2856,8 @@ void HashInstance::addB(char x, char y) {
 void HashInstance::addW(char x, char y) {
   if (inRelevantRegion(x,y)) {
     changed = true;
-    for(int i=0; i<8; i++) {
-      currentHashCode[i] -= Algo_hash::hashCodes[Pattern::flipsX(i,x,y,boardsize-1, boardsize-1) + boardsize*Pattern::flipsY(i,x,y,boardsize-1, boardsize-1)];
+    for(int i=0; i<numSyms; i++) {
+      currentHashCode[i] -= Algo_hash::hashCodes[codeIndex(i,x,y)];
     }
     numStones++;
   }
@@ -2304,8 +2866,8 @@ void HashInstance::addW(char x, char y) {
 void HashInstance::removeB(char x, char y) {
   if (inRelevantRegion(x,y)) {
     changed = true;
-    for(int i=0; i<8; i++) {
-      currentHashCode[i] -= Algo_hash::hashCodes[Pattern::flipsX(i,x,y,boardsize-1, boardsize-1) + boardsize*Pattern::flipsY(i,x,y,boardsize-1, boardsize-1)];
+    for(int i=0; i<numSyms; i++) {
+      currentHashCode[i] -= Algo_hash::hashCodes[codeIndex(i,x,y)];
     }
     numStones--;
   }
@@ -2314,8 +2876,8 @@ void HashInstance::removeB(char x, char y) {
 void HashInstance::removeW(char x, char y) {
   if (inRelevantRegion(x,y)) {
     changed = true;
-    for(int i=0; i<8; i++) {
-      currentHashCode[i] += Algo_hash::hashCodes[Pattern::flipsX(i,x,y,boardsize-1, boardsize-1) + boardsize*Pattern::flipsY(i,x,y,boardsize-1, boardsize-1)];
+    for(int i=0; i<numSyms; i++) {
+      currentHashCode[i] += Algo_hash::hashCodes[codeIndex(i,x,y)];
     }
     numStones--;
   }
@@ -2324,14 +2886,15 @@ void HashInstance::removeW(char x, char y) {
 pair<hashtype,int> HashInstance::cHC() {
   int flip = 0;
   hashtype minCHC = currentHashCode[0];
-  for(int i=0; i<8; i++) {
+  for(int i=0; i<numSyms; i++) {
     // printf("ch %d %ld\n", i, currentHashCode[i]);
     if (currentHashCode[i] < minCHC) {
       minCHC = currentHashCode[i];
       flip = i;
     }
   }
-  return make_pair(minCHC, flip*(1<<16)  + pos);
+  // for regions which are not tied to a fixed position, the frame is encoded in the higher bits
+  return make_pair(minCHC, (frame+1)*(1<<20) + flip*(1<<16)  + pos);
 }
 
 void HashInstance::bppush() {
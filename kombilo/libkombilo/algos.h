@@ -106,6 +106,8 @@
 
 #include <vector>
 #include <stack>
+#include <set>
+#include <map>
 #include <fstream>
 #include "sqlite3.h"
 #include "pstdint.h"
@@ -141,11 +143,32 @@ class Algorithm {
     virtual void finalize_process();                      ///< Called by GameList::finalize_processing
 
     virtual SnapshotVector get_data();                    ///< Extract the relevant data from file at Kombilo startup.
+    virtual void load_data(DataReader& DATA, bool in_place); ///< Read the data written by get_data; if \c in_place is true, the algorithm may keep pointers into the underlying memory.
 
     virtual int search(PatternList& patternList, GameList& gl, SearchOptions& options); ///< pattern search
 
+    /// Remove the data of the games with the given ids (called by GameList::delete_games).
+    virtual void remove_games(const std::set<int>& ids);
+    /// Add the data of the games of \c other (an algorithm of the same type,
+    /// belonging to another database) whose ids are keys of \c ids, under
+    /// the new ids given by \c ids (called by GameList::merge).
+    virtual void merge_data(Algorithm* other, const std::map<int, int>& ids);
+
+    /// Use the data in the given memory region (typically a part of the
+    /// memory-mapped .da file) which must stay valid during the lifetime of
+    /// the algorithm. It is read in place by load_data when it is needed for
+    /// the first time (see ensure_loaded).
+    void map_data(const char* DATA, size_t SIZE);
+    void ensure_loaded();                                 ///< Call load_data for mapped data which has not been read yet.
+    bool is_mapped(const char* p);                        ///< Whether \c p points into the mapped data (and hence must not be deleted).
+
     int gid;          ///< store the game id during processing
     int boardsize;    ///< board size
+
+  protected:
+    const char* mapped;
+    size_t mapped_size;
+    bool mapped_loaded;
 };
 
 
@@ -173,8 +196,11 @@ class Algo_signature : public Algorithm {
     char* signature;
     char* get_current_signature();
     std::vector<int> search_signature(char* sig);
+    void remove_games(const std::set<int>& ids);
+    void merge_data(Algorithm* other, const std::map<int, int>& ids);
 
     SnapshotVector get_data();
+    void load_data(DataReader& DATA, bool in_place);
     boost::unordered_multimap<string, int> data;
   private:
     bool main_variation;
@@ -218,14 +244,30 @@ class Algo_finalpos : public Algorithm {
     void finalize_process();
     hashtype get_current_fphash();
     hashtype get_fphash(int index);
+    void remove_games(const std::set<int>& ids);
+    void merge_data(Algorithm* other, const std::map<int, int>& ids);
 
     char* fp;
     int fpIndex;
 
     SnapshotVector get_data();
+    void load_data(DataReader& DATA, bool in_place);
     std::vector<pair<int, char* > > data;
 
     int search(PatternList& patternList, GameList& gl, SearchOptions& options);
+    /// Compare the final position of each game in the current list with all
+    /// patterns of all the pattern lists, reading it only once. For each
+    /// pattern list, the games with candidates (as entries of the current
+    /// list) and their candidates are stored in the corresponding entry of \c
+    /// results. The current list is not changed. See GameList::batch_prefilter.
+    void batch_search(std::vector<PatternList* >& patternLists, GameList& gl, std::vector<std::vector<std::pair<std::pair<int,int>, std::vector<Candidate* >* > > >& results);
+
+  private:
+    char_p* pattern_bits(Pattern* pattern); ///< the pattern in bitmap format, for the four offsets w.r.t. the 2x2 blocks of the final positions
+    char_p** patternlist_bits(PatternList& patternList);
+    void delete_bits(PatternList& patternList, char_p** allbits);
+    char* get_finalpos(int index); ///< the final position of the game with this index (or 0)
+    std::vector<Candidate* >* match(char* finalpos, PatternList& patternList, char_p** allbits);
 };
 
 
@@ -319,7 +361,54 @@ class Algo_movelist : public Algorithm {
     std::map<int, char* > data1;
     std::map<int, char* > data2;
     std::map<int, int> data1l;
+    void remove_games(const std::set<int>& ids);
+    void merge_data(Algorithm* other, const std::map<int, int>& ids);
+    SnapshotVector get_data();
+    void load_data(DataReader& DATA, bool in_place);
+};
+
+
+// --------------------------------------------------------------------------------------------------------
+
+const int MINHASH_SIZE = 32;   ///< number of hash functions used for the MinHash sketches
+const int MINHASH_BANDS = 8;   ///< number of bands for locality sensitive hashing, see find_near_duplicates
+const int MINHASH_MOVES = 200; ///< number of moves of the main line which are taken into account
+
+/*! This algorithm computes a MinHash sketch of the main line of each game,
+ * which is used to find near duplicates (see find_near_duplicates), i.e.,
+ * games recorded from different sources where a few moves differ, or one of
+ * which is truncated, or which are given in different orientations.
+ *
+ * The first MINHASH_MOVES moves of the main line are brought into a normal
+ * form w.r.t. the symmetries of the board: of the 8 images of the sequence
+ * of moves, the lexicographically smallest one is taken. The sketch
+ * consists of the minima of MINHASH_SIZE hash functions over the pairs of
+ * consecutive moves (of which we keep the upper 16 bits); the fraction of
+ * equal entries of the sketches of two games is an estimate of the Jaccard
+ * similarity of their sets of pairs of consecutive moves.
+ */
+class Algo_minhash : public Algorithm {
+  public:
+    Algo_minhash(int bsize, SnapshotVector DATA);
+    ~Algo_minhash();
+    void initialize_process();
+    void newgame_process(int game_id);
+    void move_process(Move m);
+    void endOfVariation_process();
+    void endgame_process(bool commit=true);
+    void remove_games(const std::set<int>& ids);
+    void merge_data(Algorithm* other, const std::map<int, int>& ids);
+
     SnapshotVector get_data();
+    void load_data(DataReader& DATA, bool in_place);
+
+    std::vector<int> ids;                 ///< the ids of the games with a sketch
+    std::vector<unsigned short> sketches; ///< the sketch of the game ids[i] starts at sketches[MINHASH_SIZE*i]
+    static double similarity(const unsigned short* s1, const unsigned short* s2); ///< the estimated similarity of two sketches
+  private:
+    bool main_variation;
+    std::vector<MoveNC> moves;
+    int move_code(int f, const MoveNC& m);
 };
 
 
@@ -402,7 +491,10 @@ class Algo_hash_full : public Algorithm {
 
     vector<pair<hashtype, int> > data;
     boost::unordered_multimap<hashtype, HashhitF> data_p;
+    void remove_games(const std::set<int>& ids);
+    void merge_data(Algorithm* other, const std::map<int, int>& ids);
     SnapshotVector get_data();
+    void load_data(DataReader& DATA, bool in_place);
     fstream os_data;
     
   private:
@@ -412,28 +504,51 @@ class Algo_hash_full : public Algorithm {
     std::stack<HashVarInfo>* branchpoints;
     boost::unordered_multimap<hashtype, HashhitF> hash_vector;
     void get_HHF(int ptr, vpsip results, int orientation);
+    void read_data_p(); ///< move the hits from os_data into data_p
 };
 
 
 // --------------------------------------------------------------------------------------------
 
 
+/// The frames with respect to which HashInstance computes hash codes.
+/// HASH_FRAME_BOARD uses board coordinates (corner hashing), the side frames
+/// use coordinates relative to a region at the top/bottom/left/right edge,
+/// and HASH_FRAME_CENTER uses coordinates relative to a square region anywhere on the board.
+const int HASH_FRAME_BOARD = -1;
+const int HASH_FRAME_TOP = 0;
+const int HASH_FRAME_BOTTOM = 1;
+const int HASH_FRAME_LEFT = 2;
+const int HASH_FRAME_RIGHT = 3;
+const int HASH_FRAME_CENTER = 4;
+
 class HashInstance {
   // When processing sgf games, Algo_hash maintains a list of HashInstance's -
   // those are regions on the board for which hash codes are put into the
   // database
 
   public:
-    HashInstance(char X, char Y, char SIZEX, char SIZEY, int BOARDSIZE);
+    HashInstance(char X, char Y, char SIZEX, char SIZEY, int BOARDSIZE, int FRAME = HASH_FRAME_BOARD);
     ~HashInstance();
     bool inRelevantRegion(char X, char Y);
 
+    /// Index into Algo_hash::hashCodes for the point (x,y), with respect to the symmetry i.
+    ///
+    /// For HASH_FRAME_BOARD, the coordinates are taken relative to the
+    /// board, and i runs through the 8 symmetries of the board. For the other
+    /// frames, the coordinates are taken relative to the region (for side
+    /// regions: along the side and distance from the edge), so that the same
+    /// configuration gives the same hash code wherever the region is located.
+    int codeIndex(int i, char x, char y);
+
     char xx; // position on the board
     char yy;
     int pos;
     int boardsize;
     char sizeX; // size of the pattern
     char sizeY;
+    int frame; // one of the HASH_FRAME_* constants
+    int numSyms; // number of symmetries which are taken into account: 8, or 2 for side regions
     bool changed;
 
     void initialize();
@@ -470,6 +585,8 @@ class Algo_hash : public Algorithm {
     virtual void endOfVariation_process();
     virtual void endgame_process(bool commit=true);
     virtual void finalize_process();
+    virtual void remove_games(const std::set<int>& ids);
+    virtual void merge_data(Algorithm* other, const std::map<int, int>& ids);
 
     /// Do a pattern search for the Pattern specified by patternList, in the GameList gl.
     /// 
@@ -486,11 +603,14 @@ class Algo_hash : public Algorithm {
   protected:
 
     int maxNumStones;
+    int minNumStones; ///< regions with fewer stones are not recorded (default 0)
     SnapshotVector get_data(); //< Used to read data from disk into \c data
+    void load_data(DataReader& DATA, bool in_place);
     
     /// takes a pointer to os_data, a vector results, and a bool cs (==colorSwitch)
     /// and adds the hits from the database to the results vector:
     virtual void get_HHCS(int ptr, vector<HashhitCS* >* results, bool cs);
+    void read_data_p(); ///< move the hits from os_data into data_p
 
     virtual std::pair<hashtype,std::vector<int> >  compute_hashkey(PatternList& pl, int CS);
     static const hashtype hashCodes[];
@@ -518,6 +638,63 @@ class Algo_hash_corner : public Algo_hash {
     int size;
 };
 
+/// Base class for hashing of regions which are not tied to a fixed position
+/// on the board (see Algo_hash_side and Algo_hash_center).
+///
+/// The hash codes are computed relative to the region (see HashInstance::codeIndex), and the
+/// position of the region is stored together with each hit, so that a search can produce
+/// Candidate entries for patterns which may be located anywhere along the sides, or anywhere on the board.
+class Algo_hash_window : public Algo_hash {
+  public:
+    Algo_hash_window(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int MAXNUMSTONES);
+
+    /// Do a pattern search for the Pattern specified by patternList, in the GameList gl.
+    ///
+    /// Among all regions which are contained in the pattern and which are recorded in
+    /// the database for every possible position of the pattern, the one with most stones
+    /// is used. Returns -1 if no such region exists.
+    int search(PatternList& patternList, GameList& gl, SearchOptions& options);
+
+  protected:
+    /// one HashInstance (at an arbitrary position) for each frame, describing the shape of the regions
+    std::vector<HashInstance> shapes;
+
+    /// set of frame*(1<<16) + position for all regions in \c hi
+    std::set<int> recorded;
+
+    /// Compute the hash codes (for all symmetries of \c shape) of the region at offset (ox, oy)
+    /// in pattern p. Returns the number of stones in the region, or -1 if the region
+    /// contains wildcards.
+    int window_codes(Pattern& p, HashInstance& shape, int ox, int oy, hashtype* codes);
+
+    /// Set up \c hi and \c recorded from the list of regions.
+    void add_window(char X, char Y, char SIZEX, char SIZEY, int FRAME);
+};
+
+/// Hashing for side patterns
+///
+/// Regions of size \c sizeX times \c sizeY along all four edges of the board are recorded.
+class Algo_hash_side : public Algo_hash_window {
+  public:
+    Algo_hash_side(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int SIZEX=6, int SIZEY=4, int MAXNUMSTONES = 12);
+
+    /// length of the region used for hashing (along the edge)
+    int sizeX;
+    /// depth of the region used for hashing (distance from the edge)
+    int sizeY;
+};
+
+/// Hashing for center patterns
+///
+/// Square regions of side-length \c size at every position of the board are recorded.
+class Algo_hash_center : public Algo_hash_window {
+  public:
+    Algo_hash_center(int bsize, SnapshotVector DATA, string OS_DATA_NAME, int SIZE=3, int MAXNUMSTONES = 6);
+
+    /// size of the region used for hashing
+    int size;
+};
+
 
 // ---------------------------------------------------------------------------------------------------------------
 
@@ -1,4 +1,8 @@
-%module libkombilo
+%module(threads="1") libkombilo
+
+// Release the GIL only during pattern searches, so that searches in several
+// GameLists can run in parallel threads (see KEngine.patternSearch).
+%nothread;
 
 %include <std_string.i>
 %include <std_vector.i>
@@ -31,10 +35,48 @@ namespace std {
 %ignore Hit;
 %ignore Candidate;
 %ignore SnapshotVector;
+%ignore GameListSnapshot;
 %ignore GameList::all;
 %ignore GameList::currentList;
 %include "pattern.h"
+
+%ignore GameList::set_progress_function;
+%ignore GameList::get_progress_data;
+
+%{
+// Used by GameList.set_progress_callback: calls the Python callable data as
+// data(done, total); the search is stopped if this returns a false value (or
+// raises an exception). This may be called while the GIL is released.
+static bool python_search_progress(void* data, int done, int total) {
+  SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+  PyObject* result = PyObject_CallFunction((PyObject*)data, (char *)"ii", done, total);
+  bool cont = result && PyObject_IsTrue(result) == 1;
+  if (!result) PyErr_Clear();
+  Py_XDECREF(result);
+  SWIG_PYTHON_THREAD_END_BLOCK;
+  return cont;
+}
+%}
+
+%thread GameList::search;
+%thread GameList::searchNC;
 %include "search.h"
+
+%extend GameList {
+  // Call the Python callable callback as callback(done, total) every interval
+  // games during searches (see GameList::set_progress_function). Pass None to
+  // remove the callback.
+  void set_progress_callback(PyObject* callback, int interval) {
+    PyObject* old = (PyObject*)$self->get_progress_data();
+    if (callback == Py_None) $self->set_progress_function(0, 0, interval);
+    else {
+      Py_INCREF(callback);
+      $self->set_progress_function(python_search_progress, callback, interval);
+    }
+    Py_XDECREF(old);
+  }
+};
+
 %template(vectorMNC) std::vector<MoveNC>;
 %template(vectorM) std::vector<Move>;
 %template(vectorGL) std::vector<GameList* >;
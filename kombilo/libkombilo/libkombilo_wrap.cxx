@@ -20,6 +20,7 @@
 #define SWIGPYTHON
 #endif
 
+#define SWIG_PYTHON_THREADS
 #define SWIG_PYTHON_DIRECTOR_NO_VTABLE
 
 
@@ -6098,6 +6099,28 @@ SWIG_AsVal_unsigned_SS_int (PyObject * obj, unsigned int *val)
 	};
       }
     
+// Used by GameList.set_progress_callback: calls the Python callable data as
+// data(done, total); the search is stopped if this returns a false value (or
+// raises an exception). This may be called while the GIL is released.
+static bool python_search_progress(void* data, int done, int total) {
+  SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+  PyObject* result = PyObject_CallFunction((PyObject*)data, (char *)"ii", done, total);
+  bool cont = result && PyObject_IsTrue(result) == 1;
+  if (!result) PyErr_Clear();
+  Py_XDECREF(result);
+  SWIG_PYTHON_THREAD_END_BLOCK;
+  return cont;
+}
+
+SWIGINTERN void GameList_set_progress_callback(GameList *self,PyObject *callback,int interval){
+    PyObject* old = (PyObject*)self->get_progress_data();
+    if (callback == Py_None) self->set_progress_function(0, 0, interval);
+    else {
+      Py_INCREF(callback);
+      self->set_progress_function(python_search_progress, callback, interval);
+    }
+    Py_XDECREF(old);
+  }
 SWIGINTERN swig::SwigPyIterator *std_vector_Sl_MoveNC_Sg__iterator(std::vector< MoveNC > *self,PyObject **PYTHON_SELF){
       return swig::make_output_iterator(self->begin(), self->begin(), self->end(), *PYTHON_SELF);
     }
@@ -20676,6 +20699,48 @@ SWIGINTERN PyObject *Swig_var_ALGO_HASH_SIDE_get(void) {
 }
 
 
+SWIGINTERN int Swig_var_ALGO_FULLTEXT_set(PyObject *) {
+  SWIG_Error(SWIG_AttributeError,"Variable ALGO_FULLTEXT is read-only.");
+  return 1;
+}
+
+
+SWIGINTERN PyObject *Swig_var_ALGO_FULLTEXT_get(void) {
+  PyObject *pyobj = 0;
+  
+  pyobj = SWIG_From_int(static_cast< int >(ALGO_FULLTEXT));
+  return pyobj;
+}
+
+
+SWIGINTERN int Swig_var_ALGO_MINHASH_set(PyObject *) {
+  SWIG_Error(SWIG_AttributeError,"Variable ALGO_MINHASH is read-only.");
+  return 1;
+}
+
+
+SWIGINTERN PyObject *Swig_var_ALGO_MINHASH_get(void) {
+  PyObject *pyobj = 0;
+  
+  pyobj = SWIG_From_int(static_cast< int >(ALGO_MINHASH));
+  return pyobj;
+}
+
+
+SWIGINTERN int Swig_var_ALGO_SGF_COMPRESSED_set(PyObject *) {
+  SWIG_Error(SWIG_AttributeError,"Variable ALGO_SGF_COMPRESSED is read-only.");
+  return 1;
+}
+
+
+SWIGINTERN PyObject *Swig_var_ALGO_SGF_COMPRESSED_get(void) {
+  PyObject *pyobj = 0;
+  
+  pyobj = SWIG_From_int(static_cast< int >(ALGO_SGF_COMPRESSED));
+  return pyobj;
+}
+
+
 SWIGINTERN int Swig_var_algo_finalpos_set(PyObject *) {
   SWIG_Error(SWIG_AttributeError,"Variable algo_finalpos is read-only.");
   return 1;
@@ -20774,6 +20839,20 @@ SWIGINTERN PyObject *Swig_var_algo_hash_side_get(void) {
 }
 
 
+SWIGINTERN int Swig_var_algo_minhash_set(PyObject *) {
+  SWIG_Error(SWIG_AttributeError,"Variable algo_minhash is read-only.");
+  return 1;
+}
+
+
+SWIGINTERN PyObject *Swig_var_algo_minhash_get(void) {
+  PyObject *pyobj = 0;
+  
+  pyobj = SWIG_From_int(static_cast< int >(algo_minhash));
+  return pyobj;
+}
+
+
 SWIGINTERN int Swig_var_DATE_PROFILE_START_set(PyObject *) {
   SWIG_Error(SWIG_AttributeError,"Variable DATE_PROFILE_START is read-only.");
   return 1;
@@ -25974,6 +26053,108 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_ProcessOptions_algo_hash_side_maxNumStones_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProcessOptions *arg1 = (ProcessOptions *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProcessOptions_algo_hash_side_maxNumStones_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProcessOptions, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProcessOptions_algo_hash_side_maxNumStones_set" "', argument " "1"" of type '" "ProcessOptions *""'"); 
+  }
+  arg1 = reinterpret_cast< ProcessOptions * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ProcessOptions_algo_hash_side_maxNumStones_set" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  if (arg1) (arg1)->algo_hash_side_maxNumStones = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProcessOptions_algo_hash_side_maxNumStones_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProcessOptions *arg1 = (ProcessOptions *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:ProcessOptions_algo_hash_side_maxNumStones_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProcessOptions, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProcessOptions_algo_hash_side_maxNumStones_get" "', argument " "1"" of type '" "ProcessOptions *""'"); 
+  }
+  arg1 = reinterpret_cast< ProcessOptions * >(argp1);
+  result = (int) ((arg1)->algo_hash_side_maxNumStones);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+SWIGINTERN PyObject *_wrap_ProcessOptions_algo_hash_center_maxNumStones_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProcessOptions *arg1 = (ProcessOptions *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:ProcessOptions_algo_hash_center_maxNumStones_set",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProcessOptions, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProcessOptions_algo_hash_center_maxNumStones_set" "', argument " "1"" of type '" "ProcessOptions *""'"); 
+  }
+  arg1 = reinterpret_cast< ProcessOptions * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "ProcessOptions_algo_hash_center_maxNumStones_set" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  if (arg1) (arg1)->algo_hash_center_maxNumStones = arg2;
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_ProcessOptions_algo_hash_center_maxNumStones_get(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  ProcessOptions *arg1 = (ProcessOptions *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:ProcessOptions_algo_hash_center_maxNumStones_get",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_ProcessOptions, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "ProcessOptions_algo_hash_center_maxNumStones_get" "', argument " "1"" of type '" "ProcessOptions *""'"); 
+  }
+  arg1 = reinterpret_cast< ProcessOptions * >(argp1);
+  result = (int) ((arg1)->algo_hash_center_maxNumStones);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
 SWIGINTERN PyObject *_wrap_ProcessOptions_professional_tag_set(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   ProcessOptions *arg1 = (ProcessOptions *) 0 ;
@@ -27133,6 +27314,20 @@ SWIGINTERN PyObject *Swig_var_OMIT_GAMES_WITH_SGF_ERRORS_get(void) {
 }
 
 
+SWIGINTERN int Swig_var_USE_DUPLICATE_INDEX_set(PyObject *) {
+  SWIG_Error(SWIG_AttributeError,"Variable USE_DUPLICATE_INDEX is read-only.");
+  return 1;
+}
+
+
+SWIGINTERN PyObject *Swig_var_USE_DUPLICATE_INDEX_get(void) {
+  PyObject *pyobj = 0;
+  
+  pyobj = SWIG_From_int(static_cast< int >(USE_DUPLICATE_INDEX));
+  return pyobj;
+}
+
+
 SWIGINTERN int Swig_var_UNACCEPTABLE_BOARDSIZE_set(PyObject *) {
   SWIG_Error(SWIG_AttributeError,"Variable UNACCEPTABLE_BOARDSIZE is read-only.");
   return 1;
@@ -29677,6 +29872,110 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_delete_games(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  std::vector< int,std::allocator< int > > arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_delete_games",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_delete_games" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  {
+    std::vector< int,std::allocator< int > > *ptr = (std::vector< int,std::allocator< int > > *)0;
+    int res = swig::asptr(obj1, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "GameList_delete_games" "', argument " "2"" of type '" "std::vector< int,std::allocator< int > >""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  try {
+    (arg1)->delete_games(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_merge(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  GameList *arg2 = 0 ;
+  std::vector< GameList *,std::allocator< GameList * > > arg3 ;
+  int arg4 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  void *argp3 ;
+  int res3 = 0 ;
+  int val4 ;
+  int ecode4 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:GameList_merge",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_merge" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_GameList,  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "GameList_merge" "', argument " "2"" of type '" "GameList &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_merge" "', argument " "2"" of type '" "GameList &""'"); 
+  }
+  arg2 = reinterpret_cast< GameList * >(argp2);
+  {
+    res3 = SWIG_ConvertPtr(obj2, &argp3, SWIGTYPE_p_std__vectorT_GameList_p_std__allocatorT_GameList_p_t_t,  0  | 0);
+    if (!SWIG_IsOK(res3)) {
+      SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "GameList_merge" "', argument " "3"" of type '" "std::vector< GameList *,std::allocator< GameList * > >""'"); 
+    }  
+    if (!argp3) {
+      SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_merge" "', argument " "3"" of type '" "std::vector< GameList *,std::allocator< GameList * > >""'");
+    } else {
+      std::vector< GameList *,std::allocator< GameList * > > * temp = reinterpret_cast< std::vector< GameList *,std::allocator< GameList * > > * >(argp3);
+      arg3 = *temp;
+      if (SWIG_IsNewObj(res3)) delete temp;
+    }
+  }
+  ecode4 = SWIG_AsVal_int(obj3, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "GameList_merge" "', argument " "4"" of type '" "int""'");
+  } 
+  arg4 = static_cast< int >(val4);
+  try {
+    result = (int)(arg1)->merge(*arg2,arg3,arg4);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_search__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -29712,7 +30011,11 @@ SWIGINTERN PyObject *_wrap_GameList_search__SWIG_0(PyObject *SWIGUNUSEDPARM(self
   }
   arg3 = reinterpret_cast< SearchOptions * >(argp3);
   try {
-    (arg1)->search(*arg2,arg3);
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      (arg1)->search(*arg2,arg3);
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
   }
   catch(DBError &_e) {
     SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
@@ -29751,7 +30054,11 @@ SWIGINTERN PyObject *_wrap_GameList_search__SWIG_1(PyObject *SWIGUNUSEDPARM(self
   }
   arg2 = reinterpret_cast< Pattern * >(argp2);
   try {
-    (arg1)->search(*arg2);
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      (arg1)->search(*arg2);
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
   }
   catch(DBError &_e) {
     SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
@@ -29786,7 +30093,494 @@ SWIGINTERN PyObject *_wrap_GameList_search(PyObject *self, PyObject *args) {
       int res = SWIG_ConvertPtr(argv[1], &vptr, SWIGTYPE_p_Pattern, 0);
       _v = SWIG_CheckState(res);
       if (_v) {
-        return _wrap_GameList_search__SWIG_1(self, args);
+        return _wrap_GameList_search__SWIG_1(self, args);
+      }
+    }
+  }
+  if (argc == 3) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_GameList, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      void *vptr = 0;
+      int res = SWIG_ConvertPtr(argv[1], &vptr, SWIGTYPE_p_Pattern, 0);
+      _v = SWIG_CheckState(res);
+      if (_v) {
+        void *vptr = 0;
+        int res = SWIG_ConvertPtr(argv[2], &vptr, SWIGTYPE_p_SearchOptions, 0);
+        _v = SWIG_CheckState(res);
+        if (_v) {
+          return _wrap_GameList_search__SWIG_0(self, args);
+        }
+      }
+    }
+  }
+  
+fail:
+  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'GameList_search'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    GameList::search(Pattern &,SearchOptions *)\n"
+    "    GameList::search(Pattern &)\n");
+  return 0;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_lookupLabel(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  char arg2 ;
+  char arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  char val2 ;
+  int ecode2 = 0 ;
+  char val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  char result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_lookupLabel",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_lookupLabel" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_char(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_lookupLabel" "', argument " "2"" of type '" "char""'");
+  } 
+  arg2 = static_cast< char >(val2);
+  ecode3 = SWIG_AsVal_char(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_lookupLabel" "', argument " "3"" of type '" "char""'");
+  } 
+  arg3 = static_cast< char >(val3);
+  result = (char)(arg1)->lookupLabel(arg2,arg3);
+  resultobj = SWIG_From_char(static_cast< char >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_setLabel(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  char arg2 ;
+  char arg3 ;
+  char arg4 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  char val2 ;
+  int ecode2 = 0 ;
+  char val3 ;
+  int ecode3 = 0 ;
+  char val4 ;
+  int ecode4 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  PyObject * obj3 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOOO:GameList_setLabel",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_setLabel" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_char(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_setLabel" "', argument " "2"" of type '" "char""'");
+  } 
+  arg2 = static_cast< char >(val2);
+  ecode3 = SWIG_AsVal_char(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_setLabel" "', argument " "3"" of type '" "char""'");
+  } 
+  arg3 = static_cast< char >(val3);
+  ecode4 = SWIG_AsVal_char(obj3, &val4);
+  if (!SWIG_IsOK(ecode4)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "GameList_setLabel" "', argument " "4"" of type '" "char""'");
+  } 
+  arg4 = static_cast< char >(val4);
+  (arg1)->setLabel(arg2,arg3,arg4);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_lookupContinuation(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  char arg2 ;
+  char arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  char val2 ;
+  int ecode2 = 0 ;
+  char val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  SwigValueWrapper< Continuation > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_lookupContinuation",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_lookupContinuation" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_char(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_lookupContinuation" "', argument " "2"" of type '" "char""'");
+  } 
+  arg2 = static_cast< char >(val2);
+  ecode3 = SWIG_AsVal_char(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_lookupContinuation" "', argument " "3"" of type '" "char""'");
+  } 
+  arg3 = static_cast< char >(val3);
+  result = (arg1)->lookupContinuation(arg2,arg3);
+  resultobj = SWIG_NewPointerObj((new Continuation(static_cast< const Continuation& >(result))), SWIGTYPE_p_Continuation, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_numHits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_numHits",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_numHits" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  result = (int)(arg1)->numHits();
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_searchNC__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  Pattern *arg2 = 0 ;
+  SearchOptions *arg3 = (SearchOptions *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  std::vector< int > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_searchNC",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_searchNC" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_Pattern,  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "GameList_searchNC" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_searchNC" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  arg2 = reinterpret_cast< Pattern * >(argp2);
+  res3 = SWIG_ConvertPtr(obj2, &argp3,SWIGTYPE_p_SearchOptions, 0 |  0 );
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "GameList_searchNC" "', argument " "3"" of type '" "SearchOptions *""'"); 
+  }
+  arg3 = reinterpret_cast< SearchOptions * >(argp3);
+  try {
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      result = (arg1)->searchNC(*arg2,arg3);
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = swig::from(static_cast< std::vector< int,std::allocator< int > > >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_searchNC__SWIG_1(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  Pattern *arg2 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::vector< int > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_searchNC",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_searchNC" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_Pattern,  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "GameList_searchNC" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_searchNC" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  arg2 = reinterpret_cast< Pattern * >(argp2);
+  try {
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      result = (arg1)->searchNC(*arg2);
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = swig::from(static_cast< std::vector< int,std::allocator< int > > >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_searchNC(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[4] = {
+    0
+  };
+  Py_ssize_t ii;
+  
+  if (!PyTuple_Check(args)) SWIG_fail;
+  argc = args ? PyObject_Length(args) : 0;
+  for (ii = 0; (ii < 3) && (ii < argc); ii++) {
+    argv[ii] = PyTuple_GET_ITEM(args,ii);
+  }
+  if (argc == 2) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_GameList, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      void *vptr = 0;
+      int res = SWIG_ConvertPtr(argv[1], &vptr, SWIGTYPE_p_Pattern, 0);
+      _v = SWIG_CheckState(res);
+      if (_v) {
+        return _wrap_GameList_searchNC__SWIG_1(self, args);
+      }
+    }
+  }
+  if (argc == 3) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_GameList, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      void *vptr = 0;
+      int res = SWIG_ConvertPtr(argv[1], &vptr, SWIGTYPE_p_Pattern, 0);
+      _v = SWIG_CheckState(res);
+      if (_v) {
+        void *vptr = 0;
+        int res = SWIG_ConvertPtr(argv[2], &vptr, SWIGTYPE_p_SearchOptions, 0);
+        _v = SWIG_CheckState(res);
+        if (_v) {
+          return _wrap_GameList_searchNC__SWIG_0(self, args);
+        }
+      }
+    }
+  }
+  
+fail:
+  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'GameList_searchNC'.\n"
+    "  Possible C/C++ prototypes are:\n"
+    "    GameList::searchNC(Pattern &,SearchOptions *)\n"
+    "    GameList::searchNC(Pattern &)\n");
+  return 0;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_numContinuationsNC(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_numContinuationsNC",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_numContinuationsNC" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  result = (int)(arg1)->numContinuationsNC();
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_lookupContinuationNC(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  SwigValueWrapper< Continuation > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_lookupContinuationNC",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_lookupContinuationNC" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_lookupContinuationNC" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  result = (arg1)->lookupContinuationNC(arg2);
+  resultobj = SWIG_NewPointerObj((new Continuation(static_cast< const Continuation& >(result))), SWIGTYPE_p_Continuation, SWIG_POINTER_OWN |  0 );
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_batch_add__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  Pattern *arg2 = 0 ;
+  SearchOptions *arg3 = (SearchOptions *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  void *argp3 = 0 ;
+  int res3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_batch_add",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_batch_add" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_Pattern,  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "GameList_batch_add" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_batch_add" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  arg2 = reinterpret_cast< Pattern * >(argp2);
+  res3 = SWIG_ConvertPtr(obj2, &argp3,SWIGTYPE_p_SearchOptions, 0 |  0 );
+  if (!SWIG_IsOK(res3)) {
+    SWIG_exception_fail(SWIG_ArgError(res3), "in method '" "GameList_batch_add" "', argument " "3"" of type '" "SearchOptions *""'"); 
+  }
+  arg3 = reinterpret_cast< SearchOptions * >(argp3);
+  result = (int)(arg1)->batch_add(*arg2,arg3);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_batch_add__SWIG_1(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  Pattern *arg2 = 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  void *argp2 = 0 ;
+  int res2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_batch_add",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_batch_add" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  res2 = SWIG_ConvertPtr(obj1, &argp2, SWIGTYPE_p_Pattern,  0 );
+  if (!SWIG_IsOK(res2)) {
+    SWIG_exception_fail(SWIG_ArgError(res2), "in method '" "GameList_batch_add" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  if (!argp2) {
+    SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "GameList_batch_add" "', argument " "2"" of type '" "Pattern &""'"); 
+  }
+  arg2 = reinterpret_cast< Pattern * >(argp2);
+  result = (int)(arg1)->batch_add(*arg2);
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_batch_add(PyObject *self, PyObject *args) {
+  Py_ssize_t argc;
+  PyObject *argv[4] = {
+    0
+  };
+  Py_ssize_t ii;
+  
+  if (!PyTuple_Check(args)) SWIG_fail;
+  argc = args ? PyObject_Length(args) : 0;
+  for (ii = 0; (ii < 3) && (ii < argc); ii++) {
+    argv[ii] = PyTuple_GET_ITEM(args,ii);
+  }
+  if (argc == 2) {
+    int _v;
+    void *vptr = 0;
+    int res = SWIG_ConvertPtr(argv[0], &vptr, SWIGTYPE_p_GameList, 0);
+    _v = SWIG_CheckState(res);
+    if (_v) {
+      void *vptr = 0;
+      int res = SWIG_ConvertPtr(argv[1], &vptr, SWIGTYPE_p_Pattern, 0);
+      _v = SWIG_CheckState(res);
+      if (_v) {
+        return _wrap_GameList_batch_add__SWIG_1(self, args);
       }
     }
   }
@@ -29804,102 +30598,86 @@ SWIGINTERN PyObject *_wrap_GameList_search(PyObject *self, PyObject *args) {
         int res = SWIG_ConvertPtr(argv[2], &vptr, SWIGTYPE_p_SearchOptions, 0);
         _v = SWIG_CheckState(res);
         if (_v) {
-          return _wrap_GameList_search__SWIG_0(self, args);
+          return _wrap_GameList_batch_add__SWIG_0(self, args);
         }
       }
     }
   }
   
 fail:
-  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'GameList_search'.\n"
+  SWIG_SetErrorMsg(PyExc_NotImplementedError,"Wrong number or type of arguments for overloaded function 'GameList_batch_add'.\n"
     "  Possible C/C++ prototypes are:\n"
-    "    GameList::search(Pattern &,SearchOptions *)\n"
-    "    GameList::search(Pattern &)\n");
+    "    GameList::batch_add(Pattern &,SearchOptions *)\n"
+    "    GameList::batch_add(Pattern &)\n");
   return 0;
 }
 
 
-SWIGINTERN PyObject *_wrap_GameList_lookupLabel(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_GameList_batch_search(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
-  char arg2 ;
-  char arg3 ;
+  int arg2 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
-  char val2 ;
+  int val2 ;
   int ecode2 = 0 ;
-  char val3 ;
-  int ecode3 = 0 ;
   PyObject * obj0 = 0 ;
   PyObject * obj1 = 0 ;
-  PyObject * obj2 = 0 ;
-  char result;
+  bool result;
   
-  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_lookupLabel",&obj0,&obj1,&obj2)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_batch_search",&obj0,&obj1)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_lookupLabel" "', argument " "1"" of type '" "GameList *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_batch_search" "', argument " "1"" of type '" "GameList *""'"); 
   }
   arg1 = reinterpret_cast< GameList * >(argp1);
-  ecode2 = SWIG_AsVal_char(obj1, &val2);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
   if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_lookupLabel" "', argument " "2"" of type '" "char""'");
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_batch_search" "', argument " "2"" of type '" "int""'");
   } 
-  arg2 = static_cast< char >(val2);
-  ecode3 = SWIG_AsVal_char(obj2, &val3);
-  if (!SWIG_IsOK(ecode3)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_lookupLabel" "', argument " "3"" of type '" "char""'");
-  } 
-  arg3 = static_cast< char >(val3);
-  result = (char)(arg1)->lookupLabel(arg2,arg3);
-  resultobj = SWIG_From_char(static_cast< char >(result));
+  arg2 = static_cast< int >(val2);
+  try {
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      result = (bool)(arg1)->batch_search(arg2);
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_bool(static_cast< bool >(result));
   return resultobj;
 fail:
   return NULL;
 }
 
 
-SWIGINTERN PyObject *_wrap_GameList_setLabel(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_GameList_batch_prefilter(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
-  char arg2 ;
-  char arg3 ;
-  char arg4 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
-  char val2 ;
-  int ecode2 = 0 ;
-  char val3 ;
-  int ecode3 = 0 ;
-  char val4 ;
-  int ecode4 = 0 ;
   PyObject * obj0 = 0 ;
-  PyObject * obj1 = 0 ;
-  PyObject * obj2 = 0 ;
-  PyObject * obj3 = 0 ;
   
-  if (!PyArg_ParseTuple(args,(char *)"OOOO:GameList_setLabel",&obj0,&obj1,&obj2,&obj3)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_batch_prefilter",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_setLabel" "', argument " "1"" of type '" "GameList *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_batch_prefilter" "', argument " "1"" of type '" "GameList *""'"); 
   }
   arg1 = reinterpret_cast< GameList * >(argp1);
-  ecode2 = SWIG_AsVal_char(obj1, &val2);
-  if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_setLabel" "', argument " "2"" of type '" "char""'");
-  } 
-  arg2 = static_cast< char >(val2);
-  ecode3 = SWIG_AsVal_char(obj2, &val3);
-  if (!SWIG_IsOK(ecode3)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_setLabel" "', argument " "3"" of type '" "char""'");
-  } 
-  arg3 = static_cast< char >(val3);
-  ecode4 = SWIG_AsVal_char(obj3, &val4);
-  if (!SWIG_IsOK(ecode4)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode4), "in method '" "GameList_setLabel" "', argument " "4"" of type '" "char""'");
-  } 
-  arg4 = static_cast< char >(val4);
-  (arg1)->setLabel(arg2,arg3,arg4);
+  try {
+    {
+      SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+      (arg1)->batch_prefilter();
+      SWIG_PYTHON_THREAD_END_ALLOW;
+    }
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
   resultobj = SWIG_Py_Void();
   return resultobj;
 fail:
@@ -29907,62 +30685,43 @@ fail:
 }
 
 
-SWIGINTERN PyObject *_wrap_GameList_lookupContinuation(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_GameList_batch_clear(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
-  char arg2 ;
-  char arg3 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
-  char val2 ;
-  int ecode2 = 0 ;
-  char val3 ;
-  int ecode3 = 0 ;
   PyObject * obj0 = 0 ;
-  PyObject * obj1 = 0 ;
-  PyObject * obj2 = 0 ;
-  SwigValueWrapper< Continuation > result;
   
-  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_lookupContinuation",&obj0,&obj1,&obj2)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_batch_clear",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_lookupContinuation" "', argument " "1"" of type '" "GameList *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_batch_clear" "', argument " "1"" of type '" "GameList *""'"); 
   }
   arg1 = reinterpret_cast< GameList * >(argp1);
-  ecode2 = SWIG_AsVal_char(obj1, &val2);
-  if (!SWIG_IsOK(ecode2)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_lookupContinuation" "', argument " "2"" of type '" "char""'");
-  } 
-  arg2 = static_cast< char >(val2);
-  ecode3 = SWIG_AsVal_char(obj2, &val3);
-  if (!SWIG_IsOK(ecode3)) {
-    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_lookupContinuation" "', argument " "3"" of type '" "char""'");
-  } 
-  arg3 = static_cast< char >(val3);
-  result = (arg1)->lookupContinuation(arg2,arg3);
-  resultobj = SWIG_NewPointerObj((new Continuation(static_cast< const Continuation& >(result))), SWIGTYPE_p_Continuation, SWIG_POINTER_OWN |  0 );
+  (arg1)->batch_clear();
+  resultobj = SWIG_Py_Void();
   return resultobj;
 fail:
   return NULL;
 }
 
 
-SWIGINTERN PyObject *_wrap_GameList_numHits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+SWIGINTERN PyObject *_wrap_GameList_search_interrupted(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
   void *argp1 = 0 ;
   int res1 = 0 ;
   PyObject * obj0 = 0 ;
-  int result;
+  bool result;
   
-  if (!PyArg_ParseTuple(args,(char *)"O:GameList_numHits",&obj0)) SWIG_fail;
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_search_interrupted",&obj0)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
   if (!SWIG_IsOK(res1)) {
-    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_numHits" "', argument " "1"" of type '" "GameList *""'"); 
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_search_interrupted" "', argument " "1"" of type '" "GameList *""'"); 
   }
   arg1 = reinterpret_cast< GameList * >(argp1);
-  result = (int)(arg1)->numHits();
-  resultobj = SWIG_From_int(static_cast< int >(result));
+  result = (bool)(arg1)->search_interrupted();
+  resultobj = SWIG_From_bool(static_cast< bool >(result));
   return resultobj;
 fail:
   return NULL;
@@ -30990,6 +31749,163 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_setTags(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_setTags",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_setTags" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_setTags" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    (arg1)->setTags(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_deleteTags(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_deleteTags",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_deleteTags" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_deleteTags" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    (arg1)->deleteTags(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_setTagsBySignature(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  std::vector< std::string,std::allocator< std::string > > arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_setTagsBySignature",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_setTagsBySignature" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_setTagsBySignature" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  {
+    std::vector< std::string,std::allocator< std::string > > *ptr = (std::vector< std::string,std::allocator< std::string > > *)0;
+    int res = swig::asptr(obj2, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "GameList_setTagsBySignature" "', argument " "3"" of type '" "std::vector< std::string,std::allocator< std::string > >""'"); 
+    }
+    arg3 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  try {
+    result = (int)(arg1)->setTagsBySignature(arg2,arg3);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_tagBits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::string result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_tagBits",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_tagBits" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_tagBits" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    result = (arg1)->tagBits(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_getTags__SWIG_0(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -31373,6 +32289,42 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_retain_snapshot(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_retain_snapshot",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_retain_snapshot" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_retain_snapshot" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    (arg1)->retain_snapshot(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_delete_snapshot(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -31383,6 +32335,7 @@ SWIGINTERN PyObject *_wrap_GameList_delete_snapshot(PyObject *SWIGUNUSEDPARM(sel
   int ecode2 = 0 ;
   PyObject * obj0 = 0 ;
   PyObject * obj1 = 0 ;
+  int result;
   
   if (!PyArg_ParseTuple(args,(char *)"OO:GameList_delete_snapshot",&obj0,&obj1)) SWIG_fail;
   res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
@@ -31396,13 +32349,13 @@ SWIGINTERN PyObject *_wrap_GameList_delete_snapshot(PyObject *SWIGUNUSEDPARM(sel
   } 
   arg2 = static_cast< int >(val2);
   try {
-    (arg1)->delete_snapshot(arg2);
+    result = (int)(arg1)->delete_snapshot(arg2);
   }
   catch(DBError &_e) {
     SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
   }
   
-  resultobj = SWIG_Py_Void();
+  resultobj = SWIG_From_int(static_cast< int >(result));
   return resultobj;
 fail:
   return NULL;
@@ -31436,6 +32389,178 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_snapshot_size(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_snapshot_size",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_snapshot_size" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_snapshot_size" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    result = (int)(arg1)->snapshot_size(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_snapshots_memory(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  size_t result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_snapshots_memory",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_snapshots_memory" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  result = (arg1)->snapshots_memory();
+  resultobj = SWIG_From_size_t(static_cast< size_t >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_num_snapshots(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_num_snapshots",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_num_snapshots" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  result = (arg1)->num_snapshots();
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_currentBits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  std::string result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:GameList_currentBits",&obj0)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_currentBits" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  result = (arg1)->currentBits();
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_snapshotBits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::string result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_snapshotBits",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_snapshotBits" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_snapshotBits" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    result = (arg1)->snapshotBits(arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_GameList_setCurrentBits(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  std::string arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_setCurrentBits",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_setCurrentBits" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  {
+    std::string *ptr = (std::string *)0;
+    int res = SWIG_AsPtr_std_string(obj1, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "GameList_setCurrentBits" "', argument " "2"" of type '" "std::string""'"); 
+    }
+    arg2 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  (arg1)->setCurrentBits(arg2);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_reset(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -32006,6 +33131,37 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_currentEntriesField(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::vector< std::string,std::allocator< std::string > > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:GameList_currentEntriesField",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_currentEntriesField" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_currentEntriesField" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  result = (arg1)->currentEntriesField(arg2);
+  resultobj = swig::from(static_cast< std::vector< std::string,std::allocator< std::string > > >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_getSGF(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -32091,6 +33247,54 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_getGameProperty(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  std::string arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  std::string result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_getGameProperty",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_getGameProperty" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "GameList_getGameProperty" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  {
+    std::string *ptr = (std::string *)0;
+    int res = SWIG_AsPtr_std_string(obj2, &ptr);
+    if (!SWIG_IsOK(res) || !ptr) {
+      SWIG_exception_fail(SWIG_ArgError((ptr ? res : SWIG_TypeError)), "in method '" "GameList_getGameProperty" "', argument " "3"" of type '" "std::string""'"); 
+    }
+    arg3 = *ptr;
+    if (SWIG_IsNewObj(res)) delete ptr;
+  }
+  try {
+    result = (arg1)->getGameProperty(arg2,arg3);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_From_std_string(static_cast< std::string >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *_wrap_GameList_plSize(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *resultobj = 0;
   GameList *arg1 = (GameList *) 0 ;
@@ -32144,6 +33348,39 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_GameList_set_progress_callback(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  PyObject *arg2 = (PyObject *) 0 ;
+  int arg3 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val3 ;
+  int ecode3 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  PyObject * obj2 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OOO:GameList_set_progress_callback",&obj0,&obj1,&obj2)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "GameList_set_progress_callback" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  arg2 = obj1;
+  ecode3 = SWIG_AsVal_int(obj2, &val3);
+  if (!SWIG_IsOK(ecode3)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode3), "in method '" "GameList_set_progress_callback" "', argument " "3"" of type '" "int""'");
+  } 
+  arg3 = static_cast< int >(val3);
+  GameList_set_progress_callback(arg1,arg2,arg3);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN PyObject *GameList_swigregister(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
   PyObject *obj;
   if (!PyArg_ParseTuple(args,(char*)"O:swigregister", &obj)) return NULL;
@@ -32333,6 +33570,171 @@ fail:
 }
 
 
+SWIGINTERN PyObject *_wrap_find_near_duplicates(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  std::vector< GameList *,std::allocator< GameList * > > arg1 ;
+  double arg2 ;
+  void *argp1 ;
+  int res1 = 0 ;
+  double val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::vector< int,std::allocator< int > > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:find_near_duplicates",&obj0,&obj1)) SWIG_fail;
+  {
+    res1 = SWIG_ConvertPtr(obj0, &argp1, SWIGTYPE_p_std__vectorT_GameList_p_std__allocatorT_GameList_p_t_t,  0  | 0);
+    if (!SWIG_IsOK(res1)) {
+      SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "find_near_duplicates" "', argument " "1"" of type '" "std::vector< GameList *,std::allocator< GameList * > >""'"); 
+    }  
+    if (!argp1) {
+      SWIG_exception_fail(SWIG_ValueError, "invalid null reference " "in method '" "find_near_duplicates" "', argument " "1"" of type '" "std::vector< GameList *,std::allocator< GameList * > >""'");
+    } else {
+      std::vector< GameList *,std::allocator< GameList * > > * temp = reinterpret_cast< std::vector< GameList *,std::allocator< GameList * > > * >(argp1);
+      arg1 = *temp;
+      if (SWIG_IsNewObj(res1)) delete temp;
+    }
+  }
+  ecode2 = SWIG_AsVal_double(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "find_near_duplicates" "', argument " "2"" of type '" "double""'");
+  } 
+  arg2 = static_cast< double >(val2);
+  result = find_near_duplicates(arg1,arg2);
+  resultobj = swig::from(static_cast< std::vector< int,std::allocator< int > > >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_duplicate_index_reset(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  
+  if (!PyArg_ParseTuple(args,(char *)":duplicate_index_reset")) SWIG_fail;
+  duplicate_index_reset();
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_duplicate_index_add(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  GameList *arg1 = (GameList *) 0 ;
+  int arg2 ;
+  void *argp1 = 0 ;
+  int res1 = 0 ;
+  int val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:duplicate_index_add",&obj0,&obj1)) SWIG_fail;
+  res1 = SWIG_ConvertPtr(obj0, &argp1,SWIGTYPE_p_GameList, 0 |  0 );
+  if (!SWIG_IsOK(res1)) {
+    SWIG_exception_fail(SWIG_ArgError(res1), "in method '" "duplicate_index_add" "', argument " "1"" of type '" "GameList *""'"); 
+  }
+  arg1 = reinterpret_cast< GameList * >(argp1);
+  ecode2 = SWIG_AsVal_int(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "duplicate_index_add" "', argument " "2"" of type '" "int""'");
+  } 
+  arg2 = static_cast< int >(val2);
+  try {
+    duplicate_index_add(arg1,arg2);
+  }
+  catch(DBError &_e) {
+    SWIG_Python_Raise(SWIG_NewPointerObj((new DBError(static_cast< const DBError& >(_e))),SWIGTYPE_p_DBError,SWIG_POINTER_OWN), "DBError", SWIGTYPE_p_DBError); SWIG_fail;
+  }
+  
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_duplicate_index_size(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  int result;
+  
+  if (!PyArg_ParseTuple(args,(char *)":duplicate_index_size")) SWIG_fail;
+  result = (int)duplicate_index_size();
+  resultobj = SWIG_From_int(static_cast< int >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_duplicate_index_duplicates(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  bool arg1 ;
+  bool arg2 ;
+  bool val1 ;
+  int ecode1 = 0 ;
+  bool val2 ;
+  int ecode2 = 0 ;
+  PyObject * obj0 = 0 ;
+  PyObject * obj1 = 0 ;
+  std::map< std::string,std::vector< int,std::allocator< int > >,std::less< std::string >,std::allocator< std::pair< std::string const,std::vector< int,std::allocator< int > > > > > result;
+  
+  if (!PyArg_ParseTuple(args,(char *)"OO:duplicate_index_duplicates",&obj0,&obj1)) SWIG_fail;
+  ecode1 = SWIG_AsVal_bool(obj0, &val1);
+  if (!SWIG_IsOK(ecode1)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "duplicate_index_duplicates" "', argument " "1"" of type '" "bool""'");
+  } 
+  arg1 = static_cast< bool >(val1);
+  ecode2 = SWIG_AsVal_bool(obj1, &val2);
+  if (!SWIG_IsOK(ecode2)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode2), "in method '" "duplicate_index_duplicates" "', argument " "2"" of type '" "bool""'");
+  } 
+  arg2 = static_cast< bool >(val2);
+  result = duplicate_index_duplicates(arg1,arg2);
+  resultobj = swig::from(static_cast< std::map< std::string,std::vector< int,std::allocator< int > >,std::less< std::string >,std::allocator< std::pair< std::string const,std::vector< int,std::allocator< int > > > > > >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_set_mmap_loading(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  bool arg1 ;
+  bool val1 ;
+  int ecode1 = 0 ;
+  PyObject * obj0 = 0 ;
+  
+  if (!PyArg_ParseTuple(args,(char *)"O:set_mmap_loading",&obj0)) SWIG_fail;
+  ecode1 = SWIG_AsVal_bool(obj0, &val1);
+  if (!SWIG_IsOK(ecode1)) {
+    SWIG_exception_fail(SWIG_ArgError(ecode1), "in method '" "set_mmap_loading" "', argument " "1"" of type '" "bool""'");
+  } 
+  arg1 = static_cast< bool >(val1);
+  set_mmap_loading(arg1);
+  resultobj = SWIG_Py_Void();
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
+SWIGINTERN PyObject *_wrap_get_mmap_loading(PyObject *SWIGUNUSEDPARM(self), PyObject *args) {
+  PyObject *resultobj = 0;
+  bool result;
+  
+  if (!PyArg_ParseTuple(args,(char *)":get_mmap_loading")) SWIG_fail;
+  result = (bool)get_mmap_loading();
+  resultobj = SWIG_From_bool(static_cast< bool >(result));
+  return resultobj;
+fail:
+  return NULL;
+}
+
+
 SWIGINTERN int Swig_var_HANDI_TAG_set(PyObject *) {
   SWIG_Error(SWIG_AttributeError,"Variable HANDI_TAG is read-only.");
   return 1;
@@ -38554,6 +39956,10 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"ProcessOptions_algo_hash_full_maxNumStones_get", _wrap_ProcessOptions_algo_hash_full_maxNumStones_get, METH_VARARGS, NULL},
 	 { (char *)"ProcessOptions_algo_hash_corner_maxNumStones_set", _wrap_ProcessOptions_algo_hash_corner_maxNumStones_set, METH_VARARGS, NULL},
 	 { (char *)"ProcessOptions_algo_hash_corner_maxNumStones_get", _wrap_ProcessOptions_algo_hash_corner_maxNumStones_get, METH_VARARGS, NULL},
+	 { (char *)"ProcessOptions_algo_hash_side_maxNumStones_set", _wrap_ProcessOptions_algo_hash_side_maxNumStones_set, METH_VARARGS, NULL},
+	 { (char *)"ProcessOptions_algo_hash_side_maxNumStones_get", _wrap_ProcessOptions_algo_hash_side_maxNumStones_get, METH_VARARGS, NULL},
+	 { (char *)"ProcessOptions_algo_hash_center_maxNumStones_set", _wrap_ProcessOptions_algo_hash_center_maxNumStones_set, METH_VARARGS, NULL},
+	 { (char *)"ProcessOptions_algo_hash_center_maxNumStones_get", _wrap_ProcessOptions_algo_hash_center_maxNumStones_get, METH_VARARGS, NULL},
 	 { (char *)"ProcessOptions_professional_tag_set", _wrap_ProcessOptions_professional_tag_set, METH_VARARGS, NULL},
 	 { (char *)"ProcessOptions_professional_tag_get", _wrap_ProcessOptions_professional_tag_get, METH_VARARGS, NULL},
 	 { (char *)"ProcessOptions_asString", _wrap_ProcessOptions_asString, METH_VARARGS, NULL},
@@ -38643,11 +40049,21 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"GameList_process_results", _wrap_GameList_process_results, METH_VARARGS, NULL},
 	 { (char *)"GameList_start_processing", _wrap_GameList_start_processing, METH_VARARGS, NULL},
 	 { (char *)"GameList_finalize_processing", _wrap_GameList_finalize_processing, METH_VARARGS, NULL},
+	 { (char *)"GameList_delete_games", _wrap_GameList_delete_games, METH_VARARGS, NULL},
+	 { (char *)"GameList_merge", _wrap_GameList_merge, METH_VARARGS, NULL},
 	 { (char *)"GameList_search", _wrap_GameList_search, METH_VARARGS, NULL},
 	 { (char *)"GameList_lookupLabel", _wrap_GameList_lookupLabel, METH_VARARGS, NULL},
 	 { (char *)"GameList_setLabel", _wrap_GameList_setLabel, METH_VARARGS, NULL},
 	 { (char *)"GameList_lookupContinuation", _wrap_GameList_lookupContinuation, METH_VARARGS, NULL},
 	 { (char *)"GameList_numHits", _wrap_GameList_numHits, METH_VARARGS, NULL},
+	 { (char *)"GameList_searchNC", _wrap_GameList_searchNC, METH_VARARGS, NULL},
+	 { (char *)"GameList_numContinuationsNC", _wrap_GameList_numContinuationsNC, METH_VARARGS, NULL},
+	 { (char *)"GameList_batch_add", _wrap_GameList_batch_add, METH_VARARGS, NULL},
+	 { (char *)"GameList_batch_search", _wrap_GameList_batch_search, METH_VARARGS, NULL},
+	 { (char *)"GameList_batch_prefilter", _wrap_GameList_batch_prefilter, METH_VARARGS, NULL},
+	 { (char *)"GameList_batch_clear", _wrap_GameList_batch_clear, METH_VARARGS, NULL},
+	 { (char *)"GameList_lookupContinuationNC", _wrap_GameList_lookupContinuationNC, METH_VARARGS, NULL},
+	 { (char *)"GameList_search_interrupted", _wrap_GameList_search_interrupted, METH_VARARGS, NULL},
 	 { (char *)"GameList_sigsearch", _wrap_GameList_sigsearch, METH_VARARGS, NULL},
 	 { (char *)"GameList_sigsearchNC", _wrap_GameList_sigsearchNC, METH_VARARGS, NULL},
 	 { (char *)"GameList_getSignature", _wrap_GameList_getSignature, METH_VARARGS, NULL},
@@ -38659,13 +40075,24 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"GameList_setTagID", _wrap_GameList_setTagID, METH_VARARGS, NULL},
 	 { (char *)"GameList_getTagsID", _wrap_GameList_getTagsID, METH_VARARGS, NULL},
 	 { (char *)"GameList_deleteTag", _wrap_GameList_deleteTag, METH_VARARGS, NULL},
+	 { (char *)"GameList_setTags", _wrap_GameList_setTags, METH_VARARGS, NULL},
+	 { (char *)"GameList_deleteTags", _wrap_GameList_deleteTags, METH_VARARGS, NULL},
+	 { (char *)"GameList_setTagsBySignature", _wrap_GameList_setTagsBySignature, METH_VARARGS, NULL},
+	 { (char *)"GameList_tagBits", _wrap_GameList_tagBits, METH_VARARGS, NULL},
 	 { (char *)"GameList_getTags", _wrap_GameList_getTags, METH_VARARGS, NULL},
 	 { (char *)"GameList_export_tags", _wrap_GameList_export_tags, METH_VARARGS, NULL},
 	 { (char *)"GameList_import_tags", _wrap_GameList_import_tags, METH_VARARGS, NULL},
 	 { (char *)"GameList_snapshot", _wrap_GameList_snapshot, METH_VARARGS, NULL},
 	 { (char *)"GameList_restore", _wrap_GameList_restore, METH_VARARGS, NULL},
+	 { (char *)"GameList_retain_snapshot", _wrap_GameList_retain_snapshot, METH_VARARGS, NULL},
 	 { (char *)"GameList_delete_snapshot", _wrap_GameList_delete_snapshot, METH_VARARGS, NULL},
 	 { (char *)"GameList_delete_all_snapshots", _wrap_GameList_delete_all_snapshots, METH_VARARGS, NULL},
+	 { (char *)"GameList_snapshot_size", _wrap_GameList_snapshot_size, METH_VARARGS, NULL},
+	 { (char *)"GameList_snapshots_memory", _wrap_GameList_snapshots_memory, METH_VARARGS, NULL},
+	 { (char *)"GameList_num_snapshots", _wrap_GameList_num_snapshots, METH_VARARGS, NULL},
+	 { (char *)"GameList_currentBits", _wrap_GameList_currentBits, METH_VARARGS, NULL},
+	 { (char *)"GameList_snapshotBits", _wrap_GameList_snapshotBits, METH_VARARGS, NULL},
+	 { (char *)"GameList_setCurrentBits", _wrap_GameList_setCurrentBits, METH_VARARGS, NULL},
 	 { (char *)"GameList_reset", _wrap_GameList_reset, METH_VARARGS, NULL},
 	 { (char *)"GameList_resetFormat", _wrap_GameList_resetFormat, METH_VARARGS, NULL},
 	 { (char *)"GameList_size", _wrap_GameList_size, METH_VARARGS, NULL},
@@ -38677,12 +40104,22 @@ static PyMethodDef SwigMethods[] = {
 	 { (char *)"GameList_get_currentList_entry", _wrap_GameList_get_currentList_entry, METH_VARARGS, NULL},
 	 { (char *)"GameList_currentEntryAsString", _wrap_GameList_currentEntryAsString, METH_VARARGS, NULL},
 	 { (char *)"GameList_currentEntriesAsStrings", _wrap_GameList_currentEntriesAsStrings, METH_VARARGS, NULL},
+	 { (char *)"GameList_currentEntriesField", _wrap_GameList_currentEntriesField, METH_VARARGS, NULL},
 	 { (char *)"GameList_getSGF", _wrap_GameList_getSGF, METH_VARARGS, NULL},
 	 { (char *)"GameList_getCurrentProperty", _wrap_GameList_getCurrentProperty, METH_VARARGS, NULL},
+	 { (char *)"GameList_getGameProperty", _wrap_GameList_getGameProperty, METH_VARARGS, NULL},
 	 { (char *)"GameList_plSize", _wrap_GameList_plSize, METH_VARARGS, NULL},
 	 { (char *)"GameList_plEntry", _wrap_GameList_plEntry, METH_VARARGS, NULL},
+	 { (char *)"GameList_set_progress_callback", _wrap_GameList_set_progress_callback, METH_VARARGS, NULL},
 	 { (char *)"GameList_swigregister", GameList_swigregister, METH_VARARGS, NULL},
 	 { (char *)"find_duplicates", _wrap_find_duplicates, METH_VARARGS, NULL},
+	 { (char *)"find_near_duplicates", _wrap_find_near_duplicates, METH_VARARGS, NULL},
+	 { (char *)"duplicate_index_reset", _wrap_duplicate_index_reset, METH_VARARGS, NULL},
+	 { (char *)"duplicate_index_add", _wrap_duplicate_index_add, METH_VARARGS, NULL},
+	 { (char *)"duplicate_index_size", _wrap_duplicate_index_size, METH_VARARGS, NULL},
+	 { (char *)"duplicate_index_duplicates", _wrap_duplicate_index_duplicates, METH_VARARGS, NULL},
+	 { (char *)"set_mmap_loading", _wrap_set_mmap_loading, METH_VARARGS, NULL},
+	 { (char *)"get_mmap_loading", _wrap_get_mmap_loading, METH_VARARGS, NULL},
 	 { (char *)"vectorMNC_iterator", _wrap_vectorMNC_iterator, METH_VARARGS, NULL},
 	 { (char *)"vectorMNC___nonzero__", _wrap_vectorMNC___nonzero__, METH_VARARGS, NULL},
 	 { (char *)"vectorMNC___bool__", _wrap_vectorMNC___bool__, METH_VARARGS, NULL},
@@ -39739,6 +41176,7 @@ SWIG_init(void) {
   SwigPyBuiltin_AddPublicSymbol(public_interface, swig_const_table[i].name);
 #endif
   
+  SWIG_PYTHON_INITIALIZE_THREADS;
   SWIG_InstallConstants(d,swig_const_table);
   
   PyDict_SetItemString(md,(char*)"cvar", SWIG_globals());
@@ -39765,6 +41203,9 @@ SWIG_init(void) {
   SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_HASH_CORNER",Swig_var_ALGO_HASH_CORNER_get, Swig_var_ALGO_HASH_CORNER_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_HASH_CENTER",Swig_var_ALGO_HASH_CENTER_get, Swig_var_ALGO_HASH_CENTER_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_HASH_SIDE",Swig_var_ALGO_HASH_SIDE_get, Swig_var_ALGO_HASH_SIDE_set);
+  SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_FULLTEXT",Swig_var_ALGO_FULLTEXT_get, Swig_var_ALGO_FULLTEXT_set);
+  SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_MINHASH",Swig_var_ALGO_MINHASH_get, Swig_var_ALGO_MINHASH_set);
+  SWIG_addvarlink(SWIG_globals(),(char*)"ALGO_SGF_COMPRESSED",Swig_var_ALGO_SGF_COMPRESSED_get, Swig_var_ALGO_SGF_COMPRESSED_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_finalpos",Swig_var_algo_finalpos_get, Swig_var_algo_finalpos_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_movelist",Swig_var_algo_movelist_get, Swig_var_algo_movelist_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_hash_full",Swig_var_algo_hash_full_get, Swig_var_algo_hash_full_set);
@@ -39772,12 +41213,14 @@ SWIG_init(void) {
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_intervals",Swig_var_algo_intervals_get, Swig_var_algo_intervals_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_hash_center",Swig_var_algo_hash_center_get, Swig_var_algo_hash_center_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"algo_hash_side",Swig_var_algo_hash_side_get, Swig_var_algo_hash_side_set);
+  SWIG_addvarlink(SWIG_globals(),(char*)"algo_minhash",Swig_var_algo_minhash_get, Swig_var_algo_minhash_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"DATE_PROFILE_START",Swig_var_DATE_PROFILE_START_get, Swig_var_DATE_PROFILE_START_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"DATE_PROFILE_END",Swig_var_DATE_PROFILE_END_get, Swig_var_DATE_PROFILE_END_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"CHECK_FOR_DUPLICATES",Swig_var_CHECK_FOR_DUPLICATES_get, Swig_var_CHECK_FOR_DUPLICATES_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"CHECK_FOR_DUPLICATES_STRICT",Swig_var_CHECK_FOR_DUPLICATES_STRICT_get, Swig_var_CHECK_FOR_DUPLICATES_STRICT_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"OMIT_DUPLICATES",Swig_var_OMIT_DUPLICATES_get, Swig_var_OMIT_DUPLICATES_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"OMIT_GAMES_WITH_SGF_ERRORS",Swig_var_OMIT_GAMES_WITH_SGF_ERRORS_get, Swig_var_OMIT_GAMES_WITH_SGF_ERRORS_set);
+  SWIG_addvarlink(SWIG_globals(),(char*)"USE_DUPLICATE_INDEX",Swig_var_USE_DUPLICATE_INDEX_get, Swig_var_USE_DUPLICATE_INDEX_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"UNACCEPTABLE_BOARDSIZE",Swig_var_UNACCEPTABLE_BOARDSIZE_get, Swig_var_UNACCEPTABLE_BOARDSIZE_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"SGF_ERROR",Swig_var_SGF_ERROR_get, Swig_var_SGF_ERROR_set);
   SWIG_addvarlink(SWIG_globals(),(char*)"IS_DUPLICATE",Swig_var_IS_DUPLICATE_get, Swig_var_IS_DUPLICATE_set);
@@ -209,6 +209,50 @@ string SnapshotVector::retrieve_string() {
   return result;
 }
 
+
+DataReader::DataReader(const char* DATA, size_t SIZE) {
+  current = (const unsigned char*)DATA;
+  end = current + SIZE;
+}
+
+int DataReader::retrieve_int() {
+  int result = 0;
+  for(int i=0; i<4; i++) {
+    result += ((int)*current) << (i*8);
+    current++;
+  }
+  return result;
+}
+
+hashtype DataReader::retrieve_hashtype() {
+  hashtype result = 0;
+  for(int i=0; i<8; i++) {
+    result += ((hashtype)*current) << (i*8);
+    current++;
+  }
+  return result;
+}
+
+char* DataReader::retrieve_charp() {
+  int sz = retrieve_int();
+  char* result = new char[sz];
+  memcpy(result, current, sz);
+  current += sz;
+  return result;
+}
+
+char* DataReader::retrieve_charp_in_place() {
+  int sz = retrieve_int();
+  char* result = (char*)current;
+  current += sz;
+  return result;
+}
+
+bool DataReader::empty() {
+  return current >= end;
+}
+
+
 char* SnapshotVector::to_charp() {
   char* result = new char[size()];
   int counter = 0;
@@ -482,6 +526,17 @@ int Continuation::became_unpopular() {
 void Continuation::from_snv(SnapshotVector& snv) {
   x = snv.retrieve_int();
   y = snv.retrieve_int();
+  label = snv.retrieve_char();
+  dates_B.clear();
+  dates_W.clear();
+  for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) {
+    dates_B.push_back(0);
+    dates_W.push_back(0);
+  }
+  if (!snv.retrieve_char()) { // empty continuation
+    B = W = tB = tW = wB = lB = wW = lW = 0;
+    return;
+  }
   B = snv.retrieve_int();
   W = snv.retrieve_int();
   tB = snv.retrieve_int();
@@ -490,20 +545,28 @@ void Continuation::from_snv(SnapshotVector& snv) {
   lB = snv.retrieve_int();
   wW = snv.retrieve_int();
   lW = snv.retrieve_int();
-  label = snv.retrieve_char();
-  dates_B.clear();
-  dates_W.clear();
-  for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) {
-    dates_B.push_back(snv.retrieve_int());
+  // the date profiles are stored as lists of (year index, count) for the non-zero entries
+  int n = snv.retrieve_int();
+  for(int i=0; i < n; i++) {
+    int j = snv.retrieve_int();
+    dates_B[j] = snv.retrieve_int();
   }
-  for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) {
-    dates_W.push_back(snv.retrieve_int());
+  n = snv.retrieve_int();
+  for(int i=0; i < n; i++) {
+    int j = snv.retrieve_int();
+    dates_W[j] = snv.retrieve_int();
   }
 }
 
 void Continuation::to_snv(SnapshotVector& snv) {
   snv.pb_int(x);
   snv.pb_int(y);
+  snv.pb_char(label);
+  if (!B && !W && !tB && !tW && !wB && !lB && !wW && !lW) {
+    snv.pb_char(0);
+    return;
+  }
+  snv.pb_char(1);
   snv.pb_int(B);
   snv.pb_int(W);
   snv.pb_int(tB);
@@ -512,11 +575,20 @@ void Continuation::to_snv(SnapshotVector& snv) {
   snv.pb_int(lB);
   snv.pb_int(wW);
   snv.pb_int(lW);
-  snv.pb_char(label);
+  int n = 0;
+  for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) if (dates_B[i]) n++;
+  snv.pb_int(n);
   for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) {
+    if (!dates_B[i]) continue;
+    snv.pb_int(i);
     snv.pb_int(dates_B[i]);
   }
+  n = 0;
+  for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) if (dates_W[i]) n++;
+  snv.pb_int(n);
   for(int i=0; i < (DATE_PROFILE_END - DATE_PROFILE_START + 1); i++) {
+    if (!dates_W[i]) continue;
+    snv.pb_int(i);
     snv.pb_int(dates_W[i]);
   }
 }
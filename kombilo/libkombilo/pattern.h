@@ -65,6 +65,9 @@ const int ALGO_HASH_CORNER = 8;
 // const int ALGO_INTERVALS = 16;
 const int ALGO_HASH_CENTER = 32;
 const int ALGO_HASH_SIDE = 64;
+const int ALGO_FULLTEXT = 128; ///< full text index for game info searches (see GameList::finalize_processing)
+const int ALGO_MINHASH = 256; ///< MinHash sketches of the games for finding near duplicates (see find_near_duplicates)
+const int ALGO_SGF_COMPRESSED = 512; ///< store the SGF source compressed (see GameList::compress_sgf)
 
 const int algo_finalpos = 1;
 const int algo_movelist = 2;
@@ -73,11 +76,12 @@ const int algo_hash_corner = 4;
 const int algo_intervals = 5;
 const int algo_hash_center = 6;
 const int algo_hash_side = 7;
+const int algo_minhash = 8;
 
 /// \name date profile constants
 /**@{*/
 const int DATE_PROFILE_START = 1600;
-const int DATE_PROFILE_END = 2020;
+const int DATE_PROFILE_END = 2100;
 /**@}*/
 
 char* flipped_sig(int f, char* sig, int boardsize);
@@ -110,6 +114,23 @@ class SnapshotVector : public std::vector<unsigned char> {
     SnapshotVector::iterator current;
 };
 
+/// Read data in the format written by SnapshotVector directly from a memory
+/// region (e.g. a memory-mapped file).
+class DataReader {
+  public:
+    DataReader(const char* DATA, size_t SIZE);
+
+    int retrieve_int();
+    hashtype retrieve_hashtype();
+    char* retrieve_charp();          ///< returns a copy (to be deleted by the caller)
+    char* retrieve_charp_in_place(); ///< returns a pointer into the data, without copying
+    bool empty();
+
+  private:
+    const unsigned char* current;
+    const unsigned char* end;
+};
+
 
 class PatternError {
   public:
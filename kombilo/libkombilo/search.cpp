@@ -34,6 +34,15 @@
 #include <iostream>
 #include <fstream>
 #include <sstream>
+#include <cctype>
+#include <algorithm>
+#include <zlib.h>
+#ifndef _WIN32
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <fcntl.h>
+#include <unistd.h>
+#endif
 
 // FIXME check for security pbms (buffer overflow) in all places where a char[] of fixed length is used! (also in other files)
 
@@ -129,6 +138,8 @@ ProcessOptions::ProcessOptions() {
   algos = ALGO_FINALPOS | ALGO_MOVELIST | ALGO_HASH_FULL | ALGO_HASH_CORNER;
   algo_hash_full_maxNumStones = 50;
   algo_hash_corner_maxNumStones = 20;
+  algo_hash_side_maxNumStones = 12;
+  algo_hash_center_maxNumStones = 6;
   professional_tag = 0;
 }
 
@@ -153,6 +164,19 @@ ProcessOptions::ProcessOptions(string s) {
   p = pn;
   pn = s.find('|', p) + 1;
   algo_hash_corner_maxNumStones = atoi(s.substr(p, pn-p-1).c_str());
+
+  // databases created by earlier versions do not contain the values for side and center hashing
+  algo_hash_side_maxNumStones = 12;
+  algo_hash_center_maxNumStones = 6;
+  if (pn < (int)s.size() && isdigit(s[pn])) {
+    p = pn;
+    pn = s.find('|', p) + 1;
+    algo_hash_side_maxNumStones = atoi(s.substr(p, pn-p-1).c_str());
+
+    p = pn;
+    pn = s.find('|', p) + 1;
+    algo_hash_center_maxNumStones = atoi(s.substr(p, pn-p-1).c_str());
+  }
   
   rootNodeTags = s.substr(pn);
 }
@@ -165,8 +189,9 @@ string ProcessOptions::asString() {
   else result += "f";
 
   char buf[200];
-  sprintf(buf, "%d|%d|%d|%d|%s", professional_tag, algos, algo_hash_full_maxNumStones, algo_hash_corner_maxNumStones, rootNodeTags.c_str());
+  sprintf(buf, "%d|%d|%d|%d|%d|%d|", professional_tag, algos, algo_hash_full_maxNumStones, algo_hash_corner_maxNumStones, algo_hash_side_maxNumStones, algo_hash_center_maxNumStones);
   result += buf;
+  result += rootNodeTags;
   return result;
 }
 
@@ -245,6 +270,16 @@ void GameListEntry::hits_from_snv(SnapshotVector& snv) {
   }
 }
 
+// The index of date (12 * year + month - 1) in GameList::dates_all and
+// GameList::dates_current: the months from January of DATE_PROFILE_START to
+// December of DATE_PROFILE_END - 1, followed by one entry for all earlier
+// dates (including unknown dates) and one entry for all later dates.
+static int dateIndex(int date) {
+  if (date < DATE_PROFILE_START*12) return (DATE_PROFILE_END - DATE_PROFILE_START)*12;
+  if (date >= DATE_PROFILE_END*12) return (DATE_PROFILE_END - DATE_PROFILE_START)*12 + 1;
+  return date - DATE_PROFILE_START*12;
+}
+
 int insertEntry(void *gl, int argc, char **argv, char **azColName) {
   char winner = '-';
   if (argv[1] && (argv[1][0] == 'B' || argv[1][0] == 'W' || argv[1][0] == 'J')) winner = argv[1][0];
@@ -254,7 +289,9 @@ int insertEntry(void *gl, int argc, char **argv, char **azColName) {
   if (argv[2]) {
     // date is 12 * year + month - 1, where month in [1..12];
     // the string argv[2] has format YYYY-MM-DD.
-    date = ((int)argv[2][0] - (int)'0')*12000 + ((int)argv[2][1] - (int)'0')*1200 + ((int)argv[2][2] - (int)'0')*120 + ((int)argv[2][3] - (int)'0')*12 + ((int)argv[2][5] - (int)'0')*10 + ((int)argv[2][6] - (int)'0') - 1;
+    // Dates without a month (YYYY-00-00) count as January.
+    int month = ((int)argv[2][5] - (int)'0')*10 + ((int)argv[2][6] - (int)'0');
+    date = ((int)argv[2][0] - (int)'0')*12000 + ((int)argv[2][1] - (int)'0')*1200 + ((int)argv[2][2] - (int)'0')*120 + ((int)argv[2][3] - (int)'0')*12 + (month ? month - 1 : 0);
   }
 
   string gameInfoStr = ((GameList*)gl)->format2;
@@ -284,7 +321,7 @@ int insertEntry(void *gl, int argc, char **argv, char **azColName) {
 
   // printf("id %s\n", argv[0]);
   ((GameList*)gl)->all->push_back(new GameListEntry(atoi(argv[0]), winner, gameInfoStr, date));
-  if (date >= DATE_PROFILE_START*12) ((GameList*)gl)->dates_all[date - DATE_PROFILE_START*12]++; // January of year DATE_PROFILE_START is 0; everything before is ignored
+  ((GameList*)gl)->dates_all[dateIndex(date)]++;
   return 0;
 }
 
@@ -298,6 +335,8 @@ int dbinfo_callback(void *s, int argc, char **argv, char **asColName) {
   return 0;
 }
 
+void sgf_text_function(sqlite3_context* context, int argc, sqlite3_value** argv);
+
 void GameList::open_db() throw(DBError) {
   int rc = sqlite3_open(dbname, &db); 
   if (rc) {
@@ -313,6 +352,8 @@ void GameList::open_db() throw(DBError) {
   sprintf(cache_str, "pragma cache_size = %d", -db_cache_size);
   rc = sqlite3_exec(db, cache_str, 0, 0, 0);
   if (rc) throw DBError();
+  rc = sqlite3_create_function(db, "sgf_text", 1, SQLITE_UTF8, this, sgf_text_function, 0, 0);
+  if (rc) throw DBError();
 }
 
 GameList::GameList(const char* DBNAME, string ORDERBY, string FORMAT, ProcessOptions* p_options, int BOARDSIZE, int cache) throw(DBError) {
@@ -324,6 +365,18 @@ GameList::GameList(const char* DBNAME, string ORDERBY, string FORMAT, ProcessOpt
   strcpy(dbname, DBNAME);
   db = 0;
   db_cache_size = cache;
+  da_map = 0;
+  da_map_size = 0;
+  dupl_index_db = -1;
+  dupl_index_generation = -1;
+  snapshot_counter = 0;
+  progress_fn = 0;
+  progress_data = 0;
+  progress_interval = 1000;
+  batch_index = -1;
+  batch_interrupted = false;
+  interrupted = false;
+  gis_done = 0;
 
   // try to retrieve basic options from database
   open_db();
@@ -336,7 +389,8 @@ GameList::GameList(const char* DBNAME, string ORDERBY, string FORMAT, ProcessOpt
   rc = sqlite3_exec(db, "select * from db_info where rowid = 1;", dbinfo_callback, &dbinfo, 0);
   if (rc != SQLITE_OK) throw DBError();
   if (dbinfo) {
-    if (strcmp(dbinfo, "kombilo 0.7") && strcmp(dbinfo, "kombilo 0.8")) throw DBError();
+    // kombilo 0.9 marks databases with compressed SGF sources, which earlier versions cannot read
+    if (strcmp(dbinfo, "kombilo 0.7") && strcmp(dbinfo, "kombilo 0.8") && strcmp(dbinfo, "kombilo 0.9")) throw DBError();
     delete [] dbinfo;
   }
 
@@ -354,19 +408,29 @@ GameList::GameList(const char* DBNAME, string ORDERBY, string FORMAT, ProcessOpt
       boardsize = atoi(bsizes);
       delete [] bsizes;
     }
+    if (p_op->algos & ALGO_SGF_COMPRESSED) {
+      // the dictionary is a blob, so it cannot be read by dbinfo_callback
+      sqlite3_stmt *ppStmt=0;
+      rc = sqlite3_prepare_v2(db, "select info from db_info where rowid = 4;", -1, &ppStmt, 0);
+      if (rc != SQLITE_OK || ppStmt==0) throw DBError();
+      if (sqlite3_step(ppStmt) == SQLITE_ROW)
+        sgf_dictionary = string((const char*)sqlite3_column_blob(ppStmt, 0), sqlite3_column_bytes(ppStmt, 0));
+      sqlite3_finalize(ppStmt);
+    }
     addAlgos(0);
   } else { // if this does not work: create database and read p_options (or use defaults)
     // printf("retrieving dbinfo failed\n");
 
-    // write version information to db_info
-    rc = sqlite3_exec(db, "insert into db_info (rowid,info) values (1,'kombilo 0.8')", 0, 0, 0);
-
     if (p_options == 0) p_op = new ProcessOptions(); // use default values
     else {
       // printf("use p_options\n");
       p_op = new ProcessOptions(*p_options);
       p_op->validate(); // make sure the most important information is contained in rootNodeTags list
     }
+
+    // write version information to db_info
+    if (p_op->algos & ALGO_SGF_COMPRESSED) rc = sqlite3_exec(db, "insert into db_info (rowid,info) values (1,'kombilo 0.9')", 0, 0, 0);
+    else rc = sqlite3_exec(db, "insert into db_info (rowid,info) values (1,'kombilo 0.8')", 0, 0, 0);
     string sql = "insert into db_info (rowid,info) values (2,'";
     sql += p_op->asString();
     sql += "');";
@@ -383,12 +447,8 @@ GameList::GameList(const char* DBNAME, string ORDERBY, string FORMAT, ProcessOpt
     addAlgos(1);
   }
 
-  // set up snapshot db
-  rc = sqlite3_exec(db, "create table if not exists snapshots ( data text );", 0, 0, 0);
-  if (rc != SQLITE_OK) throw DBError();
-
   all = 0;
-  for(int i = 0; i < (DATE_PROFILE_END - DATE_PROFILE_START)*12; i++) dates_all.push_back(0);
+  for(int i = 0; i < (DATE_PROFILE_END - DATE_PROFILE_START)*12 + 2; i++) dates_all.push_back(0);
   for(int i = 0; i < DATE_PROFILE_END - DATE_PROFILE_START + 1; i++) dates_all_per_year.push_back(0);
   currentList = oldList = 0;
   resetFormat(ORDERBY, FORMAT);
@@ -442,6 +502,38 @@ void GameList::resetFormat(string ORDERBY, string FORMAT) {
 }
 
 
+// The duplicate index, see duplicate_index_add. Registrations of GameList
+// instances are valid only for the generation of the index in which they were
+// made.
+struct DuplicateIndexEntry {
+  hashtype fphash;
+  int db_id;
+  int game_id;
+  DuplicateIndexEntry(hashtype FPHASH, int DB_ID, int GAME_ID) : fphash(FPHASH), db_id(DB_ID), game_id(GAME_ID) {}
+};
+
+typedef boost::unordered_multimap<string, DuplicateIndexEntry> DuplicateIndexMap;
+static DuplicateIndexMap duplicate_index;
+static int duplicate_index_generation = 0;
+static int duplicate_index_num_dbs = 0;
+
+static bool duplicate_index_probe(const string& sig, hashtype fphash, bool strict) {
+  pair<DuplicateIndexMap::iterator, DuplicateIndexMap::iterator> range = duplicate_index.equal_range(sig);
+  for(DuplicateIndexMap::iterator it = range.first; it != range.second; it++)
+    if (!strict || it->second.fphash == fphash) return true;
+  return false;
+}
+
+static bool mmap_loading = false;
+
+void set_mmap_loading(bool MMAP) {
+  mmap_loading = MMAP;
+}
+
+bool get_mmap_loading() {
+  return mmap_loading;
+}
+
 void GameList::addAlgos(bool NEW) {
   // create algo pointers; if not new, read data from file
   // FIXME be more careful in validating input ...
@@ -454,12 +546,40 @@ void GameList::addAlgos(bool NEW) {
   ifstream is(a_dbname.c_str(), ios::binary);
   string dbname_str(dbname);
 
-  if (NEW) {
+  if (!NEW && mmap_loading && map_algo_data(a_dbname)) {
+    // create the algorithms without data; they read their part of the
+    // mapped file when it is needed
     algo_ps[0] = new Algo_signature(boardsize, SnapshotVector());
     if (p_op->algos & ALGO_FINALPOS) algo_ps[algo_finalpos] = new Algo_finalpos(boardsize, SnapshotVector());
     if (p_op->algos & ALGO_MOVELIST) algo_ps[algo_movelist] = new Algo_movelist(boardsize, SnapshotVector());
     if (p_op->algos & ALGO_HASH_FULL) algo_ps[algo_hash_full] = new Algo_hash_full(boardsize, SnapshotVector(), dbname_str+"1", p_op->algo_hash_full_maxNumStones);
     if (p_op->algos & ALGO_HASH_CORNER) algo_ps[algo_hash_corner] = new Algo_hash_corner(boardsize, SnapshotVector(), dbname_str+"2", 7, p_op->algo_hash_corner_maxNumStones);
+    if (p_op->algos & ALGO_HASH_CENTER) algo_ps[algo_hash_center] = new Algo_hash_center(boardsize, SnapshotVector(), dbname_str+"4", 3, p_op->algo_hash_center_maxNumStones);
+    if (p_op->algos & ALGO_HASH_SIDE) algo_ps[algo_hash_side] = new Algo_hash_side(boardsize, SnapshotVector(), dbname_str+"3", 6, 4, p_op->algo_hash_side_maxNumStones);
+    if (p_op->algos & ALGO_MINHASH) algo_ps[algo_minhash] = new Algo_minhash(boardsize, SnapshotVector());
+
+    // the blocks in the .da file are in the same order as the algorithms in algo_ps
+    size_t offset = 0;
+    for(int i=0; i<20; i++) {
+      if (!algo_ps[i]) continue;
+      size_t si = 0;
+      if (offset + sizeof(si) <= da_map_size) {
+        memcpy(&si, da_map + offset, sizeof(si));
+        offset += sizeof(si);
+      }
+      if (offset + si > da_map_size) si = 0; // truncated file
+      algo_ps[i]->map_data(da_map + offset, si);
+      offset += si;
+    }
+  } else if (NEW) {
+    algo_ps[0] = new Algo_signature(boardsize, SnapshotVector());
+    if (p_op->algos & ALGO_FINALPOS) algo_ps[algo_finalpos] = new Algo_finalpos(boardsize, SnapshotVector());
+    if (p_op->algos & ALGO_MOVELIST) algo_ps[algo_movelist] = new Algo_movelist(boardsize, SnapshotVector());
+    if (p_op->algos & ALGO_HASH_FULL) algo_ps[algo_hash_full] = new Algo_hash_full(boardsize, SnapshotVector(), dbname_str+"1", p_op->algo_hash_full_maxNumStones);
+    if (p_op->algos & ALGO_HASH_CORNER) algo_ps[algo_hash_corner] = new Algo_hash_corner(boardsize, SnapshotVector(), dbname_str+"2", 7, p_op->algo_hash_corner_maxNumStones);
+    if (p_op->algos & ALGO_HASH_CENTER) algo_ps[algo_hash_center] = new Algo_hash_center(boardsize, SnapshotVector(), dbname_str+"4", 3, p_op->algo_hash_center_maxNumStones);
+    if (p_op->algos & ALGO_HASH_SIDE) algo_ps[algo_hash_side] = new Algo_hash_side(boardsize, SnapshotVector(), dbname_str+"3", 6, 4, p_op->algo_hash_side_maxNumStones);
+    if (p_op->algos & ALGO_MINHASH) algo_ps[algo_minhash] = new Algo_minhash(boardsize, SnapshotVector());
   } else {
     // printf("read algo db\n");
     size_t si;
@@ -507,10 +627,52 @@ void GameList::addAlgos(bool NEW) {
       delete [] d;
       algo_ps[algo_hash_corner] = new Algo_hash_corner(boardsize, data, dbname_str+"2", 7, p_op->algo_hash_corner_maxNumStones);
     }
+    if (p_op->algos & ALGO_HASH_CENTER) {
+      is.read((char *)&si, sizeof(si));
+      char* d = new char[si];
+      is.read(d, si);
+      SnapshotVector data(d, si);
+      delete [] d;
+      algo_ps[algo_hash_center] = new Algo_hash_center(boardsize, data, dbname_str+"4", 3, p_op->algo_hash_center_maxNumStones);
+    }
+    if (p_op->algos & ALGO_HASH_SIDE) {
+      is.read((char *)&si, sizeof(si));
+      char* d = new char[si];
+      is.read(d, si);
+      SnapshotVector data(d, si);
+      delete [] d;
+      algo_ps[algo_hash_side] = new Algo_hash_side(boardsize, data, dbname_str+"3", 6, 4, p_op->algo_hash_side_maxNumStones);
+    }
+    if (p_op->algos & ALGO_MINHASH) {
+      is.read((char *)&si, sizeof(si));
+      char* d = new char[si];
+      is.read(d, si);
+      SnapshotVector data(d, si);
+      delete [] d;
+      algo_ps[algo_minhash] = new Algo_minhash(boardsize, data);
+    }
   }
   // for(int a=20*ctr; a<20*(ctr+1); a++) printf("aa %d %p\n", a, algo_ps[a]);
-  // if (algos & ALGO_HASH_SIDE) 
-  //   algo_ps[algo_hash_side] = new Algo_hash_side(boardsize, 6, 4, p_op->algo_hash_side_maxNumStones);
+}
+
+bool GameList::map_algo_data(const string& fname) {
+#ifdef _WIN32
+  return false;
+#else
+  int fd = open(fname.c_str(), O_RDONLY);
+  if (fd == -1) return false;
+  struct stat st;
+  if (fstat(fd, &st) == -1 || st.st_size == 0) {
+    close(fd);
+    return false;
+  }
+  void* p = mmap(0, st.st_size, PROT_READ, MAP_SHARED, fd, 0);
+  close(fd);
+  if (p == MAP_FAILED) return false;
+  da_map = (char*)p;
+  da_map_size = st.st_size;
+  return true;
+#endif
 }
 
 void GameList::readDB() throw(DBError) {
@@ -526,6 +688,7 @@ void GameList::readDB() throw(DBError) {
   all = new vector<GameListEntry* >;
   currentList = 0;
   oldList = 0;
+  for(unsigned int i = 0; i < dates_all.size(); i++) dates_all[i] = 0;
 
   int rc;
   rc = sqlite3_exec(db, "begin transaction;", 0, 0, 0);
@@ -569,6 +732,12 @@ GameList::~GameList() {
   for (std::vector<Continuation *>::const_iterator i = continuations.begin(); i != continuations.end(); ++i) {
     delete *i;
   }
+  for (std::vector<Continuation *>::const_iterator i = continuationsNC.begin(); i != continuationsNC.end(); ++i) {
+    delete *i;
+  }
+  for(boost::unordered_map<int, GameListSnapshot* >::iterator it = snapshots.begin(); it != snapshots.end(); it++)
+    delete it->second;
+  batch_clear();
 
   delete [] dbname;
   if (all) {
@@ -580,6 +749,9 @@ GameList::~GameList() {
   if (oldList) delete oldList;
   for(unsigned int i=0; i<20; i++) 
     if (algo_ps[i]) delete algo_ps[i];
+#ifndef _WIN32
+  if (da_map) munmap(da_map, da_map_size);
+#endif
   if (db) sqlite3_close(db);
   db = 0;
   // printf("leave ~GameList\n");
@@ -651,9 +823,9 @@ int GameList::end_sorted() {
 
 void GameList::update_dates_current() {
   dates_current.clear();
-  for(int i=0; i<(DATE_PROFILE_END - DATE_PROFILE_START)*12; i++) dates_current.push_back(0);
+  for(int i=0; i<(DATE_PROFILE_END - DATE_PROFILE_START)*12 + 2; i++) dates_current.push_back(0);
   for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
-    if ((*all)[it->second]->date >= DATE_PROFILE_START*12) dates_current[(*all)[it->second]->date - DATE_PROFILE_START*12]++;
+    dates_current[dateIndex((*all)[it->second]->date)]++;
   }
 }
 
@@ -735,7 +907,7 @@ void GameList::reset() {
   BwinsG = Bwins = BwinsAll;
   WwinsG = Wwins = WwinsAll;
   dates_current.clear();
-  for(int i = 0; i < (DATE_PROFILE_END - DATE_PROFILE_START)*12; i++) dates_current.push_back(dates_all[i]);
+  for(int i = 0; i < (DATE_PROFILE_END - DATE_PROFILE_START)*12 + 2; i++) dates_current.push_back(dates_all[i]);
 }
 
 void GameList::tagsearch(int tag) throw(DBError) {
@@ -893,6 +1065,112 @@ void GameList::deleteTag(int tag, int i) throw(DBError) {
   if (rc != SQLITE_OK) throw DBError();
 }
 
+static string bits_to_hex(const vector<bool>& bits);
+
+void GameList::tag_current(int tag, const char* sql) throw(DBError) {
+  // execute sql (with parameters game_id, tag_id) for all games in the current
+  // list, in one transaction
+  int rc = sqlite3_exec(db, "begin transaction", 0, 0, 0);
+  if (rc != SQLITE_OK) throw DBError();
+  sqlite3_stmt *ppStmt=0;
+  // use prepare_v2, since the schema may have been changed by other
+  // connections (e.g. lkGameList.recordFiles)
+  rc = sqlite3_prepare_v2(db, sql, -1, &ppStmt, 0);
+  if (rc != SQLITE_OK || ppStmt==0) {
+    sqlite3_exec(db, "rollback", 0, 0, 0);
+    throw DBError();
+  }
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+    sqlite3_bind_int(ppStmt, 1, (*all)[it->second]->id);
+    sqlite3_bind_int(ppStmt, 2, tag);
+    rc = sqlite3_step(ppStmt);
+    sqlite3_reset(ppStmt);
+    if (rc != SQLITE_DONE) {
+      sqlite3_finalize(ppStmt);
+      sqlite3_exec(db, "rollback", 0, 0, 0);
+      throw DBError();
+    }
+  }
+  sqlite3_finalize(ppStmt);
+  rc = sqlite3_exec(db, "commit", 0, 0, 0);
+  if (rc != SQLITE_OK) throw DBError();
+}
+
+void GameList::setTags(int tag) throw(DBError) {
+  tag_current(tag, "insert or ignore into GAME_TAGS (game_id, tag_id) values (?, ?)");
+}
+
+void GameList::deleteTags(int tag) throw(DBError) {
+  tag_current(tag, "delete from GAME_TAGS where game_id=? and tag_id=?");
+}
+
+int GameList::setTagsBySignature(int tag, vector<string> sigs) throw(DBError) {
+  // put the signatures into a temporary table with the signature as primary
+  // key, so that the join below is one scan of GAMES with a lookup per game
+  int rc = sqlite3_exec(db, "begin transaction", 0, 0, 0);
+  if (rc != SQLITE_OK) throw DBError();
+  rc = sqlite3_exec(db, "create temp table if not exists tag_signatures ( signature text primary key ); delete from temp.tag_signatures;", 0, 0, 0);
+  if (rc != SQLITE_OK) {
+    sqlite3_exec(db, "rollback", 0, 0, 0);
+    throw DBError();
+  }
+  sqlite3_stmt *ppStmt=0;
+  rc = sqlite3_prepare_v2(db, "insert or ignore into temp.tag_signatures (signature) values (?)", -1, &ppStmt, 0);
+  if (rc != SQLITE_OK || ppStmt==0) {
+    sqlite3_exec(db, "rollback", 0, 0, 0);
+    throw DBError();
+  }
+  for(vector<string>::iterator it = sigs.begin(); it != sigs.end(); it++) {
+    sqlite3_bind_text(ppStmt, 1, it->c_str(), -1, SQLITE_TRANSIENT);
+    rc = sqlite3_step(ppStmt);
+    sqlite3_reset(ppStmt);
+    if (rc != SQLITE_DONE) {
+      sqlite3_finalize(ppStmt);
+      sqlite3_exec(db, "rollback", 0, 0, 0);
+      throw DBError();
+    }
+  }
+  sqlite3_finalize(ppStmt);
+
+  char sql[300];
+  sprintf(sql, "insert or ignore into GAME_TAGS (game_id, tag_id) select GAMES.id, %d from GAMES join temp.tag_signatures on GAMES.signature = temp.tag_signatures.signature", tag);
+  rc = sqlite3_exec(db, sql, 0, 0, 0);
+  int count = sqlite3_changes(db);
+  if (rc == SQLITE_OK) rc = sqlite3_exec(db, "delete from temp.tag_signatures", 0, 0, 0);
+  if (rc != SQLITE_OK) {
+    sqlite3_exec(db, "rollback", 0, 0, 0);
+    throw DBError();
+  }
+  rc = sqlite3_exec(db, "commit", 0, 0, 0);
+  if (rc != SQLITE_OK) throw DBError();
+  return count;
+}
+
+string GameList::tagBits(int tag) throw(DBError) {
+  boost::unordered_map<int, int> position; // id -> position in all
+  for(int i=0; i < (int)all->size(); i++) position[(*all)[i]->id] = i;
+  vector<bool> bits(all->size(), false);
+
+  sqlite3_stmt *ppStmt=0;
+  int rc = sqlite3_prepare_v2(db, "select game_id from GAME_TAGS where tag_id=?", -1, &ppStmt, 0); // see tag_current
+  if (rc != SQLITE_OK || ppStmt==0) throw DBError();
+  sqlite3_bind_int(ppStmt, 1, tag);
+  do {
+    rc = sqlite3_step(ppStmt);
+    if (rc != SQLITE_DONE && rc != SQLITE_ROW) {
+      sqlite3_finalize(ppStmt);
+      throw DBError();
+    }
+    if (rc == SQLITE_ROW) {
+      boost::unordered_map<int, int>::iterator it = position.find(sqlite3_column_int(ppStmt, 0));
+      if (it != position.end()) bits[it->second] = true;
+    }
+  } while (rc == SQLITE_ROW);
+  rc = sqlite3_finalize(ppStmt);
+  if (rc != SQLITE_OK) throw DBError();
+  return bits_to_hex(bits);
+}
+
 int gettags_callback(void *res, int argc, char **argv, char **azColName) {
   if (!argc) return 1;
   ((vector<int>*)res)->push_back(atoi(argv[0]));
@@ -1004,19 +1282,61 @@ vector<int> GameList::sigsearchNC(char* sig) throw(DBError) {
 
 int gis_callback(void *gl, int argc, char **argv, char **azColName) {
   if (!argc) return 1;
-  ((GameList*)gl)->makeIndexHit(atoi(argv[0]), 0);
+  GameList* g = (GameList*)gl;
+  g->makeIndexHit(atoi(argv[0]), 0);
+  // the rows are ordered by id, so this is the number of games examined so far
+  int done = g->current + 1;
+  if (g->progress_fn && done / g->progress_interval != g->gis_done / g->progress_interval) {
+    g->gis_done = done;
+    if (!g->report_progress(done, g->oldList->size(), true)) return 1;
+  }
+  g->gis_done = done;
   return 0;
 }
 
+int gis_progress(void *gl) {
+  // called by sqlite during long-running queries (see sqlite3_progress_handler)
+  GameList* g = (GameList*)gl;
+  return g->report_progress(g->gis_done, g->oldList->size(), true) ? 0 : 1;
+}
+
+void GameList::set_progress_function(SearchProgressFn fn, void* data, int interval) {
+  progress_fn = fn;
+  progress_data = data;
+  progress_interval = interval > 0 ? interval : 1000;
+}
+
+void* GameList::get_progress_data() {
+  return progress_data;
+}
+
+bool GameList::search_interrupted() {
+  return interrupted;
+}
+
+bool GameList::report_progress(int done, int total, bool force) {
+  if (interrupted) return false;
+  if (!progress_fn || (!force && done % progress_interval)) return true;
+  #pragma omp critical (kombilo_progress)
+  {
+    if (!interrupted && !progress_fn(progress_data, done, total)) interrupted = true;
+  }
+  return !interrupted;
+}
+
 void GameList::gisearch(const char* sql, int complete) throw(DBError) {
+  interrupted = false;
   if (start_sorted() == 0) { 
     string query;
     if (!complete) query = "select id from GAMES where ";
     query += sql;
     if (!complete) query += " order by id";
     // printf("%s\n", query.c_str());
+    gis_done = 0;
+    if (progress_fn) sqlite3_progress_handler(db, 100*progress_interval, gis_progress, this);
     int rc = sqlite3_exec(db, query.c_str(), gis_callback, this, 0);
-    if( rc!=SQLITE_OK ) throw DBError();
+    if (progress_fn) sqlite3_progress_handler(db, 0, 0, 0);
+    if (rc != SQLITE_OK && !interrupted) throw DBError();
 
     end_sorted();
     update_dates_current();
@@ -1147,6 +1467,26 @@ vector<string> GameList::currentEntriesAsStrings(int start, int end) {
   return result;
 }
 
+vector<string> GameList::currentEntriesField(int field) {
+  vector<string> result;
+  result.reserve(currentList->size());
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+    const string& s = (*all)[it->second]->gameInfoStr;
+    size_t start = 0;
+    for(int i=0; i<field && start != string::npos; i++) {
+      start = s.find(",,,", start);
+      if (start != string::npos) start += 3;
+    }
+    if (start == string::npos) {
+      result.push_back("");
+      continue;
+    }
+    size_t end = s.find(",,,", start);
+    result.push_back(s.substr(start, end == string::npos ? string::npos : end - start));
+  }
+  return result;
+}
+
 string GameList::currentEntryAsString(int i) {
   // should really be called get_current_gameInfoStr (or something similar), cf.
   // get_gameInfoStr
@@ -1184,7 +1524,7 @@ string GameList::getSignature(int i) throw(DBError) {
 }
 
 string GameList::getSGF(int i) throw(DBError) {
-  return getCurrentProperty(i, "sgf");
+  return getCurrentProperty(i, "sgf_text(sgf)");
 }
 
 string GameList::getCurrentProperty(int i, string tag) throw(DBError) {
@@ -1206,7 +1546,23 @@ string GameList::getCurrentProperty(int i, string tag) throw(DBError) {
   return prop_str;
 }
 
+string GameList::getGameProperty(int id, string tag) throw(DBError) {
+  string sql = "select " + tag + " from GAMES where id = ?;";
+  sqlite3_stmt *ppStmt=0;
+  int rc = sqlite3_prepare_v2(db, sql.c_str(), -1, &ppStmt, 0);
+  if (rc != SQLITE_OK || ppStmt==0) throw DBError();
+  sqlite3_bind_int(ppStmt, 1, id);
+  rc = sqlite3_step(ppStmt);
+  string prop_str;
+  if (rc == SQLITE_ROW && sqlite3_column_type(ppStmt, 0) != SQLITE_NULL)
+    prop_str = string((const char*)sqlite3_column_text(ppStmt, 0), sqlite3_column_bytes(ppStmt, 0));
+  sqlite3_finalize(ppStmt);
+  if (rc != SQLITE_ROW && rc != SQLITE_DONE) throw DBError();
+  return prop_str;
+}
+
 void GameList::search(Pattern& pattern, SearchOptions* so) throw(DBError) {
+  interrupted = false;
   if (mrs_pattern) delete mrs_pattern;
   mrs_pattern = new Pattern(pattern);
   if (searchOptions) delete searchOptions;
@@ -1251,10 +1607,44 @@ void GameList::search(Pattern& pattern, SearchOptions* so) throw(DBError) {
       }
     }
 
+    // SIDE PATTERN?
+    if (hash_result == -1 && (searchOptions->algos & ALGO_HASH_SIDE) && algo_ps[algo_hash_side]) {
+      hash_result = ((Algo_hash_side*)algo_ps[algo_hash_side])->search(pl, *this, *searchOptions);
+      if (hash_result == 0) {
+        if (searchOptions->algos & ALGO_MOVELIST && algo_ps[algo_movelist])
+          algo_ps[algo_movelist]->search(pl, *this, *searchOptions);
+      }
+    }
+
+    // CENTER PATTERN (or any other pattern containing a suitable 3x3 region)?
+    if (hash_result == -1 && (searchOptions->algos & ALGO_HASH_CENTER) && algo_ps[algo_hash_center]) {
+      hash_result = ((Algo_hash_center*)algo_ps[algo_hash_center])->search(pl, *this, *searchOptions);
+      if (hash_result == 0) {
+        if (searchOptions->algos & ALGO_MOVELIST && algo_ps[algo_movelist])
+          algo_ps[algo_movelist]->search(pl, *this, *searchOptions);
+      }
+    }
+
     if (hash_result == -1) {
       // printf("no hashing\n");
-      if (searchOptions->algos & ALGO_FINALPOS && algo_ps[algo_finalpos])
-        algo_ps[algo_finalpos]->search(pl, *this, *searchOptions);
+      if (searchOptions->algos & ALGO_FINALPOS && algo_ps[algo_finalpos]) {
+        if (batch_index == -1) algo_ps[algo_finalpos]->search(pl, *this, *searchOptions);
+        else if (batch_state[batch_index] == BATCH_PREFILTERED) {
+          // use the candidates found by batch_prefilter
+          startO();
+          vector<pair<pair<int,int>, vector<Candidate* >* > >& cands = batch_candidates[batch_index];
+          for(vector<pair<pair<int,int>, vector<Candidate* >* > >::iterator it = cands.begin(); it != cands.end(); it++) {
+            (*all)[it->first.second]->set_candidates(it->second);
+            currentList->push_back(it->first);
+          }
+          cands.clear();
+          batch_state[batch_index] = BATCH_DONE;
+          if (batch_interrupted) interrupted = true;
+        } else {
+          batch_state[batch_index] = BATCH_PENDING;
+          return;
+        }
+      }
       // printf("%d candidates\n", currentList->size());
       if (searchOptions->algos & ALGO_MOVELIST && algo_ps[algo_movelist])
         algo_ps[algo_movelist]->search(pl, *this, *searchOptions);
@@ -1280,6 +1670,160 @@ void GameList::search(Pattern& pattern, SearchOptions* so) throw(DBError) {
 }
 
 
+vector<int> GameList::searchNC(Pattern& pattern, SearchOptions* so) throw(DBError) {
+  // save the state of the GameList (compare snapshot/restore; here
+  // everything stays in memory, and the hits are not copied, but detached
+  // from the games in the current list while search runs)
+  vector<pair<int,int> > savedList(*currentList);
+  vector<vector<Hit* >* > savedHits;
+  vector<vector<Candidate* >* > savedCandidates;
+  for(vector<pair<int,int> >::iterator it = savedList.begin(); it != savedList.end(); it++) {
+    savedHits.push_back((*all)[it->second]->hits);
+    savedCandidates.push_back((*all)[it->second]->candidates);
+    (*all)[it->second]->hits = 0;
+    (*all)[it->second]->candidates = 0;
+  }
+  Pattern* saved_mrs_pattern = mrs_pattern;
+  SearchOptions* savedSearchOptions = searchOptions;
+  char* savedLabels = labels;
+  mrs_pattern = 0;
+  searchOptions = 0;
+  labels = 0;
+  vector<Continuation* > savedContinuations;
+  savedContinuations.swap(continuations);
+  vector<int> savedDates;
+  savedDates.swap(dates_current);
+  int saved[] = { num_hits, num_switched, Bwins, Wwins, BwinsG, WwinsG };
+
+  vector<int> result;
+  try {
+    search(pattern, so);
+    result.push_back(currentList->size());
+    result.push_back(num_hits);
+    result.push_back(num_switched);
+    result.push_back(Bwins);
+    result.push_back(Wwins);
+    result.push_back(BwinsG);
+    result.push_back(WwinsG);
+  } catch (DBError) {
+    result.clear();
+  }
+
+  // keep the continuations which received a label
+  for(vector<Continuation* >::iterator it = continuationsNC.begin(); it != continuationsNC.end(); it++)
+    delete *it;
+  continuationsNC.clear();
+  for(unsigned int i=0; i<continuations.size(); i++) {
+    if (labels && labels[i] != '.' && mrs_pattern) {
+      continuations[i]->x = i % mrs_pattern->sizeX;
+      continuations[i]->y = i / mrs_pattern->sizeX;
+      continuations[i]->label = labels[i];
+      continuationsNC.push_back(continuations[i]);
+    } else delete continuations[i];
+  }
+  continuations.clear();
+
+  // restore the state
+  if (mrs_pattern) delete mrs_pattern;
+  if (searchOptions) delete searchOptions;
+  if (labels) delete [] labels;
+  mrs_pattern = saved_mrs_pattern;
+  searchOptions = savedSearchOptions;
+  labels = savedLabels;
+  continuations.swap(savedContinuations);
+  dates_current.swap(savedDates);
+  num_hits = saved[0];
+  num_switched = saved[1];
+  Bwins = saved[2];
+  Wwins = saved[3];
+  BwinsG = saved[4];
+  WwinsG = saved[5];
+
+  if (oldList) delete oldList;
+  oldList = 0;
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+    (*all)[it->second]->set_hits(0);
+    (*all)[it->second]->set_candidates(0);
+  }
+  *currentList = savedList;
+  for(unsigned int i=0; i<savedList.size(); i++) {
+    (*all)[savedList[i].second]->hits = savedHits[i];
+    (*all)[savedList[i].second]->candidates = savedCandidates[i];
+  }
+  if (result.empty()) throw DBError();
+  return result;
+}
+
+int GameList::batch_add(Pattern& pattern, SearchOptions* so) {
+  batch_patterns.push_back(new Pattern(pattern));
+  batch_options.push_back(so ? new SearchOptions(*so) : new SearchOptions());
+  batch_state.push_back(BATCH_NEW);
+  batch_candidates.push_back(vector<pair<pair<int,int>, vector<Candidate* >* > >());
+  return batch_patterns.size() - 1;
+}
+
+bool GameList::batch_search(int i) throw(DBError) {
+  if (i < 0 || i >= (int)batch_patterns.size() || batch_state[i] == BATCH_DONE) throw DBError();
+  batch_index = i;
+  try {
+    search(*batch_patterns[i], batch_options[i]);
+  } catch (...) {
+    batch_index = -1;
+    throw;
+  }
+  batch_index = -1;
+  if (batch_state[i] == BATCH_PENDING) return false;
+  batch_state[i] = BATCH_DONE;
+  return true;
+}
+
+void GameList::batch_prefilter() throw(DBError) {
+  interrupted = false;
+  vector<int> pending;
+  vector<PatternList* > pls;
+  for(unsigned int i=0; i<batch_patterns.size(); i++) {
+    if (batch_state[i] != BATCH_PENDING) continue;
+    pending.push_back(i);
+    pls.push_back(new PatternList(*batch_patterns[i], batch_options[i]->fixedColor, batch_options[i]->nextMove, this));
+  }
+  if (pending.size() && algo_ps[algo_finalpos]) {
+    vector<vector<pair<pair<int,int>, vector<Candidate* >* > > > results;
+    ((Algo_finalpos*)algo_ps[algo_finalpos])->batch_search(pls, *this, results);
+    for(unsigned int k=0; k<pending.size(); k++) {
+      batch_candidates[pending[k]].swap(results[k]);
+      batch_state[pending[k]] = BATCH_PREFILTERED;
+    }
+  }
+  batch_interrupted = interrupted;
+  for(vector<PatternList* >::iterator it = pls.begin(); it != pls.end(); it++) delete *it;
+}
+
+void GameList::batch_clear() {
+  for(unsigned int i=0; i<batch_patterns.size(); i++) {
+    delete batch_patterns[i];
+    delete batch_options[i];
+    for(vector<pair<pair<int,int>, vector<Candidate* >* > >::iterator it = batch_candidates[i].begin(); it != batch_candidates[i].end(); it++) {
+      for(vector<Candidate* >::iterator c = it->second->begin(); c != it->second->end(); c++) delete *c;
+      delete it->second;
+    }
+  }
+  batch_patterns.clear();
+  batch_options.clear();
+  batch_state.clear();
+  batch_candidates.clear();
+  batch_interrupted = false;
+}
+
+int GameList::numContinuationsNC() {
+  return continuationsNC.size();
+}
+
+Continuation GameList::lookupContinuationNC(int i) {
+  if (i < 0 || i >= (int)continuationsNC.size()) return Continuation(this);
+  return *continuationsNC[i];
+}
+
+
 int GameList::plSize() {
   return pl.size();
 }
@@ -1408,18 +1952,22 @@ void GameList::start_processing(int PROCESSVARIATIONS) throw(DBError) {
 void GameList::finalize_processing() throw(DBError) {
   // printf("enter finalize_processing %d\n", db);
   for(unsigned int a=0; a<20; a++) if (algo_ps[a]) algo_ps[a]->finalize_process();
+  if (p_op->algos & ALGO_SGF_COMPRESSED) compress_stored_sgf();
   int rc = sqlite3_exec(db, "commit;", 0, 0, 0);
   if (rc != SQLITE_OK) {
     sqlite3_close(db);
     db = 0;
     throw DBError();
   }
+  if (p_op->algos & ALGO_FULLTEXT) create_fulltext_index();
 
-  // write algorithm data to file
+  // write algorithm data to file; write to a new file and rename it, since
+  // the old file might be memory-mapped (see set_mmap_loading)
 
   string a_dbname(dbname);
   a_dbname[a_dbname.size()-1] = 'a';
-  ofstream os(a_dbname.c_str(), ios::binary);
+  string tmp_dbname = a_dbname + ".tmp";
+  ofstream os(tmp_dbname.c_str(), ios::binary);
 
   for(vector<algo_p>::iterator it = algo_ps.begin(); it != algo_ps.end(); it++) {
     if (*it) {
@@ -1430,12 +1978,209 @@ void GameList::finalize_processing() throw(DBError) {
     }
   }
   os.close();
+#ifdef _WIN32
+  remove(a_dbname.c_str()); // rename does not replace existing files on Windows
+#endif
+  if (rename(tmp_dbname.c_str(), a_dbname.c_str())) throw DBError();
 
   readDB();
 
   delete SGFtags;
 }
 
+void GameList::create_fulltext_index() {
+  // The index is an FTS5 table with "external content" (i.e., it refers to
+  // the GAMES table instead of storing a copy of the text), and it is rebuilt
+  // from scratch, so that it covers the games added by earlier calls to
+  // process, too. The trigram tokenizer allows to look up arbitrary
+  // substrings (of length at least 3). If the sqlite library does not
+  // support FTS5, no index is created, and game info searches just scan the
+  // GAMES table.
+  string columns;
+  for(vector<string>::iterator it = SGFtags->begin(); it != SGFtags->end(); it++)
+    if (*it == "PB" || *it == "PW" || *it == "EV") columns += *it + ", ";
+  sqlite3_exec(db, "drop table if exists games_fts;", 0, 0, 0);
+  string content = "GAMES";
+  if (p_op->algos & ALGO_SGF_COMPRESSED) {
+    // the index reads the SGF sources through a view which decompresses them
+    sqlite3_exec(db, "drop view if exists games_text;", 0, 0, 0);
+    string view = "create view games_text as select id, " + columns + "sgf_text(sgf) as sgf from GAMES;";
+    if (sqlite3_exec(db, view.c_str(), 0, 0, 0) != SQLITE_OK) return;
+    content = "games_text";
+  }
+  string sql = "create virtual table games_fts using fts5(" + columns + "sgf, content='" + content + "', content_rowid='id', tokenize='trigram');";
+  if (sqlite3_exec(db, sql.c_str(), 0, 0, 0) != SQLITE_OK) return;
+  if (sqlite3_exec(db, "insert into games_fts(games_fts) values('rebuild');", 0, 0, 0) != SQLITE_OK)
+    sqlite3_exec(db, "drop table if exists games_fts;", 0, 0, 0);
+}
+
+// Compression of the SGF sources (ALGO_SGF_COMPRESSED)
+//
+// A compressed SGF source is stored as a blob: the length of the
+// uncompressed text (4 bytes, big endian), followed by the zlib stream. The
+// compression uses a preset dictionary which is trained on the first
+// SGF_DICTIONARY_SAMPLE games of the database and stored in db_info (rowid
+// 4). Sources stored as text (the sample, or databases created without
+// ALGO_SGF_COMPRESSED) are returned unchanged by the SQL function sgf_text.
+
+const unsigned int SGF_DICTIONARY_SAMPLE = 200;
+const unsigned int SGF_DICTIONARY_SIZE = 32768; // the window size of zlib
+const char* SGF_DICTIONARY_BASE = "(;GM[1]FF[4]CA[UTF-8]SZ[19]KM[6.5]RU[Japanese]HA[0]";
+
+void sgf_text_function(sqlite3_context* context, int argc, sqlite3_value** argv) {
+  if (sqlite3_value_type(argv[0]) != SQLITE_BLOB) {
+    sqlite3_result_value(context, argv[0]);
+    return;
+  }
+  GameList* gl = (GameList*)sqlite3_user_data(context);
+  try {
+    string s = gl->decompress_sgf((const char*)sqlite3_value_blob(argv[0]), sqlite3_value_bytes(argv[0]));
+    sqlite3_result_text(context, s.c_str(), s.size(), SQLITE_TRANSIENT);
+  } catch (DBError) {
+    sqlite3_result_error(context, "invalid compressed SGF source", -1);
+  }
+}
+
+void GameList::train_sgf_dictionary() throw(DBError) {
+  // The dictionary consists of the properties (including the moves) which
+  // occur more than once in the sample, ordered by number of occurrences
+  // times length, the most valuable ones last (since zlib encodes matches at
+  // small distances most cheaply).
+  boost::unordered_map<string, int> counts;
+  for(vector<string>::iterator it = sgf_sample.begin(); it != sgf_sample.end(); it++) {
+    const string& s = *it;
+    size_t i = 0;
+    while (i < s.size()) {
+      size_t start = i;
+      if (s[i] == ';') i++;
+      while (i < s.size() && isupper(s[i])) i++;
+      if (i == start || i >= s.size() || s[i] != '[') {
+        i = max(i, start+1);
+        continue;
+      }
+      while (i < s.size() && s[i] != ']') i += (s[i] == '\\') ? 2 : 1;
+      if (i >= s.size()) break;
+      i++;
+      if (i - start <= 64) counts[s.substr(start, i - start)]++;
+    }
+  }
+  vector<pair<int, string> > tokens;
+  for(boost::unordered_map<string, int>::iterator it = counts.begin(); it != counts.end(); it++)
+    if (it->second > 1) tokens.push_back(make_pair(it->second * (int)it->first.size(), it->first));
+  sort(tokens.begin(), tokens.end());
+
+  size_t size = strlen(SGF_DICTIONARY_BASE);
+  vector<pair<int, string> >::iterator first = tokens.end();
+  while (first != tokens.begin() && size + (first-1)->second.size() <= SGF_DICTIONARY_SIZE) {
+    first--;
+    size += first->second.size();
+  }
+  sgf_dictionary = SGF_DICTIONARY_BASE;
+  for(vector<pair<int, string> >::iterator it = first; it != tokens.end(); it++) sgf_dictionary += it->second;
+  sgf_sample.clear();
+
+  sqlite3_stmt *ppStmt=0;
+  int rc = sqlite3_prepare_v2(db, "insert or replace into db_info (rowid, info) values (4, ?);", -1, &ppStmt, 0);
+  if (rc != SQLITE_OK || ppStmt==0) throw DBError();
+  sqlite3_bind_blob(ppStmt, 1, sgf_dictionary.data(), sgf_dictionary.size(), SQLITE_TRANSIENT);
+  rc = sqlite3_step(ppStmt);
+  sqlite3_finalize(ppStmt);
+  if (rc != SQLITE_DONE) throw DBError();
+}
+
+string GameList::compress_sgf(const string& sgf) throw(DBError) {
+  z_stream zs;
+  memset(&zs, 0, sizeof(zs));
+  if (deflateInit(&zs, Z_DEFAULT_COMPRESSION) != Z_OK) throw DBError();
+  if (deflateSetDictionary(&zs, (const Bytef*)sgf_dictionary.data(), sgf_dictionary.size()) != Z_OK) {
+    deflateEnd(&zs);
+    throw DBError();
+  }
+  uLong bound = deflateBound(&zs, sgf.size());
+  string result(4 + bound, '\0');
+  uint32_t n = sgf.size();
+  for(int i=0; i<4; i++) result[i] = (char)((n >> (24 - 8*i)) & 0xff);
+  zs.next_in = (Bytef*)sgf.data();
+  zs.avail_in = sgf.size();
+  zs.next_out = (Bytef*)&result[4];
+  zs.avail_out = bound;
+  int rc = deflate(&zs, Z_FINISH);
+  result.resize(4 + zs.total_out);
+  deflateEnd(&zs);
+  if (rc != Z_STREAM_END) throw DBError();
+  return result;
+}
+
+string GameList::decompress_sgf(const char* data, int size) throw(DBError) {
+  if (size < 4) throw DBError();
+  uint32_t n = 0;
+  for(int i=0; i<4; i++) n = (n << 8) | (unsigned char)data[i];
+  string result(n, '\0');
+  z_stream zs;
+  memset(&zs, 0, sizeof(zs));
+  if (inflateInit(&zs) != Z_OK) throw DBError();
+  zs.next_in = (Bytef*)(data + 4);
+  zs.avail_in = size - 4;
+  zs.next_out = (Bytef*)&result[0];
+  zs.avail_out = n;
+  int rc = inflate(&zs, Z_FINISH);
+  if (rc == Z_NEED_DICT) {
+    if (inflateSetDictionary(&zs, (const Bytef*)sgf_dictionary.data(), sgf_dictionary.size()) == Z_OK)
+      rc = inflate(&zs, Z_FINISH);
+  }
+  inflateEnd(&zs);
+  if (rc != Z_STREAM_END || zs.total_out != n) throw DBError();
+  return result;
+}
+
+int GameList::bind_sgf(sqlite3_stmt* stmt, int i, const string& sgf) throw(DBError) {
+  if (!(p_op->algos & ALGO_SGF_COMPRESSED))
+    return sqlite3_bind_text(stmt, i, sgf.c_str(), -1, SQLITE_TRANSIENT);
+  if (sgf_dictionary.empty()) {
+    // store the games of the sample uncompressed; they are compressed by
+    // compress_stored_sgf in finalize_processing
+    sgf_sample.push_back(sgf);
+    if (sgf_sample.size() < SGF_DICTIONARY_SAMPLE)
+      return sqlite3_bind_text(stmt, i, sgf.c_str(), -1, SQLITE_TRANSIENT);
+    train_sgf_dictionary();
+  }
+  string z = compress_sgf(sgf);
+  return sqlite3_bind_blob(stmt, i, z.data(), z.size(), SQLITE_TRANSIENT);
+}
+
+void GameList::compress_stored_sgf() throw(DBError) {
+  if (sgf_dictionary.empty()) {
+    if (sgf_sample.empty()) return;
+    train_sgf_dictionary();
+  }
+  sqlite3_stmt *select=0;
+  sqlite3_stmt *update=0;
+  // only the games of the sample are stored uncompressed (see bind_sgf)
+  int rc = sqlite3_prepare_v2(db, "select id, sgf from GAMES where typeof(sgf) = 'text' limit ?;", -1, &select, 0);
+  if (rc != SQLITE_OK || select==0) throw DBError();
+  sqlite3_bind_int(select, 1, SGF_DICTIONARY_SAMPLE);
+  rc = sqlite3_prepare_v2(db, "update GAMES set sgf = ? where id = ?;", -1, &update, 0);
+  if (rc != SQLITE_OK || update==0) {
+    sqlite3_finalize(select);
+    throw DBError();
+  }
+  vector<pair<int, string> > compressed; // do not modify the table while reading it
+  while (sqlite3_step(select) == SQLITE_ROW)
+    compressed.push_back(make_pair(sqlite3_column_int(select, 0), compress_sgf((const char*)sqlite3_column_text(select, 1))));
+  sqlite3_finalize(select);
+  for(vector<pair<int, string> >::iterator it = compressed.begin(); it != compressed.end(); it++) {
+    sqlite3_bind_blob(update, 1, it->second.data(), it->second.size(), SQLITE_TRANSIENT);
+    sqlite3_bind_int(update, 2, it->first);
+    rc = sqlite3_step(update);
+    sqlite3_reset(update);
+    if (rc != SQLITE_DONE) {
+      sqlite3_finalize(update);
+      throw DBError();
+    }
+  }
+  sqlite3_finalize(update);
+}
+
 int GameList::process(const char* sgf, const char* path, const char* fn, std::vector<GameList* > glists, const char* DBTREE, int flags) throw(SGFError,DBError) {
   process_results_vector.clear();
   const char* dbtree = "";
@@ -1599,12 +2344,12 @@ int GameList::process(const char* sgf, const char* path, const char* fn, std::ve
     if (rc != SQLITE_OK) throw DBError();
 
     if (p_op->sgfInDB) {
-      if (c->root->numChildren == 1) rc = sqlite3_bind_text(ppStmt, stmt_ctr++, sgf, -1, SQLITE_TRANSIENT);
+      if (c->root->numChildren == 1) rc = bind_sgf(ppStmt, stmt_ctr++, sgf);
       else {
         string s= "(";
         s += c->outputVar(root);
         s+= ")";
-        rc = sqlite3_bind_text(ppStmt, stmt_ctr++, s.c_str(), -1, SQLITE_TRANSIENT); 
+        rc = bind_sgf(ppStmt, stmt_ctr++, s);
       }
     } else {
       // Write only root node to sgf column.
@@ -1612,7 +2357,7 @@ int GameList::process(const char* sgf, const char* path, const char* fn, std::ve
       string s= "(";
       s += root->SGFstring.c_str();
       s+= ")";
-      rc = sqlite3_bind_text(ppStmt, stmt_ctr++, s.c_str(), -1, SQLITE_TRANSIENT); 
+      rc = bind_sgf(ppStmt, stmt_ctr++, s);
     }
     if (rc != SQLITE_OK) throw DBError();
 
@@ -1852,38 +2597,10 @@ int GameList::process(const char* sgf, const char* path, const char* fn, std::ve
     {
 
       // check for duplicates (if desired)
-      bool is_duplicate = false;
-      if (flags & (CHECK_FOR_DUPLICATES|CHECK_FOR_DUPLICATES_STRICT)) {
-        vector<int> all_duplicates = ((Algo_signature*)algo_ps[0])->search_signature(sig);
-        if (all_duplicates.size()) {
-          // printf("all_dupl size %d\n", all_duplicates.size());
-          is_duplicate = true;
-          if ((flags & CHECK_FOR_DUPLICATES_STRICT) && (p_op->algos & ALGO_FINALPOS)) {
-            vector<int>::iterator d_it = all_duplicates.begin();
-            while (d_it != all_duplicates.end() && !(fphash == ((Algo_finalpos*)algo_ps[algo_finalpos])->get_fphash(*d_it))) d_it++;
-            if (d_it == all_duplicates.end()) is_duplicate = false;
-          }
-        }
-        if (!is_duplicate) {    // need to check the other databases
-          for(vector<GameList* >::iterator glit = glists.begin(); glit != glists.end(); glit++) {
-            // printf("check others\n");
-            GameList* glitp = *glit;
-            vector<int> dupls = ((Algo_signature*)glitp->algo_ps[0])->search_signature(sig);
-            if (dupls.size()) {
-              is_duplicate = true;
-              if ((flags & CHECK_FOR_DUPLICATES_STRICT) && (p_op->algos & ALGO_FINALPOS)) {
-                vector<int>::iterator did=dupls.begin();
-                while(did != dupls.end() && !(fphash == ((Algo_finalpos*)glitp->algo_ps[algo_finalpos])->get_fphash(*did))) did++;
-                if (did == dupls.end()) is_duplicate = false;
-              }
-              if (is_duplicate) break;
-            }
-          }
-        }
-        if (is_duplicate) {
-          return_val |= IS_DUPLICATE;
-          if (flags & OMIT_DUPLICATES) commit = false;
-        }
+      bool use_index = (flags & USE_DUPLICATE_INDEX) && dupl_index_generation == duplicate_index_generation;
+      if ((flags & (CHECK_FOR_DUPLICATES|CHECK_FOR_DUPLICATES_STRICT)) && is_duplicate(sig, fphash, glists, flags)) {
+        return_val |= IS_DUPLICATE;
+        if (flags & OMIT_DUPLICATES) commit = false;
       }
 
       if (commit) {
@@ -1898,6 +2615,7 @@ int GameList::process(const char* sgf, const char* path, const char* fn, std::ve
         // printf("sql1 %s\n", sql1);
         rc = sqlite3_exec(db, sql1, 0, 0, 0);
         if (rc != SQLITE_OK)  throw DBError();
+        if (use_index) duplicate_index.insert(make_pair(string(sig), DuplicateIndexEntry(fphash, dupl_index_db, game_id)));
 
         // evaluate tags
         if ((*rootNodeProperties)[posHA] != "") { // handicap game
@@ -1942,12 +2660,201 @@ int GameList::process_results(unsigned int i) {
   return process_results_vector[i];
 }
 
+bool GameList::is_duplicate(const char* sig, hashtype fphash, vector<GameList* >& glists, int flags) {
+  bool strict = (flags & CHECK_FOR_DUPLICATES_STRICT) && (p_op->algos & ALGO_FINALPOS);
+  if ((flags & USE_DUPLICATE_INDEX) && dupl_index_generation == duplicate_index_generation) {
+    // one lookup covers this and all other registered databases
+    return duplicate_index_probe(sig, fphash, strict);
+  }
+  vector<GameList* > gls(1, this);
+  gls.insert(gls.end(), glists.begin(), glists.end());
+  for(vector<GameList* >::iterator glit = gls.begin(); glit != gls.end(); glit++) {
+    GameList* glitp = *glit;
+    vector<int> dupls = ((Algo_signature*)glitp->algo_ps[0])->search_signature((char*)sig);
+    if (!strict && dupls.size()) return true;
+    for(vector<int>::iterator did = dupls.begin(); did != dupls.end(); did++)
+      if (fphash == ((Algo_finalpos*)glitp->algo_ps[algo_finalpos])->get_fphash(*did)) return true;
+  }
+  return false;
+}
+
+void GameList::delete_games(vector<int> ids) throw(DBError) {
+  sqlite3_stmt *del_game=0;
+  sqlite3_stmt *del_tags=0;
+  int rc = sqlite3_prepare_v2(db, "delete from GAMES where id = ?;", -1, &del_game, 0);
+  if (rc != SQLITE_OK || del_game==0) throw DBError();
+  rc = sqlite3_prepare_v2(db, "delete from GAME_TAGS where game_id = ?;", -1, &del_tags, 0);
+  if (rc != SQLITE_OK || del_tags==0) {
+    sqlite3_finalize(del_game);
+    throw DBError();
+  }
+  for(vector<int>::iterator it = ids.begin(); it != ids.end(); it++) {
+    sqlite3_bind_int(del_game, 1, *it);
+    sqlite3_bind_int(del_tags, 1, *it);
+    rc = sqlite3_step(del_game);
+    if (rc == SQLITE_DONE) rc = sqlite3_step(del_tags);
+    sqlite3_reset(del_game);
+    sqlite3_reset(del_tags);
+    if (rc != SQLITE_DONE) break;
+  }
+  sqlite3_finalize(del_game);
+  sqlite3_finalize(del_tags);
+  if (rc != SQLITE_DONE && ids.size()) throw DBError();
+
+  std::set<int> id_set(ids.begin(), ids.end());
+  for(int a=0; a < 20; a++)
+    if (algo_ps[a]) algo_ps[a]->remove_games(id_set);
+
+  if (dupl_index_generation == duplicate_index_generation) {
+    for(DuplicateIndexMap::iterator it = duplicate_index.begin(); it != duplicate_index.end(); ) {
+      if (it->second.db_id == dupl_index_db && id_set.count(it->second.game_id)) it = duplicate_index.erase(it);
+      else it++;
+    }
+  }
+}
+
+int GameList::merge(GameList& other, vector<GameList* > glists, int flags) throw(DBError) {
+  process_results_vector.clear();
+
+  // the columns of GAMES (other than id) are the same in both databases
+  vector<string> columns;
+  sqlite3_stmt *stmt=0;
+  int rc = sqlite3_prepare_v2(db, "pragma table_info(GAMES);", -1, &stmt, 0);
+  if (rc != SQLITE_OK || stmt==0) throw DBError();
+  while (sqlite3_step(stmt) == SQLITE_ROW) {
+    string col((const char*)sqlite3_column_text(stmt, 1));
+    if (col != "id") columns.push_back(col);
+  }
+  sqlite3_finalize(stmt);
+
+  string select = "select id";
+  string insert = "insert into GAMES (";
+  string question_marks;
+  int col_sgf = -1;
+  int col_signature = -1;
+  int col_fphash = -1;
+  for(unsigned int i=0; i < columns.size(); i++) {
+    select += ", " + columns[i];
+    insert += (i ? ", " : "") + columns[i];
+    question_marks += i ? ",?" : "?";
+    if (columns[i] == "sgf") col_sgf = i;
+    if (columns[i] == "signature") col_signature = i;
+    if (columns[i] == "fphash") col_fphash = i;
+  }
+  select += " from GAMES order by id;";
+  insert += ") values (" + question_marks + ");";
+  if (col_sgf == -1 || col_signature == -1 || col_fphash == -1) throw DBError();
+
+  sqlite3_stmt *sel=0;
+  sqlite3_stmt *ins=0;
+  rc = sqlite3_prepare_v2(other.db, select.c_str(), -1, &sel, 0);
+  if (rc != SQLITE_OK || sel==0) throw DBError();
+  rc = sqlite3_prepare_v2(db, insert.c_str(), -1, &ins, 0);
+  if (rc != SQLITE_OK || ins==0) {
+    sqlite3_finalize(sel);
+    throw DBError();
+  }
+
+  bool use_index = (flags & USE_DUPLICATE_INDEX) && dupl_index_generation == duplicate_index_generation;
+  bool strict = (flags & CHECK_FOR_DUPLICATES_STRICT) && (p_op->algos & ALGO_FINALPOS);
+  boost::unordered_multimap<string, hashtype> merged; // the games of other added so far (for the duplicate check without the index)
+  map<int, int> ids; // id in other -> id in this database
+  try {
+    while ((rc = sqlite3_step(sel)) == SQLITE_ROW) {
+      int return_val = 0;
+      const char* sig = (const char*)sqlite3_column_text(sel, col_signature+1);
+      string signature(sig ? sig : "");
+      hashtype fphash = sqlite3_column_int64(sel, col_fphash+1);
+
+      if (flags & (CHECK_FOR_DUPLICATES|CHECK_FOR_DUPLICATES_STRICT)) {
+        bool dupl = is_duplicate(signature.c_str(), fphash, glists, flags);
+        if (!dupl && !use_index) {
+          pair<boost::unordered_multimap<string, hashtype>::iterator, boost::unordered_multimap<string, hashtype>::iterator> range = merged.equal_range(signature);
+          for(boost::unordered_multimap<string, hashtype>::iterator it = range.first; it != range.second; it++)
+            if (!strict || it->second == fphash) dupl = true;
+        }
+        if (dupl) return_val |= IS_DUPLICATE;
+      }
+
+      if ((return_val & IS_DUPLICATE) && (flags & OMIT_DUPLICATES)) {
+        return_val |= NOT_INSERTED_INTO_DB;
+      } else {
+        for(unsigned int i=0; i < columns.size(); i++) {
+          if ((int)i == col_sgf) {
+            string sgf;
+            if (sqlite3_column_type(sel, i+1) == SQLITE_BLOB)
+              sgf = other.decompress_sgf((const char*)sqlite3_column_blob(sel, i+1), sqlite3_column_bytes(sel, i+1));
+            else if (sqlite3_column_type(sel, i+1) != SQLITE_NULL)
+              sgf = (const char*)sqlite3_column_text(sel, i+1);
+            rc = bind_sgf(ins, i+1, sgf);
+          } else rc = sqlite3_bind_value(ins, i+1, sqlite3_column_value(sel, i+1));
+          if (rc != SQLITE_OK) throw DBError();
+        }
+        rc = sqlite3_step(ins);
+        sqlite3_reset(ins);
+        if (rc != SQLITE_DONE) throw DBError();
+        int game_id = sqlite3_last_insert_rowid(db);
+        ids[sqlite3_column_int(sel, 0)] = game_id;
+        if (use_index) duplicate_index.insert(make_pair(signature, DuplicateIndexEntry(fphash, dupl_index_db, game_id)));
+        else merged.insert(make_pair(signature, fphash));
+      }
+      process_results_vector.push_back(return_val);
+    }
+  } catch (DBError) {
+    sqlite3_finalize(sel);
+    sqlite3_finalize(ins);
+    throw;
+  }
+  sqlite3_finalize(sel);
+  sqlite3_finalize(ins);
+  if (rc != SQLITE_DONE) throw DBError();
+
+  // tags
+  rc = sqlite3_prepare_v2(other.db, "select game_id, tag_id from GAME_TAGS;", -1, &sel, 0);
+  if (rc != SQLITE_OK || sel==0) throw DBError();
+  rc = sqlite3_prepare_v2(db, "insert or ignore into GAME_TAGS (game_id, tag_id) values (?, ?);", -1, &ins, 0);
+  if (rc != SQLITE_OK || ins==0) {
+    sqlite3_finalize(sel);
+    throw DBError();
+  }
+  while ((rc = sqlite3_step(sel)) == SQLITE_ROW) {
+    map<int, int>::iterator id = ids.find(sqlite3_column_int(sel, 0));
+    if (id == ids.end()) continue;
+    sqlite3_bind_int(ins, 1, id->second);
+    sqlite3_bind_int(ins, 2, sqlite3_column_int(sel, 1));
+    rc = sqlite3_step(ins);
+    sqlite3_reset(ins);
+    if (rc != SQLITE_DONE) break;
+  }
+  sqlite3_finalize(sel);
+  sqlite3_finalize(ins);
+  if (rc != SQLITE_DONE) throw DBError();
+
+  // the data of the search algorithms
+  for(int a=0; a < 20; a++) {
+    if (!algo_ps[a]) continue;
+    if (!other.algo_ps[a]) throw DBError(); // other was built with different processing options
+    algo_ps[a]->merge_data(other.algo_ps[a], ids);
+  }
+  return process_results_vector.size();
+}
+
+
+GameListSnapshot::GameListSnapshot(SnapshotVector& snv) {
+  data = snv.to_charp();
+  size = snv.size();
+  refcount = 1;
+}
+
+GameListSnapshot::~GameListSnapshot() {
+  delete [] data;
+}
 
 int GameList::snapshot() throw(DBError) {
-  // return a handle to a snapshot stored in the main GameList db
+  // return a handle to a snapshot kept in memory
   // the snapshot contains copies of
   // - orderby, format1, format2
-  // - currentList
+  // - currentList (as a bitset over all, if currentList is sorted w.r.t. the second component)
   // - all hits in the GameListEntry's of currentList
   // - pattern, labels, continuations, num_hits, num_switched, Bwins, Wwins
 
@@ -1956,17 +2863,53 @@ int GameList::snapshot() throw(DBError) {
   snapshot.pb_string(format1);
   snapshot.pb_string(format2);
 
-  snapshot.pb_int(currentList->size());
-  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
-    snapshot.pb_int(it->first);
-    snapshot.pb_int(it->second);
-    vector<Hit* >* hits = (*all)[it->second]->hits;
-    if (hits==0) {
-      snapshot.pb_int(-1);
-    } else {
-      snapshot.pb_int(hits->size());
-      for (vector<Hit* >::iterator it_h = hits->begin(); it_h != hits->end(); it_h++) {
-        (*it_h)->to_snv(snapshot);
+  bool sorted = true;
+  for(unsigned int i=1; i < currentList->size(); i++) {
+    if ((*currentList)[i-1].second >= (*currentList)[i].second) {
+      sorted = false;
+      break;
+    }
+  }
+  if (sorted) {
+    // two bitsets over all: games in currentList, and games in currentList with hits;
+    // the database id is restored from all
+    int n = all->size();
+    char* in_list = new char[(n+7)/8];
+    char* with_hits = new char[(n+7)/8];
+    for(int i=0; i < (n+7)/8; i++) in_list[i] = with_hits[i] = 0;
+    for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+      in_list[it->second / 8] |= 1 << (it->second % 8);
+      if ((*all)[it->second]->hits) with_hits[it->second / 8] |= 1 << (it->second % 8);
+    }
+    snapshot.pb_char(1);
+    snapshot.pb_int(currentList->size());
+    snapshot.pb_charp(in_list, (n+7)/8);
+    snapshot.pb_charp(with_hits, (n+7)/8);
+    delete [] in_list;
+    delete [] with_hits;
+    for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+      vector<Hit* >* hits = (*all)[it->second]->hits;
+      if (hits) {
+        snapshot.pb_int(hits->size());
+        for (vector<Hit* >::iterator it_h = hits->begin(); it_h != hits->end(); it_h++) {
+          (*it_h)->to_snv(snapshot);
+        }
+      }
+    }
+  } else {
+    snapshot.pb_char(0);
+    snapshot.pb_int(currentList->size());
+    for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+      snapshot.pb_int(it->first);
+      snapshot.pb_int(it->second);
+      vector<Hit* >* hits = (*all)[it->second]->hits;
+      if (hits==0) {
+        snapshot.pb_int(-1);
+      } else {
+        snapshot.pb_int(hits->size());
+        for (vector<Hit* >::iterator it_h = hits->begin(); it_h != hits->end(); it_h++) {
+          (*it_h)->to_snv(snapshot);
+        }
       }
     }
   }
@@ -1991,42 +2934,21 @@ int GameList::snapshot() throw(DBError) {
   snapshot.pb_int(BwinsG);
   snapshot.pb_int(WwinsG);
 
-  // insert snapshot into database
-  sqlite3_stmt *ppStmt=0;
-  int rc = sqlite3_prepare(db, "insert into snapshots (data) values (?)", -1, &ppStmt, 0);
-  if (rc != SQLITE_OK || ppStmt==0) throw DBError();
-  char* snchp = snapshot.to_charp();
-  rc = sqlite3_bind_blob(ppStmt, 1, snchp, snapshot.size(), SQLITE_TRANSIENT);
-  delete [] snchp;
-  if (rc != SQLITE_OK) throw DBError();
-  rc = sqlite3_step(ppStmt);
-  if (rc != SQLITE_DONE) throw DBError();
-  rc = sqlite3_finalize(ppStmt);
-  if (rc != SQLITE_OK) throw DBError();
-  return sqlite3_last_insert_rowid(db);
+  snapshots[++snapshot_counter] = new GameListSnapshot(snapshot);
+  return snapshot_counter;
+}
+
+GameListSnapshot* GameList::get_snapshot(int handle) throw(DBError) {
+  boost::unordered_map<int, GameListSnapshot* >::iterator it = snapshots.find(handle);
+  if (it == snapshots.end()) throw DBError();
+  return it->second;
 }
 
 void GameList::restore(int handle, bool del) throw(DBError) {
   // restore the state of the GameList associated with handle
 
-  // retrieve info associated with handle from db
-
-  char* sn = 0;
-  int sn_size = 0;
-  sqlite3_stmt *ppStmt=0;
-  int rc = sqlite3_prepare(db, "select data from snapshots where rowid = ?", -1, &ppStmt, 0);
-  if (rc != SQLITE_OK || ppStmt==0) {
-    throw DBError();
-  }
-  rc = sqlite3_bind_int(ppStmt, 1, handle);
-  if (rc != SQLITE_OK) throw DBError();
-  rc = sqlite3_step(ppStmt);
-  if (rc == SQLITE_ROW) {
-    sn = (char*)sqlite3_column_blob(ppStmt, 0);
-    sn_size = sqlite3_column_bytes(ppStmt, 0);
-  } else throw DBError();
-
-  SnapshotVector snapshot(sn, sn_size);
+  GameListSnapshot* sn = get_snapshot(handle);
+  SnapshotVector snapshot(sn->data, sn->size);
 
   // parse info
 
@@ -2044,16 +2966,31 @@ void GameList::restore(int handle, bool del) throw(DBError) {
     (*it)->set_candidates(0);
   }
 
-  for(int i=0; i<(DATE_PROFILE_END - DATE_PROFILE_START)*12; i++) dates_current.push_back(0);
+  dates_current.clear();
+  for(int i=0; i<(DATE_PROFILE_END - DATE_PROFILE_START)*12 + 2; i++) dates_current.push_back(0);
+  char bitset = snapshot.retrieve_char();
   int cl_size = snapshot.retrieve_int();
-  for(int i=0; i<cl_size; i++) {
-    int i1 = snapshot.retrieve_int();
-    int i2 = snapshot.retrieve_int();
+  if (bitset) {
+    char* in_list = snapshot.retrieve_charp();
+    char* with_hits = snapshot.retrieve_charp();
+    currentList->reserve(cl_size);
+    for(int i=0; i < (int)all->size(); i++) {
+      if (!(in_list[i/8] & (1 << (i%8)))) continue;
+      currentList->push_back(make_pair((*all)[i]->id, i));
+      if (with_hits[i/8] & (1 << (i%8))) (*all)[i]->hits_from_snv(snapshot);
+      dates_current[dateIndex((*all)[i]->date)]++;
+    }
+    delete [] in_list;
+    delete [] with_hits;
+  } else {
+    for(int i=0; i<cl_size; i++) {
+      int i1 = snapshot.retrieve_int();
+      int i2 = snapshot.retrieve_int();
 
-    currentList->push_back(make_pair(i1, i2));
-    // if ((*currentList)[currentList->size()-1].second >= all->size()) printf("ouch %d\n", (*currentList)[currentList->size()-1].second);
-    (*all)[(*currentList)[currentList->size()-1].second]->hits_from_snv(snapshot);
-    if ((*all)[(*currentList)[currentList->size()-1].second]->date >= DATE_PROFILE_START*12) dates_current[(*all)[(*currentList)[currentList->size()-1].second]->date - DATE_PROFILE_START*12]++;
+      currentList->push_back(make_pair(i1, i2));
+      (*all)[i2]->hits_from_snv(snapshot);
+      dates_current[dateIndex((*all)[i2]->date)]++;
+    }
   }
 
   if (mrs_pattern) delete mrs_pattern;
@@ -2087,30 +3024,126 @@ void GameList::restore(int handle, bool del) throw(DBError) {
   BwinsG = snapshot.retrieve_int();
   WwinsG = snapshot.retrieve_int();
 
-  rc = sqlite3_finalize(ppStmt);
-  if (rc != SQLITE_OK) throw DBError();
-  if (del) { // delete snapshot from db
-    char sql[100];
-    sprintf(sql, "delete from snapshots where rowid = %d", handle);
-    rc = sqlite3_exec(db, sql, 0, 0, 0);
-    if (rc != SQLITE_OK) throw DBError();
-  }
+  if (del) delete_snapshot(handle);
 }
 
-void GameList::delete_snapshot(int handle) throw(DBError) {
-  char sql[100];
-  sprintf(sql, "delete from snapshots where rowid = %d", handle);
-  int rc = sqlite3_exec(db, sql, 0, 0, 0);
-  if (rc != SQLITE_OK) throw DBError();
+void GameList::retain_snapshot(int handle) throw(DBError) {
+  get_snapshot(handle)->refcount++;
+}
+
+int GameList::delete_snapshot(int handle) throw(DBError) {
+  GameListSnapshot* sn = get_snapshot(handle);
+  if (--sn->refcount > 0) return sn->refcount;
+  snapshots.erase(handle);
+  delete sn;
+  return 0;
 }
 
 void GameList::delete_all_snapshots() throw(DBError) {
-  int rc = sqlite3_exec(db, "drop table snapshots", 0, 0, 0);
-  if (rc != SQLITE_OK) throw DBError();
-  rc = sqlite3_exec(db, "create table if not exists snapshots ( data text );", 0, 0, 0);
-  if (rc != SQLITE_OK) throw DBError();
-  rc = sqlite3_exec(db, "vacuum", 0, 0, 0);
-  if (rc != SQLITE_OK) throw DBError();
+  for(boost::unordered_map<int, GameListSnapshot* >::iterator it = snapshots.begin(); it != snapshots.end(); it++)
+    delete it->second;
+  snapshots.clear();
+}
+
+int GameList::snapshot_size(int handle) throw(DBError) {
+  return get_snapshot(handle)->size;
+}
+
+size_t GameList::snapshots_memory() {
+  size_t result = 0;
+  for(boost::unordered_map<int, GameListSnapshot* >::iterator it = snapshots.begin(); it != snapshots.end(); it++)
+    result += sizeof(GameListSnapshot) + it->second->size;
+  return result;
+}
+
+int GameList::num_snapshots() {
+  return snapshots.size();
+}
+
+static string bits_to_hex(const vector<bool>& bits) {
+  int nd = (bits.size() + 3) / 4;
+  if (!nd) return "0";
+  string result(nd, '0');
+  for(int i=0; i < (int)bits.size(); i++) {
+    if (!bits[i]) continue;
+    char& c = result[nd - 1 - i/4];
+    int d = (c <= '9' ? c - '0' : c - 'a' + 10) | (1 << (i%4));
+    c = "0123456789abcdef"[d];
+  }
+  return result;
+}
+
+static vector<bool> hex_to_bits(const string& hex, int n) {
+  vector<bool> result(n, false);
+  int nd = hex.size();
+  for(int k=0; k < nd && 4*k < n; k++) {
+    char c = hex[nd - 1 - k];
+    int d = 0;
+    if (c >= '0' && c <= '9') d = c - '0';
+    else if (c >= 'a' && c <= 'f') d = c - 'a' + 10;
+    else if (c >= 'A' && c <= 'F') d = c - 'A' + 10;
+    for(int j=0; j < 4 && 4*k + j < n; j++)
+      if (d & (1 << j)) result[4*k + j] = true;
+  }
+  return result;
+}
+
+string GameList::currentBits() {
+  vector<bool> bits(all->size(), false);
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++)
+    bits[it->second] = true;
+  return bits_to_hex(bits);
+}
+
+string GameList::snapshotBits(int handle) throw(DBError) {
+  GameListSnapshot* sn = get_snapshot(handle);
+  SnapshotVector snapshot(sn->data, sn->size);
+  snapshot.retrieve_string();
+  snapshot.retrieve_string();
+  snapshot.retrieve_string();
+  vector<bool> bits(all->size(), false);
+  char bitset = snapshot.retrieve_char();
+  int cl_size = snapshot.retrieve_int();
+  if (bitset) {
+    char* in_list = snapshot.retrieve_charp();
+    for(int i=0; i < (int)all->size(); i++)
+      if (in_list[i/8] & (1 << (i%8))) bits[i] = true;
+    delete [] in_list;
+  } else {
+    for(int i=0; i<cl_size; i++) {
+      snapshot.retrieve_int();
+      bits[snapshot.retrieve_int()] = true;
+      int h_size = snapshot.retrieve_int();
+      for(int j=0; j<h_size; j++) delete new Hit(snapshot);
+    }
+  }
+  return bits_to_hex(bits);
+}
+
+void GameList::setCurrentBits(string bits) {
+  vector<bool> b = hex_to_bits(bits, all->size());
+  vector<bool> in_current(all->size(), false);
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++)
+    in_current[it->second] = true;
+
+  if (oldList) delete oldList;
+  oldList = 0;
+  currentList->clear();
+  for(int i=0; i < (int)all->size(); i++) {
+    if (!in_current[i]) {
+      (*all)[i]->set_hits(0);
+      (*all)[i]->set_candidates(0);
+    }
+    if (b[i]) currentList->push_back(make_pair((*all)[i]->id, i));
+  }
+  BwinsG = WwinsG = 0;
+  for(vector<pair<int,int> >::iterator it = currentList->begin(); it != currentList->end(); it++) {
+    if ((*all)[it->second]->winner == 'B') BwinsG++;
+    if ((*all)[it->second]->winner == 'W') WwinsG++;
+  }
+  Bwins = BwinsG;
+  Wwins = WwinsG;
+  update_dates_current();
 }
 
 VarInfo::VarInfo(Node* N, abstractBoard* B, int I) {
@@ -2207,3 +3240,151 @@ map<string, vector<int > >  find_duplicates(vector<string> glists, bool strict,
 }
 
 
+static int uf_find(vector<int>& parent, int i) {
+  while (parent[i] != i) {
+    parent[i] = parent[parent[i]];
+    i = parent[i];
+  }
+  return i;
+}
+
+vector<int> find_near_duplicates(vector<GameList* > glists, double threshold) {
+  // collect the sketches of all games
+  vector<pair<int,int> > games; // (db_id, game_id)
+  vector<const unsigned short*> sketches;
+  for(unsigned int db_id = 0; db_id < glists.size(); db_id++) {
+    Algo_minhash* a = (Algo_minhash*)glists[db_id]->algo_ps[algo_minhash];
+    if (!a) continue;
+    a->ensure_loaded();
+    for(unsigned int i=0; i < a->ids.size(); i++) {
+      games.push_back(make_pair(db_id, a->ids[i]));
+      sketches.push_back(&a->sketches[MINHASH_SIZE*i]);
+    }
+  }
+  int n = games.size();
+
+  // In each band, the games whose sketches agree in this band are
+  // candidates. The rows of a band (4 entries of 16 bits) make up a 64 bit
+  // key, so sorting the keys groups the candidates. Within large groups, each
+  // game is compared only with its max_compare predecessors, which suffices
+  // to connect clusters of near duplicates.
+  const int rows = MINHASH_SIZE / MINHASH_BANDS;
+  const int max_compare = 64;
+  vector<int> parent(n);
+  for(int i=0; i<n; i++) parent[i] = i;
+  boost::unordered_map<uint64_t, double> examined; // pair i*n+j -> similarity
+  vector<pair<uint64_t, int> > keys(n);
+  for(int band=0; band < MINHASH_BANDS; band++) {
+    for(int i=0; i<n; i++) {
+      uint64_t key = 0;
+      for(int r=0; r < rows; r++) key = (key << 16) | sketches[i][band*rows + r];
+      keys[i] = make_pair(key, i);
+    }
+    sort(keys.begin(), keys.end());
+    int start = 0;
+    for(int e=1; e <= n; e++) {
+      if (e < n && keys[e].first == keys[start].first) continue;
+      for(int k=start+1; k < e; k++) {
+        for(int l = max(start, k-max_compare); l < k; l++) {
+          uint64_t p = (uint64_t)keys[l].second * n + keys[k].second;
+          if (examined.find(p) != examined.end()) continue;
+          double sim = Algo_minhash::similarity(sketches[keys[l].second], sketches[keys[k].second]);
+          examined[p] = sim;
+          if (sim >= threshold) parent[uf_find(parent, keys[l].second)] = uf_find(parent, keys[k].second);
+        }
+      }
+      start = e;
+    }
+  }
+
+  // the clusters, and for each cluster the smallest similarity of the pairs
+  // which were joined
+  map<int, vector<int> > clusters; // root -> games
+  map<int, double> scores;
+  for(int i=0; i<n; i++) clusters[uf_find(parent, i)].push_back(i);
+  for(boost::unordered_map<uint64_t, double>::iterator it = examined.begin(); it != examined.end(); it++) {
+    if (it->second < threshold) continue;
+    int root = uf_find(parent, it->first / n);
+    if (scores.find(root) == scores.end() || it->second < scores[root]) scores[root] = it->second;
+  }
+
+  vector<int> result;
+  for(map<int, vector<int> >::iterator it = clusters.begin(); it != clusters.end(); it++) {
+    if (it->second.size() < 2) continue;
+    result.push_back(it->second.size());
+    result.push_back((int)(1000 * scores[it->first] + 0.5));
+    for(vector<int>::iterator g = it->second.begin(); g != it->second.end(); g++) {
+      result.push_back(games[*g].first);
+      result.push_back(games[*g].second);
+    }
+  }
+  return result;
+}
+
+void duplicate_index_reset() {
+  duplicate_index.clear();
+  duplicate_index_generation++;
+  duplicate_index_num_dbs = 0;
+}
+
+void duplicate_index_add(GameList* gl, int db_id) throw(DBError) {
+  sqlite3_stmt *ppStmt=0;
+  int rc = sqlite3_prepare_v2(gl->db, "select id, signature, fphash from GAMES where signature is not null;", -1, &ppStmt, 0);
+  if (rc != SQLITE_OK || ppStmt==0) throw DBError();
+  do {
+    rc = sqlite3_step(ppStmt);
+    if (rc != SQLITE_DONE && rc != SQLITE_ROW) {
+      sqlite3_finalize(ppStmt);
+      throw DBError();
+    }
+    if (rc == SQLITE_ROW) {
+      string signature(reinterpret_cast<const char*>(sqlite3_column_text(ppStmt, 1)));
+      duplicate_index.insert(make_pair(signature, DuplicateIndexEntry(sqlite3_column_int64(ppStmt, 2), db_id, sqlite3_column_int(ppStmt, 0))));
+    }
+  } while (rc == SQLITE_ROW);
+  rc = sqlite3_finalize(ppStmt);
+  if (rc != SQLITE_OK) throw DBError();
+
+  gl->dupl_index_db = db_id;
+  gl->dupl_index_generation = duplicate_index_generation;
+  if (db_id >= duplicate_index_num_dbs) duplicate_index_num_dbs = db_id + 1;
+}
+
+int duplicate_index_size() {
+  return duplicate_index.size();
+}
+
+static bool dupl_index_entry_cmp(const DuplicateIndexEntry& e1, const DuplicateIndexEntry& e2) {
+  return e1.db_id < e2.db_id || (e1.db_id == e2.db_id && e1.game_id < e2.game_id);
+}
+
+map<string, vector<int> > duplicate_index_duplicates(bool strict, bool dupl_within_db) {
+  map<string, vector<int> > duplicates;
+  if (duplicate_index_num_dbs == 1) dupl_within_db = true;
+
+  // entries with the same signature are adjacent, so we can go through the
+  // index group by group
+  DuplicateIndexMap::iterator it = duplicate_index.begin();
+  while (it != duplicate_index.end()) {
+    pair<DuplicateIndexMap::iterator, DuplicateIndexMap::iterator> range = duplicate_index.equal_range(it->first);
+    it = range.second;
+    DuplicateIndexMap::iterator second = range.first;
+    if (++second == range.second) continue; // only one game with this signature
+
+    vector<DuplicateIndexEntry> games;
+    for(DuplicateIndexMap::iterator jt = range.first; jt != range.second; jt++) games.push_back(jt->second);
+    sort(games.begin(), games.end(), dupl_index_entry_cmp);
+
+    vector<int> d;
+    for(unsigned int i=0; i < games.size(); i++) {
+      for(unsigned int j=i+1; j < games.size(); j++) {
+        if (!dupl_within_db && games[i].db_id == games[j].db_id) continue;
+        if (strict && games[i].fphash != games[j].fphash) continue;
+        insert_if_new(d, games[i].db_id, games[i].game_id);
+        insert_if_new(d, games[j].db_id, games[j].game_id);
+      }
+    }
+    if (d.size()) duplicates[range.first->first] = d;
+  }
+  return duplicates;
+}
@@ -71,6 +71,17 @@
  * 50 (the default value). For positions with more stones, the ALGO_FINALPOS
  * algorithm is usually sufficiently fast anyway. 
  * \li \c algo_hash_corner_maxNumStones Same for ALGO_HASH_CORNER. Default: 20. 
+ * \li \c algo_hash_side_maxNumStones Same for ALGO_HASH_SIDE, which hashes
+ * the 6x4 regions along the edges of the board. Default: 12. 
+ * \li \c algo_hash_center_maxNumStones Same for ALGO_HASH_CENTER, which hashes
+ * all 3x3 regions of the board. Default: 6. The ALGO_HASH_SIDE and
+ * ALGO_HASH_CENTER algorithms are not enabled by default, since they
+ * considerably increase the size of the database files. Adding ALGO_FULLTEXT
+ * creates a full text index on the PB, PW, EV and sgf columns of the GAMES
+ * table in finalize_processing (if the sqlite library supports FTS5); it is
+ * used for game info searches (see kombiloNG.lkGameList.gisearch).
+ * ALGO_MINHASH stores a MinHash sketch of each game, which is used by
+ * find_near_duplicates.
  * \li \c professional_tag Determines whether/which games should be tagged as 
  * pro games. 0 = do not tag any games (default); 1 = tag all games; 2 = use
  * for players with 1p to 9p ranks in the \c BR, \c WR SGF tags.
@@ -84,6 +95,8 @@ class ProcessOptions {
     int algos;           ///< algorithms to be used
     int algo_hash_full_maxNumStones;
     int algo_hash_corner_maxNumStones;
+    int algo_hash_side_maxNumStones;
+    int algo_hash_center_maxNumStones;
     int professional_tag;               ///< whether to use "P" tag (0 = don't use; 1 = always use; 2 = use for players with 1p to 9p ranks)
 
     std::string asString();
@@ -109,6 +122,19 @@ class SearchOptions {
     void to_snv(SnapshotVector& snv);
 };
 
+/// A snapshot of the state of a GameList, see GameList::snapshot. The data
+/// is kept in memory in the format written by SnapshotVector; the current list
+/// is stored as a bitset over all games whenever it is sorted w.r.t. the
+/// position within all (which is the usual case).
+class GameListSnapshot {
+  public:
+    GameListSnapshot(SnapshotVector& snv);
+    ~GameListSnapshot();
+    char* data;
+    int size;
+    int refcount; ///< number of references, see GameList::retain_snapshot
+};
+
 class GameListEntry {
   public:
     int id; // id within the concerning database
@@ -146,6 +172,7 @@ const int CHECK_FOR_DUPLICATES = 1; ///< check for duplicates using the signatur
 const int CHECK_FOR_DUPLICATES_STRICT = 2; ///< check for duplicates using the final position (if ALGO_FINAPOS is available)
 const int OMIT_DUPLICATES = 4; ///< Omit games recognized as duplicates from the database.
 const int OMIT_GAMES_WITH_SGF_ERRORS = 8; 
+const int USE_DUPLICATE_INDEX = 16; ///< check for duplicates using the duplicate index (if the GameList is registered there, see duplicate_index_add) instead of the glists, and add the games to the index
 /**@}*/ 
 
 /// \name process return values
@@ -184,11 +211,21 @@ const int INDEX_OUT_OF_RANGE = 16;
  * automatically AND-combined.
  */
 
+/// Type of the functions which can be passed to GameList::set_progress_function.
+/// The function is called with the \c data pointer passed there, the number of
+/// games examined so far in the current pass of the search, and the total
+/// number of games of this pass. It returns false if the search should be stopped.
+typedef bool (*SearchProgressFn)(void* data, int done, int total);
+
 class GameList {
   private:
     std::vector<std::pair<int,int> > * currentList; // pair<int,int>: (database id, position within all )
                                                     // (usually sorted w.r.t. second component)
     std::vector<std::pair<int,int> > * oldList;
+    std::vector<Continuation* > continuationsNC; // continuations of the most recent searchNC
+    boost::unordered_map<int, GameListSnapshot* > snapshots;
+    int snapshot_counter; // the most recently used snapshot handle
+    GameListSnapshot* get_snapshot(int handle) throw(DBError);
   public:
     char* dbname;
     std::string orderby;
@@ -214,9 +251,9 @@ class GameList {
     int WwinsAll; ///< number of B wins in all games of the gamelist (independent of currentList)
     Pattern* mrs_pattern; ///< most recent search pattern
     SearchOptions* searchOptions;
-    vector<int> dates_all; ///< a vector which counts, for each month between January 1600 and December 2020, the number of games in the all list
-    vector<int> dates_all_per_year; ///< a vector which counts, for each year between 1600 and 2020, the number of games in the all list
-    vector<int> dates_current; ///< a vector which counts, for each month between January 1600 and December 2020, the number of games in the current list
+    vector<int> dates_all; ///< a vector which counts, for each month between January 1600 and December 2099, the number of games in the all list, followed by the numbers of games before 1600 (including games with unknown date) and from 2100 on
+    vector<int> dates_all_per_year; ///< a vector which counts, for each year between 1600 and 2099, the number of games in the all list
+    vector<int> dates_current; ///< a vector which counts, for each month between January 1600 and December 2099, the number of games in the current list, followed by the numbers of games before 1600 (including games with unknown date) and from 2100 on
     // ----------------------------------------------------------------------------
     // the following methods provide the user interface
 
@@ -336,6 +373,7 @@ class GameList {
      * \li \c CHECK_FOR_DUPLICATES_STRICT
      * \li \c OMIT_DUPLICATES 
      * \li \c OMIT_GAMES_WITH_SGF_ERRORS
+     * \li \c USE_DUPLICATE_INDEX
      *
      * Combine the flags using bitwise \c OR.
      * 
@@ -364,6 +402,28 @@ class GameList {
 
     void start_processing(int PROCESSVARIATIONS=-1) throw(DBError);
     void finalize_processing() throw(DBError);
+
+    /*! Delete the games with the given ids from the database, i.e., from
+     * the tables \c GAMES and \c GAME_TAGS, from the data of the search
+     * algorithms and from the duplicate index. Call this between
+     * \c start_processing and \c finalize_processing.
+     */
+    void delete_games(std::vector<int> ids) throw(DBError);
+
+    /*! Add the games of the database \c other, which must have been built
+     * with the same processing options, to this database (their game info,
+     * tags and the data of the search algorithms, so the games do not have to
+     * be processed again). Call this between \c start_processing and \c
+     * finalize_processing.
+     *
+     * The \c flags concerning duplicates are used as in \c process: the games
+     * are compared to the games in this database (including the games of \c
+     * other which were added before) and the databases in \c glists (or in
+     * the duplicate index). Returns the number of games in \c other; use \c
+     * process_results(i) for the result for the i-th of them (ordered by
+     * their ids in \c other).
+     */
+    int merge(GameList& other, std::vector<GameList* > glists, int flags=0) throw(DBError);
     /**@}*/ 
 
 
@@ -374,8 +434,71 @@ class GameList {
     void setLabel(char x, char y, char label);
     Continuation lookupContinuation(char x, char y);
     int numHits(); ///< Number of hits in most recent pattern search
+
+    /*! Search for the pattern in the current list without changing the
+     * GameList: the current list (and the hits of its games), the labels,
+     * the continuations and the statistics of the most recent search are
+     * kept.
+     *
+     * Returns a vector with the number of games found, and the number of
+     * hits, switched hits, B wins, W wins (counting hits), B wins, W wins
+     * (counting games) of this search. The continuations of this search
+     * (i.e. those points of the pattern which have a label other than '.',
+     * with x, y relative to \c pattern) can be retrieved with
+     * numContinuationsNC and lookupContinuationNC, until the next call of
+     * searchNC.
+     */
+    vector<int> searchNC(Pattern& pattern, SearchOptions* options = 0) throw(DBError);
+    int numContinuationsNC();
+    Continuation lookupContinuationNC(int i);
     /**@}*/ 
 
+    /*! \name Batch search
+     *
+     * Search for several patterns in the same current list, with only one
+     * pass of Algo_finalpos over the games for all of them:
+     *
+     * - Add the patterns with batch_add.
+     * - Call batch_search for each pattern. If the pattern is searched for by
+     *   one of the hashing algorithms, this works like search and returns
+     *   true. Otherwise the search is postponed, the current list is not
+     *   changed, and batch_search returns false.
+     * - Call batch_prefilter, which compares the final position of each game
+     *   in the current list with all postponed patterns at once.
+     * - Call batch_search for each postponed pattern again. The final
+     *   position candidates of batch_prefilter are then checked with
+     *   Algo_movelist, and the result is the same as that of search.
+     * - Call batch_clear.
+     *
+     * The current list must be the same for all calls (for instance,
+     * restore a snapshot after each search).
+     */
+    /**@{*/
+    int batch_add(Pattern& pattern, SearchOptions* options = 0); ///< returns the index of the pattern
+    bool batch_search(int i) throw(DBError);
+    void batch_prefilter() throw(DBError);
+    void batch_clear();
+    /**@}*/
+
+    /*! \name Progress and cancellation
+     *
+     * A function set by set_progress_function is called every \c interval
+     * games from inside the loops of the pattern search algorithms, and
+     * regularly during game info searches. If it returns false, the search is
+     * stopped. The current list then contains the games which were
+     * recognized as hits up to this point (all of them are genuine hits,
+     * since the candidates of the earlier passes are only accepted after the
+     * final pass), and search_interrupted returns true.
+     *
+     * The function may be called from several threads at the same time (if
+     * the search algorithms run in parallel); the calls are serialized.
+     */
+    /**@{*/
+    void set_progress_function(SearchProgressFn fn, void* data, int interval=1000);
+    void* get_progress_data(); ///< the \c data pointer passed to set_progress_function
+    bool search_interrupted(); ///< whether the most recent search was stopped by the progress function
+    /**@}*/
+
     /// \name Signature search
     /**@{*/ 
     void sigsearch(char* sig) throw(DBError);
@@ -437,6 +560,22 @@ class GameList {
 
     void deleteTag(int tag, int i = -1) throw(DBError); ///< Remove \c tag from game with \c ID \c i, or from all games in the list (if \c i is -1, the default!).
 
+    void setTags(int tag) throw(DBError); ///< Tag all games in the current list with \c tag (in one transaction).
+    void deleteTags(int tag) throw(DBError); ///< Remove \c tag from all games in the current list (in one transaction).
+
+    /*! Tag all games (in \c all) whose signature is in \c sigs with \c tag,
+     * in one pass over the games and one transaction. The signatures must be
+     * symmetrized (see symmetrize) and must not contain wildcards. Returns the
+     * number of games which were newly tagged.
+     */
+    int setTagsBySignature(int tag, std::vector<std::string> sigs) throw(DBError);
+
+    /*! Return the set of games tagged with \c tag as a bitset w.r.t. the
+     * positions of the games in \c all, in the hexadecimal format of
+     * currentBits.
+     */
+    std::string tagBits(int tag) throw(DBError);
+
 
     /*! If \c tag is 0, return \c vector with all tags attached to \c i-th game
      * of \c currentList.  If tag is not 0, return vector with single element
@@ -456,10 +595,39 @@ class GameList {
 
     /// \name snapshot, restore
     /**@{*/
+    /**
+     * Snapshots are kept in memory and are reference counted: snapshot
+     * returns a handle with one reference, retain_snapshot adds a
+     * reference, and delete_snapshot (or restore with del=true) drops one;
+     * the snapshot is freed when no references are left. Handles are never
+     * reused.
+     */
     int snapshot() throw(DBError);
     void restore(int handle, bool del=false) throw(DBError);
-    void delete_snapshot(int handle) throw(DBError);
+    void retain_snapshot(int handle) throw(DBError);
+    int delete_snapshot(int handle) throw(DBError); ///< Returns the number of references left.
     void delete_all_snapshots() throw(DBError);
+    int snapshot_size(int handle) throw(DBError); ///< Size (in bytes) of the data of a snapshot.
+    size_t snapshots_memory(); ///< Total memory (in bytes) held by the snapshots of this GameList.
+    int num_snapshots();
+    /**@}*/
+
+    /// \name current list as a set of games
+    /**@{*/
+    /**
+     * The current list (or the list stored in a snapshot) as a bitset over
+     * all games: bit i (counted from the least significant bit) is set if
+     * the game at position i of all is in the list. The bitset is given as a
+     * hexadecimal string (as in Python's int(bits, 16)).
+     */
+    std::string currentBits();
+    std::string snapshotBits(int handle) throw(DBError);
+    /**
+     * Make the games given by the bitset (see currentBits) the current list.
+     * Games which were in the current list keep their hits; the statistics
+     * BwinsG, WwinsG (and Bwins, Wwins) and the date profile are recomputed.
+     */
+    void setCurrentBits(std::string bits);
     /**@}*/
 
     // ------- misc ---------------------------------------------------------------
@@ -478,8 +646,17 @@ class GameList {
     pair<int, int> get_currentList_entry(unsigned int i);
     std::string currentEntryAsString(int i);
     std::vector<std::string> currentEntriesAsStrings(int start=0, int end=0);
+    /// The \c field-th entry (entries are separated by <tt>,,,</tt> in the
+    /// format string) of the game info string of each game in currentList;
+    /// cheaper than currentEntriesAsStrings if only one entry (e.g. a sort
+    /// key) is needed, since the list of hits is not formatted.
+    std::vector<std::string> currentEntriesField(int field);
     std::string getSGF(int i) throw(DBError);
     std::string getCurrentProperty(int i, std::string tag) throw (DBError);
+    /// The value of \c tag (a column of the GAMES table, or an SQL
+    /// expression such as <tt>sgf_text(sgf)</tt>) for the game with the given
+    /// id, which need not be in currentList; "" if there is no such game.
+    std::string getGameProperty(int id, std::string tag) throw (DBError);
     /**@}*/
 
 
@@ -495,14 +672,42 @@ class GameList {
     friend class Algo_hash_full;
     friend class Algo_hash;
     friend class Algo_hash_corner;
+    friend class Algo_hash_window;
     friend int gis_callback(void *gl, int argc, char **argv, char **azColName);
     friend int gis_callbackNC(void *pair_gl_CL, int argc, char **argv, char **azColName);
+    friend int gis_progress(void *gl);
+    friend void duplicate_index_add(GameList* gl, int db_id) throw(DBError);
+    friend void sgf_text_function(sqlite3_context* context, int argc, sqlite3_value** argv);
 
   private:
+    enum { BATCH_NEW, BATCH_PENDING, BATCH_PREFILTERED, BATCH_DONE };
+    std::vector<Pattern* > batch_patterns;
+    std::vector<SearchOptions* > batch_options;
+    std::vector<int> batch_state;
+    std::vector<std::vector<std::pair<std::pair<int,int>, std::vector<Candidate* >* > > > batch_candidates; // (entry of the current list, candidates), see batch_prefilter
+    int batch_index; // the pattern searched for by batch_search, or -1
+    bool batch_interrupted; // whether batch_prefilter was stopped by the progress function
+    SearchProgressFn progress_fn;
+    void* progress_data;
+    int progress_interval;
+    volatile bool interrupted;
+    int gis_done; // number of games of the current list examined so far in gisearch
+    /// Called by the search algorithms for each game; calls the progress function if
+    /// appropriate (or always, if force is true). Returns false if the search should be stopped.
+    bool report_progress(int done, int total, bool force=false);
+    /// Check whether a game with signature \c sig and final position hash \c fphash is a duplicate
+    /// of a game in this database or in the databases in \c glists (or in the duplicate
+    /// index, if \c flags contains USE_DUPLICATE_INDEX), see process.
+    bool is_duplicate(const char* sig, hashtype fphash, std::vector<GameList* >& glists, int flags);
     void createGamesDB() throw(DBError);
+    void create_fulltext_index();
+    void tag_current(int tag, const char* sql) throw(DBError);
     void open_db() throw(DBError);
     void readDB() throw(DBError);
     void addAlgos(bool NEW);
+    bool map_algo_data(const std::string& fname); ///< memory-map the .da file, see set_mmap_loading
+    char* da_map;
+    size_t da_map_size;
     int db_cache_size;
     int posDT; // used when parsing the DT, SZ, BR, WR, HA fields during processing
     int posSZ;
@@ -510,6 +715,15 @@ class GameList {
     int posWR;
     int posHA;
     int SGFtagsSize;
+    int dupl_index_db; // the number of this GameList in the duplicate index
+    int dupl_index_generation; // registration is valid only if this equals the generation of the index
+    std::string sgf_dictionary; // preset dictionary for the compression of the SGF source (ALGO_SGF_COMPRESSED)
+    std::vector<std::string> sgf_sample; // the games on which the dictionary will be trained
+    void train_sgf_dictionary() throw(DBError);
+    std::string compress_sgf(const std::string& sgf) throw(DBError);
+    std::string decompress_sgf(const char* data, int size) throw(DBError);
+    int bind_sgf(sqlite3_stmt* stmt, int i, const std::string& sgf) throw(DBError);
+    void compress_stored_sgf() throw(DBError);
     ProcessOptions* p_op;
     std::vector<std::string>* SGFtags;
     std::string sql_ins_rnp; // sql string to insert root node properties
@@ -560,6 +774,60 @@ class GameList {
  */
 std::map<std::string, std::vector<int> >  find_duplicates(std::vector<string> glists, bool strict=false, bool dupl_within_db=false) throw(DBError);
 
+// ------- near duplicates ----------------------------------------------------
+/*! Find games which are probably near duplicates of each other, using the
+ * MinHash sketches of the GameList instances in glists which were processed
+ * with ALGO_MINHASH (see Algo_minhash); the others are ignored.
+ *
+ * Candidate pairs are the games whose sketches agree in one of
+ * MINHASH_BANDS bands (locality sensitive hashing), so the running time is
+ * roughly linear in the number of games. Pairs with an estimated similarity
+ * of at least \c threshold are joined into clusters.
+ *
+ * The clusters are returned in one vector of the form n, score, db_id1,
+ * game_id1, ..., db_idn, game_idn, followed by the next cluster, where n is
+ * the number of games in the cluster, score is the smallest similarity (in
+ * thousandths) of the pairs of games which connect the cluster, db_id is the
+ * place within glists and game_id the id within that GameList.
+ */
+std::vector<int> find_near_duplicates(std::vector<GameList* > glists, double threshold);
+
+// ------- duplicate index ----------------------------------------------------
+/*! The duplicate index is a single in-memory hash table which maps the
+ * signatures of the games of several GameList instances to triples (final
+ * position hash, db_id, game_id). Register each GameList by
+ * duplicate_index_add; its games are read from the database, and the
+ * GameList is given the number db_id. When a registered GameList processes
+ * games with the flag USE_DUPLICATE_INDEX, the duplicate check is one lookup
+ * in the index (instead of one lookup per GameList in glists), and the
+ * games which are inserted into the database are added to the index.
+ *
+ * duplicate_index_reset clears the index (and the registrations).
+ */
+void duplicate_index_reset();
+void duplicate_index_add(GameList* gl, int db_id) throw(DBError);
+int duplicate_index_size(); ///< the number of games in the duplicate index
+
+/*! Find the duplicates among the games in the duplicate index. Only
+ * signatures with more than one game are examined. The arguments and the
+ * return value are as for find_duplicates, with db_id the number which was
+ * passed to duplicate_index_add.
+ */
+std::map<std::string, std::vector<int> > duplicate_index_duplicates(bool strict, bool dupl_within_db);
+
+// ------- memory-mapped loading ----------------------------------------------
+/*! If this is switched on, GameList instances which are constructed afterwards
+ * for existing databases memory-map their .da file (read-only) instead of
+ * reading it into memory. The data of each algorithm is read when it is
+ * needed for the first time, and the final positions and move lists are used
+ * in place. So opening a database is fast, and several processes using the
+ * same database share its data via the page cache.
+ *
+ * Memory-mapping is not available on Windows; there the setting is ignored.
+ */
+void set_mmap_loading(bool MMAP);
+bool get_mmap_loading(); ///< see set_mmap_loading
+
 
 
 const int HANDI_TAG = 1;
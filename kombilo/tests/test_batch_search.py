@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_batch_search.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:10], files[10:20], files[20:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-batch%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-batch%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-batch*.d*'))
+
+
+PATTERNS = [
+    Pattern('''
+            .......
+            .......
+            .......
+            ...X...
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7),
+    Pattern('''
+            .......
+            .......
+            ..X....
+            .......
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NW_PATTERN, sizeX=7, sizeY=7),
+    Pattern('\n'.join(['.' * 19] * 19), ptype=FULLBOARD_PATTERN),
+    Pattern('''
+            .X.
+            XO.
+            ...
+            ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+    Pattern('''
+            ....
+            .XO.
+            ..X.
+            ....
+            ''', ptype=CENTER_PATTERN, sizeX=4, sizeY=4),
+    Pattern('''
+            .....
+            ..X..
+            .....
+            ''', ptype=SIDE_N_PATTERN, sizeX=5, sizeY=3),
+    Pattern('''
+            .......
+            .......
+            ..XO...
+            ...X...
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7),
+    ]
+
+
+def continuations(conts):
+    return [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label)) for c in conts]
+
+
+@pytest.mark.parametrize('parallel,options', [(0, None), (2, None), (0, (1, 1, 150)), ])
+def test_batch_equals_single_searches(K, parallel, options):
+    so = lk.SearchOptions(*options) if options else None
+    K.gamelist.reset()
+    K.gameinfoSearch("PB like 'S%' or PW like 'S%' or PB like 'K%'")
+    before = [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())]
+    assert before
+
+    results = K.batchPatternSearch(PATTERNS, so, parallel=parallel)
+
+    # the current list is not changed
+    assert [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())] == before
+
+    for p, r in zip(PATTERNS, results):
+        assert r.pattern is p
+
+        K.gamelist.reset()
+        K.gameinfoSearch("PB like 'S%' or PW like 'S%' or PB like 'K%'")
+        K.patternSearch(p, so)
+        assert r.noOfGames() == K.gamelist.noOfGames()
+        assert r.hits == set((i, K.gamelist.DBlist[i]['data'].get_currentList_entry(j)[0])
+                             for i in range(len(K.gamelist.DBlist))
+                             for j in range(K.gamelist.DBlist[i]['data'].size()))
+        assert (r.noMatches, r.noSwitched, r.Bwins, r.Wwins, r.BwinsG, r.WwinsG) == (
+                K.noMatches, K.noSwitched, K.Bwins, K.Wwins, K.BwinsG, K.WwinsG)
+        assert continuations(r.continuations) == continuations(K.continuations)
+    assert results[0].noOfGames() > 0
+
+
+def test_batch_prefilter(K):
+    K.gamelist.reset()
+    gl = K.gamelist.DBlist[0]['data']
+    size = gl.size()
+    for p in PATTERNS:
+        gl.batch_add(p)
+
+    # the full board pattern and the last corner pattern are searched for by
+    # hashing, the others are postponed until batch_prefilter
+    hashed = []
+    for k in range(len(PATTERNS)):
+        hashed.append(gl.batch_search(k))
+        gl.reset()
+    assert hashed == [False, False, True, False, False, False, True]
+
+    def ids():
+        return [gl.get_currentList_entry(j)[0] for j in range(gl.size())]
+
+    gl.batch_prefilter()
+    sizes = []
+    for k, h in enumerate(hashed):
+        if h:
+            with pytest.raises(lk.DBError):
+                gl.batch_search(k)
+            continue
+        assert gl.batch_search(k)
+        found = (ids(), gl.num_hits)
+        gl.reset()
+        gl.search(PATTERNS[k])
+        assert found == (ids(), gl.num_hits)
+        sizes.append(gl.size())
+        gl.reset()
+    gl.batch_clear()
+    assert any(0 < n < size for n in sizes), sizes
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_compressed_sgf.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import sqlite3
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+DBDIR = os.path.join(os.path.dirname(__file__), 'db')
+
+
+@pytest.fixture(scope='module', params=[1, 8])
+def K(request):
+    # with 8 copies of each game, the dictionary is trained during processing
+    sgfs = {}
+    for f in sgfFiles(SGFDIR):
+        for i in range(request.param):
+            sgfs['%d-%s' % (i, os.path.basename(f))] = readSGFFile(f)
+    create_db(sgfs, 'kombilo-plain', algos=lk.ALGO_FULLTEXT)
+    create_db(sgfs, 'kombilo-z', algos=lk.ALGO_FULLTEXT | lk.ALGO_SGF_COMPRESSED)
+
+    K = KEngine()
+    K.gamelist.populateDBlist({
+        '0': ['sgfs', DBDIR, 'kombilo-plain', ],
+        '1': ['sgfs', DBDIR, 'kombilo-z', ], })
+    K.loadDBs()
+    yield K
+
+    del K
+    os.system('rm -f %s %s' % (os.path.join(DBDIR, 'kombilo-plain.d*'), os.path.join(DBDIR, 'kombilo-z.d*')))
+
+
+def test_compressed_sgf(K):
+    plain, z = [db['data'] for db in K.gamelist.DBlist]
+    assert plain.sgfDictionary() is None
+    assert z.sgfDictionary()
+
+    db = sqlite3.connect(os.path.join(DBDIR, 'kombilo-z.db'))
+    try:
+        assert db.execute('select info from db_info where rowid = 1').fetchone()[0] == 'kombilo 0.9'
+        assert db.execute("select count(*) from GAMES where typeof(sgf) != 'blob'").fetchone()[0] == 0
+        stored = db.execute('select sum(length(sgf)) from GAMES').fetchone()[0]
+    finally:
+        db.close()
+    db = sqlite3.connect(os.path.join(DBDIR, 'kombilo-plain.db'))
+    try:
+        assert stored < db.execute('select sum(length(sgf)) from GAMES').fetchone()[0] / 2
+    finally:
+        db.close()
+
+    # getSGF decompresses transparently
+    n = plain.size()
+    assert n == z.size()
+    assert [z.getSGF(i) for i in range(n)] == [plain.getSGF(i) for i in range(n)]
+    assert K.gamelist.getSGF(0).startswith('(;')
+    assert z.exportData(range(1, n + 1)) == plain.exportData(range(1, n + 1))
+    assert z.storedSGF(n) == plain.storedSGF(n) == plain.exportData([n])[n][1]
+    assert z.storedSGF(n + 1) == b''
+
+
+@pytest.mark.parametrize('query', ["sgf like '%AB[%'", "sgf like '%RE[W+R%' and PB like 'Cho%'", "pb like '%sgf%' or SGF like '%ko%'"])
+def test_sgf_query(K, query):
+    K.gameinfoSearch(query)
+    plain, z = [db['data'] for db in K.gamelist.DBlist]
+    assert plain.size()
+    assert plain.size() == z.size()
+    K.gamelist.reset()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_date_profile.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+EXTRA_DATES = ['1990', '1990-07', '1580-05-01', '2030-01-01', '2019-12-31', '2150-03-01', '0950-02-01', '2999-12-31', 'unknown', ]
+
+
+@pytest.fixture(scope='module')
+def K():
+    sgfs = {}
+    for f in sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/*.sgf'))):
+        with open(f) as file:
+            sgfs[f] = file.read()
+    for i, dt in enumerate(EXTRA_DATES):
+        sgfs['extra%d.sgf' % i] = '(;GM[1]FF[4]SZ[19]PB[Black %d]PW[White]DT[%s]RE[B+R];B[pd];W[dp];B[q%s])' % (i, dt, 'abcdefghi'[i])
+    create_db(sgfs, 'kombilo-dp')
+
+    K = KEngine()
+    K.gamelist.populateDBlist({'1': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-dp', ], })
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-dp.d*'))
+
+
+INTERVALS = [(0, 1990), (1990, 1991), (1991, 1998), (1998, 2010), (2010, 2020), (2020, 3000), ]
+# intervals containing only a part of the years before lk.DATE_PROFILE_START or
+# from lk.DATE_PROFILE_END on
+PARTIAL_INTERVALS = [(1000, 1990), (1590, 1600), (2100, 2200), (2020, 2151), ]
+
+
+def sql_profile(K, intervals=INTERVALS):
+    return [(i, K.gameinfoSearchNC("date >= '%d-00-00' and date < '%d-00-00'" % i)) for i in intervals]
+
+
+def forbid_sql(K, monkeypatch):
+    def fail(*args):
+        raise AssertionError('SQL query')
+    monkeypatch.setattr(K, 'gameinfoSearchNC', fail)
+    for db in K.gamelist.DBlist:
+        monkeypatch.setattr(db['data'], 'countGames', fail)
+
+
+@pytest.mark.parametrize('query', [None, "PB like 'Cho%' or PB like 'Black%'", "date >= '1998-00-00'", "date < '1600-00-00' or date >= '2100-00-00'", ])
+def test_date_profile(K, query, monkeypatch):
+    K.gamelist.reset()
+    if query:
+        K.gameinfoSearch(query)
+    assert K.dateProfile(PARTIAL_INTERVALS) == sql_profile(K, PARTIAL_INTERVALS)
+    expected = sql_profile(K)
+    forbid_sql(K, monkeypatch)
+    assert K.dateProfile(INTERVALS) == expected
+    assert sum(y for x, y in K.dateProfile(INTERVALS)) == K.gamelist.noOfGames()
+    K.dateProfile()
+
+
+def test_date_profile_whole_db(K, monkeypatch):
+    K.gamelist.reset()
+    expected = sql_profile(K)
+    expected_partial = sql_profile(K, PARTIAL_INTERVALS)
+    K.gameinfoSearch("PB like 'Cho%'")
+    assert K.dateProfile(PARTIAL_INTERVALS, wholeDB=True) == expected_partial
+    forbid_sql(K, monkeypatch)
+    assert K.dateProfile(INTERVALS, wholeDB=True) == expected
+    assert [x for x, y, z in K.dateProfileRelative()] == [x for x, y in K.dateProfile()]
+    assert [z for x, y, z in K.dateProfileRelative()] == [y for x, y in K.dateProfile(wholeDB=True)]
+
+
+def test_dates_relative(K):
+    K.gamelist.reset()
+    d_all = K.gamelist.countBy('date', key=lambda d: (d // 10000 - lk.DATE_PROFILE_START) * 12 + max(d // 100 % 100, 1) - 1)
+    K.gameinfoSearch("date >= '1998-00-00'")
+    current = K.gamelist.countBy('date', key=lambda d: (d // 10000 - lk.DATE_PROFILE_START) * 12 + max(d // 100 % 100, 1) - 1)
+
+    for fr, to, chunk_size in [(0, 0, 1), ((1990 - lk.DATE_PROFILE_START) * 12, (2000 - lk.DATE_PROFILE_START) * 12 - 1, 5), (4000, 5000, 12), ]:
+        result = K.gamelist.dates_relative(fr, to, chunk_size)
+        to = to or DateHistogram.SIZE
+        assert len(result) == (to - fr) // chunk_size
+        for i, r in enumerate(result):
+            months = range(fr + i * chunk_size, fr + (i + 1) * chunk_size)
+            c, a = sum(current.get(m, 0) for m in months), sum(d_all.get(m, 0) for m in months)
+            assert r == (c / a if a else 0)
+
+
+def test_date_histogram():
+    h = DateHistogram()
+    h.counts[0] = 2
+    h.counts[13] = 3
+    h2 = h + h
+    assert h2.months(0, DateHistogram.SIZE) == 10
+    assert h2.years(lk.DATE_PROFILE_START + 1, lk.DATE_PROFILE_END + 5) == 6
+    assert h2.years(0, lk.DATE_PROFILE_START + 1) == 4
+    assert h2.chunks(0, 24, 12) == [4, 6]
+    assert h.months(14, 3) == 0
+
+    h = DateHistogram(list(range(DateHistogram.SIZE)) + [3, 4])
+    h2 = h + h
+    assert (h2.before, h2.after) == (6, 8)
+    assert h2.counts[5] == 10
+    assert h2.years(0, 3000) == h2.months(0, DateHistogram.SIZE)
+
+
+def test_dates_after_processing():
+    sgf = '(;GM[1]FF[4]SZ[19]PB[Black]PW[White]DT[%s]RE[B+R];B[pd];W[dp];B[%s])'
+    create_db(dict(('first%d.sgf' % i, sgf % (dt, 'qa'[i])) for i, dt in enumerate(['1580', '1990-05', ])), 'kombilo-dp2')
+    gl = lkGameList(os.path.join(os.path.dirname(__file__), 'db/kombilo-dp2.db'))
+    gl.start_processing()
+    for i, dt in enumerate(['1990-05', '2150', 'unknown', ]):
+        gl.process(sgf % (dt, 'bcd'[i]), 'sgfs', 'second%d.sgf' % i, lk.vectorGL(), '', 0)
+    gl.finalize_processing()
+    h = gl.datesAll()
+    assert (h.before, h.after) == (2, 1)
+    assert h.months((1990 - lk.DATE_PROFILE_START) * 12 + 4, (1990 - lk.DATE_PROFILE_START) * 12 + 5) == 2
+    assert sum(h.counts) + h.before + h.after == gl.size_all() == 5
+    del gl
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-dp2.d*'))
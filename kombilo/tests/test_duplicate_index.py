@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_duplicate_index.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import shutil
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+
+
+def pairs(d):
+    return sorted((k, tuple(sorted(zip(v[::2], v[1::2])))) for k, v in d.items())
+
+
+@pytest.fixture
+def engine(tmp_path):
+    files = sgfFiles(SGFDIR)
+    for i, fs in enumerate([files[:20], files[15:35] + files[:2], files[30:40]]):
+        sgfdir = tmp_path / ('sgfs%d' % i)
+        sgfdir.mkdir()
+        for f in fs:
+            shutil.copy(f, str(sgfdir))
+        # a duplicate within the database
+        shutil.copy(fs[-1], os.path.join(str(sgfdir), 'zz-' + os.path.basename(fs[-1])))
+
+    K = KEngine()
+    messages = bufferedMessages()
+    for i in range(3):
+        K.addDB(str(tmp_path / ('sgfs%d' % i)), (str(tmp_path), 'db%d' % i), messages=messages)
+    K.loadDBs()
+    K.messages = messages
+    return K
+
+
+@pytest.mark.parametrize('strict', [True, False])
+@pytest.mark.parametrize('dupl_within_db', [True, False])
+def test_find_duplicates(engine, strict, dupl_within_db):
+    dbnames = [db['data'].dbname for db in engine.gamelist.DBlist]
+    d = engine.find_duplicates(strict, dupl_within_db)
+    assert pairs(d) == pairs(lk.find_duplicates(dbnames, strict, dupl_within_db))
+    assert d
+
+    # disabled databases are not taken into account
+    engine.gamelist.DBlist[1]['disabled'] = 1
+    engine.gamelist.DBlist[1]['data'] = None
+    assert pairs(engine.find_duplicates(strict, dupl_within_db)) == pairs(lk.find_duplicates([dbnames[0], dbnames[2]], strict, dupl_within_db))
+
+
+def test_process(engine, tmp_path):
+    duplicates = [l for l in ''.join(engine.messages.text).splitlines() if l.startswith('Duplicate ...')]
+    # 7 in db1 (from db0), 5 in db2 (from db1), and one within each database
+    assert len(duplicates) == 15
+    engine.find_duplicates()  # loadDBs replaced the lkGameList instances, so the index is built anew
+    assert lk.duplicate_index_size() == sum(db['data'].size_all() for db in engine.gamelist.DBlist)
+
+    # adding a database extends the index
+    resets = duplicateIndex.resets
+    sgfdir = tmp_path / 'sgfs3'
+    sgfdir.mkdir()
+    for f in sgfFiles(str(tmp_path / 'sgfs0'))[:4]:
+        shutil.copy(f, str(sgfdir))
+    messages = bufferedMessages()
+    engine.addDB(str(sgfdir), (str(tmp_path), 'db3'), acceptDupl=False, messages=messages)
+    assert len([l for l in ''.join(messages.text).splitlines() if l.startswith('Duplicate ...')]) == 4
+    assert duplicateIndex.resets == resets
+    assert len(engine.gamelist.DBlist) == 3  # all games were omitted
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_export.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import shutil
+import tarfile
+import zipfile
+
+import pytest
+
+from ..kombiloNG import *
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+
+
+@pytest.fixture(params=[False, True])
+def engine(request, tmp_path):
+    sgfdir = tmp_path / 'sgfs'
+    sgfdir.mkdir()
+    for f in sgfFiles(SGFDIR)[:10]:
+        shutil.copy(f, str(sgfdir))
+    # a collection of two games
+    with open(str(sgfdir / 'collection.sgf'), 'w') as file:
+        file.write(readSGFFile(sgfFiles(SGFDIR)[10]).strip() + '\n' + readSGFFile(sgfFiles(SGFDIR)[11]).strip())
+
+    K = KEngine()
+    K.addDB(str(sgfdir), (str(tmp_path), 'db'), acceptDupl=True, sgfInDB=request.param, messages=bufferedMessages())
+    K.loadDBs()
+    K.gameinfoSearch("filename like 'collection%' or filename like 'Gosei%'")
+    K.sgfInDB = request.param
+    return K
+
+
+def test_export_folder(engine, tmp_path):
+    target = tmp_path / 'export'
+    target.mkdir()
+    (target / 'Gosei-Gos23-T01.sgf').write_text('existing')
+    names = sorted(os.listdir(str(tmp_path / 'sgfs')))
+    gosei = [n for n in names if n.startswith('Gosei')]
+    assert engine.exportCurrentGames(str(target), fromDB=True) == (len(gosei) - 1) + (2 if engine.sgfInDB else 1)
+    # existing files are not overwritten
+    assert (target / 'Gosei-Gos23-T01.sgf').read_text() == 'existing'
+    for n in gosei[1:]:
+        assert (target / n).read_bytes() == (tmp_path / 'sgfs' / n).read_bytes()
+    if engine.sgfInDB:
+        # the games of the collection are exported separately, from the database
+        assert sorted(n for n in os.listdir(str(target)) if n.startswith('collection')) == ['collection-1.sgf', 'collection.sgf']
+    else:
+        assert (target / 'collection.sgf').read_bytes() == (tmp_path / 'sgfs' / 'collection.sgf').read_bytes()
+
+    target = tmp_path / 'linked'
+    target.mkdir()
+    engine.exportCurrentGames(str(target), hardlink=True)
+    assert (target / gosei[0]).read_bytes() == (tmp_path / 'sgfs' / gosei[0]).read_bytes()
+
+
+def test_export_archives(engine, tmp_path):
+    n = engine.gamelist.noOfGames()
+
+    engine.exportCurrentGames(str(tmp_path / 'games.zip'), fromDB=True)
+    with zipfile.ZipFile(str(tmp_path / 'games.zip')) as archive:
+        zipped = dict((name, archive.read(name)) for name in archive.namelist())
+
+    engine.exportCurrentGames(str(tmp_path / 'games.tar.gz'), fromDB=True)
+    with tarfile.open(str(tmp_path / 'games.tar.gz')) as archive:
+        tarred = dict((m.name, archive.extractfile(m).read()) for m in archive.getmembers())
+    assert zipped == tarred
+    assert len(zipped) == (n if engine.sgfInDB else n - 1)
+    assert zipped['Gosei-Gos23-T02.sgf'] == (tmp_path / 'sgfs' / 'Gosei-Gos23-T02.sgf').read_bytes()
+
+    # all games in one collection, in the order of the game list
+    assert engine.exportCurrentGames(str(tmp_path / 'all.sgf'), fromDB=True) == len(zipped)
+    c = Cursor(readSGFFile(str(tmp_path / 'all.sgf')), 1)
+    assert c.root.numChildren == n
+    players = [c.getRootNode(i)['PB'][0] for i in range(n)]
+    expected = [engine.gamelist.getProperty(i, GL_PB) for i in range(n)]
+    if engine.sgfInDB:
+        assert players == expected
+    else:
+        # the collection file is exported as a whole, at the place of its first game
+        assert sorted(players) == sorted(expected)
+
+
+def test_copy_to_folder(engine, tmp_path):
+    # the original SGF files are copied, also for databases with sgfInDB
+    target = tmp_path / 'copy'
+    target.mkdir()
+    engine.copyCurrentGamesToFolder(str(target))
+    names = sorted(os.listdir(str(tmp_path / 'sgfs')))
+    assert sorted(os.listdir(str(target))) == [n for n in names if n.startswith('Gosei') or n == 'collection.sgf']
+    for n in os.listdir(str(target)):
+        assert (target / n).read_bytes() == (tmp_path / 'sgfs' / n).read_bytes()
+
+    engine.exportCurrentGames(str(tmp_path / 'games.zip'))
+    with zipfile.ZipFile(str(tmp_path / 'games.zip')) as archive:
+        assert sorted(archive.namelist()) == sorted(os.listdir(str(target)))
+
+
+def test_copy_file(tmp_path):
+    src = tmp_path / 'a.sgf'
+    src.write_bytes(b'(;GM[1]' + b';B[aa]' * 100000 + b')')
+    for hardlink in [False, True]:
+        dst = tmp_path / ('b%d.sgf' % hardlink)
+        copyFile(str(src), str(dst), hardlink)
+        assert dst.read_bytes() == src.read_bytes()
+    assert os.stat(str(src)).st_nlink == 2
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_fulltext.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+def engine(dbname, algos):
+    sgfs = {}
+    for f in sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/*.sgf'))):
+        with open(f) as file:
+            sgfs[f] = file.read()
+    create_db(sgfs, dbname, algos)
+    K = KEngine()
+    K.gamelist.populateDBlist({'1': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), dbname, ], })
+    K.loadDBs()
+    return K
+
+
+@pytest.fixture(scope='module')
+def engines():
+    yield engine('kombilo-fts', lk.ALGO_FULLTEXT), engine('kombilo-nofts', None)
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-*fts.d*'))
+
+
+def games(K):
+    return sorted(K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames()))
+
+
+QUERIES = [
+        "PB like '%Cho%'",
+        "pw like '%kobayashi%' or PB like 'Kato%'",
+        "EV like '%Gosei%' and not PW like '%Koichi%'",
+        "sgf like '%Oza%'",
+        "PB like '%Ch%'",
+        "PW like 'O''Neil%'",
+        "date >= '1998-00-00'",
+        ]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_fulltext_search(engines, query):
+    K1, K2 = engines
+    for K in engines:
+        K.gamelist.reset()
+        K.gameinfoSearch(query)
+    assert games(K1) == games(K2)
+    assert K1.gameinfoSearchNC(query) == K2.gameinfoSearchNC(query) == K1.gamelist.noOfGames()
+
+
+def test_fulltext_query(engines):
+    K1, K2 = engines
+    gl1, gl2 = K1.gamelist.DBlist[0]['data'], K2.gamelist.DBlist[0]['data']
+    assert gl1.fulltextColumns() == set(['PB', 'PW', 'EV', 'SGF'])
+    assert gl2.fulltextColumns() == set()
+
+    assert 'games_fts' in gl1.fulltextQuery("PB like '%Cho%'")
+    assert gl2.fulltextQuery("PB like '%Cho%'") == "PB like '%Cho%'"
+    # patterns without 3 consecutive characters, or with _, are left alone
+    for q in ["PB like '%Ch%'", "PB like 'Cho_Chikun'", "date >= '1998-00-00'", "PB not like '%Cho%'", ]:
+        assert gl1.fulltextQuery(q) == q
+
+
+def test_fulltext_options(engines):
+    K1, K2 = engines
+    dbh = sqlite3.connect(uu(K1.gamelist.DBlist[0]['data'].dbname))
+    pop = lk.ProcessOptions(dbh.execute('select info from db_info where rowid = 2').fetchone()[0])
+    dbh.close()
+    assert pop.algos & lk.ALGO_FULLTEXT
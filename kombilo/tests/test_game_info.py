@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_game_info.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+
+
+def rootNodeOfFile(filename):
+    c = Cursor(readSGFFile(filename), 1)
+    root = c.getRootNode(0)
+    return dict((p, ', '.join(root[p])) for p in ROOT_NODE_PROPERTIES if p in root)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    sgfdir = tmp_path / 'sgfs'
+    shutil.copytree(SGFDIR, str(sgfdir))
+    K = KEngine()
+    K.addDB(str(sgfdir), (str(tmp_path), 'db'), sgfInDB=False, messages=bufferedMessages())
+    K.loadDBs()
+    return K
+
+
+def test_root_node(engine, tmp_path):
+    gl = engine.gamelist.DBlist[0]['data']
+    cols = gl.columns()
+    files = dict((ID, os.path.join(cols.names[cols.path[r]], cols.filename[r])) for r, ID in enumerate(cols.ids))
+    expected = dict((ID, rootNodeOfFile(f)) for ID, f in files.items())
+    assert any('GC' in node for node in expected.values())
+
+    # the game info does not depend on the SGF files
+    shutil.rmtree(str(tmp_path / 'sgfs'))
+    for ID in files:
+        assert gl.rootNode(ID) == expected[ID]
+
+    info = engine.gamelist.printGameInfo(0)[0]
+    ID, pos = gl.get_currentList_entry(0)
+    assert info.startswith(expected[ID]['PW'])
+    for p in expected[ID]:
+        if p not in ['RE', 'GC', ]:  # RE is translated, line breaks in GC are removed
+            assert expected[ID][p] in info
+
+
+def test_root_node_cache(engine):
+    gl = engine.gamelist.DBlist[0]['data']
+    gl.rootNodeCacheSize = 5
+    ids = list(gl.columns().ids)
+    for ID in ids:
+        gl.rootNode(ID)
+    assert list(gl._rootNodes[2]) == ids[-5:]
+    node = gl.rootNode(ids[-5])
+    assert gl.rootNode(ids[-5]) is node
+    assert list(gl._rootNodes[2])[-1] == ids[-5]
+
+
+def test_root_node_without_columns():
+    # databases which store only PW, PB, RE, DT, EV: the other properties are
+    # taken from the root node in the sgf column
+    sgfs = {}
+    for f in sgfFiles(SGFDIR):
+        sgfs[os.path.basename(f)] = readSGFFile(f)
+    create_db(sgfs, 'kombilo-rn')
+    try:
+        K = KEngine()
+        K.gamelist.populateDBlist({'0': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-rn', ], })
+        K.loadDBs()
+        gl = K.gamelist.DBlist[0]['data']
+        cols = gl.columns()
+        for r, ID in enumerate(cols.ids):
+            assert gl.rootNode(ID) == rootNodeOfFile(os.path.join(SGFDIR, cols.filename[r]))
+        connection = gl._rootNodeDB
+        assert connection is not None
+
+        # if the stored SGF source cannot be decoded, only the columns are used
+        db = sqlite3.connect(gl.dbname)
+        db.execute('update GAMES set sgf = cast(? as text) where id = ?', (b'(;GC[\xff])', cols.ids[0]))
+        db.commit()
+        db.close()
+        gl.invalidateCache()
+        expected = rootNodeOfFile(os.path.join(SGFDIR, cols.filename[0]))
+        assert gl.rootNode(cols.ids[0]) == dict((p, v) for p, v in expected.items() if p in ['PW', 'PB', 'RE', 'DT', 'EV', ])
+        assert gl._rootNodeDB is connection
+        del K, gl
+    finally:
+        os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-rn.d*'))
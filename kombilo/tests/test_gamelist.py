@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_gamelist.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:15], files[15:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-gl%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-gl%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-gl*.d*'))
+
+
+def eager_index(gamelist, sortcrit, sortReverse):
+    # the game index as computed by previous versions of GameList.update
+    gameIndex = []
+    for i, db in enumerate(gamelist.DBlist):
+        if db['disabled']:
+            continue
+        gameIndex.extend([(db['data'].getCurrent(x)[sortcrit], i, x) for x in range(db['data'].size())])
+    gameIndex.sort()
+    if sortReverse:
+        gameIndex.reverse()
+    return gameIndex
+
+
+@pytest.mark.parametrize('sortcrit', [GL_DATE, GL_FILENAME, GL_PB, GL_PW, GL_RESULT])
+@pytest.mark.parametrize('sortReverse', [False, True])
+def test_update_sorting(K, sortcrit, sortReverse):
+    K.gamelist.reset()
+    K.patternSearch(Pattern('''
+            .......
+            .......
+            .......
+            ...X...
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7))
+    K.gamelist.update(sortcrit, sortReverse)
+
+    expected = eager_index(K.gamelist, sortcrit, sortReverse)
+    assert 0 < len(expected) < K.gamelist.DBlist[0]['data'].size_all() + K.gamelist.DBlist[1]['data'].size_all()
+    assert len(K.gamelist.gameIndex) == len(expected) == K.gamelist.noOfGames()
+    assert list(K.gamelist.gameIndex) == expected
+    assert K.gamelist.gameIndex[-1] == expected[-1]
+    assert K.gamelist.gameIndex[2:5] == expected[2:5]
+    for i in range(len(expected)):
+        assert K.gamelist.getIndex(i) == expected[i][-2:]
+    assert K.gamelist.getIndex(len(expected)) == (-1, -1)
+
+
+def test_update_disabled(K):
+    K.gamelist.DBlist[0]['disabled'] = 1
+    try:
+        K.gamelist.reset()
+        assert len(K.gamelist.gameIndex) == K.gamelist.DBlist[1]['data'].size()
+        assert set(db for key, db, x in K.gamelist.gameIndex) == set([1])
+    finally:
+        K.gamelist.DBlist[0]['disabled'] = 0
+        K.gamelist.reset()
+
+
+def test_columns(K):
+    K.gamelist.reset()
+    K.gameinfoSearch("PB like 'K%' or PW like 'O%'")
+    n = K.gamelist.noOfGames()
+    assert n > 0
+
+    assert K.gamelist.currentColumn('PB') == [K.gamelist.getProperty(i, GL_PB) for i in range(n)]
+    assert K.gamelist.currentColumn('PW') == [K.gamelist.getProperty(i, GL_PW) for i in range(n)]
+    assert K.gamelist.currentColumn('date') == [
+            GameInfoColumns.dateAsInt(K.gamelist.getProperty(i, GL_DATE)) for i in range(n)]
+    assert K.gamelist.currentColumn('winner') == [K.gamelist.getProperty(i, GL_RESULT) for i in range(n)]
+
+    counts = K.gamelist.countBy('PB')
+    assert sum(counts.values()) == n
+    for pb, c in counts.items():
+        assert c == len([i for i in range(n) if K.gamelist.getProperty(i, GL_PB) == pb])
+    winners = K.gamelist.countBy('winner')
+    assert winners.get('B', 0) == K.gamelist.BwinsG
+    assert winners.get('W', 0) == K.gamelist.WwinsG
+    assert K.gamelist.countBy('date', key=lambda d: d // 10000) == dict(
+            (y, len([d for d in K.gamelist.currentColumn('date') if d // 10000 == y]))
+            for y in set(d // 10000 for d in K.gamelist.currentColumn('date')))
+
+    files = K.gamelist.listOfCurrentSGFFiles()
+    assert len(files) == n
+    assert all(f.endswith('.sgf') for f in files)
+
+
+def test_columns_row(K):
+    K.gamelist.reset()
+    gl = K.gamelist.DBlist[0]['data']
+    cols = gl.columns()
+    assert len(cols) == gl.size_all()
+    ID, pos = gl.get_currentList_entry(0)
+    row = cols.row(ID)
+    assert cols.ids[row] == ID
+    assert cols.value('PB', row) == gl[pos][GL_PB]
+    assert cols.row(-1) == cols.row(len(cols.rowOf)) == -1
+    assert gl.columns() is cols
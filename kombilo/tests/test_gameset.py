@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_gameset.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:15], files[15:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-gs%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-gs%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-gs*.d*'))
+
+
+def pattern(p):
+    return Pattern('''
+            .......
+            .......
+            .......
+            %s
+            .......
+            .......
+            .......
+            ''' % p, ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7)
+
+
+def games(K):
+    return set(K.gamelist.get_data(i).split(':')[0] for i in range(K.gamelist.noOfGames()))
+
+
+def search(K, p):
+    K.gamelist.reset()
+    K.patternSearch(pattern(p))
+    return K.gamelist.currentSet(), games(K)
+
+
+def test_combine(K):
+    A, gA = search(K, '...X...')
+    B, gB = search(K, '....X..')
+    K.gamelist.reset()
+    K.gameinfoSearch("PW like 'Kobayashi%' or PB like 'Kobayashi%'")
+    C, gC = K.gamelist.currentSet(), games(K)
+    assert gA and gB and gC and gA != gB
+    assert len(A) == len(gA)
+
+    K.gamelist.reset()
+    all_games = games(K)
+    assert len(K.gamelist.currentSet()) == 30
+    assert ~(A & ~A) == K.gamelist.currentSet()
+    assert len(A ^ A) == 0
+
+    for s, expected in [
+            ((A | B) - C, (gA | gB) - gC),
+            (A & B, gA & gB),
+            (A ^ C, gA ^ gC),
+            (~A, all_games - gA),
+            ]:
+        K.gamelist.setCurrent(s)
+        assert games(K) == expected
+        assert K.gamelist.noOfGames() == len(s) == len(expected)
+        assert K.gamelist.currentSet() == s
+        winners = list(K.gamelist.currentColumn('winner'))
+        assert K.gamelist.BwinsG == winners.count('B')
+        assert K.gamelist.WwinsG == winners.count('W')
+
+
+def test_hits_kept(K):
+    A, gA = search(K, '...X...')
+    hits = dict((K.gamelist.get_data(i).split(':')[0], K.gamelist.get_data(i)) for i in range(K.gamelist.noOfGames()))
+    B, gB = search(K, '....X..')
+    K.gamelist.reset()
+    K.patternSearch(pattern('...X...'))
+    K.gamelist.setCurrent(A & B)
+    assert games(K) == gA & gB
+    for i in range(K.gamelist.noOfGames()):
+        entry = K.gamelist.get_data(i)
+        assert entry == hits[entry.split(':')[0]]
+
+
+def test_snapshot_set(K):
+    A, gA = search(K, '...X...')
+    snapshot_ids = [(i, db['data'].snapshot()) for i, db in enumerate(K.gamelist.DBlist)]
+    K.gamelist.reset()
+    assert K.gamelist.snapshotSet(snapshot_ids) == A
+    for i, sid in snapshot_ids:
+        K.gamelist.DBlist[i]['data'].delete_snapshot(sid)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_hash_side_center.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    sgfs = {}
+    for f in glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')):
+        with open(f) as file:
+            sgfs[f] = file.read()
+    create_db(sgfs, 'kombilo-hsc', algos=lk.ALGO_HASH_SIDE | lk.ALGO_HASH_CENTER)
+
+    K = KEngine()
+    K.gamelist.populateDBlist({'1': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-hsc', ], })
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-hsc.d*'))
+
+
+PATTERNS = [
+    # side pattern, may be anywhere along the lower edge
+    Pattern('''
+            ........
+            ..O.....
+            ..X.X...
+            ........
+            ........
+            ''', ptype=SIDE_S_PATTERN, sizeX=8, sizeY=5),
+    # the same pattern, may be anywhere along the left edge
+    Pattern('''
+            .....
+            .....
+            ..XO.
+            .....
+            ..X..
+            .....
+            .....
+            .....
+            ''', ptype=SIDE_W_PATTERN, sizeX=5, sizeY=8),
+    # center patterns
+    Pattern('''
+            .X.
+            XO.
+            ...
+            ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+    Pattern('''
+            ....
+            .XO.
+            .OX.
+            ....
+            ''', ptype=CENTER_PATTERN, sizeX=4, sizeY=4),
+    Pattern('''
+            .....
+            ..X..
+            .XOO.
+            ..X..
+            .....
+            ''', ptype=CENTER_PATTERN, sizeX=5, sizeY=5),
+    ]
+
+
+def search(K, p, algos, fixedColor=0):
+    so = lk.SearchOptions(fixedColor, 0)
+    so.algos = algos
+    K.gamelist.reset()
+    K.patternSearch(p, so)
+    return (sorted(K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())),
+            K.noMatches, K.noSwitched,
+            [(c.x, c.y, c.B, c.W) for c in K.continuations])
+
+
+def test_process_options_string():
+    pop = lk.ProcessOptions()
+    pop.algo_hash_side_maxNumStones = 10
+    pop.algo_hash_center_maxNumStones = 5
+    pop2 = lk.ProcessOptions(pop.asString())
+    assert pop2.algo_hash_side_maxNumStones == 10
+    assert pop2.algo_hash_center_maxNumStones == 5
+    assert pop2.rootNodeTags == pop.rootNodeTags
+
+    # strings written by earlier versions do not contain these values
+    pop3 = lk.ProcessOptions('tt0|31|50|20|PB,PW')
+    assert pop3.algo_hash_corner_maxNumStones == 20
+    assert pop3.algo_hash_side_maxNumStones == 12
+    assert pop3.rootNodeTags == 'PB,PW'
+
+
+@pytest.mark.parametrize('algo', [lk.ALGO_HASH_SIDE, lk.ALGO_HASH_CENTER])
+@pytest.mark.parametrize('fixedColor', [0, 1])
+@pytest.mark.parametrize('p', range(len(PATTERNS)))
+def test_hash_equals_finalpos(K, p, algo, fixedColor):
+    pattern = PATTERNS[p]
+    expected = search(K, pattern, lk.ALGO_FINALPOS | lk.ALGO_MOVELIST, fixedColor)
+    result = search(K, pattern, lk.ALGO_FINALPOS | lk.ALGO_MOVELIST | algo, fixedColor)
+    assert result == expected
+
+
+def test_found_games(K):
+    for p in PATTERNS[:3]:
+        assert search(K, p, lk.ALGO_FINALPOS | lk.ALGO_MOVELIST | lk.ALGO_HASH_SIDE | lk.ALGO_HASH_CENTER)[1] > 0
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_mmap.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+DBPATH = os.path.join(os.path.dirname(__file__), 'db')
+
+
+@pytest.fixture(scope='module')
+def sgfs():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    sgfs = {}
+    for f in files:
+        with open(f) as file:
+            sgfs[f] = file.read()
+    create_db(sgfs, 'kombilo-mmap')
+    yield sgfs
+
+    os.system('rm -f %s' % os.path.join(DBPATH, 'kombilo-mmap*.d*'))
+
+
+def engine(mmap):
+    K = KEngine()
+    K.gamelist.populateDBlist({'0': ['sgfs', DBPATH, 'kombilo-mmap', ], })
+    K.loadDBs(mmap=mmap)
+    return K
+
+
+def search_results(K):
+    return (
+            K.gamelist.noOfGames(), K.noMatches, K.noSwitched,
+            K.Bwins, K.Wwins, K.BwinsG, K.WwinsG,
+            [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label)) for c in K.continuations],
+            [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())],
+            )
+
+
+PATTERNS = [
+    Pattern('''
+            .......
+            .......
+            ...X...
+            .......
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7),
+    Pattern('\n'.join(['.' * 19] * 19), ptype=FULLBOARD_PATTERN),
+    Pattern('''
+            .X.
+            XO.
+            ...
+            ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+    ]
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_mmap_search(sgfs, pattern):
+    K = engine(False)
+    K.patternSearch(pattern)
+    expected = search_results(K)
+    assert expected[0] > 0
+
+    Km = engine(True)
+    assert not lk.get_mmap_loading()
+    Km.patternSearch(pattern)
+    assert search_results(Km) == expected
+
+
+def test_mmap_signature_search(sgfs):
+    K = engine(True)
+    sig = K.gamelist.printSignature(0)
+    filename = K.gamelist.getProperty(0, GL_FILENAME)
+    K.signatureSearch(sig)
+    assert K.gamelist.noOfGames() >= 1
+    assert filename in [K.gamelist.getProperty(i, GL_FILENAME) for i in range(K.gamelist.noOfGames())]
+
+
+def test_mmap_process(sgfs):
+    # add games to a database whose data is memory-mapped
+
+    create_db(dict(list(sgfs.items())[:10]), 'kombilo-mmap-proc')
+    lk.set_mmap_loading(True)
+    try:
+        gl = lkGameList(os.path.join(DBPATH, 'kombilo-mmap-proc.db'))
+    finally:
+        lk.set_mmap_loading(False)
+    gls = lk.vectorGL()
+    gl.start_processing()
+    for fn, sgf in list(sgfs.items())[10:]:
+        gl.process(sgf, 'sgfs', fn, gls, '', lk.CHECK_FOR_DUPLICATES)
+    gl.finalize_processing()
+
+    K = engine(False)
+    pattern = PATTERNS[0]
+    K.patternSearch(pattern)
+    expected = search_results(K)[1:8]
+    gl.reset()
+    K.gamelist.DBlist[0]['data'] = gl
+    K.gamelist.reset()
+    K.patternSearch(pattern)
+    assert search_results(K)[1:8] == expected
+    del K
+    del gl
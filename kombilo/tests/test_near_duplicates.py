@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_near_duplicates.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import re
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+
+
+def transform(sgf, f):
+    # apply the symmetry f to all moves
+    def repl(m):
+        x, y = ord(m.group(2)) - 97, ord(m.group(3)) - 97
+        return '%s[%s%s]' % (m.group(1), chr(lk.Pattern.flipsX(f, x, y, 18, 18) + 97), chr(lk.Pattern.flipsY(f, x, y, 18, 18) + 97))
+    return re.sub(r'(;[BW])\[([a-s])([a-s])\]', repl, sgf)
+
+
+def truncate(sgf, n):
+    # keep the first n moves
+    nodes = sgf.split(';')
+    return ';'.join(nodes[:n + 2]).rstrip() + ')'
+
+
+@pytest.fixture(scope='module', params=[False, True])
+def K(request):
+    files = sorted(glob.glob(os.path.join(SGFDIR, '*.sgf')))
+    sgfs = {}
+    for f in files:
+        with open(f) as file:
+            sgfs[os.path.basename(f)] = file.read()
+    sgfs['rotated.sgf'] = transform(sgfs['Gosei-Gos23-T03.sgf'], 5)
+    sgfs['truncated.sgf'] = truncate(sgfs['Gosei-Gos23-T05.sgf'], 150)
+    sgfs['both.sgf'] = truncate(transform(sgfs['Agon-Agon02-2.sgf'], 3), 200)
+    create_db(sgfs, 'kombilo-nd', algos=lk.ALGO_MINHASH)
+
+    K = KEngine()
+    K.gamelist.populateDBlist({'0': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-nd', ], })
+    K.loadDBs(mmap=request.param)
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-nd.d*'))
+
+
+def test_near_duplicates(K):
+    cols = K.gamelist.DBlist[0]['data'].columns()
+    clusters = K.find_near_duplicates(0.6)
+    found = dict((tuple(sorted(cols.filename[cols.row(i)] for db, i in games)), score) for score, games in clusters)
+    assert sorted(found) == [('Agon-Agon02-2.sgf', 'both.sgf'), ('Gosei-Gos23-T03.sgf', 'rotated.sgf'), ('Gosei-Gos23-T05.sgf', 'truncated.sgf'), ]
+    # only the first MINHASH_MOVES moves are taken into account
+    assert found[('Gosei-Gos23-T03.sgf', 'rotated.sgf')] == found[('Agon-Agon02-2.sgf', 'both.sgf')] == 1
+    assert 0.6 <= found[('Gosei-Gos23-T05.sgf', 'truncated.sgf')] < 1
+    assert [score for score, games in clusters] == sorted(found.values(), reverse=True)
+
+    # with a higher threshold, the truncated game is not found
+    assert [len(games) for score, games in K.find_near_duplicates(0.99)] == [2, 2]
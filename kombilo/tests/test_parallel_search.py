@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_parallel_search.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:10], files[10:20], files[20:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-par%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-par%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-par*.d*'))
+
+
+def search_results(K):
+    return (
+            K.gamelist.noOfGames(), K.noMatches, K.noSwitched,
+            K.Bwins, K.Wwins, K.BwinsG, K.WwinsG,
+            [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label)) for c in K.continuations],
+            [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())],
+            )
+
+
+@pytest.mark.parametrize('pattern', [
+    Pattern('''
+            .......
+            .......
+            .......
+            ...X...
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7),
+    Pattern('''
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ...................
+            ''', ptype=FULLBOARD_PATTERN),
+    Pattern('''
+            .X.
+            XO.
+            ...
+            ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+    ])
+def test_parallel_equals_serial(K, pattern):
+    assert len(K.gamelist.DBlist) == 3
+
+    K.gamelist.reset()
+    K.patternSearch(pattern)
+    serial = search_results(K)
+
+    K.gamelist.reset()
+    K.patternSearch(pattern, parallel=3)
+    assert search_results(K) == serial
+    assert serial[0] > 0
+
+    # searches on the current list are narrowed in the same way
+    K.patternSearch(pattern, parallel=2)
+    narrowed = search_results(K)
+    K.gamelist.reset()
+    K.patternSearch(pattern)
+    K.patternSearch(pattern)
+    assert search_results(K) == narrowed
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_pattern_search_nc.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:15], files[15:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-nc%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-nc%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-nc*.d*'))
+
+
+PATTERNS = [
+    Pattern('''
+            .......
+            .......
+            ..X....
+            .......
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NW_PATTERN, sizeX=7, sizeY=7),
+    Pattern('\n'.join(['.' * 19] * 19), ptype=FULLBOARD_PATTERN),
+    Pattern('''
+            .X.
+            XO.
+            ...
+            ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+    ]
+
+START = Pattern('''
+                .......
+                .......
+                .......
+                ...X...
+                .......
+                .......
+                .......
+                ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7)
+
+
+def continuations(conts):
+    return [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label)) for c in conts]
+
+
+def state(K):
+    return ([K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())],
+            (K.noMatches, K.noSwitched, K.Bwins, K.Wwins, K.BwinsG, K.WwinsG),
+            continuations(K.continuations),
+            [(db['data'].size(), db['data'].numHits(), ''.join(uu(db['data'].lookupLabel(x, y)) for x in range(7) for y in range(7)))
+             for db in K.gamelist.DBlist], )
+
+
+def test_nc_equals_pattern_search(K):
+    K.gamelist.reset()
+    K.patternSearch(START)
+    before = state(K)
+    assert before[0] and before[2]
+
+    results = [K.patternSearchNC(p, continuations=True) for p in PATTERNS]
+
+    # nothing is changed
+    assert state(K) == before
+
+    for p, r in zip(PATTERNS, results):
+        assert r.pattern is p
+        K.gamelist.reset()
+        K.patternSearch(START)
+        K.patternSearch(p)
+        assert r.noOfGames() == K.gamelist.noOfGames()
+        assert (r.noMatches, r.noSwitched, r.Bwins, r.Wwins, r.BwinsG, r.WwinsG) == (
+                K.noMatches, K.noSwitched, K.Bwins, K.Wwins, K.BwinsG, K.WwinsG)
+        assert continuations(r.continuations) == continuations(K.continuations)
+    assert results[0].noOfGames() > 0
+
+
+def test_nc_without_continuations(K):
+    K.gamelist.reset()
+    r = K.patternSearchNC(PATTERNS[0])
+    assert r.continuations is None
+    assert r.noOfGames() > 0
+    assert K.gamelist.noOfGames() == 30
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_process.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+import glob
+import shutil
+import sqlite3
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+
+SGFDIR = os.path.join(os.path.dirname(__file__), 'sgfs')
+DBDIR = os.path.join(os.path.dirname(__file__), 'db')
+
+
+def test_sgf_reader():
+    files = sgfFiles(SGFDIR)
+    assert files == sorted(glob.glob(os.path.join(SGFDIR, '*.sgf')))
+
+    reader = SGFReader(files + [os.path.join(SGFDIR, 'missing.sgf')], num_threads=3, prefetch=5)
+    result = list(reader)
+    assert [f for f, sgf in result] == files + [os.path.join(SGFDIR, 'missing.sgf')]
+    assert result[-1][1] is None
+    for f, sgf in result[:-1]:
+        with open(f) as file:
+            assert sgf == file.read()
+
+    batches = list(reader.batches(7))
+    assert [len(b) for b in batches[:-1]] == [7] * (len(batches) - 1)
+    assert sum(batches, []) == result
+
+
+def test_process():
+    os.system('rm -f %s' % os.path.join(DBDIR, 'kombilo-proc.d*'))
+    K = KEngine()
+    messages = bufferedMessages()
+    gl = K.process(SGFDIR, (DBDIR, 'kombilo-proc'), messages=messages, readers=2, prefetch=3, batchSize=4)
+    noFiles, noGames, seconds = K.processStatistics
+    assert noFiles == len(sgfFiles(SGFDIR))
+    assert noGames == gl.size_all() > 0
+    assert 'games/sec' in ''.join(messages.text)
+
+    os.system('rm -f %s' % os.path.join(DBDIR, 'kombilo-proc.d*'))
+
+
+ALL_ALGOS = lk.ALGO_HASH_FULL | lk.ALGO_HASH_CORNER | lk.ALGO_HASH_SIDE | lk.ALGO_HASH_CENTER | lk.ALGO_MINHASH
+
+
+def search_results(K):
+    results = []
+    for p in [Pattern('.X.XO....', ptype=CENTER_PATTERN, sizeX=3, sizeY=3),
+              Pattern('''
+                  .......
+                  .......
+                  .......
+                  ...X...
+                  .......
+                  .......
+                  .......
+                  ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7),
+              ]:
+        K.gamelist.reset()
+        K.patternSearch(p)
+        results.append((K.gamelist.noOfGames(), K.noMatches,
+                        sorted((c.x, c.y, c.B, c.W) for c in K.continuations)))
+    return results
+
+
+@pytest.mark.parametrize('acceptDupl,algos', [(True, None), (False, None), (True, ALL_ALGOS | lk.ALGO_SGF_COMPRESSED)])
+def test_parallel_process(tmp_path, acceptDupl, algos):
+    sgfdir = tmp_path / 'sgfs'
+    sgfdir.mkdir()
+    files = sgfFiles(SGFDIR)
+    for f in files:
+        shutil.copy(f, str(sgfdir))
+    # duplicates, which end up in the last shards
+    for f in files[:3]:
+        shutil.copy(f, os.path.join(str(sgfdir), 'zz-' + os.path.basename(f)))
+
+    def build(name, processes, acceptDupl=acceptDupl):
+        K = KEngine()
+        messages = bufferedMessages()
+        K.addDB(str(sgfdir), (str(tmp_path), name), acceptDupl=acceptDupl, algos=algos, messages=messages, processes=processes)
+        duplicates = sorted(l for l in ''.join(messages.text).splitlines() if l.startswith('Duplicate ...'))
+        return K, duplicates
+
+    serial, serialDuplicates = build('serial', 0)
+    parallel, parallelDuplicates = build('parallel', 3)
+    assert len(serial.gamelist.DBlist) == len(parallel.gamelist.DBlist) == 1
+    assert parallelDuplicates == serialDuplicates
+    assert len(serialDuplicates) == 3
+    gl = parallel.gamelist.DBlist[0]['data']
+    assert gl.size_all() == serial.gamelist.DBlist[0]['data'].size_all()
+    assert search_results(parallel) == search_results(serial)
+    assert sorted(gl.getFiles()) == sorted(serial.gamelist.DBlist[0]['data'].getFiles())
+    for K in [serial, parallel]:
+        K.gamelist.reset()
+    assert sorted(parallel.gamelist.get_data(i) for i in range(parallel.gamelist.noOfGames())) == \
+        sorted(serial.gamelist.get_data(i) for i in range(serial.gamelist.noOfGames()))
+    # the shards are removed
+    assert not glob.glob(os.path.join(str(tmp_path), 'parallel.part*'))
+    if not acceptDupl:
+        assert gl.size_all() == build('accept', 0, True)[0].gamelist.DBlist[0]['data'].size_all() - 3
+
+
+def test_update_db(tmp_path):
+    sgfdir = tmp_path / 'sgfs'
+    sgfdir.mkdir()
+    files = sgfFiles(SGFDIR)
+    for f in files[:30]:
+        shutil.copy(f, str(sgfdir))
+
+    def search(K):
+        K.gamelist.reset()
+        K.patternSearch(Pattern('.X.XO....', ptype=CENTER_PATTERN, sizeX=3, sizeY=3))
+        return K.gamelist.noOfGames(), K.noMatches
+
+    def fresh(name):
+        K = KEngine()
+        K.addDB(str(sgfdir), (str(tmp_path), name))
+        return K.gamelist.DBlist[0]['data'].size_all(), search(K)
+
+    K = KEngine()
+    K.addDB(str(sgfdir), (str(tmp_path), 'kombilo'))
+    assert K.updateDB(0) == ([], [], [])
+
+    for f in files[30:]:
+        shutil.copy(f, str(sgfdir))
+    added, modified, deleted = K.updateDB(0)
+    assert len(added) == len(files) - 30 and not modified and not deleted
+    assert (K.gamelist.DBlist[0]['data'].size_all(), search(K)) == fresh('fresh1')
+
+    # tags are kept, also for the games from modified files
+    K.gamelist.reset()
+    K.gameinfoSearch("filename like 'Gosei-Gos23-T01%'")
+    K.gamelist.addTag(SEEN_TAG, 0)
+    K.gamelist.reset()
+    K.gameinfoSearch("filename like '%s%%'" % os.path.splitext(os.path.basename(files[6]))[0])
+    assert K.gamelist.noOfGames() == 1
+    K.gamelist.addTag(SEEN_TAG, 0)
+    unchanged = [os.path.split(os.path.join(str(sgfdir), os.path.basename(f))) for f in files[8:]]
+    ids = K.gamelist.DBlist[0]['data'].gameIds(unchanged)
+
+    os.utime(os.path.join(str(sgfdir), os.path.basename(files[5])), (0, 0))
+    with open(os.path.join(str(sgfdir), os.path.basename(files[6])), 'a') as f:
+        f.write('\n')
+    os.remove(os.path.join(str(sgfdir), os.path.basename(files[7])))
+    added, modified, deleted = K.updateDB(0)
+    assert not added
+    assert modified == [os.path.join(str(sgfdir), os.path.basename(files[6]))]
+    assert deleted == [os.path.join(str(sgfdir), os.path.basename(files[7]))]
+    assert (K.gamelist.DBlist[0]['data'].size_all(), search(K)) == fresh('fresh2')
+
+    # the games from unchanged files were not processed anew
+    assert K.gamelist.DBlist[0]['data'].gameIds(unchanged) == ids
+    assert not [f for f in os.listdir(str(tmp_path)) if '.update' in f]
+
+    K.gamelist.reset()
+    K.tagSearch('S')
+    assert K.gamelist.noOfGames() == 2
+    assert K.updateDB(0) == ([], [], [])
+
+    # if the update fails, the database is unchanged
+    before = (K.gamelist.DBlist[0]['data'].size_all(), search(K))
+
+    def fail(*args, **kwargs):
+        raise RuntimeError
+    K.process = fail
+    for f in files[:3]:
+        os.remove(os.path.join(str(sgfdir), os.path.basename(f)))
+    shutil.copy(files[7], str(sgfdir))
+    with pytest.raises(RuntimeError):
+        K.updateDB(0)
+    assert (K.gamelist.DBlist[0]['data'].size_all(), search(K)) == before
+    assert not [f for f in os.listdir(str(tmp_path)) if '.update' in f]
+    del K.process
+    added, modified, deleted = K.updateDB(0)
+    assert len(added) == 1 and not modified and len(deleted) == 3
+    assert (K.gamelist.DBlist[0]['data'].size_all(), search(K)) == fresh('fresh3')
+
+
+def test_update_db_options(tmp_path):
+    sgfdir = tmp_path / 'sgfs'
+    (sgfdir / 'sub').mkdir(parents=True)
+    files = sgfFiles(SGFDIR)
+    for f in files[:5]:
+        shutil.copy(f, str(sgfdir))
+    for f in files[5:10]:
+        shutil.copy(f, str(sgfdir / 'sub'))
+
+    # one database per folder: the databases do not include subfolders
+    K = KEngine()
+    K.addDB(str(sgfdir), (str(tmp_path), 'kombilo'), all_in_one_db=False)
+    assert [K.gamelist.DBlist[i]['data'].size_all() for i in range(2)] == [5, 5]
+    assert K.updateDB(0) == ([], [], [])
+    assert K.updateDB(1) == ([], [], [])
+
+    # databases without recorded options
+    K = KEngine()
+    K.addDB(str(sgfdir), (str(tmp_path), 'all'))
+    gl = K.gamelist.DBlist[0]['data']
+    assert gl.getFileOptions() == (True, '*.sgf')
+    dbh = sqlite3.connect(gl.dbname)
+    dbh.execute('drop table FILE_OPTIONS')
+    dbh.commit()
+    dbh.close()
+    assert K.updateDB(0) == ([], [], [])
+    assert gl.getFileOptions() == (True, '*.sgf')
+
+
+def test_sgf_hash():
+    sgf = '(;GN[\u00e4])'
+    assert sgfHash(sgf) == sgfHash(sgf.encode('utf-8'))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_search_cache.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    sgfs = {}
+    for f in glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')):
+        with open(f) as file:
+            sgfs[f] = file.read()
+    create_db(sgfs, 'kombilo-sc')
+
+    K = KEngine()
+    K.gamelist.populateDBlist({'1': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-sc', ], })
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-sc.d*'))
+
+
+def search_results(K):
+    gl = K.gamelist.DBlist[0]['data']
+    return (
+            K.gamelist.noOfGames(), K.noMatches, K.noSwitched,
+            K.Bwins, K.Wwins, K.BwinsG, K.WwinsG,
+            [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label)) for c in K.continuations],
+            [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())],
+            list(gl.dates_current),
+            )
+
+
+def corner_pattern(p='...X...'):
+    return Pattern('''
+            .......
+            .......
+            .......
+            %s
+            .......
+            .......
+            .......
+            ''' % p, ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7)
+
+
+def test_cache_hit(K):
+    K.searchCache = SearchCache()
+
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern())
+    first = search_results(K)
+    assert (K.searchCache.hits, K.searchCache.misses) == (0, 1)
+    assert first[0] > 0
+
+    # a different search in between does not matter
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern('....X..'))
+
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern())
+    assert (K.searchCache.hits, K.searchCache.misses) == (1, 2)
+    assert search_results(K) == first
+
+    # same pattern on a different current list
+    K.gamelist.reset()
+    K.gameinfoSearch("PB like 'Kobayashi%'")
+    K.patternSearch(corner_pattern())
+    assert (K.searchCache.hits, K.searchCache.misses) == (1, 3)
+    narrowed = search_results(K)
+    assert narrowed[0] <= first[0]
+
+    K.gamelist.reset()
+    K.gameinfoSearch("PB like 'Kobayashi%'")
+    K.patternSearch(corner_pattern())
+    assert (K.searchCache.hits, K.searchCache.misses) == (2, 3)
+    assert search_results(K) == narrowed
+
+    # different search options
+    K.gamelist.reset()
+    so = lk.SearchOptions(1, 0)
+    K.patternSearch(corner_pattern(), so)
+    assert (K.searchCache.hits, K.searchCache.misses) == (2, 4)
+
+    K.searchCache.clear()
+    assert len(K.searchCache) == 0
+    assert K.searchCache.size == 0
+    K.searchCache = None
+
+
+def test_cache_eviction(K):
+    patterns = ['...X...', '....X..', '.....X.']
+    sizes = []
+    for p in patterns:
+        K.searchCache = SearchCache()
+        K.gamelist.reset()
+        K.patternSearch(corner_pattern(p))
+        sizes.append(K.searchCache.size)
+    assert min(sizes) > 0
+    maxSize = sum(sorted(sizes)[:2]) - 1  # room for one entry only
+    assert maxSize >= max(sizes)
+
+    K.searchCache = SearchCache(maxSize)
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern())
+    for p in patterns[1:] + patterns[:1]:
+        K.gamelist.reset()
+        K.patternSearch(corner_pattern(p))
+        assert len(K.searchCache) == 1
+        assert K.searchCache.size <= K.searchCache.maxSize
+    assert K.searchCache.hits == 0
+    K.searchCache = None
+
+
+def test_cache_invalidation(K):
+    K.searchCache = SearchCache()
+    gl = K.gamelist.DBlist[0]['data']
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern())
+    assert len(K.searchCache) == 1
+
+    gl.delete_all_snapshots()
+    assert len(K.searchCache) == 0
+
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern())
+    assert len(K.searchCache) == 1
+    state = gl.listState
+    gl.invalidateCache()  # called when games are processed
+    assert len(K.searchCache) == 0
+    assert gl.listState is None
+    K.gamelist.reset()
+    assert gl.listState != state
+    K.patternSearch(corner_pattern())
+    assert K.searchCache.hits == 0
+    K.searchCache = None
+
+
+def test_cache_symmetric_patterns(K):
+    # the mirror image of the corner pattern in the north west corner
+    mirrored = Pattern('''
+            .......
+            .......
+            .......
+            ..X....
+            .......
+            .......
+            .......
+            ''', ptype=CORNER_NW_PATTERN, sizeX=7, sizeY=7)
+    K.gamelist.reset()
+    K.patternSearch(mirrored)
+    direct = search_results(K)
+
+    K.searchCache = SearchCache()
+    K.gamelist.reset()
+    K.patternSearch(corner_pattern('....X..'))
+    K.gamelist.reset()
+    K.patternSearch(mirrored)
+    assert (K.searchCache.hits, K.searchCache.misses) == (1, 1)
+    assert search_results(K) == direct
+    K.searchCache = None
+
+
+def test_canonical_search_without_cache(K):
+    # the mirror image of this pattern is its canonical form
+    assert K.searchCache is None
+    p = corner_pattern('....X..')
+    cp, flip = p.canonical()
+    assert flip
+    K.gamelist.reset()
+    K.patternSearch(cp)
+    direct = search_results(K)
+
+    K.gamelist.reset()
+    K.patternSearch(p)
+    gl = K.gamelist.DBlist[0]['data']
+    assert gl.searchPattern is p
+    assert gl.patternFlip == flip
+    results = search_results(K)
+    assert results[:7] == direct[:7] and results[9] == direct[9]
+    # the continuations are given in the coordinates of p (the labels of
+    # continuations with the same frequency may differ)
+    assert sorted(c[:-1] for c in results[7]) == sorted((6 - c[0], ) + c[1:-1] for c in direct[7])
+
+
+def test_canonical_pattern():
+    p = corner_pattern('.X.....')
+    for f in range(8):
+        q = patternFromKey(flipPatternKey(p.key(), f))
+        assert q.canonical()[0].key() == p.canonical()[0].key()
+
+    # patterns which are symmetric themselves are not replaced
+    p = Pattern('.X.XOX.X.', ptype=CENTER_PATTERN, sizeX=3, sizeY=3)
+    assert p.canonical() == (p, 0)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_search_progress.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:15], files[15:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-progress%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-progress%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-progress*.d*'))
+
+
+PATTERN = Pattern('''
+                  .X.
+                  XO.
+                  ...
+                  ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3)
+
+
+def SO():
+    so = lk.SearchOptions(0, 0)
+    so.algos = lk.ALGO_FINALPOS | lk.ALGO_MOVELIST
+    return so
+
+
+def current(K):
+    return [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())]
+
+
+def games(K):
+    # the games only; the labels of the hits depend on the continuations found
+    return set(g.split(':')[0] for g in current(K))
+
+
+def result(K):
+    return (current(K), K.noMatches, K.noSwitched, K.Bwins, K.Wwins,
+            [(c.x, c.y, c.B, c.W, c.label) for c in K.continuations])
+
+
+class Stop(object):
+    def __init__(self):
+        self.value = False
+
+    def get(self):
+        return self.value
+
+
+@pytest.mark.parametrize('parallel', [0, 2])
+def test_progress(K, parallel):
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO(), parallel=parallel)
+    expected = result(K)
+    assert not K.searchInterrupted
+
+    calls = []
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO(), parallel=parallel, progress=lambda done, total: calls.append((done, total)), progressInterval=2)
+    assert result(K) == expected
+    assert not K.searchInterrupted
+    assert calls
+    assert all(total == 30 and 0 <= done <= total for done, total in calls)
+
+
+@pytest.mark.parametrize('parallel', [0, 2])
+def test_cancel_keep_partial(K, parallel):
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO())
+    complete = games(K)
+
+    calls = []
+
+    def progress(done, total):
+        calls.append(done)
+        if len(calls) > 12:  # stop during the final pass in the first database
+            return False
+
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO(), parallel=parallel, progress=progress, progressInterval=2)
+    assert K.searchInterrupted
+    partial = games(K)
+    assert len(partial) < len(complete)
+    assert partial <= complete
+    assert K.noMatches >= len(partial)
+    if not parallel:
+        assert partial
+
+
+def test_cancel_restore(K):
+    K.gamelist.reset()
+    K.gameinfoSearch("PB like 'K%' or PW like 'K%'")
+    p = Pattern('''
+                ...
+                .X.
+                ...
+                ''', ptype=CENTER_PATTERN, sizeX=3, sizeY=3)
+    K.patternSearch(p, SO())
+    before = result(K)
+    assert before[0]
+
+    stop = Stop()
+
+    def progress(done, total):
+        stop.value = done > 0
+
+    K.patternSearch(PATTERN, SO(), progress=progress, stop_var=stop, progressInterval=1, keepPartial=False)
+    assert K.searchInterrupted
+    assert result(K) == before
+    assert K.currentSearchPattern is p
+
+    # a search which is not interrupted is not affected by keepPartial
+    K.patternSearch(PATTERN, SO(), progressInterval=1, stop_var=Stop(), keepPartial=False)
+    assert not K.searchInterrupted
+    assert K.currentSearchPattern is PATTERN
+
+
+def test_time_limit(K):
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO(), timeLimit=0, progressInterval=1)
+    assert K.searchInterrupted
+    assert K.gamelist.noOfGames() == 0
+
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO(), timeLimit=1000)
+    assert not K.searchInterrupted
+    assert K.gamelist.noOfGames() > 0
+
+
+def test_exception_in_progress(K):
+    def progress(done, total):
+        raise ValueError
+
+    K.gamelist.reset()
+    with pytest.raises(ValueError):
+        K.patternSearch(PATTERN, SO(), progress=progress)
+    assert K.searchInterrupted
+
+    # the callbacks are removed again
+    K.gamelist.reset()
+    K.patternSearch(PATTERN, SO())
+    assert not K.searchInterrupted
+
+
+def test_gameinfo_search(K):
+    query = "PB like '%' or PW like '%'"
+    K.gamelist.reset()
+    K.gameinfoSearch(query)
+    complete = current(K)
+    assert len(complete) == 30
+
+    calls = []
+
+    def progress(done, total):
+        calls.append((done, total))
+        return len(calls) < 3
+
+    K.gamelist.reset()
+    K.gameinfoSearch(query, progress=progress, progressInterval=2)
+    assert K.searchInterrupted
+    assert 0 < K.gamelist.noOfGames() < 30
+    assert set(current(K)) <= set(complete)
+
+    K.gamelist.reset()
+    K.gameinfoSearch(query, progress=lambda done, total: False, keepPartial=False, progressInterval=1)
+    assert K.searchInterrupted
+    assert K.gamelist.noOfGames() == 30
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_sgf_tree.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:15], files[15:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-tree%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-tree%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-tree*.d*'))
+
+
+def tree(K, sgf, selection, one_pass, reset_game_list, fixedColor, sort_criterion='total'):
+    options = ConfigObj({
+        'min_number_of_hits': 2,
+        'max_number_of_branches': 4,
+        'depth': 3,
+        'comment_head': '@@monospace',
+        'reset_game_list': reset_game_list,
+        'one_pass': one_pass,
+        'sort_criterion': sort_criterion,
+        'boardsize': 19,
+        'sizex': selection[1][0] - selection[0][0] + 1,
+        'sizey': selection[1][1] - selection[0][1] + 1,
+        'anchors': (selection[0][0], selection[0][0], selection[0][1], selection[0][1]),
+        'selection': selection,
+        })
+    so = lk.SearchOptions(fixedColor, 0)
+    cursor = Cursor(sgf)
+    K.sgf_tree(cursor, 0, options, so)
+    return cursor.exportGame(0)
+
+
+@pytest.mark.parametrize('sgf,selection', [
+    ('(;GM[1]FF[4]SZ[19])', ((0, 0), (18, 18))),
+    ('(;GM[1]FF[4]SZ[19])', ((0, 0), (8, 8))),
+    ('(;GM[1]FF[4]SZ[19]AB[pd])', ((9, 0), (18, 9))),
+    ])
+@pytest.mark.parametrize('reset_game_list', [0, 1])
+@pytest.mark.parametrize('fixedColor', [0, 1])
+def test_one_pass(K, sgf, selection, reset_game_list, fixedColor):
+    K.gamelist.reset()
+    expected = tree(K, sgf, selection, 0, reset_game_list, fixedColor)
+    assert expected.count(';') > 10
+    assert tree(K, sgf, selection, 1, reset_game_list, fixedColor) == expected
+    assert K.gamelist.noOfGames() == 30
+
+
+def test_one_pass_sort_criterion(K):
+    K.gamelist.reset()
+    sgf = '(;GM[1]FF[4]SZ[19])'
+    selection = ((0, 0), (8, 8))
+    expected = tree(K, sgf, selection, 0, 0, 0, 'latest')
+    assert tree(K, sgf, selection, 1, 0, 0, 'latest') == expected
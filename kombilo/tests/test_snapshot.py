@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_snapshot.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from .. import libkombilo as lk
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    sgfs = {}
+    for f in glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/Gosei*.sgf')):
+        with open(f) as file:
+            sgfs[f] = file.read()
+    create_db(sgfs, 'kombilo-snap')
+
+    K = KEngine()
+    K.gamelist.populateDBlist({'1': ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-snap', ], })
+    K.loadDBs()
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-snap.d*'))
+
+
+def state(K):
+    gl = K.gamelist.DBlist[0]['data']
+    K.gamelist.update()
+    return (
+            [K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames())],
+            gl.num_hits, gl.num_switched, gl.Bwins, gl.Wwins, gl.BwinsG, gl.WwinsG,
+            [(c.x, c.y, c.B, c.W, c.tB, c.tW, c.wB, c.lB, c.wW, c.lW, uu(c.label), list(c.dates_B), list(c.dates_W))
+             for c in [gl.lookupContinuation(x, y) for x in range(7) for y in range(7)] if c.B or c.W] if gl.mrs_pattern else [],
+            list(gl.dates_current),
+            )
+
+
+PATTERN = Pattern('''
+                  .......
+                  .......
+                  .......
+                  ...X...
+                  .......
+                  .......
+                  .......
+                  ''', ptype=CORNER_NE_PATTERN, sizeX=7, sizeY=7)
+
+
+def test_restore(K):
+    gl = K.gamelist.DBlist[0]['data']
+    gl.delete_all_snapshots()
+    K.gamelist.reset()
+    K.patternSearch(PATTERN)
+    expected = state(K)
+    assert 0 < len(expected[0]) < 30
+    handle = gl.snapshot()
+
+    K.gamelist.reset()
+    assert state(K) != expected
+    gl.restore(handle)
+    assert state(K) == expected
+
+    # a game info search leaves no hits in the current list
+    K.gamelist.reset()
+    K.gameinfoSearch("pw like 'Kobayashi%'")
+    expected_gi = state(K)
+    handle_gi = gl.snapshot()
+    gl.restore(handle)
+    gl.restore(handle_gi)
+    assert state(K) == expected_gi
+
+
+def test_compact(K):
+    gl = K.gamelist.DBlist[0]['data']
+    gl.delete_all_snapshots()
+    K.gamelist.reset()
+    handle = gl.snapshot()
+    # the current list is stored as a bitset over all games, and the date
+    # profiles of the continuations are stored sparsely
+    assert gl.snapshot_size(handle) < 2000
+    assert gl.num_snapshots() == 1
+    assert gl.snapshots_memory() >= gl.snapshot_size(handle)
+    assert K.gamelist.snapshotsMemory() == [(uu(gl.dbname), gl.snapshots_memory())]
+
+
+def test_reference_counting(K):
+    gl = K.gamelist.DBlist[0]['data']
+    gl.delete_all_snapshots()
+    K.gamelist.reset()
+    h1 = gl.snapshot()
+    h2 = gl.snapshot()
+    assert h2 != h1
+    gl.retain_snapshot(h1)
+    assert gl.num_snapshots() == 2
+    assert gl.delete_snapshot(h1) == 1
+    gl.restore(h1, True)
+    assert gl.num_snapshots() == 1
+    with pytest.raises(lk.DBError):
+        gl.restore(h1)
+    with pytest.raises(lk.DBError):
+        gl.delete_snapshot(h1)
+    assert gl.delete_snapshot(h2) == 0
+    assert gl.num_snapshots() == 0
+    assert gl.snapshots_memory() == 0
+
+    # handles are not reused
+    assert gl.snapshot() not in (h1, h2)
+
+
+def test_sgf_tree_releases_snapshots(K):
+    gl = K.gamelist.DBlist[0]['data']
+    gl.delete_all_snapshots()
+    K.gamelist.reset()
+    options = ConfigObj({
+        'min_number_of_hits': 2, 'max_number_of_branches': 3, 'depth': 3,
+        'comment_head': '@@monospace', 'reset_game_list': 0, 'sort_criterion': 'total',
+        'boardsize': 19, 'sizex': 19, 'sizey': 19, 'anchors': (0, 0, 0, 0),
+        'selection': ((0, 0), (18, 18)),
+        })
+    K.sgf_tree(Cursor('(;GM[1]FF[4]SZ[19])'), 0, options, lk.SearchOptions(0, 0))
+    assert gl.num_snapshots() == 0
+    assert K.gamelist.noOfGames() == 30
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+
+# File: kombilo/tests/test_tags.py
+
+##   Copyright (C) 2001- Ulrich Goertz (ug@geometry.de)
+
+##   Kombilo is a go database program.
+
+## Permission is hereby granted, free of charge, to any person obtaining a copy of
+## this software and associated documentation files (the "Software"), to deal in
+## the Software without restriction, including without limitation the rights to
+## use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+## of the Software, and to permit persons to whom the Software is furnished to do
+## so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+
+from __future__ import absolute_import, division, unicode_literals
+
+import pytest
+
+from ..kombiloNG import *
+
+from .util import create_db
+
+
+@pytest.fixture(scope='module')
+def K():
+    files = sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'sgfs/*.sgf')))
+    dbs = {}
+    for i, fl in enumerate([files[:20], files[20:]]):
+        sgfs = {}
+        for f in fl:
+            with open(f) as file:
+                sgfs[f] = file.read()
+        create_db(sgfs, 'kombilo-tags%d' % i)
+        dbs['%d' % i] = ['sgfs', os.path.join(os.path.dirname(__file__), 'db'), 'kombilo-tags%d' % i, ]
+
+    K = KEngine()
+    K.gamelist.populateDBlist(dbs)
+    K.loadDBs()
+    K.gamelist.customTags['10'] = ('X', 'Test tag', )
+    yield K
+
+    os.system('rm -f %s' % os.path.join(os.path.dirname(__file__), 'db/kombilo-tags*.d*'))
+
+
+def games(K):
+    return sorted(K.gamelist.get_data(i) for i in range(K.gamelist.noOfGames()))
+
+
+def sql_tag_search(K, tag):
+    # the tag search as it was done before the tag bitsets were introduced
+    query = tag.replace('(', ' ( ').replace(')', ' ) ').split()
+    for i, q in enumerate(query):
+        if q not in ['and', 'or', 'not', '(', ')']:
+            t = [x for x in K.gamelist.customTags if K.gamelist.customTags[x][0] == q][0]
+            query[i] = 'exists(select * from game_tags where game_id=games.id and tag_id=%s)' % t
+    for db in K.gamelist.DBlist:
+        db['data'].tagsearchSQL(' '.join(query))
+    K.gamelist.update()
+
+
+def tag_games(K, query, tag, delete=False):
+    K.gamelist.reset()
+    K.gameinfoSearch(query)
+    if delete:
+        K.gamelist.deleteTags(tag)
+    else:
+        K.gamelist.setTags(tag)
+
+
+QUERIES = ['X', 'not X', 'X and S', 'X or not S', 'not (X or S)', 'H or P', 'not not X and not S', ]
+
+
+def check(K, pre_query=None):
+    for q in QUERIES:
+        result = []
+        for search in [K.tagSearch, lambda q: sql_tag_search(K, q)]:
+            K.gamelist.reset()
+            if pre_query:
+                K.gameinfoSearch(pre_query)
+            search(q)
+            result.append(games(K))
+        assert result[0] == result[1]
+
+
+def test_tags(K):
+    tag_games(K, "PB like 'K%'", 10)
+    K.gamelist.reset()
+    K.tagSearch('X')
+    assert K.gamelist.noOfGames() == K.gameinfoSearchNC("PB like 'K%'") > 0
+
+    tag_games(K, "date < '1998-00-00'", SEEN_TAG)
+    check(K)
+    check(K, "PW like '%o%'")
+
+    # the bitsets are kept up to date
+    tag_games(K, "PB like 'Ko%'", 10, delete=True)
+    check(K)
+    K.gamelist.reset()
+    K.gamelist.addTag(10, 0)
+    K.gamelist.DBlist[1]['data'].setTagID(10, 3)
+    check(K)
+    for db in K.gamelist.DBlist:
+        db['data'].deleteTag(SEEN_TAG)
+    check(K)
+
+
+def test_tag_bits(K):
+    K.gamelist.reset()
+    for db in K.gamelist.DBlist:
+        gl = db['data']
+        gl.setTags(11)
+        assert gl.tagBits(11) == int(gl.currentBits(), 16) == (1 << gl.size_all()) - 1
+        gl.deleteTags(11)
+        assert gl.tagBits(11) == 0
+        gl.invalidateCache()
+        assert gl.tagBits(11) == 0
+
+
+def test_tag_references(K):
+    references = {}
+    for db in K.gamelist.DBlist:
+        dbh = sqlite3.connect(db['data'].dbname)
+        references.update((sig, ['Book']) for sig, in dbh.execute('select signature from games order by id limit 3'))
+        dbh.close()
+    references['aaaaaaaaaaaa'] = ['Nothing']
+    K.gamelist.references = references
+
+    def expected(gl):
+        # the tagging as it was done before setTagsBySignature was introduced
+        return set(gid for ref in references for gid in gl.sigsearchNC(ref))
+
+    def tagged(gl):
+        dbh = sqlite3.connect(gl.dbname)
+        ids = set(gid for gid, in dbh.execute('select game_id from game_tags where tag_id = ?', (REFERENCED_TAG, )))
+        dbh.close()
+        assert bin(gl.tagBits(REFERENCED_TAG)).count('1') == len(ids)
+        return ids
+
+    for db in K.gamelist.DBlist:
+        gl = db['data']
+        gl.setTagID(REFERENCED_TAG, max(gl.columns().ids))  # removed by retag
+        K.tagReferences(gl, retag=True)
+        assert tagged(gl) == expected(gl) != set()
+        assert gl.setTagsBySignature(REFERENCED_TAG, list(references)) == 0
+
+    hash = K.referencesHash()
+    del references[sorted(references)[0]]
+    assert K.referencesHash() != hash
+    K.loadDBs(retagReferences=True)
+    for db in K.gamelist.DBlist:
+        assert tagged(db['data']) == expected(db['data'])
+
+
+def test_invalid_tag_query(K):
+    tag_games(K, "PB like 'K%'", 10)
+    K.gamelist.reset()
+    K.gameinfoSearch("PW like '%o%'")
+    before = games(K)
+    for q in ['X and', 'X X', 'not', '(X or S', 'X or S)', '()', 'Y', 'X and or S', 'X.__class__']:
+        with pytest.raises(ValueError):
+            K.tagSearch(q)
+        assert games(K) == before
+
+
+def test_parse_tag_query():
+    evaluate = parseTagQuery('A or not B and (C or A)', {'1': ('A', ''), '2': ('B', ''), '3': ('C', '')})
+    bits = {1: 0b0001, 2: 0b0110, 3: 0b1010}
+    assert evaluate(bits.get) & 0b1111 == 0b1001
@@ -35,13 +35,15 @@ from .. import libkombilo as lk
 from ..kombiloNG import *
 
 
-def create_db(sgfs, dbname='kombilo'):
+def create_db(sgfs, dbname='kombilo', algos=None):
     pop = lk.ProcessOptions()
     pop.rootNodeTags = 'PW,PB,RE,DT,EV'
     pop.sgfInDB = True
     pop.professional_tag = False
     pop.processVariations = True
     pop.algos = lk.ALGO_FINALPOS | lk.ALGO_MOVELIST | lk.ALGO_HASH_FULL | lk.ALGO_HASH_CORNER
+    if algos:
+        pop.algos |= algos
 
     gls = lk.vectorGL()
 
@@ -16,13 +16,15 @@ if sys.platform.startswith('win'):
     sources.append('kombilo/libkombilo/sqlite3.c')
     kwargs['library_dirs'] = ['C:\\Libraries\\boost_1_62_0', ]
     kwargs['extra_compile_args'] = ['-I.', '-IC:\\Libraries\\boost_1_62_0', '-openmp']
+    kwargs['define_macros'] = [('SQLITE_ENABLE_FTS5', None), ]  # full text index, see ALGO_FULLTEXT
+    kwargs['libraries'] = ['zlib', ]  # compressed SGF sources, see ALGO_SGF_COMPRESSED
 elif sys.platform.startswith('darwin'):
-    kwargs['libraries'] = ['stdc++', 'sqlite3']
+    kwargs['libraries'] = ['stdc++', 'sqlite3', 'z']
     kwargs['library_dirs'] = ['/usr/lib', ]
     kwargs['extra_compile_args'] = ['-I.', '-I/usr/local/include', '-I/opt/local/include']  # can use this w/ g++ to max optimization
     kwargs['extra_link_args'] = [ ]
 else:
-    kwargs['libraries'] = ['stdc++', 'sqlite3']
+    kwargs['libraries'] = ['stdc++', 'sqlite3', 'z']
     kwargs['library_dirs'] = ['/usr/lib', ]
     kwargs['extra_compile_args'] = ['-O3', '-I.', '-fopenmp']  # can use this w/ g++ to max optimization
     kwargs['extra_link_args'] = [ '-lgomp', ]